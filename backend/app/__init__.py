@@ -1,5 +1,14 @@
 """Application factory."""
-from flask import Flask
+import os
+import time
+
+# Opt-in import profiling; must run before the heavy imports below.
+# Read from the environment directly because config itself is being timed.
+if os.environ.get('STARTUP_REPORT', '').lower() == 'true':
+    from app.infrastructure.observability import install_import_timer
+    install_import_timer()
+
+from flask import Flask, Response
 from flask_cors import CORS
 import json
 from bson import ObjectId
@@ -8,9 +17,12 @@ import datetime
 from app.presentation.config import get_config
 from app.presentation.config.logging_config import setup_logging
 from app.presentation.middlewares import register_error_handlers
+from app.presentation.utils.middleware import ops_access_required
 from app.infrastructure.database import MongoDBManager
-from app.infrastructure.external import NotificationService
+from app.infrastructure.observability import timed_init, build_startup_report, log_startup_report
+from app.infrastructure.observability.metrics import registry as metrics_registry
 from app.domain.services_interfaces import INotificationService
+from app.container import LazyService, container
 
 
 class JSONEncoder(json.JSONEncoder):
@@ -23,7 +35,8 @@ class JSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
-notification_service: INotificationService = None
+# Built on first use; Firebase is only initialized when an FCM message is sent
+notification_service: INotificationService = LazyService(container, 'notification_service')
 
 
 def create_app(config_name: str = None):
@@ -36,8 +49,7 @@ def create_app(config_name: str = None):
     Returns:
         Flask application instance
     """
-    global notification_service
-    
+    started_at = time.perf_counter()
     app = Flask(__name__)
     
     # Load configuration
@@ -50,18 +62,25 @@ def create_app(config_name: str = None):
     app.logger.info(f"Starting application with {config.__class__.__name__}")
     
     # Initialize MongoDB FIRST (before importing controllers)
-    mongo_manager = MongoDBManager()
-    mongo_manager.initialize(
-        mongo_uri=config.MONGO_URI,
-        database_name=config.DATABASE_NAME
-    )
+    with timed_init('MongoDBManager'):
+        mongo_manager = MongoDBManager()
+        mongo_manager.initialize(
+            mongo_uri=config.MONGO_URI,
+            database_name=config.DATABASE_NAME
+        )
+    
+    # Zero-shot label sets are shared by every relevancy check (the
+    # container records the init time)
+    container.relevancy_labels
     
     # Setup CORS - Allow all origins or specify the frontend URL
     cors_origins = ["*"] # or ["https://reputation-guardian.vercel.app", "http://localhost:3000"]
     CORS(app, origins=cors_origins)
     
     # Import blueprints AFTER MongoDB initialization
-    from app.presentation.api.routes import auth_bp, qr_bp, dashboard_bp, webhook_bp
+    # (route modules only declare lazy services; nothing is built here)
+    with timed_init('blueprints'):
+        from app.presentation.api.routes import auth_bp, qr_bp, dashboard_bp, webhook_bp
     
     # Register blueprints
     app.register_blueprint(auth_bp)
@@ -72,19 +91,40 @@ def create_app(config_name: str = None):
     # Register error handlers
     register_error_handlers(app)
     
-    # Initialize Firebase (optional)
-    try:
-        notification_service = NotificationService()
-        app.logger.info("Notification service initialized successfully")
-    except Exception as e:
-        app.logger.warning(f"Firebase initialization failed: {e}")
-    
     # Health check endpoint
     @app.route('/health')
     def health_check():
         return {'status': 'healthy', 'message': 'Application is running'}, 200
     
-    app.logger.info("Application initialized successfully")
+    # Prometheus metrics (pipeline stages, external calls, fallbacks)
+    @app.route('/metrics')
+    @ops_access_required
+    def metrics():
+        return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+    
+    # Rate limiter metrics
+    @app.route('/health/rate-limits')
+    @ops_access_required
+    def rate_limit_metrics():
+        from app.infrastructure.throttling import RateLimiter
+        return RateLimiter.instance().metrics(), 200
+    
+    # Degraded-mode signals (reviews in flight, backlog, HF latency)
+    @app.route('/health/load')
+    @ops_access_required
+    def load_report():
+        return container.load_monitor.snapshot(), 200
+    
+    # Startup cost breakdown (imports are included when STARTUP_REPORT=true)
+    @app.route('/health/startup')
+    @ops_access_required
+    def startup_report():
+        return build_startup_report(), 200
+    
+    startup_seconds = time.perf_counter() - started_at
+    app.logger.info("Application initialized successfully in %.0fms", startup_seconds * 1000)
+    if os.environ.get('STARTUP_REPORT', '').lower() == 'true':
+        log_startup_report(app.logger)
     
     return app
 
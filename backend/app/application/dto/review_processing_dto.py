@@ -23,6 +23,7 @@ class ReviewDocument(BaseModel):
     processing: Processing
     analysis: Optional[Dict[str, Any]] = None
     generated_content: Optional[Dict[str, Any]] = None
+    pipeline: Optional[Dict[str, Any]] = None  # Stage checkpoint (see ProcessReviewUseCase)
 
     class Config:
         populate_by_name = True
@@ -2,9 +2,13 @@
 from .auth_service import AuthService
 from .dashboard_service import DashboardService
 from .webhook_service import WebhookService
+from .inference_usage_service import InferenceUsageService
+from .review_worker import ReviewWorker
 
 __all__ = [
     'AuthService',
     'DashboardService', 
     'WebhookService',
+    'InferenceUsageService',
+    'ReviewWorker',
 ]
@@ -59,6 +59,12 @@ class AuthService(IAuthService):
         if not self.user_repository.verify_password(user.password_hash, password):
             raise InvalidCredentialsException()
         
+        # Upgrade hashes made with an older cost factor
+        try:
+            self.user_repository.rehash_password_if_needed(user.id, user.password_hash, password)
+        except Exception as e:
+            logger.warning("Password rehash skipped for user %s: %s", user.id, e)
+        
         # Generate token
         token = jwt.encode({
             "email": user.email,
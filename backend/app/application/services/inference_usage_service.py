@@ -0,0 +1,107 @@
+"""
+Inference Usage Service
+Per-shop reports of external model usage and its estimated cost.
+"""
+from typing import Dict, List
+from app.infrastructure.repositories import InferenceUsageRepository
+from app.infrastructure.observability.inference_usage import estimate_cost
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceUsageService:
+    def __init__(self, usage_repository: InferenceUsageRepository = None):
+        """
+        Args:
+            usage_repository: Inference usage repository (injected for testing)
+        """
+        self.usage_repository = usage_repository or InferenceUsageRepository()
+
+    def get_shop_report(self, shop_id: str, days: int = 30) -> dict:
+        """
+        Usage of one shop over the last `days` days.
+
+        Returns:
+            Dictionary with period totals, per-service totals (with estimated
+            cost), averages per review and a daily series.
+        """
+        daily = self.usage_repository.find_by_shop(shop_id, days)
+
+        services: Dict[str, dict] = {}
+        reviews = 0
+        total_cost = 0.0
+        series = []
+        for doc in daily:
+            totals = doc.get('totals', {})
+            reviews += doc.get('reviews', 0)
+            total_cost += totals.get('estimated_cost', 0)
+            for service, entry in doc.get('services', {}).items():
+                merged = services.setdefault(service, {})
+                for field, value in entry.items():
+                    merged[field] = merged.get(field, 0) + value
+            series.append({
+                'day': doc['day'],
+                'reviews': doc.get('reviews', 0),
+                'calls': totals.get('calls', 0),
+                'tokens': totals.get('prompt_tokens', 0) + totals.get('completion_tokens', 0),
+                'estimated_cost': round(totals.get('estimated_cost', 0), 6)
+            })
+
+        # Per-service cost uses current rates; totals use the rates at the time
+        for service, entry in services.items():
+            entry['avg_latency_ms'] = round(entry['latency_ms'] / entry['calls'], 1) if entry.get('calls') else 0
+            entry['estimated_cost'] = estimate_cost({service: entry})
+
+        total_calls = sum(entry.get('calls', 0) for entry in services.values())
+        total_tokens = sum(entry.get('prompt_tokens', 0) + entry.get('completion_tokens', 0) for entry in services.values())
+        total_cost = round(total_cost, 6)
+        return {
+            'shop_id': shop_id,
+            'days': days,
+            'reviews': reviews,
+            'calls': total_calls,
+            'tokens': total_tokens,
+            'estimated_cost': total_cost,
+            'per_review': {
+                'calls': round(total_calls / reviews, 2) if reviews else 0,
+                'tokens': round(total_tokens / reviews, 1) if reviews else 0,
+                'estimated_cost': round(total_cost / reviews, 6) if reviews else 0
+            },
+            'services': services,
+            'daily': series
+        }
+
+    def get_top_shops(self, days: int = 7, limit: int = 20, sort_by: str = 'calls') -> List[dict]:
+        """
+        Shops ranked by usage, with their share of all usage in the period.
+
+        A shop whose `share` is far above its share of reviews is the one
+        driving disproportionate inference load.
+        """
+        overall = self.usage_repository.period_totals(days)
+        all_calls = overall['totals']['calls'] or 1
+        all_tokens = (overall['totals']['prompt_tokens'] + overall['totals']['completion_tokens']) or 1
+        all_reviews = overall['reviews'] or 1
+        all_cost = overall['estimated_cost'] or 1
+
+        rows = []
+        for row in self.usage_repository.top_shops(days, limit, sort_by):
+            totals = row['totals']
+            tokens = totals['prompt_tokens'] + totals['completion_tokens']
+            rows.append({
+                'shop_id': row['shop_id'],
+                'reviews': row['reviews'],
+                'calls': totals['calls'],
+                'tokens': tokens,
+                'avg_latency_ms': round(totals['latency_ms'] / totals['calls'], 1) if totals['calls'] else 0,
+                'calls_per_review': round(totals['calls'] / row['reviews'], 2) if row['reviews'] else 0,
+                'estimated_cost': round(row.get('estimated_cost', 0), 6),
+                'share': {
+                    'reviews': round(row['reviews'] / all_reviews, 4),
+                    'calls': round(totals['calls'] / all_calls, 4),
+                    'tokens': round(tokens / all_tokens, 4),
+                    'estimated_cost': round(row.get('estimated_cost', 0) / all_cost, 4)
+                }
+            })
+        return rows
@@ -0,0 +1,249 @@
+"""
+Review Worker
+Runs the background review jobs, shared fairly between shops.
+
+The jobs are interrupted reviews to resume and reviews saved in degraded
+mode to enrich (see ProcessReviewUseCase). Taking them oldest first lets one
+shop with a flood of submissions hold up every other shop, so each poll
+reads the waiting reviews grouped by shop and a FairScheduler (weighted
+deficit round-robin) picks which shop runs next, within per-shop
+concurrency caps.
+
+Reviews also carry the priority assigned at ingestion (complaints and low
+ratings are HIGH, see PriorityProcessor). Higher priority reviews run first,
+across shops; a review gains one priority level per WORKER_PRIORITY_AGING_SECONDS
+waited, so praise is delayed by a burst of complaints but never starved.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Mapping, Optional, Set
+
+from app.application.services.webhook_service import WebhookService
+from app.domain.enums import ReviewPriority
+from app.infrastructure.repositories import ReviewRepository
+from app.infrastructure.throttling import FairScheduler, LoadMonitor
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DEPTH = registry.gauge(
+    'review_worker_queue_depth',
+    'Reviews waiting for the review worker, per shop.',
+    ('shop_id',)
+)
+RUNNING = registry.gauge(
+    'review_worker_running',
+    'Review worker jobs running, per shop.',
+    ('shop_id',)
+)
+JOBS_TOTAL = registry.counter(
+    'review_worker_jobs_total',
+    'Review worker jobs, by kind and outcome.',
+    ('kind', 'outcome')
+)
+
+
+class ReviewWorker:
+    """
+    Polls the waiting reviews and runs them on a thread pool, fairly per shop.
+
+    Claims are atomic, so several workers (processes) can run side by side;
+    a review another worker took first is counted as 'skipped'.
+    """
+
+    # Least time between polls while jobs are finishing
+    MIN_POLL_SECONDS = 1.0
+
+    def __init__(
+        self,
+        webhook_service: WebhookService,
+        review_repository: ReviewRepository,
+        load_monitor: LoadMonitor = None,
+        concurrency: int = 4,
+        shop_concurrency: int = 1,
+        shop_concurrency_overrides: Mapping[str, int] = None,
+        shop_weights: Mapping[str, float] = None,
+        fetch_per_shop: int = 20,
+        priority_aging_seconds: float = 300
+    ):
+        """
+        Args:
+            webhook_service: Runs the resume and enrich jobs
+            review_repository: Repository holding the waiting reviews
+            load_monitor: Enrich jobs wait while degraded (optional)
+            concurrency: Jobs running at once in this worker
+            shop_concurrency: Jobs of one shop running at once
+            shop_concurrency_overrides: `shop_concurrency` per shop
+            shop_weights: Share of turns per shop (default 1)
+            fetch_per_shop: Waiting reviews read per shop and poll
+            priority_aging_seconds: Wait that raises a review one priority
+                level (0 disables aging)
+        """
+        self.webhook_service = webhook_service
+        self.review_repository = review_repository
+        self.load_monitor = load_monitor
+        self.concurrency = concurrency
+        self.fetch_per_shop = fetch_per_shop
+        self.priority_aging_seconds = priority_aging_seconds
+        self.scheduler: FairScheduler[dict] = FairScheduler(
+            weights=shop_weights,
+            concurrency=shop_concurrency_overrides,
+            default_concurrency=shop_concurrency,
+            rank=self._lane
+        )
+        self._running_ids: Set[str] = set()
+        self._outcomes: Dict[str, int] = {}
+        self._reported_shops: Set[str] = set()
+        self._job_done = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(
+        cls,
+        webhook_service: WebhookService,
+        review_repository: ReviewRepository,
+        load_monitor: LoadMonitor = None
+    ) -> 'ReviewWorker':
+        """Build a worker with the WORKER_* settings."""
+        from app.presentation.config import (
+            WORKER_CONCURRENCY,
+            WORKER_SHOP_CONCURRENCY,
+            WORKER_SHOP_CONCURRENCY_OVERRIDES,
+            WORKER_SHOP_WEIGHTS,
+            WORKER_FETCH_PER_SHOP,
+            WORKER_PRIORITY_AGING_SECONDS
+        )
+        return cls(
+            webhook_service,
+            review_repository,
+            load_monitor,
+            concurrency=WORKER_CONCURRENCY,
+            shop_concurrency=WORKER_SHOP_CONCURRENCY,
+            shop_concurrency_overrides=WORKER_SHOP_CONCURRENCY_OVERRIDES,
+            shop_weights=WORKER_SHOP_WEIGHTS,
+            fetch_per_shop=WORKER_FETCH_PER_SHOP,
+            priority_aging_seconds=WORKER_PRIORITY_AGING_SECONDS
+        )
+
+    def poll(self) -> int:
+        """
+        Refresh the scheduler with the reviews waiting now.
+
+        Returns:
+            Number of jobs queued (across shops)
+        """
+        max_attempts = self.webhook_service.process_review_use_case.max_attempts
+        try:
+            groups = self.review_repository.find_waiting_by_shop(
+                max_attempts,
+                self.fetch_per_shop,
+                self.priority_aging_seconds
+            )
+        except Exception as e:
+            logger.error("Failed to read the waiting reviews: %s", e)
+            return 0
+
+        enrich = self.load_monitor is None or not self.load_monitor.degraded
+        with self._lock:
+            running = set(self._running_ids)
+        jobs: Dict[str, list] = {}
+        for group in groups:
+            shop_id = str(group['shop_id'])
+            jobs[shop_id] = [
+                review for review in group['reviews']
+                if str(review['_id']) not in running and (enrich or self._kind(review) == 'resume')
+            ]
+            QUEUE_DEPTH.set(group['depth'], shop_id=shop_id)
+        for shop_id in self._reported_shops - set(jobs):
+            QUEUE_DEPTH.remove(shop_id=shop_id)
+        self._reported_shops = set(jobs)
+
+        self.scheduler.replace(jobs)
+        return sum(len(queue) for queue in jobs.values())
+
+    def run(self, stop: threading.Event, interval: float = 10.0, once: bool = False) -> Dict[str, int]:
+        """
+        Run jobs until `stop` is set.
+
+        Args:
+            stop: Set to stop (running jobs are finished first)
+            interval: Seconds between polls while idle
+            once: Return once no more reviews are waiting
+
+        Returns:
+            Number of jobs run by '<kind>:<outcome>'
+        """
+        self._outcomes = {}
+        last_poll: Optional[float] = None
+        queued = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='review-worker') as pool:
+            while not stop.is_set():
+                now = time.monotonic()
+                if (last_poll is None or now - last_poll >= interval
+                        or (self._drained() and now - last_poll >= self.MIN_POLL_SECONDS)):
+                    queued = self.poll()
+                    last_poll = now
+                self._dispatch(pool)
+                idle = self._in_flight() == 0
+                if once and idle and self._drained() and not queued:
+                    break
+                self._job_done.wait(interval if idle and self._drained() else self.MIN_POLL_SECONDS)
+                self._job_done.clear()
+        return dict(self._outcomes)
+
+    def _dispatch(self, pool: ThreadPoolExecutor) -> None:
+        while self._in_flight() < self.concurrency:
+            picked = self.scheduler.next()
+            if picked is None:
+                return
+            shop_id, review = picked
+            with self._lock:
+                self._running_ids.add(str(review['_id']))
+            self._report_running(shop_id)
+            pool.submit(self._run_job, shop_id, review)
+
+    def _run_job(self, shop_id: str, review: dict) -> None:
+        review_id = str(review['_id'])
+        kind = self._kind(review)
+        try:
+            if kind == 'resume':
+                outcome = self.webhook_service.resume_review(review_id)
+            else:
+                outcome = self.webhook_service.enrich_review(review_id)
+        except Exception as e:
+            logger.error("Review worker job %s %s failed: %s", kind, review_id, e)
+            outcome = 'error'
+        outcome = outcome or 'skipped'
+        JOBS_TOTAL.inc(kind=kind, outcome=outcome)
+        with self._lock:
+            key = f"{kind}:{outcome}"
+            self._outcomes[key] = self._outcomes.get(key, 0) + 1
+            self._running_ids.discard(review_id)
+        self.scheduler.done(shop_id)
+        self._report_running(shop_id)
+        self._job_done.set()
+
+    def _report_running(self, shop_id: str) -> None:
+        running = self.scheduler.running(shop_id)
+        if running:
+            RUNNING.set(running, shop_id=shop_id)
+        else:
+            RUNNING.remove(shop_id=shop_id)
+
+    def _in_flight(self) -> int:
+        with self._lock:
+            return len(self._running_ids)
+
+    def _drained(self) -> bool:
+        return not any(entry['waiting'] for entry in self.scheduler.snapshot().values())
+
+    @staticmethod
+    def _lane(review: dict) -> int:
+        """Priority level of a waiting review, aging included."""
+        return min(int(review.get('priority', ReviewPriority.NORMAL)), int(ReviewPriority.HIGH))
+
+    @staticmethod
+    def _kind(review: dict) -> str:
+        return 'resume' if review.get('state') in ReviewRepository.ACTIVE_PIPELINE_STATES else 'enrich'
@@ -5,6 +5,8 @@ Responsible for extracting and structuring form fields from webhook payloads.
 import logging
 from typing import Dict, Any, List
 
+logger = logging.getLogger(__name__)
+
 
 class FormFieldExtractor:
     """
@@ -84,5 +86,5 @@ class FormFieldExtractor:
         try:
             return int(value)
         except (ValueError, TypeError):
-            logging.warning(f"Could not parse rating value: {value}")
+            logger.warning("Could not parse rating value: %s", value)
             return 0
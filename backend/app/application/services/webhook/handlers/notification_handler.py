@@ -3,10 +3,15 @@ Notification Handler
 Sends review notifications to shop owners via FCM or Telegram.
 """
 import logging
+from concurrent.futures import Future
+from typing import List, Optional
 
 from app.infrastructure.external import NotificationService, TelegramService
+from app.infrastructure.repositories import UserRepository
 from app.application.dto.review_processing_dto import ReviewDocument
 
+logger = logging.getLogger(__name__)
+
 
 class NotificationHandler:
     """
@@ -16,18 +21,48 @@ class NotificationHandler:
     Follows SRP - only handles notification sending logic.
     """
     
-    def __init__(self, notification_service: NotificationService, telegram_service: TelegramService):
+    def __init__(
+        self,
+        notification_service: NotificationService,
+        telegram_service: TelegramService,
+        user_repository: UserRepository = None
+    ):
         """
         Initialize NotificationHandler with required dependencies.
         
         Args:
             notification_service: Service for FCM notifications
             telegram_service: Service for Telegram notifications
+            user_repository: Repository used to prune stale FCM tokens
         """
         self.notification_service = notification_service
         self.telegram_service = telegram_service
+        self.user_repository = user_repository
     
-    def send_review_notification(self, owner, review_doc: ReviewDocument) -> None:
+    def send_preliminary_notification(self, owner, review_doc: ReviewDocument) -> Optional[Future]:
+        """
+        Send a fast first alert before AI enrichment finishes.
+        
+        Only Telegram supports editing the alert afterwards, so FCM owners
+        get a single notification once analysis is done.
+        
+        Args:
+            owner: User/Shop owner object with notification preferences
+            review_doc: Review document with sentiment but no generated content
+            
+        Returns:
+            Future for the sent alert (pass it to `send_review_notification`),
+            or None if no preliminary alert was sent
+        """
+        try:
+            if not owner or owner.notification_tokens or not owner.telegram_chat_id:
+                return None
+            return self.telegram_service.send_preliminary_notification(owner.telegram_chat_id, review_doc)
+        except Exception as e:
+            logger.error("Preliminary notification failed for shop %s: %s", review_doc.shop_id, e)
+            return None
+    
+    def send_review_notification(self, owner, review_doc: ReviewDocument, preliminary: Optional[Future] = None) -> None:
         """
         Send notification based on the processed review document.
         
@@ -37,34 +72,39 @@ class NotificationHandler:
         Args:
             owner: User/Shop owner object with notification preferences
             review_doc: Processed review document
+            preliminary: Preliminary Telegram alert to update in place
         """
         try:
             if not owner:
-                logging.warning(f"No owner found for shop {review_doc.shop_id}")
+                logger.warning("No owner found for shop %s", review_doc.shop_id)
                 return
             
             # Check if owner has notification channels configured
-            if not (owner.device_token or owner.telegram_chat_id):
-                logging.info(f"No notification channels configured for shop {review_doc.shop_id}")
+            device_tokens = owner.notification_tokens
+            if not (device_tokens or owner.telegram_chat_id):
+                logger.info("No notification channels configured for shop %s", review_doc.shop_id)
                 return
             
-            # Send via FCM if device token is available
-            if owner.device_token:
-                self._send_fcm_notification(owner.device_token, review_doc)
+            # Send via FCM to every registered device
+            if device_tokens:
+                self._send_fcm_notification(owner, device_tokens, review_doc)
             
             # Send via Telegram if chat ID is available
             elif owner.telegram_chat_id:
-                self._send_telegram_notification(owner.telegram_chat_id, review_doc)
+                self._send_telegram_notification(owner.telegram_chat_id, review_doc, preliminary)
                 
         except Exception as e:
-            logging.error(f"Notification failed for shop {review_doc.shop_id}: {e}")
+            logger.error("Notification failed for shop %s: %s", review_doc.shop_id, e)
     
-    def _send_fcm_notification(self, device_token: str, review_doc: ReviewDocument) -> None:
+    def _send_fcm_notification(self, owner, device_tokens: List[str], review_doc: ReviewDocument) -> None:
         """
-        Send simple FCM notification.
+        Send simple FCM notification to all of the owner's devices in one batch.
+        
+        Tokens FCM reports as unregistered are removed from the owner.
         
         Args:
-            device_token: FCM device token
+            owner: Shop owner
+            device_tokens: FCM device tokens
             review_doc: Review document
         """
         try:
@@ -72,23 +112,32 @@ class NotificationHandler:
             sentiment = review_doc.analysis.get('sentiment', 'محايد')
             message = f"تقييم جديد: {stars}\n{sentiment}"
             
-            self.notification_service.send_fcm_notification(device_token, message)
-            logging.info(f"FCM notification sent for shop {review_doc.shop_id}")
+            stale_tokens = self.notification_service.send_fcm_multicast(device_tokens, message)
+            logger.info("FCM notification sent to %s device(s) for shop %s", len(device_tokens), review_doc.shop_id)
+            
+            if stale_tokens and self.user_repository and owner.id:
+                self.user_repository.remove_device_tokens(owner.id, stale_tokens)
             
         except Exception as e:
-            logging.error(f"FCM notification failed: {e}")
+            logger.error("FCM notification failed: %s", e)
     
-    def _send_telegram_notification(self, chat_id: str, review_doc: ReviewDocument) -> None:
+    def _send_telegram_notification(
+        self,
+        chat_id: str,
+        review_doc: ReviewDocument,
+        preliminary: Optional[Future] = None
+    ) -> None:
         """
         Send rich formatted Telegram notification.
         
         Args:
             chat_id: Telegram chat ID
             review_doc: Review document
+            preliminary: Preliminary alert to edit instead of sending a new message
         """
         try:
-            self.telegram_service.send_review_notification(chat_id, review_doc)
-            logging.info(f"Telegram notification sent for shop {review_doc.shop_id}")
+            self.telegram_service.send_review_notification(chat_id, review_doc, preliminary)
+            logger.info("Telegram notification sent for shop %s", review_doc.shop_id)
             
         except Exception as e:
-            logging.error(f"Telegram notification failed: {e}")
+            logger.error("Telegram notification failed: %s", e)
@@ -9,6 +9,8 @@ from bson import ObjectId
 from app.infrastructure.repositories import UserRepository
 from app.infrastructure.external import TelegramService
 
+logger = logging.getLogger(__name__)
+
 
 class TelegramHandler:
     """
@@ -49,7 +51,7 @@ class TelegramHandler:
             text = update_data.get('message', {}).get('text', '')
             
             if not chat_id:
-                logging.warning("No chat_id in telegram webhook")
+                logger.warning("No chat_id in telegram webhook")
                 return
             
             # Route to appropriate handler based on command
@@ -59,7 +61,7 @@ class TelegramHandler:
                 self._handle_default_message(chat_id)
                 
         except Exception as e:
-            logging.error(f"Error processing telegram webhook: {e}")
+            logger.error("Error processing telegram webhook: %s", e)
     
     def _handle_start_command(self, chat_id: int, text: str) -> None:
         """
@@ -84,15 +86,15 @@ class TelegramHandler:
                 
                 # Send connection success message
                 self.telegram_service.send_connection_success(chat_id)
-                logging.info(f"Telegram linked successfully for user {user_id_payload}")
+                logger.info("Telegram linked successfully for user %s", user_id_payload)
                 
             else:
                 # No user ID provided
                 self.telegram_service.send_connection_error(chat_id)
-                logging.warning(f"Start command without user ID from chat {chat_id}")
+                logger.warning("Start command without user ID from chat %s", chat_id)
                 
         except Exception as e:
-            logging.error(f"Failed to handle start command: {e}")
+            logger.error("Failed to handle start command: %s", e)
             self.telegram_service.send_connection_error(chat_id)
     
     def _handle_default_message(self, chat_id: int) -> None:
@@ -105,4 +107,4 @@ class TelegramHandler:
         try:
             self.telegram_service.send_welcome_message(chat_id)
         except Exception as e:
-            logging.error(f"Failed to send welcome message: {e}")
+            logger.error("Failed to send welcome message: %s", e)
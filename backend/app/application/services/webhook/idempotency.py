@@ -0,0 +1,211 @@
+"""
+Webhook Idempotency
+Runs each Tally submission through the pipeline once.
+
+Tally re-delivers a webhook when the previous delivery timed out, often while
+the first one is still running. Every delivery of a submission has the same
+key (`data.responseId`, else `data.submissionId`, else a hash of the
+fields), and:
+
+- the first delivery claims the key and runs the pipeline; its result is
+  stored when it succeeds, and the claim is dropped when it fails so a later
+  retry runs again;
+- a retry of a completed submission returns the stored result;
+- a retry arriving while the submission is running waits for that result
+  (in-process through a shared Event, across workers by polling the store)
+  and gets ReviewInProgressException (409) if it is not ready in time.
+
+The claim's lease is the review lease (PIPELINE_LEASE_SECONDS). A retry
+that takes over an expired claim does not run the paid stages again on its
+own: it finds the review saved under the same key, and that review's lease
+is renewed while its run is alive (see ProcessReviewUseCase), so the retry
+only resumes a run that actually died.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from app.application.shared.exceptions import ReviewInProgressException
+from app.infrastructure.observability.metrics import registry
+from app.presentation.config import (
+    IDEMPOTENCY_ENABLED,
+    IDEMPOTENCY_WAIT_SECONDS,
+    IDEMPOTENCY_TTL_SECONDS,
+    PIPELINE_LEASE_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.25
+
+IDEMPOTENCY_TOTAL = registry.counter(
+    'webhook_idempotency_total',
+    'Webhook deliveries by idempotency outcome (executed, replayed, coalesced, in_progress, unkeyed, unguarded).',
+    ('outcome',)
+)
+
+
+def tally_submission_key(form_data: Dict[str, Any]) -> Optional[str]:
+    """
+    The key of a Tally payload from its submission ID (None without one).
+
+    Unlike `idempotency_key` it never falls back to the content, so it is
+    unique to one submission and may be kept on the review for good.
+    """
+    data = form_data.get('data') or {}
+    submission_id = data.get('responseId') or data.get('submissionId')
+    if submission_id:
+        return f"tally:{data.get('formId') or ''}:{submission_id}"
+    return None
+
+
+def idempotency_key(form_data: Dict[str, Any]) -> Optional[str]:
+    """
+    The submission key of a Tally payload (None if it has no fields).
+
+    Without a submission ID this is a hash of the fields, which two customers
+    sending the same answers share; it only dedupes retries while the
+    idempotency record lives (IDEMPOTENCY_TTL_SECONDS).
+    """
+    key = tally_submission_key(form_data)
+    if key:
+        return key
+    data = form_data.get('data') or {}
+    fields = data.get('fields')
+    if not fields:
+        return None
+    canonical = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+    return "sha256:" + hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class _Execution:
+    """A submission being processed in this process; duplicates wait on it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class IdempotencyGuard:
+    """
+    Wraps the review pipeline with a claim/replay per submission.
+
+    Args:
+        repository: IdempotencyRepository (claims and stored results)
+        enabled: When False every delivery runs the pipeline
+        lease_seconds: How long a claim blocks other deliveries (default
+            PIPELINE_LEASE_SECONDS, the review lease)
+        wait_seconds: How long a duplicate waits for the running delivery
+        ttl_seconds: How long completed results are kept
+    """
+
+    def __init__(
+        self,
+        repository,
+        enabled: bool = None,
+        lease_seconds: float = None,
+        wait_seconds: float = None,
+        ttl_seconds: float = None
+    ):
+        self.repository = repository
+        self.enabled = IDEMPOTENCY_ENABLED if enabled is None else enabled
+        self.lease_seconds = PIPELINE_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self.wait_seconds = IDEMPOTENCY_WAIT_SECONDS if wait_seconds is None else wait_seconds
+        self.ttl_seconds = IDEMPOTENCY_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._running: Dict[str, _Execution] = {}
+        self._lock = threading.Lock()
+
+    def execute(self, form_data: Dict[str, Any], pipeline: Callable[[], dict]) -> dict:
+        """
+        Run `pipeline` for this submission unless it already ran (or is running).
+
+        Args:
+            form_data: Webhook payload (used for the key only)
+            pipeline: Processes the review and returns its result dict
+
+        Returns:
+            The pipeline result, or the stored result of an earlier delivery
+
+        Raises:
+            ReviewInProgressException: Another delivery is still processing it
+        """
+        key = idempotency_key(form_data) if self.enabled else None
+        if key is None:
+            IDEMPOTENCY_TOTAL.inc(outcome='unkeyed')
+            return pipeline()
+
+        with self._lock:
+            execution = self._running.get(key)
+            leader = execution is None
+            if leader:
+                execution = self._running[key] = _Execution()
+
+        if not leader:
+            IDEMPOTENCY_TOTAL.inc(outcome='coalesced')
+            if not execution.done.wait(self.wait_seconds):
+                raise ReviewInProgressException()
+            if execution.error is not None:
+                raise execution.error
+            return execution.result
+
+        try:
+            execution.result = self._execute_once(key, pipeline)
+            return execution.result
+        except BaseException as e:
+            execution.error = e
+            raise
+        finally:
+            execution.done.set()
+            with self._lock:
+                self._running.pop(key, None)
+
+    def _execute_once(self, key: str, pipeline: Callable[[], dict]) -> dict:
+        owner = uuid.uuid4().hex
+        try:
+            claimed, record = self.repository.claim(key, owner, self.lease_seconds, self.ttl_seconds)
+        except Exception as e:
+            # Without the store, processing twice beats not processing at all
+            logger.error("Idempotency claim failed for %s, processing unguarded: %s", key, e)
+            IDEMPOTENCY_TOTAL.inc(outcome='unguarded')
+            return pipeline()
+        if not claimed:
+            if record.get('status') != 'completed':
+                record = self._wait_for_result(key)
+            if record is None or record.get('status') != 'completed':
+                IDEMPOTENCY_TOTAL.inc(outcome='in_progress')
+                logger.info("Submission %s is still being processed by another delivery", key)
+                raise ReviewInProgressException()
+            IDEMPOTENCY_TOTAL.inc(outcome='replayed')
+            logger.info("Replaying stored result for submission %s", key)
+            return record.get('result') or {}
+
+        IDEMPOTENCY_TOTAL.inc(outcome='executed')
+        try:
+            result = pipeline()
+        except BaseException:
+            self._release(key, owner)
+            raise
+        try:
+            self.repository.complete(key, result, self.ttl_seconds)
+        except Exception as e:
+            logger.error("Failed to store result of submission %s: %s", key, e)
+        return result
+
+    def _wait_for_result(self, key: str) -> Optional[dict]:
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            record = self.repository.get(key)
+            if record is None or record.get('status') == 'completed' or time.monotonic() >= deadline:
+                return record
+            time.sleep(POLL_INTERVAL)
+
+    def _release(self, key: str, owner: str) -> None:
+        try:
+            self.repository.release(key, owner)
+        except Exception as e:
+            logger.error("Failed to release claim on submission %s: %s", key, e)
@@ -4,6 +4,7 @@ Processors package - Review processing components.
 from app.application.services.webhook.processors.quality_gate_processor import QualityGateProcessor
 from app.application.services.webhook.processors.relevancy_gate_processor import RelevancyGateProcessor
 from app.application.services.webhook.processors.ai_analysis_processor import AIAnalysisProcessor
+from app.application.services.webhook.processors.priority_processor import PriorityProcessor
 
-__all__ = ['QualityGateProcessor', 'RelevancyGateProcessor', 'AIAnalysisProcessor']
+__all__ = ['QualityGateProcessor', 'RelevancyGateProcessor', 'AIAnalysisProcessor', 'PriorityProcessor']
 
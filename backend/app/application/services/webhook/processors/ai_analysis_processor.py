@@ -3,12 +3,14 @@ AI Analysis Processor
 Performs AI sentiment analysis and generates insights for reviews.
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
 from app.infrastructure.external import SentimentService, DeepSeekService
 from app.application.dto.sentiment_analysis_result_dto import SentimentAnalysisResultDTO
 from app.application.dto.analysis_result_dto import AnalysisResultDTO
 
+logger = logging.getLogger(__name__)
+
 
 class AIAnalysisProcessor:
     """
@@ -35,7 +37,8 @@ class AIAnalysisProcessor:
         rating: int,
         source_fields: Dict[str, Any],
         shop_type: str,
-        quality_result: dict
+        quality_result: dict,
+        sentiment: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Perform full AI analysis on review text.
@@ -46,6 +49,7 @@ class AIAnalysisProcessor:
             source_fields: Original form fields
             shop_type: Category/type of the shop
             quality_result: Quality assessment results
+            sentiment: Sentiment already computed by `quick_sentiment` (skips the HF call)
             
         Returns:
             Dictionary containing:
@@ -59,14 +63,15 @@ class AIAnalysisProcessor:
         should_skip = self.should_skip_ai_processing(text, quality_result.get('flags', []))
         
         if should_skip:
-            logging.info(f"⚡ Skipping AI processing - stars-only or no text content")
+            logger.info("⚡ Skipping AI processing - stars-only or no text content")
             return self._generate_simple_analysis(rating, quality_result.get('toxicity_status', 'non-toxic'))
         
         # Perform full AI analysis
-        logging.info(f"🤖 Running full AI analysis")
+        logger.info("🤖 Running full AI analysis")
         
         # A) Sentiment Analysis
-        sentiment = self.sentiment_service.analyze_sentiment(text)
+        if sentiment is None:
+            sentiment = self.sentiment_service.analyze_sentiment(text)
         toxicity = quality_result.get('toxicity_status', 'non-toxic')
         
         # B) DeepSeek AI Analysis for insights and replies
@@ -103,6 +108,46 @@ class AIAnalysisProcessor:
             }
         }
     
+    def quick_sentiment(self, text: str, rating: int, quality_flags: list) -> Tuple[str, str]:
+        """
+        Determine sentiment only, without the DeepSeek enrichment.
+        
+        Used for the fast first notification; pass the result back to
+        `analyze` to avoid a second sentiment call.
+        
+        Args:
+            text: Review text content
+            rating: Star rating
+            quality_flags: Flags from quality assessment
+            
+        Returns:
+            Tuple of (sentiment, source): 'rating', or the source from
+            `SentimentService.analyze_sentiment_with_source`
+        """
+        if self.should_skip_ai_processing(text, quality_flags):
+            return self._sentiment_from_rating(rating), 'rating'
+        return self.sentiment_service.analyze_sentiment_with_source(text)
+    
+    def local_sentiment(self, text: str, rating: int) -> Tuple[str, str]:
+        """
+        Sentiment without any remote call, for degraded mode.
+        
+        Uses the local sentiment model, or the star rating when it is not
+        available.
+        
+        Args:
+            text: Review text content
+            rating: Star rating
+            
+        Returns:
+            Tuple of (sentiment, source): 'degraded' for the local model,
+            else 'rating'
+        """
+        sentiment = self.sentiment_service.analyze_sentiment_locally(text)
+        if sentiment is not None:
+            return sentiment, 'degraded'
+        return self._sentiment_from_rating(rating), 'rating'
+    
     def should_skip_ai_processing(self, text: str, quality_flags: list) -> bool:
         """
         Determine if AI processing should be skipped.
@@ -146,15 +191,8 @@ class AIAnalysisProcessor:
             Dictionary with simple sentiment, category, and generated content
         """
         # Infer sentiment from rating
-        if rating >= 4:
-            sentiment = "إيجابي"
-            category = "مدح"
-        elif rating <= 2:
-            sentiment = "سلبي"
-            category = "شكوى"
-        else:
-            sentiment = "محايد"
-            category = "محايد"
+        sentiment = self._sentiment_from_rating(rating)
+        category = {"إيجابي": "مدح", "سلبي": "شكوى"}.get(sentiment, "محايد")
         
         # Simple generated content
         stars_display = '⭐' * rating
@@ -172,6 +210,15 @@ class AIAnalysisProcessor:
             "generated_content": generated_content
         }
     
+    @staticmethod
+    def _sentiment_from_rating(rating: int) -> str:
+        """Infer sentiment from the star rating alone."""
+        if rating >= 4:
+            return "إيجابي"
+        if rating <= 2:
+            return "سلبي"
+        return "محايد"
+    
     def _create_temp_review_dto(self, rating: int, text: str, source_fields: Dict[str, Any]):
         """
         Create a temporary review DTO for DeepSeek service.
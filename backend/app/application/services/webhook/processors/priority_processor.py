@@ -0,0 +1,95 @@
+"""
+Priority Processor
+Assigns a review its processing priority at ingestion.
+
+Owners need complaints first, so the priority comes from the star rating and
+signals that cost no model call: the toxicity cascade's local score
+(profanity, insults, curses and harsh words) and a lexicon of complaint
+words. The review worker runs higher priorities first (see ReviewWorker).
+"""
+import re
+from typing import List, Tuple
+
+from app.domain.enums import ReviewPriority
+from app.infrastructure.external.toxicity_cascade import LocalVerdict, local_score
+from app.infrastructure.observability.metrics import registry
+
+# Complaint words that are not harsh enough for the toxicity lexicon (no
+# words that are also praise, e.g. "بارد" for a cold drink)
+NEGATIVE_TERMS = frozenset({
+    'سيء', 'سيئ', 'سيئة', 'سيئه', 'رديء', 'رديئة', 'ردي', 'خايس', 'بايخ', 'تعبان', 'بطيء',
+    'بطيئة', 'بطيئه', 'بطء', 'متاخر', 'تاخير', 'تاخر', 'غالي', 'مزعج', 'خربان', 'مكسور',
+    'منتهي',
+    'bad', 'worst', 'terrible', 'awful', 'horrible', 'rude', 'slow', 'late', 'broken', 'refund',
+})
+PREFIXES = ('وال', 'بال', 'ال', 'و')
+
+_TOKEN = re.compile(r"\w+")
+
+PRIORITY_TOTAL = registry.counter(
+    'reviews_priority_total',
+    'Reviews by the priority assigned at ingestion.',
+    ('priority',)
+)
+
+
+class PriorityProcessor:
+    """
+    Assigns review priorities from stars and local text signals.
+
+    HIGH: 1-2 stars, abusive text, or a complaint with 3 stars or fewer
+    NORMAL: 3 stars, a complaint despite 4-5 stars, or no rating
+    LOW: 4-5 stars without a complaint
+    """
+
+    def assign(self, rating: int, text: str) -> Tuple[ReviewPriority, List[str]]:
+        """
+        Priority of a new review.
+
+        Args:
+            rating: Star rating (0 when missing)
+            text: Concatenated review text
+
+        Returns:
+            Tuple of (priority, signals that raised it)
+        """
+        signals = []
+        if rating and rating <= 2:
+            signals.append(f"stars:{rating}")
+
+        verdict = local_score(text or '')
+        if self._is_abusive(verdict):
+            signals.append('profanity')
+        if self._is_complaint(text or '', verdict.signals):
+            signals.append('negative_lexicon')
+
+        if (rating and rating <= 2) or 'profanity' in signals:
+            priority = ReviewPriority.HIGH
+        elif 'negative_lexicon' in signals:
+            priority = ReviewPriority.HIGH if rating and rating <= 3 else ReviewPriority.NORMAL
+        elif not rating or rating == 3:
+            priority = ReviewPriority.NORMAL
+        else:
+            priority = ReviewPriority.LOW
+
+        PRIORITY_TOTAL.inc(priority=priority.name.lower())
+        return priority, signals
+
+    @staticmethod
+    def _is_abusive(verdict: LocalVerdict) -> bool:
+        """Strong terms, curses or insults aimed at someone (not pattern or undirected hits)."""
+        return verdict.conclusive or any(
+            signal.startswith(('strong:', 'curse:', 'directed:')) for signal in verdict.signals
+        )
+
+    @staticmethod
+    def _is_complaint(text: str, toxicity_signals: List[str]) -> bool:
+        """Whether the text has harsh words or complaint words."""
+        if any(signal.startswith('harsh:') for signal in toxicity_signals):
+            return True
+        normalized = text.lower().replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
+        for token in _TOKEN.findall(normalized):
+            candidates = [token] + [token[len(p):] for p in PREFIXES if token.startswith(p) and len(token) - len(p) >= 2]
+            if any(candidate in NEGATIVE_TERMS for candidate in candidates):
+                return True
+        return False
@@ -10,6 +10,8 @@ from app.presentation.config import QUALITY_GATE_THRESHOLD
 from app.infrastructure.external import QualityService
 from app.application.dto.review_processing_dto import ReviewDocument, Source, Processing
 
+logger = logging.getLogger(__name__)
+
 
 class QualityGateProcessor:
     """
@@ -86,37 +88,35 @@ class QualityGateProcessor:
 
         # 🔴 1. Hard reject: toxic content
         if toxicity_status == "toxic":
-            logging.warning("❌ Rejected: toxic content detected")
+            logger.warning("❌ Rejected: toxic content detected")
             return False
 
         # 🔴 2. Hard reject: extremely low quality
         if score < HARD_REJECT_THRESHOLD:
-            logging.warning(
-                f"❌ Rejected: very low quality score ({score})"
+            logger.warning(
+                "❌ Rejected: very low quality score (%s)", score
             )
             return False
 
         # ⚠️ 3. Uncertain toxicity → stricter quality requirement
         if toxicity_status == "uncertain":
             if score < UNCERTAIN_TOXICITY_THRESHOLD:
-                logging.warning(
-                    f"❌ Rejected: uncertain toxicity with insufficient quality "
-                    f"(score={score}, required={UNCERTAIN_TOXICITY_THRESHOLD})"
+                logger.warning(
+                    "❌ Rejected: uncertain toxicity with insufficient quality (score=%s, required=%s)", score, UNCERTAIN_TOXICITY_THRESHOLD
                 )
                 return False
 
         # ⚠️ 4. Suspicious signals → require minimum acceptable score
         if is_suspicious:
             if score < BASE_THRESHOLD:
-                logging.warning(
-                    f"❌ Rejected: suspicious review with low score "
-                    f"(score={score}, flags={flags})"
+                logger.warning(
+                    "❌ Rejected: suspicious review with low score (score=%s, flags=%s)", score, flags
                 )
                 return False
 
         # ✅ 5. Passed all gates
-        logging.info(
-            f"✅ Review accepted (score={score}, toxicity={toxicity_status}, flags={flags})"
+        logger.info(
+            "✅ Review accepted (score=%s, toxicity=%s, flags=%s)", score, toxicity_status, flags
         )
         return True
 
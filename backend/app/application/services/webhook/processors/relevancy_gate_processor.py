@@ -6,9 +6,11 @@ import logging
 from typing import Tuple, Dict
 from bson import ObjectId
 
-from app.infrastructure.external import SentimentService
+from app.infrastructure.external import SentimentService, RelevancyLexicon
 from app.application.dto.review_processing_dto import ReviewDocument, Source, Processing
 
+logger = logging.getLogger(__name__)
+
 
 class RelevancyGateProcessor:
     """
@@ -18,20 +20,24 @@ class RelevancyGateProcessor:
     Follows SRP - only handles relevancy gate logic.
     """
     
-    def __init__(self, sentiment_service: SentimentService):
+    def __init__(self, sentiment_service: SentimentService, lexicon: RelevancyLexicon = None):
         """
         Initialize RelevancyGateProcessor with required dependencies.
         
         Args:
             sentiment_service: Service for sentiment and context analysis
+            lexicon: Keyword check that accepts clearly relevant reviews
+                before the zero-shot model (optional)
         """
         self.sentiment_service = sentiment_service
+        self.lexicon = lexicon
     
     def check_relevancy(
         self,
         text: str,
         shop_type: str,
-        quality_flags: list
+        quality_flags: list,
+        allow_model: bool = True
     ) -> Tuple[bool, dict]:
         """
         Check if review content is relevant to the shop type.
@@ -40,6 +46,9 @@ class RelevancyGateProcessor:
             text: Review text content
             shop_type: Category/type of the shop
             quality_flags: Flags from quality assessment
+            allow_model: When False (degraded mode), reviews the lexicon does
+                not accept pass with a `deferred` result instead of calling
+                the zero-shot model
             
         Returns:
             Tuple of (is_relevant, context_check_result)
@@ -49,7 +58,7 @@ class RelevancyGateProcessor:
         # Check if context check should be skipped
         if self.should_skip_context_check(text, quality_flags):
             skip_reason = 'stars-only' if 'stars_only' in quality_flags else 'insufficient text'
-            logging.info(f"⚡ Skipping context check - {skip_reason}")
+            logger.info("⚡ Skipping context check - %s", skip_reason)
             
             return True, {
                 'mismatch_score': 0.0,
@@ -59,13 +68,39 @@ class RelevancyGateProcessor:
                 'predicted_label': f'N/A ({skip_reason})'
             }
         
+        # Clearly relevant reviews pass on keywords alone
+        if self.lexicon is not None:
+            match = self.lexicon.match(text, shop_type)
+            if match.relevant:
+                logger.info("⚡ Relevancy passed by lexicon: %s", match.shop_terms or match.generic_terms)
+                return True, {
+                    'mismatch_score': 0.0,
+                    'confidence': 100.0,
+                    'reasons': [],
+                    'has_mismatch': False,
+                    'predicted_label': shop_type,
+                    'method': 'lexicon',
+                    'matched_terms': match.shop_terms + match.generic_terms
+                }
+        
+        if not allow_model:
+            logger.info("⚡ Deferring context check - degraded mode")
+            return True, {
+                'mismatch_score': 0.0,
+                'confidence': 0.0,
+                'reasons': [],
+                'has_mismatch': False,
+                'predicted_label': 'N/A (deferred)',
+                'deferred': True
+            }
+        
         # Perform context mismatch detection
         context_check_result = self.sentiment_service.detect_context_mismatch(text, shop_type)
         
         has_mismatch = context_check_result.get('has_mismatch', False)
         
         if has_mismatch:
-            logging.warning(f"Context mismatch detected. Reason: {context_check_result.get('reasons')}")
+            logger.warning("Context mismatch detected. Reason: %s", context_check_result.get('reasons'))
         
         return not has_mismatch, context_check_result
     
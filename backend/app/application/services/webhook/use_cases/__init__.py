@@ -3,6 +3,8 @@ Use Cases package - Application use case orchestrators.
 """
 from app.application.services.webhook.use_cases.process_review_use_case import ProcessReviewUseCase
 from app.application.services.webhook.use_cases.process_telegram_use_case import ProcessTelegramUseCase
+from app.application.services.webhook.use_cases.resume_review_use_case import ResumeReviewUseCase
+from app.application.services.webhook.use_cases.enrich_review_use_case import EnrichReviewUseCase
 
-__all__ = ['ProcessReviewUseCase', 'ProcessTelegramUseCase']
+__all__ = ['ProcessReviewUseCase', 'ProcessTelegramUseCase', 'ResumeReviewUseCase', 'EnrichReviewUseCase']
 
@@ -0,0 +1,97 @@
+"""
+Enrich Review Use Case
+Adds the deferred AI enrichment to reviews saved in degraded mode.
+"""
+import logging
+from collections import Counter
+from typing import Dict, Optional
+
+from app.application.services.webhook.use_cases.process_review_use_case import ProcessReviewUseCase
+from app.infrastructure.repositories import ReviewRepository
+from app.infrastructure.throttling import LoadMonitor
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+ENRICHED_TOTAL = registry.counter(
+    'review_enrichment_total',
+    'Deferred enrichments of reviews saved in degraded mode, by outcome.',
+    ('outcome',)
+)
+
+
+class EnrichReviewUseCase:
+    """
+    Claims reviews marked `enrichment_pending` and enriches them, oldest first.
+
+    Stops as soon as the LoadMonitor reports degraded mode, so enrichment
+    only uses capacity that ingestion does not need.
+    """
+
+    def __init__(
+        self,
+        review_repository: ReviewRepository,
+        process_review_use_case: ProcessReviewUseCase,
+        load_monitor: LoadMonitor = None
+    ):
+        """
+        Initialize use case with its dependencies.
+
+        Args:
+            review_repository: Repository holding the reviews
+            process_review_use_case: Pipeline whose `enrich` step is run
+                (its lease and attempt settings are used for claiming)
+            load_monitor: Pauses enrichment while degraded (optional)
+        """
+        self.review_repository = review_repository
+        self.process_review_use_case = process_review_use_case
+        self.load_monitor = load_monitor
+
+    def execute(self, limit: int = 10) -> Dict[str, int]:
+        """
+        Enrich up to `limit` reviews while the pipeline is not degraded.
+
+        Args:
+            limit: Most reviews enriched in this call
+
+        Returns:
+            Number of reviews by outcome ('enriched', 'pending' or 'error')
+        """
+        outcomes = Counter()
+        use_case = self.process_review_use_case
+        for _ in range(limit):
+            if self.load_monitor is not None and self.load_monitor.degraded:
+                break
+            document = self.review_repository.claim_enrichment(use_case.lease_seconds, use_case.max_attempts)
+            if document is None:
+                break
+            outcomes[self._enrich(document)] += 1
+        return dict(outcomes)
+
+    def enrich_one(self, review_id: str) -> Optional[str]:
+        """
+        Enrich one review saved in degraded mode, unless still degraded.
+
+        Args:
+            review_id: Review to enrich
+
+        Returns:
+            Its outcome, or None if it was not enriched now (degraded, or
+            no longer pending)
+        """
+        if self.load_monitor is not None and self.load_monitor.degraded:
+            return None
+        use_case = self.process_review_use_case
+        document = self.review_repository.claim_enrichment(use_case.lease_seconds, use_case.max_attempts, review_id)
+        if document is None:
+            return None
+        return self._enrich(document)
+
+    def _enrich(self, document: dict) -> str:
+        try:
+            outcome = self.process_review_use_case.enrich(document)['status']
+        except Exception as e:
+            logger.error("Enriching review %s failed: %s", document.get('_id'), e)
+            outcome = 'error'
+        ENRICHED_TOTAL.inc(outcome=outcome)
+        return outcome
@@ -1,12 +1,42 @@
 """
 Process Review Use Case
 Orchestrates the complete review processing flow.
+
+The review is saved as soon as it is validated and checkpointed after each
+stage, so a run cut short by a crash, a timeout or a failed DeepSeek call is
+resumed from its last completed stage (by worker.py, or when Tally
+re-delivers the submission) without repeating the model calls before it.
+A run holds its review with a lease that it renews while alive, so only a
+run that died is resumed, however long one of its model calls takes.
+`pipeline.state` on the review document moves through:
+
+    pending    validated and saved, not analyzed yet
+    gated      passed the quality and relevancy gates (toxicity, quality
+               and context are in `analysis`)
+    analyzed   sentiment and DeepSeek content saved; `status` is 'processed'
+    notified   owner notified (final)
+    rejected   stopped at a gate; `status` is 'rejected_*' (final)
+
+`status` keeps the values the dashboard reads ('pending' until the review is
+processed or rejected).
+
+While the LoadMonitor reports degraded mode, reviews skip the relevancy model
+and DeepSeek: they are saved as processed with local sentiment and
+`enrichment_pending: true`, and Telegram owners get the preliminary alert.
+`enrich` (run by worker.py once the load drops) adds the relevancy result and
+the DeepSeek content and turns the alert into the full one.
 """
 import logging
-from typing import Dict, Any
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, Callable, List, Optional
 from bson import ObjectId
 
-from app.infrastructure.external import SentimentService
+from app.infrastructure.external import SentimentService, ToxicityCascade
 from app.application.dto.review_processing_dto import ReviewDocument, Source, Processing
 from app.application.services.webhook.extractors.form_field_extractor import FormFieldExtractor
 from app.application.services.webhook.validators.shop_validator import ShopValidator
@@ -14,8 +44,62 @@ from app.application.services.webhook.validators.review_validator import ReviewV
 from app.application.services.webhook.processors.quality_gate_processor import QualityGateProcessor
 from app.application.services.webhook.processors.relevancy_gate_processor import RelevancyGateProcessor
 from app.application.services.webhook.processors.ai_analysis_processor import AIAnalysisProcessor
+from app.application.services.webhook.processors.priority_processor import PriorityProcessor
 from app.application.services.webhook.handlers.notification_handler import NotificationHandler
-from app.infrastructure.repositories import ReviewRepository
+from app.application.services.webhook.idempotency import tally_submission_key
+from app.application.shared.exceptions import ReviewInProgressException
+from app.domain.enums import ReviewPriority
+from app.infrastructure.repositories import ReviewRepository, InferenceUsageRepository
+from app.infrastructure.throttling import LoadMonitor
+from app.infrastructure.observability.metrics import (
+    REVIEWS_TOTAL,
+    REVIEW_SECONDS,
+    time_stage,
+    collect_fallbacks,
+    registry
+)
+from app.infrastructure.observability.inference_usage import InferenceUsage, collect_usage, attribute_usage
+from app.infrastructure.observability.tracing import current_span
+from app.presentation.config import PIPELINE_LEASE_SECONDS, PIPELINE_MAX_ATTEMPTS, PIPELINE_RETRY_FALLBACKS
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATES = ('pending', 'gated', 'analyzed')
+
+DEGRADED_REVIEWS_TOTAL = registry.counter(
+    'reviews_degraded_total',
+    'Reviews saved in degraded mode with their AI enrichment deferred.'
+)
+
+REJECTION_REASONS = {
+    "rejected_low_quality": "Review did not meet quality standards.",
+    "rejected_irrelevant": "Review content is not relevant to the shop category."
+}
+
+
+@dataclass
+class ReviewRun:
+    """A review moving through the pipeline (rebuilt from its checkpoint on resume)."""
+    review_id: str
+    shop_id: str
+    email: Optional[str]
+    owner: Any
+    source: Source
+    processing: Processing
+    shop_type: str
+    state: str = 'pending'
+    priority: ReviewPriority = ReviewPriority.NORMAL
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    analysis: Dict[str, Any] = field(default_factory=dict)
+    generated_content: Optional[Dict[str, Any]] = None
+    preliminary: Optional[Future] = None
+    preliminary_sent: bool = False
+    preliminary_message_id: Optional[int] = None
+    attempts: int = 1
+    final_attempt: bool = True
+    degraded: bool = False
+    enrichment_pending: bool = False
+    fallbacks: List[str] = field(default_factory=list)
 
 
 class ProcessReviewUseCase:
@@ -29,9 +113,12 @@ class ProcessReviewUseCase:
     4. Calculate toxicity (once)
     5. Run quality gate
     6. Run relevancy gate (if needed)
-    7. Perform AI analysis (if needed)
-    8. Assemble and save document
-    9. Send notification
+    7. Send preliminary alert, then perform AI analysis (if needed)
+    8. Save the processed document
+    9. Send notification (updating the preliminary alert)
+    
+    Steps 4-9 checkpoint their results on the review document (see the
+    module docstring); `resume` continues a review from its checkpoint.
     
     Follows clean architecture principles with dependency injection.
     """
@@ -46,7 +133,14 @@ class ProcessReviewUseCase:
         ai_processor: AIAnalysisProcessor,
         notification_handler: NotificationHandler,
         review_repository: ReviewRepository,
-        sentiment_service: SentimentService
+        sentiment_service: SentimentService,
+        usage_repository: InferenceUsageRepository = None,
+        toxicity_cascade: ToxicityCascade = None,
+        lease_seconds: float = None,
+        max_attempts: int = None,
+        retry_fallbacks: bool = None,
+        load_monitor: LoadMonitor = None,
+        priority_processor: PriorityProcessor = None
     ):
         """
         Initialize use case with all required dependencies.
@@ -61,6 +155,17 @@ class ProcessReviewUseCase:
             notification_handler: Sends notifications
             review_repository: Repository for review persistence
             sentiment_service: Service for text cleaning and toxicity
+            usage_repository: Repository for per-shop inference usage (optional)
+            toxicity_cascade: Local-first toxicity check (optional; without it
+                every text goes to sentiment_service.analyze_toxicity)
+            lease_seconds: How long a run holds its review before it may be resumed
+            max_attempts: Runs per review, the webhook included
+            retry_fallbacks: Leave reviews whose DeepSeek call fell back for
+                a later attempt instead of saving the fallback content
+            load_monitor: Decides when reviews run in degraded mode (optional;
+                without it they never do)
+            priority_processor: Assigns the priority the worker queue is
+                ordered by
         """
         self.form_extractor = form_extractor
         self.shop_validator = shop_validator
@@ -71,6 +176,13 @@ class ProcessReviewUseCase:
         self.notification_handler = notification_handler
         self.review_repository = review_repository
         self.sentiment_service = sentiment_service
+        self.usage_repository = usage_repository
+        self.toxicity_classifier = toxicity_cascade or sentiment_service
+        self.lease_seconds = PIPELINE_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self.max_attempts = PIPELINE_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self.retry_fallbacks = PIPELINE_RETRY_FALLBACKS if retry_fallbacks is None else retry_fallbacks
+        self.load_monitor = load_monitor
+        self.priority_processor = priority_processor or PriorityProcessor()
     
     def execute(self, form_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -81,130 +193,609 @@ class ProcessReviewUseCase:
             
         Returns:
             Dictionary with processing result:
-            - status: 'processed', 'rejected_low_quality', or 'rejected_irrelevant'
-            - review_id: ID of saved review (if processed)
+            - status: 'processed', 'rejected_low_quality', 'rejected_irrelevant',
+              or 'pending' (left for a later attempt)
+            - review_id: ID of saved review (if processed or pending)
             - reason: Rejection reason (if rejected)
             
         Raises:
             ValueError: If payload is invalid or missing required fields
             LookupError: If shop not found or duplicate review exists
+            ReviewInProgressException: If an earlier delivery of the same
+                submission is still being processed
         """
+        return self._observe(lambda fallbacks: self._run_pipeline(form_data, fallbacks))
+    
+    def resume(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Continue a review from its last checkpoint.
+        
+        Args:
+            document: Review document claimed with `ReviewRepository.claim_resumable`
+            
+        Returns:
+            Same as `execute`
+            
+        Raises:
+            LookupError: If the shop no longer exists
+        """
+        return self._observe(lambda fallbacks: self._resume_pipeline(document, fallbacks))
+    
+    def _observe(self, pipeline: Callable[[List[str]], Dict[str, Any]]) -> Dict[str, Any]:
+        """Run `pipeline` with the review's metrics, trace attributes and usage."""
+        started_at = time.perf_counter()
+        outcome = "error"
+        tracking = self.load_monitor.track() if self.load_monitor is not None else nullcontext()
+        with tracking, collect_fallbacks() as fallbacks, collect_usage() as usage:
+            try:
+                result = pipeline(fallbacks)
+                outcome = result["status"]
+                return result
+            except (ValueError, LookupError):
+                outcome = "invalid"
+                raise
+            finally:
+                fallback = "true" if fallbacks else "false"
+                self._annotate_trace(
+                    outcome=outcome,
+                    fallbacks=",".join(fallbacks),
+                    inference_calls=usage.total_calls,
+                    inference_tokens=usage.total_tokens
+                )
+                self._record_usage(usage)
+                REVIEWS_TOTAL.inc(outcome=outcome, fallback=fallback)
+                REVIEW_SECONDS.observe(time.perf_counter() - started_at, outcome=outcome, fallback=fallback)
+    
+    def _run_pipeline(self, form_data: Dict[str, Any], fallbacks: List[str]) -> Dict[str, Any]:
+        """Validate a new submission, save it and run its stages (see `execute`)."""
         # --- Step 1: Extract Form Fields ---
         fields = form_data.get('data', {}).get('fields', [])
         if not fields:
             raise ValueError("Payload is missing 'data.fields' array.")
         
-        extracted_fields = self.form_extractor.extract(fields)
-        logging.info(f"Extracted fields for shop {extracted_fields.get('shop_id')}")
+        with time_stage('extract'):
+            extracted_fields = self.form_extractor.extract(fields)
+        logger.info("Extracted fields for shop %s", extracted_fields.get('shop_id'))
         
         # --- Step 2: Validate Shop ---
         shop_id = extracted_fields.get('shop_id')
-        shop_validation, owner = self.shop_validator.validate_and_get_shop(shop_id)
+        self._annotate_trace(shop_id=shop_id)
+        attribute_usage(shop_id=shop_id)
+        with time_stage('validate_shop'):
+            shop_validation, owner = self.shop_validator.validate_and_get_shop(shop_id)
         
         if not shop_validation.is_valid:
             raise LookupError(shop_validation.error_message)
         
+        # A re-delivered submission continues the review saved by the first
+        # delivery (only with a Tally submission ID: content hashes are shared
+        # by customers who send the same answers)
+        submission_key = tally_submission_key(form_data)
+        if submission_key:
+            existing = self.review_repository.find_by_submission(submission_key)
+            if existing is not None:
+                return self._resume_submission(existing, owner, fallbacks)
+        
         # --- Step 3: Validate Review (Check Duplicates) ---
         respondent_email = extracted_fields.get('respondent_email')
         if respondent_email:
-            duplicate_check = self.review_validator.check_duplicate_review(respondent_email, shop_id)
+            with time_stage('duplicate_check'):
+                duplicate_check = self.review_validator.check_duplicate_review(respondent_email, shop_id)
             if not duplicate_check.is_valid:
                 raise LookupError(duplicate_check.error_message)
         
-        # --- Step 4: Prepare Initial Data ---
+        # --- Step 4: Prepare Initial Data and save the pending review ---
         source, processing = self._prepare_initial_data(extracted_fields)
+        priority, priority_signals = self.priority_processor.assign(source.rating, processing.concatenated_text)
+        self._annotate_trace(priority=priority.name.lower())
+        logger.info("Review for shop %s has priority %s %s", shop_id, priority.name, priority_signals)
+        run = ReviewRun(
+            review_id=str(ObjectId()),
+            shop_id=shop_id,
+            email=respondent_email,
+            owner=owner,
+            source=source,
+            processing=processing,
+            shop_type=extracted_fields.get('shop_type', 'عام'),
+            priority=priority,
+            final_attempt=self.max_attempts <= 1,
+            fallbacks=fallbacks
+        )
+        self._save_pending(run, submission_key)
+        return self._run_stages(run)
+    
+    def _resume_pipeline(self, document: Dict[str, Any], fallbacks: List[str]) -> Dict[str, Any]:
+        """Rebuild a claimed review's run from its checkpoint and continue it (see `resume`)."""
+        shop_id = document.get('shop_id')
+        self._annotate_trace(shop_id=shop_id)
+        attribute_usage(shop_id=shop_id)
+        with time_stage('validate_shop'):
+            shop_validation, owner = self.shop_validator.validate_and_get_shop(shop_id)
+        if not shop_validation.is_valid:
+            raise LookupError(shop_validation.error_message)
+        return self._run_stages(self._restore_run(document, owner, fallbacks))
+    
+    def _resume_submission(self, document: Dict[str, Any], owner, fallbacks: List[str]) -> Dict[str, Any]:
+        """Result of a re-delivered submission, resuming its review if it was interrupted."""
+        review_id = str(document['_id'])
+        if (document.get('pipeline') or {}).get('state') in ACTIVE_STATES:
+            claimed = self.review_repository.claim_resumable(self.lease_seconds, self.max_attempts, review_id)
+            if claimed is not None:
+                return self._run_stages(self._restore_run(claimed, owner, fallbacks))
+            document = self.review_repository.find_document(review_id) or document
+            pipeline = document.get('pipeline') or {}
+            if pipeline.get('state') in ACTIVE_STATES and pipeline.get('attempts', 1) < self.max_attempts:
+                raise ReviewInProgressException()
+        return self._result(document)
+    
+    def _run_stages(self, run: ReviewRun) -> Dict[str, Any]:
+        """Run the stages after the run's checkpoint; the lease is dropped if one fails."""
+        self._annotate_trace(review_id=run.review_id)
+        attribute_usage(review_id=run.review_id)
+        if run.state != 'pending':
+            logger.info("Resuming review %s from stage %s (attempt %s)", run.review_id, run.state, run.attempts)
+        run.degraded = self.load_monitor is not None and self.load_monitor.degraded
+        try:
+            with self._hold_lease(run.review_id):
+                return self._run_held_stages(run)
+        except BaseException:
+            self._release_lease(run)
+            raise
+    
+    def _run_held_stages(self, run: ReviewRun) -> Dict[str, Any]:
+        """The stages of `_run_stages`, run while the lease is held."""
+        # --- Steps 5-7: Toxicity, Quality Gate, Relevancy Gate ---
+        if run.state == 'pending':
+            rejection = self._gate(run)
+            if rejection is not None:
+                return rejection
         
-        # --- Step 5: Pre-calculate Toxicity (once for entire flow) ---
-        toxicity_status = self.sentiment_service.analyze_toxicity(processing.concatenated_text)
+        # --- Steps 8-9: Preliminary Alert, Full AI Analysis, Save ---
+        if run.state == 'gated' and not self._analyze(run):
+            return {"status": "pending", "review_id": run.review_id}
         
-        # --- Step 6: Quality Gate (Gate 1) ---
-        passes_quality, quality_result = self.quality_processor.assess_quality(
-            extracted_fields,
-            toxicity_status
-        )
+        # --- Step 10: Send Notification ---
+        if run.state == 'analyzed':
+            self._notify(run)
         
-        if not passes_quality :
-            rejected_doc = self.quality_processor.create_rejected_quality_document(
-                shop_id=shop_id,
-                email=respondent_email,
-                rating=source.rating,
-                source=source,
-                processing=processing,
-                quality_result=quality_result
-            )
-            self.review_repository.create_review(rejected_doc.model_dump(by_alias=True))
-            logging.warning(f"Rejected low-quality review for shop {shop_id}")
-            return {"status": "rejected_low_quality", "reason": "Review did not meet quality standards."}
+        return {"status": "processed", "review_id": run.review_id}
+    
+    def _gate(self, run: ReviewRun) -> Optional[Dict[str, Any]]:
+        """Toxicity, quality and relevancy; returns the result if the review is rejected."""
+        text = run.processing.concatenated_text
+        quality_result = run.analysis.get('quality')
         
-        logging.info(f"Review for shop {shop_id} passed Quality Gate.")
+        if quality_result is None:
+            # --- Step 5: Pre-calculate Toxicity (once for entire flow) ---
+            with time_stage('toxicity'):
+                toxicity_status = self.toxicity_classifier.analyze_toxicity(text)
+            
+            # --- Step 6: Quality Gate (Gate 1) ---
+            with time_stage('quality_gate'):
+                passes_quality, quality_result = self.quality_processor.assess_quality(
+                    {'source_fields': run.source.fields, 'rating': run.source.rating},
+                    toxicity_status
+                )
+            
+            if not passes_quality:
+                rejected_doc = self.quality_processor.create_rejected_quality_document(
+                    shop_id=run.shop_id,
+                    email=run.email,
+                    rating=run.source.rating,
+                    source=run.source,
+                    processing=run.processing,
+                    quality_result=quality_result
+                )
+                logger.warning("Rejected low-quality review for shop %s", run.shop_id)
+                return self._reject(run, rejected_doc)
+            
+            run.analysis.update(toxicity=toxicity_status, quality=quality_result)
+            self._checkpoint(run, {'analysis.toxicity': toxicity_status, 'analysis.quality': quality_result})
         
-        # --- Step 7: Relevancy Gate (Gate 2) ---
-        shop_type = extracted_fields.get('shop_type', 'عام')
-        quality_flags = quality_result.get('flags', [])
+        logger.info("Review for shop %s passed Quality Gate.", run.shop_id)
         
-        is_relevant, context_result = self.relevancy_processor.check_relevancy(
-            processing.concatenated_text,
-            shop_type,
-            quality_flags
-        )
+        # --- Step 7: Relevancy Gate (Gate 2) ---
+        with time_stage('relevancy_gate'):
+            is_relevant, context_result = self.relevancy_processor.check_relevancy(
+                text,
+                run.shop_type,
+                quality_result.get('flags', []),
+                allow_model=not run.degraded
+            )
         
         if not is_relevant:
             rejected_doc = self.relevancy_processor.create_rejected_relevancy_document(
-                shop_id=shop_id,
-                email=respondent_email,
-                rating=source.rating,
-                source=source,
-                processing=processing,
+                shop_id=run.shop_id,
+                email=run.email,
+                rating=run.source.rating,
+                source=run.source,
+                processing=run.processing,
                 quality_result=quality_result,
                 context_result=context_result
             )
-            self.review_repository.create_review(rejected_doc.model_dump(by_alias=True))
-            logging.warning(f"Rejected irrelevant review for shop {shop_id}")
-            return {"status": "rejected_irrelevant", "reason": "Review content is not relevant to the shop category."}
+            logger.warning("Rejected irrelevant review for shop %s", run.shop_id)
+            return self._reject(run, rejected_doc)
+        
+        logger.info("Review for shop %s passed Relevancy Gate.", run.shop_id)
+        run.analysis['context'] = context_result
+        self._checkpoint(run, {'analysis.context': context_result}, state='gated')
+        return None
+    
+    def _analyze(self, run: ReviewRun) -> bool:
+        """
+        Sentiment, preliminary alert and DeepSeek analysis, saved as 'processed'.
+            
+        Returns:
+            False if DeepSeek fell back and the review is left for a later attempt
+        """
+        text = run.processing.concatenated_text
+        quality_result = run.analysis.get('quality') or {}
+        quality_flags = quality_result.get('flags', [])
         
-        logging.info(f"Review for shop {shop_id} passed Relevancy Gate.")
+        if run.degraded and not self.ai_processor.should_skip_ai_processing(text, quality_flags):
+            self._save_degraded(run)
+            return True
         
-        # --- Step 8: Full AI Analysis (for High-Quality, Relevant Reviews) ---
-        logging.info(f"Proceeding with full analysis for shop {shop_id}.")
+        # --- Step 8: Preliminary Alert + Full AI Analysis ---
+        sentiment = run.analysis.get('sentiment')
+        if sentiment is None:
+            with time_stage('sentiment'):
+                sentiment, sentiment_source = self.ai_processor.quick_sentiment(text, run.source.rating, quality_flags)
+            run.analysis.update(sentiment=sentiment, sentiment_source=sentiment_source)
+            
+            # Alert the owner now; the message is edited once DeepSeek finishes.
+            if not self.ai_processor.should_skip_ai_processing(text, quality_flags):
+                self._send_preliminary(run)
+            self._checkpoint(run, {
+                'overall_sentiment': sentiment,
+                'analysis.sentiment': sentiment,
+                'analysis.sentiment_source': sentiment_source,
+                'pipeline.preliminary_sent': run.preliminary_sent
+            })
         
-        source_fields = extracted_fields.get('source_fields', {})
-        analysis_result = self.ai_processor.analyze(
-            text=processing.concatenated_text,
-            rating=source.rating,
-            source_fields=source_fields,
-            shop_type=shop_type,
-            quality_result=quality_result
-        )
+        logger.info("Proceeding with full analysis for shop %s.", run.shop_id)
+        
+        with time_stage('ai_analysis'):
+            analysis_result = self.ai_processor.analyze(
+                text=text,
+                rating=run.source.rating,
+                source_fields=run.source.fields,
+                shop_type=run.shop_type,
+                quality_result=quality_result,
+                sentiment=sentiment
+            )
+        
+        if self.retry_fallbacks and not run.final_attempt and 'deepseek' in run.fallbacks:
+            logger.warning(
+                "DeepSeek fell back for review %s (attempt %s of %s); leaving it for a retry",
+                run.review_id, run.attempts, self.max_attempts
+            )
+            return False
         
         # --- Step 9: Final Document Assembly & Saving ---
-        processed_doc = ReviewDocument(
-            id=str(ObjectId()),
-            shop_id=shop_id,
-            email=respondent_email,
-            stars=source.rating,
-            overall_sentiment=analysis_result['sentiment'],
-            status="processed",
-            source=source,
-            processing=processing,
-            analysis={
-                "sentiment": analysis_result['sentiment'],
-                "toxicity": analysis_result['toxicity'],
-                "category": analysis_result['category'],
-                "quality": quality_result,
-                "context": context_result,
-                "key_themes": analysis_result['key_themes'],
-            },
-            generated_content=analysis_result['generated_content']
-        )
+        run.analysis = {
+            "sentiment": analysis_result['sentiment'],
+            "sentiment_source": run.analysis.get('sentiment_source'),
+            "toxicity": analysis_result['toxicity'],
+            "category": analysis_result['category'],
+            "quality": quality_result,
+            "context": run.analysis.get('context'),
+            "key_themes": analysis_result['key_themes'],
+        }
+        run.generated_content = analysis_result['generated_content']
+        processed_doc = self._document(run, "processed")
         
-        review_id = self.review_repository.create_review(processed_doc.model_dump(by_alias=True))
-        logging.info(f"Successfully processed and saved review {review_id} for shop {shop_id}.")
+        self._checkpoint(run, {
+            'status': processed_doc.status,
+            'overall_sentiment': processed_doc.overall_sentiment,
+            'analysis': processed_doc.analysis,
+            'generated_content': processed_doc.generated_content
+        }, state='analyzed')
+        logger.info("Successfully processed and saved review %s for shop %s.", run.review_id, run.shop_id)
+        return True
+    
+    def _save_degraded(self, run: ReviewRun) -> None:
+        """Save the review as processed with local sentiment only, leaving DeepSeek to `enrich`."""
+        sentiment = run.analysis.get('sentiment')
+        if sentiment is None:
+            with time_stage('sentiment'):
+                sentiment, sentiment_source = self.ai_processor.local_sentiment(
+                    run.processing.concatenated_text,
+                    run.source.rating
+                )
+            run.analysis.update(sentiment=sentiment, sentiment_source=sentiment_source)
+        run.enrichment_pending = True
         
-        # --- Step 10: Send Notification ---
-        if owner and (owner.device_token or owner.telegram_chat_id):
-            self.notification_handler.send_review_notification(owner, processed_doc)
+        self._checkpoint(run, {
+            'status': "processed",
+            'overall_sentiment': sentiment,
+            'analysis.sentiment': sentiment,
+            'analysis.sentiment_source': run.analysis.get('sentiment_source'),
+            'enrichment_pending': True
+        }, state='analyzed')
+        DEGRADED_REVIEWS_TOTAL.inc()
+        logger.warning("Saved review %s for shop %s in degraded mode; enrichment deferred", run.review_id, run.shop_id)
+    
+    def _notify(self, run: ReviewRun) -> None:
+        """Send the review notification (updating the preliminary alert) and finish the run."""
+        owner = run.owner
+        if owner and (owner.notification_tokens or owner.telegram_chat_id):
+            if run.enrichment_pending and not owner.notification_tokens:
+                # The full Telegram message replaces this alert after `enrich`
+                self._send_preliminary(run)
+            else:
+                with time_stage('notification'):
+                    self.notification_handler.send_review_notification(
+                        owner,
+                        self._document(run, "processed"),
+                        self._preliminary_alert(run)
+                    )
+        self._checkpoint(run, {'pipeline.preliminary_sent': run.preliminary_sent}, state='notified', hold_lease=False)
+    
+    def enrich(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add the deferred AI enrichment to a review saved in degraded mode.
+        
+        Runs the relevancy model (recorded in `analysis.context`; the review
+        stays processed) and DeepSeek, saves the category, key themes and
+        generated content, and updates the owner's Telegram alert.
         
-        return {"status": "processed", "review_id": str(review_id)}
+        Args:
+            document: Review document claimed with `ReviewRepository.claim_enrichment`
+            
+        Returns:
+            Dictionary with status 'enriched', or 'pending' if DeepSeek fell
+            back and the review is left for a later attempt, and review_id
+            
+        Raises:
+            LookupError: If the shop no longer exists
+        """
+        with collect_fallbacks() as fallbacks, collect_usage() as usage, self._hold_lease(str(document['_id'])):
+            try:
+                return self._enrich(document, fallbacks)
+            finally:
+                self._record_usage(usage, reviews=0)
+    
+    def _enrich(self, document: Dict[str, Any], fallbacks: List[str]) -> Dict[str, Any]:
+        """Enrich a claimed review (see `enrich`); the lease is dropped if it fails."""
+        shop_id = document.get('shop_id')
+        attribute_usage(shop_id=shop_id, review_id=str(document['_id']))
+        shop_validation, owner = self.shop_validator.validate_and_get_shop(shop_id)
+        if not shop_validation.is_valid:
+            raise LookupError(shop_validation.error_message)
+        
+        run = self._restore_run(document, owner, fallbacks)
+        attempts = (document.get('pipeline') or {}).get('enrichment_attempts', 1)
+        text = run.processing.concatenated_text
+        quality_result = run.analysis.get('quality') or {}
+        try:
+            context_result = run.analysis.get('context') or {}
+            if context_result.get('deferred'):
+                with time_stage('relevancy_gate'):
+                    is_relevant, context_result = self.relevancy_processor.check_relevancy(
+                        text,
+                        run.shop_type,
+                        quality_result.get('flags', [])
+                    )
+                if not is_relevant:
+                    logger.warning("Review %s saved in degraded mode is off-topic for shop %s", run.review_id, shop_id)
+                run.analysis['context'] = context_result
+            
+            with time_stage('ai_analysis'):
+                analysis_result = self.ai_processor.analyze(
+                    text=text,
+                    rating=run.source.rating,
+                    source_fields=run.source.fields,
+                    shop_type=run.shop_type,
+                    quality_result=quality_result,
+                    sentiment=run.analysis.get('sentiment')
+                )
+            
+            if self.retry_fallbacks and attempts < self.max_attempts and 'deepseek' in fallbacks:
+                logger.warning("DeepSeek fell back enriching review %s; leaving it for a retry", run.review_id)
+                self._checkpoint(run, {'analysis.context': context_result})
+                return {"status": "pending", "review_id": run.review_id}
+            
+            run.analysis.update(category=analysis_result['category'], key_themes=analysis_result['key_themes'])
+            run.generated_content = analysis_result['generated_content']
+            run.enrichment_pending = False
+            self._checkpoint(run, {
+                'analysis.context': context_result,
+                'analysis.category': analysis_result['category'],
+                'analysis.key_themes': analysis_result['key_themes'],
+                'generated_content': run.generated_content,
+                'enrichment_pending': False
+            }, hold_lease=False)
+            logger.info("Enriched review %s for shop %s.", run.review_id, shop_id)
+            
+            if owner and owner.telegram_chat_id and not owner.notification_tokens:
+                with time_stage('notification'):
+                    self.notification_handler.send_review_notification(
+                        owner,
+                        self._document(run, "processed"),
+                        self._preliminary_alert(run)
+                    )
+        except BaseException:
+            self._release_lease(run)
+            raise
+        
+        return {"status": "enriched", "review_id": run.review_id}
+    
+    def _send_preliminary(self, run: ReviewRun) -> None:
+        """Send the preliminary alert once per review, recording its message ID for resumed runs."""
+        if run.preliminary_sent:
+            return
+        with time_stage('preliminary_notification'):
+            run.preliminary = self.notification_handler.send_preliminary_notification(
+                run.owner,
+                self._document(run, "pending")
+            )
+        if run.preliminary is None:
+            return
+        run.preliminary_sent = True
+        review_id = run.review_id
+    
+        def store_message_id(sent: Future) -> None:
+            try:
+                message_id = None if sent.exception() else (sent.result() or {}).get('message_id')
+                if message_id:
+                    self.review_repository.update(
+                        ObjectId(review_id),
+                        {'pipeline.preliminary_message_id': message_id}
+                    )
+            except Exception as e:
+                logger.error("Failed to record preliminary alert of review %s: %s", review_id, e)
+        
+        run.preliminary.add_done_callback(store_message_id)
+    
+    @staticmethod
+    def _preliminary_alert(run: ReviewRun) -> Optional[Future]:
+        """The preliminary alert to edit: this run's, or the one a previous run sent."""
+        if run.preliminary is not None or not run.preliminary_message_id:
+            return run.preliminary
+        sent = Future()
+        sent.set_result({'message_id': run.preliminary_message_id})
+        return sent
+    
+    def _reject(self, run: ReviewRun, rejected_doc: ReviewDocument) -> Dict[str, Any]:
+        """Save the rejection on the pending review and finish the run."""
+        fields = rejected_doc.model_dump(by_alias=True, exclude={'id', 'created_at', 'pipeline'})
+        self._checkpoint(run, fields, state='rejected', hold_lease=False)
+        return {"status": rejected_doc.status, "reason": REJECTION_REASONS[rejected_doc.status]}
+    
+    def _save_pending(self, run: ReviewRun, submission_key: Optional[str]) -> None:
+        """Insert the validated review with a 'pending' checkpoint, leased to this run."""
+        now = datetime.now(timezone.utc)
+        pipeline = {
+            'state': run.state,
+            'shop_type': run.shop_type,
+            'priority': int(run.priority),
+            'attempts': run.attempts,
+            'lease_until': now + timedelta(seconds=self.lease_seconds),
+            'updated_at': now
+        }
+        if submission_key:
+            pipeline['submission_key'] = submission_key
+        document = self._document(run, "pending")
+        document.pipeline = pipeline
+        with time_stage('mongo_insert'):
+            self.review_repository.create_review(document.model_dump(by_alias=True))
+    
+    def _checkpoint(self, run: ReviewRun, fields: Dict[str, Any], state: str = None, hold_lease: bool = True) -> None:
+        """Save stage results (and the new state) on the review document."""
+        if state is not None:
+            fields = {**fields, 'pipeline.state': state}
+            run.state = state
+        with time_stage('checkpoint'):
+            self.review_repository.save_checkpoint(
+                run.review_id,
+                fields,
+                self.lease_seconds if hold_lease else None
+            )
+    
+    @contextmanager
+    def _hold_lease(self, review_id: str):
+        """
+        Renew the review's lease in the background while the block runs.
+        
+        A model call can outlast the lease (retries and 503 waits add up), and
+        an expired lease lets the worker or a Tally retry run the paid stages
+        a second time. Renewals stop once the lease was ended by a checkpoint.
+        """
+        stop = threading.Event()
+        
+        def renew() -> None:
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    if not self.review_repository.renew_lease(review_id, self.lease_seconds):
+                        return
+                except Exception as e:
+                    logger.error("Failed to renew the lease of review %s: %s", review_id, e)
+        
+        threading.Thread(target=renew, name=f"lease-{review_id}", daemon=True).start()
+        try:
+            yield
+        finally:
+            stop.set()
+    
+    def _release_lease(self, run: ReviewRun) -> None:
+        """Let the worker resume a failed run without waiting for the lease (never raises)."""
+        try:
+            self.review_repository.release_lease(run.review_id)
+        except Exception as e:
+            logger.error("Failed to release review %s: %s", run.review_id, e)
+    
+    def _restore_run(self, document: Dict[str, Any], owner, fallbacks: List[str]) -> ReviewRun:
+        """ReviewRun of a saved review, at its checkpointed stage."""
+        pipeline = document.get('pipeline') or {}
+        attempts = pipeline.get('attempts', 1)
+        return ReviewRun(
+            review_id=str(document['_id']),
+            shop_id=document.get('shop_id'),
+            email=document.get('email'),
+            owner=owner,
+            source=Source(**document['source']),
+            processing=Processing(**document['processing']),
+            shop_type=pipeline.get('shop_type', 'عام'),
+            state=pipeline.get('state', 'pending'),
+            created_at=document.get('created_at') or datetime.utcnow(),
+            analysis=dict(document.get('analysis') or {}),
+            generated_content=document.get('generated_content'),
+            preliminary_sent=pipeline.get('preliminary_sent', False),
+            preliminary_message_id=pipeline.get('preliminary_message_id'),
+            attempts=attempts,
+            final_attempt=attempts >= self.max_attempts,
+            enrichment_pending=bool(document.get('enrichment_pending')),
+            fallbacks=fallbacks
+        )
+    
+    @staticmethod
+    def _document(run: ReviewRun, status: str) -> ReviewDocument:
+        """The run's review as a ReviewDocument (for saving and notifications)."""
+        return ReviewDocument(
+            id=run.review_id,
+            shop_id=run.shop_id,
+            email=run.email,
+            stars=run.source.rating,
+            overall_sentiment=run.analysis.get('sentiment'),
+            created_at=run.created_at,
+            status=status,
+            source=run.source,
+            processing=run.processing,
+            analysis=run.analysis,
+            generated_content=run.generated_content
+        )
+    
+    @staticmethod
+    def _result(document: Dict[str, Any]) -> Dict[str, Any]:
+        """The `execute` result of an already saved review."""
+        status = document.get('status')
+        if status in REJECTION_REASONS:
+            return {"status": status, "reason": REJECTION_REASONS[status]}
+        return {"status": "processed" if status == "processed" else "pending", "review_id": str(document['_id'])}
+    
+    @staticmethod
+    def _annotate_trace(**attributes) -> None:
+        """Attach identifiers to the request's root span for trace lookup."""
+        span = current_span()
+        if span is not None:
+            for key, value in attributes.items():
+                span.set_attribute(key, value)
+    
+    def _record_usage(self, usage: InferenceUsage, reviews: int = 1) -> None:
+        """
+        Add the review's inference usage to its shop's totals (never raises).
+        
+        Reviews that made no model call are counted too, so per-review
+        averages include the reviews answered locally. An enrichment adds
+        its calls to a review already counted (`reviews=0`).
+        """
+        if self.usage_repository is None or not usage.shop_id:
+            return
+        try:
+            self.usage_repository.record(usage, reviews)
+        except Exception as e:
+            logger.error("Failed to record inference usage for shop %s: %s", usage.shop_id, e)
     
     def _prepare_initial_data(self, extracted_fields: Dict[str, Any]) -> tuple:
         """
@@ -7,6 +7,8 @@ from typing import Dict, Any
 
 from app.application.services.webhook.handlers.telegram_handler import TelegramHandler
 
+logger = logging.getLogger(__name__)
+
 
 class ProcessTelegramUseCase:
     """
@@ -32,5 +34,5 @@ class ProcessTelegramUseCase:
         Args:
             update_data: Telegram webhook update payload
         """
-        logging.info("Processing Telegram webhook update")
+        logger.info("Processing Telegram webhook update")
         self.telegram_handler.process_telegram_update(update_data)
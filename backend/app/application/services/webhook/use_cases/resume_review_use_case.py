@@ -0,0 +1,88 @@
+"""
+Resume Review Use Case
+Continues reviews whose pipeline run was interrupted.
+"""
+import logging
+from collections import Counter
+from typing import Dict, Optional
+
+from app.application.services.webhook.use_cases.process_review_use_case import ProcessReviewUseCase
+from app.infrastructure.repositories import ReviewRepository
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+RESUMED_TOTAL = registry.counter(
+    'review_pipeline_resumed_total',
+    'Reviews resumed from a checkpoint, by the stage they resumed from and their outcome.',
+    ('state', 'outcome')
+)
+
+
+class ResumeReviewUseCase:
+    """
+    Claims reviews whose lease expired and continues them from their checkpoint.
+
+    A lease expires when the process running the review died, timed out or
+    failed, or left the review for a retry (PIPELINE_RETRY_FALLBACKS). Each
+    review is claimed atomically, so several workers can run this at once.
+    """
+
+    def __init__(self, review_repository: ReviewRepository, process_review_use_case: ProcessReviewUseCase):
+        """
+        Initialize use case with its dependencies.
+
+        Args:
+            review_repository: Repository holding the review checkpoints
+            process_review_use_case: Pipeline the reviews are resumed in
+                (its lease and attempt settings are used for claiming)
+        """
+        self.review_repository = review_repository
+        self.process_review_use_case = process_review_use_case
+
+    def execute(self, limit: int = 10) -> Dict[str, int]:
+        """
+        Resume up to `limit` interrupted reviews, oldest first.
+
+        Args:
+            limit: Most reviews resumed in this call
+
+        Returns:
+            Number of resumed reviews by outcome ('processed', 'pending',
+            'rejected_*' or 'error')
+        """
+        outcomes = Counter()
+        use_case = self.process_review_use_case
+        for _ in range(limit):
+            document = self.review_repository.claim_resumable(use_case.lease_seconds, use_case.max_attempts)
+            if document is None:
+                break
+            outcomes[self._resume(document)] += 1
+        return dict(outcomes)
+
+    def resume_one(self, review_id: str) -> Optional[str]:
+        """
+        Resume one interrupted review.
+
+        Args:
+            review_id: Review to resume
+
+        Returns:
+            Its outcome, or None if it is no longer resumable (e.g. another
+            worker claimed it)
+        """
+        use_case = self.process_review_use_case
+        document = self.review_repository.claim_resumable(use_case.lease_seconds, use_case.max_attempts, review_id)
+        if document is None:
+            return None
+        return self._resume(document)
+
+    def _resume(self, document: dict) -> str:
+        state = (document.get('pipeline') or {}).get('state', 'pending')
+        try:
+            outcome = self.process_review_use_case.resume(document)['status']
+        except Exception as e:
+            logger.error("Resuming review %s from stage %s failed: %s", document.get('_id'), state, e)
+            outcome = 'error'
+        RESUMED_TOTAL.inc(state=state, outcome=outcome)
+        return outcome
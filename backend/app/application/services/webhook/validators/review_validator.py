@@ -9,6 +9,8 @@ from bson import ObjectId
 from app.infrastructure.repositories import ReviewRepository
 from app.domain.value_objects.review_validation_result import ReviewValidationResult
 
+logger = logging.getLogger(__name__)
+
 
 class ReviewValidator:
     """
@@ -75,11 +77,11 @@ class ReviewValidator:
                     error_type='duplicate'
                 )
             
-            logging.info(f"No duplicate review found for {email} and shop {shop_id}")
+            logger.info("No duplicate review found for %s and shop %s", email, shop_id)
             return ReviewValidationResult.success()
             
         except Exception as e:
-            logging.error(f"Error checking duplicate review: {e}")
+            logger.error("Error checking duplicate review: %s", e)
             return ReviewValidationResult.failure(
                 f"Error checking for duplicate review: {str(e)}",
                 error_type='validation_error'
@@ -9,6 +9,8 @@ from bson import ObjectId
 from app.infrastructure.repositories import UserRepository
 from app.domain.value_objects.review_validation_result import ReviewValidationResult
 
+logger = logging.getLogger(__name__)
+
 
 class ShopValidator:
     """
@@ -61,11 +63,11 @@ class ShopValidator:
                     None
                 )
             
-            logging.info(f"Shop {shop_id} validated successfully")
+            logger.info("Shop %s validated successfully", shop_id)
             return (ReviewValidationResult.success(), owner)
             
         except Exception as e:
-            logging.error(f"Error validating shop {shop_id}: {e}")
+            logger.error("Error validating shop %s: %s", shop_id, e)
             return (
                 ReviewValidationResult.failure(
                     f"Error validating shop: {str(e)}",
@@ -6,16 +6,24 @@ This service has been refactored following Clean Architecture and SOLID principl
 It now acts as a lightweight orchestrator delegating to specialized use cases.
 """
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from app.infrastructure.repositories import UserRepository, ReviewRepository
+from app.infrastructure.repositories import (
+    UserRepository,
+    ReviewRepository,
+    InferenceUsageRepository,
+    IdempotencyRepository
+)
 from app.infrastructure.external import (
     SentimentService,
     DeepSeekService,
     NotificationService,
     TelegramService,
-    QualityService
+    QualityService,
+    ToxicityCascade,
+    RelevancyLexicon
 )
+from app.infrastructure.throttling import LoadMonitor
 
 # Import all components
 from app.application.services.webhook.extractors.form_field_extractor import FormFieldExtractor
@@ -28,6 +36,9 @@ from app.application.services.webhook.handlers.notification_handler import Notif
 from app.application.services.webhook.handlers.telegram_handler import TelegramHandler
 from app.application.services.webhook.use_cases.process_review_use_case import ProcessReviewUseCase
 from app.application.services.webhook.use_cases.process_telegram_use_case import ProcessTelegramUseCase
+from app.application.services.webhook.use_cases.resume_review_use_case import ResumeReviewUseCase
+from app.application.services.webhook.use_cases.enrich_review_use_case import EnrichReviewUseCase
+from app.application.services.webhook.idempotency import IdempotencyGuard
 
 
 class WebhookService:
@@ -50,7 +61,16 @@ class WebhookService:
         self,
         user_repository: UserRepository = None,
         review_repository: ReviewRepository = None,
-        telegram_service: TelegramService = None
+        telegram_service: TelegramService = None,
+        sentiment_service: SentimentService = None,
+        deepseek_service: DeepSeekService = None,
+        notification_service: NotificationService = None,
+        quality_service: QualityService = None,
+        usage_repository: InferenceUsageRepository = None,
+        toxicity_cascade: ToxicityCascade = None,
+        relevancy_lexicon: RelevancyLexicon = None,
+        idempotency_repository: IdempotencyRepository = None,
+        load_monitor: LoadMonitor = None
     ):
         """
         Initialize WebhookService with dependency injection.
@@ -61,17 +81,32 @@ class WebhookService:
             user_repository: Optional repository for user/shop data
             review_repository: Optional repository for review data
             telegram_service: Optional Telegram service instance
+            sentiment_service: Optional HF sentiment/toxicity service
+            deepseek_service: Optional DeepSeek insights service
+            notification_service: Optional FCM/Telegram delivery service
+            quality_service: Optional quality scoring service
+            usage_repository: Optional repository for per-shop inference usage
+            toxicity_cascade: Optional local-first toxicity check
+            relevancy_lexicon: Optional keyword check ahead of the relevancy model
+            idempotency_repository: Optional store of claimed/completed submissions
+            load_monitor: Optional degraded-mode switch (defaults to the process-wide one)
         """
         # Initialize repositories
         self.user_repository = user_repository or UserRepository()
         self.review_repository = review_repository or ReviewRepository()
+        self.usage_repository = usage_repository or InferenceUsageRepository()
+        self.idempotency_repository = idempotency_repository or IdempotencyRepository()
         
         # Initialize external services
-        self.sentiment_service = SentimentService()
-        self.deepseek_service = DeepSeekService()
-        self.notification_service = NotificationService()
+        self.sentiment_service = sentiment_service or SentimentService()
+        self.deepseek_service = deepseek_service or DeepSeekService()
+        self.notification_service = notification_service or NotificationService()
         self.telegram_service = telegram_service or TelegramService(self.notification_service)
-        self.quality_service = QualityService()
+        self.quality_service = quality_service or QualityService()
+        self.toxicity_cascade = toxicity_cascade or ToxicityCascade(self.sentiment_service)
+        self.relevancy_lexicon = relevancy_lexicon or RelevancyLexicon()
+        self.load_monitor = load_monitor or LoadMonitor.instance()
+        self.load_monitor.attach_backlog(self.review_repository.count_in_pipeline)
         
         # Initialize components
         self._initialize_components()
@@ -90,7 +125,7 @@ class WebhookService:
         
         # Processors
         self.quality_processor = QualityGateProcessor(self.quality_service)
-        self.relevancy_processor = RelevancyGateProcessor(self.sentiment_service)
+        self.relevancy_processor = RelevancyGateProcessor(self.sentiment_service, self.relevancy_lexicon)
         self.ai_processor = AIAnalysisProcessor(
             self.sentiment_service,
             self.deepseek_service
@@ -99,7 +134,8 @@ class WebhookService:
         # Handlers
         self.notification_handler = NotificationHandler(
             self.notification_service,
-            self.telegram_service
+            self.telegram_service,
+            self.user_repository
         )
         self.telegram_handler = TelegramHandler(
             self.user_repository,
@@ -117,12 +153,27 @@ class WebhookService:
             ai_processor=self.ai_processor,
             notification_handler=self.notification_handler,
             review_repository=self.review_repository,
-            sentiment_service=self.sentiment_service
+            sentiment_service=self.sentiment_service,
+            usage_repository=self.usage_repository,
+            toxicity_cascade=self.toxicity_cascade,
+            load_monitor=self.load_monitor
+        )
+        
+        self.resume_review_use_case = ResumeReviewUseCase(
+            self.review_repository,
+            self.process_review_use_case
+        )
+        self.enrich_review_use_case = EnrichReviewUseCase(
+            self.review_repository,
+            self.process_review_use_case,
+            self.load_monitor
         )
         
         self.process_telegram_use_case = ProcessTelegramUseCase(
             telegram_handler=self.telegram_handler
         )
+        
+        self.idempotency_guard = IdempotencyGuard(self.idempotency_repository)
     
     def process_review(self, form_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -130,21 +181,70 @@ class WebhookService:
         
         Applies sequential quality and relevancy gates before committing
         to expensive AI analysis. This is the main public API method.
+        Re-deliveries of a submission return the first delivery's result.
         
         Args:
             form_data: Webhook payload containing review data
             
         Returns:
             Dictionary with processing result:
-            - status: 'processed', 'rejected_low_quality', or 'rejected_irrelevant'
-            - review_id: ID of saved review (if processed)
+            - status: 'processed', 'rejected_low_quality', 'rejected_irrelevant',
+              or 'pending' (left for worker.py to finish)
+            - review_id: ID of saved review (if processed or pending)
             - reason: Rejection reason (if rejected)
             
         Raises:
             ValueError: If payload is invalid or missing required fields
             LookupError: If shop not found or duplicate review exists
+            ReviewInProgressException: If another delivery of the same
+                submission is still being processed
+        """
+        return self.idempotency_guard.execute(
+            form_data,
+            lambda: self.process_review_use_case.execute(form_data)
+        )
+    
+    def resume_pending_reviews(self, limit: int = 10) -> Dict[str, int]:
+        """
+        Continue reviews whose pipeline run was interrupted (see worker.py).
+        
+        Args:
+            limit: Most reviews resumed in this call
+            
+        Returns:
+            Number of resumed reviews by outcome
+        """
+        return self.resume_review_use_case.execute(limit)
+    
+    def enrich_pending_reviews(self, limit: int = 10) -> Dict[str, int]:
+        """
+        Add the deferred AI enrichment to reviews saved in degraded mode (see worker.py).
+        
+        Args:
+            limit: Most reviews enriched in this call
+            
+        Returns:
+            Number of enriched reviews by outcome
+        """
+        return self.enrich_review_use_case.execute(limit)
+    
+    def resume_review(self, review_id: str) -> Optional[str]:
+        """
+        Continue one interrupted review (used by ReviewWorker).
+        
+        Returns:
+            Its outcome, or None if it is no longer resumable
+        """
+        return self.resume_review_use_case.resume_one(review_id)
+    
+    def enrich_review(self, review_id: str) -> Optional[str]:
+        """
+        Enrich one review saved in degraded mode (used by ReviewWorker).
+        
+        Returns:
+            Its outcome, or None if it was not enriched now
         """
-        return self.process_review_use_case.execute(form_data)
+        return self.enrich_review_use_case.enrich_one(review_id)
     
     def process_telegram_webhook(self, update_data: Dict[str, Any]):
         """
@@ -6,7 +6,8 @@ from .auth_exceptions import (
     UserAlreadyExistsException,
     UnauthorizedException,
     TokenExpiredException,
-    InvalidTokenException
+    InvalidTokenException,
+    AuthServiceBusyException
 )
 from .validation_exceptions import (
     ValidationException,
@@ -20,6 +21,7 @@ from .database_exceptions import (
     RecordNotFoundException,
     DuplicateRecordException
 )
+from .webhook_exceptions import ReviewInProgressException
 
 __all__ = [
     'AppException',
@@ -29,6 +31,7 @@ __all__ = [
     'UnauthorizedException',
     'TokenExpiredException',
     'InvalidTokenException',
+    'AuthServiceBusyException',
     'ValidationException',
     'InvalidEmailException',
     'WeakPasswordException',
@@ -37,4 +40,5 @@ __all__ = [
     'DatabaseException',
     'RecordNotFoundException',
     'DuplicateRecordException',
+    'ReviewInProgressException',
 ]
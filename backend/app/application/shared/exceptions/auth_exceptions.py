@@ -29,3 +29,8 @@ class InvalidTokenException(AuthException):
     """Raised when JWT token is invalid."""
     def __init__(self, message: str = "رمز الجلسة غير صالح"):
         super().__init__(message, status_code=401)
+
+class AuthServiceBusyException(AuthException):
+    """Raised when too many password checks are already in progress."""
+    def __init__(self, message: str = "الخدمة مشغولة حالياً، يرجى المحاولة بعد قليل"):
+        super().__init__(message, status_code=503)
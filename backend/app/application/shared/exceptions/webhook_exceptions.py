@@ -0,0 +1,7 @@
+"""Webhook processing exceptions."""
+from .base_exception import AppException
+
+class ReviewInProgressException(AppException):
+    """Raised when the same submission is still being processed by another delivery."""
+    def __init__(self, message: str = "هذا التقييم قيد المعالجة حالياً"):
+        super().__init__(message, status_code=409)
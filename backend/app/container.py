@@ -0,0 +1,252 @@
+"""
+Dependency Container
+Owns one instance of each repository, external service and application
+service per process.
+
+Routes, WebhookService and background workers resolve their dependencies
+here instead of constructing their own, so HTTP sessions, caches, the
+Telegram dispatcher and Mongo collections are shared. Every instance is
+built on first access (Mongo must be initialized before a repository is
+resolved).
+"""
+import threading
+import time
+from typing import Any, Callable, Dict
+
+from app.infrastructure.observability import record_init
+
+
+class Container:
+    """
+    Lazily built, process-wide singletons.
+
+    Use `override()` to substitute an instance (e.g. a fake repository in a
+    test or benchmark) before it is first resolved.
+    """
+
+    def __init__(self):
+        self._instances: Dict[str, Any] = {}
+        # Re-entrant: building a service resolves its own dependencies
+        self._lock = threading.RLock()
+
+    def _singleton(self, name: str, factory: Callable[[], Any]) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    start = time.perf_counter()
+                    instance = factory()
+                    record_init(name, time.perf_counter() - start)
+                    self._instances[name] = instance
+        return instance
+
+    def override(self, name: str, instance: Any) -> None:
+        """Register `instance` under `name` (e.g. 'user_repository')."""
+        with self._lock:
+            self._instances[name] = instance
+
+    def reset(self) -> None:
+        """Forget all instances (they are rebuilt on next access)."""
+        with self._lock:
+            self._instances.clear()
+
+    # ------------------------------------------------------------------
+    # Repositories
+    # ------------------------------------------------------------------
+
+    @property
+    def user_repository(self):
+        from app.infrastructure.repositories import UserRepository
+        return self._singleton('user_repository', UserRepository)
+
+    @property
+    def review_repository(self):
+        from app.infrastructure.repositories import ReviewRepository
+        return self._singleton('review_repository', ReviewRepository)
+
+    @property
+    def inference_usage_repository(self):
+        from app.infrastructure.repositories import InferenceUsageRepository
+        return self._singleton('inference_usage_repository', InferenceUsageRepository)
+
+    @property
+    def relevancy_lexicon_repository(self):
+        from app.infrastructure.repositories import RelevancyLexiconRepository
+        return self._singleton('relevancy_lexicon_repository', RelevancyLexiconRepository)
+
+    @property
+    def idempotency_repository(self):
+        from app.infrastructure.repositories import IdempotencyRepository
+        return self._singleton('idempotency_repository', IdempotencyRepository)
+
+    # ------------------------------------------------------------------
+    # External services
+    # ------------------------------------------------------------------
+
+    @property
+    def notification_service(self):
+        from app.infrastructure.external import NotificationService
+        return self._singleton('notification_service', NotificationService)
+
+    @property
+    def telegram_service(self):
+        from app.infrastructure.external import TelegramService
+        return self._singleton('telegram_service', lambda: TelegramService(self.notification_service))
+
+    @property
+    def sentiment_service(self):
+        from app.infrastructure.external import SentimentService
+        return self._singleton('sentiment_service', SentimentService)
+
+    @property
+    def deepseek_service(self):
+        from app.infrastructure.external import DeepSeekService
+        return self._singleton('deepseek_service', DeepSeekService)
+
+    @property
+    def quality_service(self):
+        from app.infrastructure.external import QualityService
+        return self._singleton('quality_service', QualityService)
+
+    @property
+    def toxicity_cascade(self):
+        from app.infrastructure.external import ToxicityCascade
+        return self._singleton('toxicity_cascade', lambda: ToxicityCascade(self.sentiment_service))
+
+    @property
+    def relevancy_labels(self):
+        from app.infrastructure.external import LabelRegistry
+        return self._singleton('relevancy_labels', LabelRegistry.instance)
+
+    @property
+    def relevancy_lexicon(self):
+        from app.infrastructure.external import RelevancyLexicon
+        return self._singleton(
+            'relevancy_lexicon',
+            lambda: RelevancyLexicon(self.relevancy_lexicon_repository, labels=self.relevancy_labels)
+        )
+
+    @property
+    def load_monitor(self):
+        from app.infrastructure.throttling import LoadMonitor
+        return self._singleton('load_monitor', LoadMonitor.instance)
+
+    @property
+    def qr_service(self):
+        from app.domain.services import QRService
+        return self._singleton('qr_service', QRService)
+
+    # ------------------------------------------------------------------
+    # Application services
+    # ------------------------------------------------------------------
+
+    @property
+    def auth_service(self):
+        from app.application.services import AuthService
+        return self._singleton('auth_service', lambda: AuthService(self.user_repository))
+
+    @property
+    def dashboard_service(self):
+        from app.application.services import DashboardService
+        return self._singleton(
+            'dashboard_service',
+            lambda: DashboardService(self.user_repository, self.review_repository)
+        )
+
+    @property
+    def webhook_service(self):
+        from app.application.services import WebhookService
+        return self._singleton('webhook_service', lambda: WebhookService(
+            user_repository=self.user_repository,
+            review_repository=self.review_repository,
+            telegram_service=self.telegram_service,
+            sentiment_service=self.sentiment_service,
+            deepseek_service=self.deepseek_service,
+            notification_service=self.notification_service,
+            quality_service=self.quality_service,
+            usage_repository=self.inference_usage_repository,
+            toxicity_cascade=self.toxicity_cascade,
+            relevancy_lexicon=self.relevancy_lexicon,
+            idempotency_repository=self.idempotency_repository,
+            load_monitor=self.load_monitor
+        ))
+
+    @property
+    def inference_usage_service(self):
+        from app.application.services import InferenceUsageService
+        return self._singleton(
+            'inference_usage_service',
+            lambda: InferenceUsageService(self.inference_usage_repository)
+        )
+
+    @property
+    def review_worker(self):
+        from app.application.services import ReviewWorker
+        return self._singleton('review_worker', lambda: ReviewWorker.from_config(
+            self.webhook_service,
+            self.review_repository,
+            self.load_monitor
+        ))
+
+    # Processors are owned by the webhook service's pipeline; exposed here
+    # so workers reuse the same instances.
+
+    @property
+    def quality_processor(self):
+        return self.webhook_service.quality_processor
+
+    @property
+    def relevancy_processor(self):
+        return self.webhook_service.relevancy_processor
+
+    @property
+    def ai_processor(self):
+        return self.webhook_service.ai_processor
+
+    @property
+    def notification_handler(self):
+        return self.webhook_service.notification_handler
+
+    @property
+    def process_review_use_case(self):
+        return self.webhook_service.process_review_use_case
+
+
+
+class LazyService:
+    """
+    Proxy for a container service, resolved on first use.
+
+    Module-level names (e.g. `app.notification_service`) can refer to a
+    service without building it at import time; the container builds it
+    (and records its startup cost) on the first attribute access, which is
+    forwarded to the instance.
+    """
+
+    def __init__(self, owner: Container, name: str):
+        """
+        Args:
+            owner: Container holding the service
+            name: Container property of the service (e.g. 'notification_service')
+        """
+        self._owner = owner
+        self._name = name
+
+    def get(self) -> Any:
+        """Return the service, building it on the first call."""
+        return getattr(self._owner, self._name)
+
+    @property
+    def is_initialized(self) -> bool:
+        return self._name in self._owner._instances
+
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
+
+    def __repr__(self) -> str:
+        state = 'initialized' if self.is_initialized else 'pending'
+        return f"<LazyService {self._name} ({state})>"
+
+
+container = Container()
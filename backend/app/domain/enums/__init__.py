@@ -1,5 +1,6 @@
 """Enumerations module."""
 from .shop_type import ShopType
 from .review_status import ReviewStatus
+from .review_priority import ReviewPriority
 
-__all__ = ['ShopType', 'ReviewStatus']
+__all__ = ['ShopType', 'ReviewStatus', 'ReviewPriority']
@@ -0,0 +1,10 @@
+"""Review priority enumeration."""
+from enum import IntEnum
+
+
+class ReviewPriority(IntEnum):
+    """Processing priority assigned at ingestion (higher runs first)."""
+    
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
@@ -1,7 +1,7 @@
 """User domain entity."""
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from bson import ObjectId
 
 
@@ -13,13 +13,22 @@ class User:
     password_hash: str
     shop_name: str
     shop_type: str
-    device_token: str = ""
+    device_token: str = ""  # Legacy single token (most recently registered device)
+    device_tokens: List[str] = field(default_factory=list)
     telegram_chat_id: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
     id: Optional[ObjectId] = None
     is_active: bool = True
     
+    @property
+    def notification_tokens(self) -> List[str]:
+        """All FCM tokens for this user, including the legacy single token."""
+        tokens = list(self.device_tokens)
+        if self.device_token and self.device_token not in tokens:
+            tokens.append(self.device_token)
+        return tokens
+    
     def to_dict(self) -> dict:
         """Convert to dictionary for MongoDB."""
         return {
@@ -29,6 +38,7 @@ class User:
             'shop_name': self.shop_name,
             'shop_type': self.shop_type,
             'device_token': self.device_token,
+            'device_tokens': self.device_tokens,
             'telegram_chat_id': self.telegram_chat_id,
             'is_active': self.is_active,
             'created_at': self.created_at,
@@ -45,6 +55,7 @@ class User:
             shop_name=data['shop_name'],
             shop_type=data['shop_type'],
             device_token=data.get('device_token', ''),
+            device_tokens=data.get('device_tokens') or [],
             telegram_chat_id=data.get('telegram_chat_id'),
             is_active=data.get('is_active', True),
             created_at=data.get('created_at', datetime.utcnow()),
@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import List, Optional
 
 class INotificationService(ABC):
     @abstractmethod
@@ -7,6 +9,16 @@ class INotificationService(ABC):
         pass
 
     @abstractmethod
-    def send_telegram_notification(self, chat_id: str, message: str) -> None:
-        """إرسال إشعار عبر Telegram"""
-        pass
\ No newline at end of file
+    def send_fcm_multicast(self, device_tokens: List[str], message: str, title: str = "تقييم جديد") -> List[str]:
+        """إرسال إشعار لعدة أجهزة دفعة واحدة؛ يعيد الرموز غير الصالحة"""
+        pass
+
+    @abstractmethod
+    def send_telegram_notification(self, chat_id: str, message: str) -> Optional[Future]:
+        """إرسال إشعار عبر Telegram (queued; returns a Future for the sent message)"""
+        pass
+
+    @abstractmethod
+    def edit_telegram_message(self, chat_id: str, message_id: int, message: str) -> Optional[Future]:
+        """تعديل رسالة Telegram مرسلة مسبقاً"""
+        pass
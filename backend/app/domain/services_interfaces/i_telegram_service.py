@@ -1,17 +1,39 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from typing import List, Optional
 from app.application.dto.review_processing_dto import ReviewDocument
 
 class ITelegramService(ABC):
     """Interface for Telegram notification service."""
     
     @abstractmethod
-    def send_review_notification(self, chat_id: str, review_doc: ReviewDocument) -> None:
+    def send_review_notification(
+        self,
+        chat_id: str,
+        review_doc: ReviewDocument,
+        preliminary: Optional[Future] = None
+    ) -> None:
         """
         Send formatted review notification to Telegram.
         
         Args:
             chat_id: Telegram chat ID
             review_doc: Review document with all data
+            preliminary: Pending preliminary alert to edit instead of sending a new message
+        """
+        pass
+    
+    @abstractmethod
+    def send_preliminary_notification(self, chat_id: str, review_doc: ReviewDocument) -> Optional[Future]:
+        """
+        Send a lightweight alert before AI enrichment completes.
+        
+        Args:
+            chat_id: Telegram chat ID
+            review_doc: Review document without generated content
+            
+        Returns:
+            Future resolving to the sent message, or None if not sent
         """
         pass
     
@@ -28,6 +50,19 @@ class ITelegramService(ABC):
         """
         pass
     
+    @abstractmethod
+    def build_digest_message(self, review_docs: List[ReviewDocument]) -> str:
+        """
+        Build one summary message for a batch of reviews.
+        
+        Args:
+            review_docs: Reviews collected during a digest window
+            
+        Returns:
+            Formatted Telegram message with Markdown
+        """
+        pass
+    
     @abstractmethod
     def send_connection_success(self, chat_id: str) -> None:
         """Send connection success message."""
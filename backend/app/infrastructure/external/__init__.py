@@ -5,6 +5,10 @@ from .sentiment_service import SentimentService
 from .text_profanity_service import TextProfanityService
 from .telegram_service import TelegramService
 from .quality_service import QualityService
+from .toxicity_cascade import ToxicityCascade
+from .relevancy_labels import LabelRegistry
+from .relevancy_lexicon import RelevancyLexicon
+from .local_sentiment_model import LocalSentimentModel
 
 __all__ = [
     'NotificationService',
@@ -12,6 +16,10 @@ __all__ = [
     'DeepSeekService',
     'TextProfanityService',
     'TelegramService',
-    'QualityService'
+    'QualityService',
+    'ToxicityCascade',
+    'LabelRegistry',
+    'RelevancyLexicon',
+    'LocalSentimentModel'
 ]
 
@@ -1,11 +1,15 @@
-import requests
 import logging
 import json
 from app.presentation.config import HF_TOKEN, MODEL_ID, API_URL
+from app.infrastructure.external import http_client
+from app.infrastructure.observability.metrics import record_fallback
+from app.infrastructure.observability.inference_usage import record_tokens
 from app.application.dto.analysis_result_dto import AnalysisResultDTO
 from app.application.dto.sentiment_analysis_result_dto import SentimentAnalysisResultDTO
 from app.application.dto.review_dto import ReviewDTO
 
+logger = logging.getLogger(__name__)
+
 class DeepSeekService:
     def __init__(self):
         self.headers = {"Authorization": f"Bearer {HF_TOKEN}"}
@@ -19,13 +23,16 @@ class DeepSeekService:
             "response_format": {"type": "json_object"} 
         }
         try:
-            response = requests.post(API_URL, headers=self.headers, json=payload)
+            response = http_client.post('deepseek', API_URL, headers=self.headers, json=payload)
             response.raise_for_status()
             
-            content = response.json()["choices"][0]["message"]["content"]
+            body = response.json()
+            usage = body.get("usage") or {}
+            record_tokens('deepseek', usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+            content = body["choices"][0]["message"]["content"]
             return content
         except Exception as e:
-            logging.error(f"AI Model Query Error: {e}")
+            logger.error("AI Model Query Error: %s", e)
             return None
 
     def format_insights_and_reply(
@@ -84,7 +91,7 @@ class DeepSeekService:
         raw_response = self.query_deepseek(messages, max_tokens=1500, temperature=0.5)
         
         if not raw_response:
-            logging.error("DeepSeek returned None, using fallback.")
+            logger.error("DeepSeek returned None, using fallback.")
             return self._get_fallback_analysis(sentiment_result, dto.stars)
 
         try:
@@ -103,11 +110,12 @@ class DeepSeekService:
                 context_match=sentiment_result.context_match
             )
         except json.JSONDecodeError as e:
-            logging.error(f"Failed to parse JSON from DeepSeek: {e}. Raw: {raw_response}")
+            logger.error("Failed to parse JSON from DeepSeek: %s. Raw: %s", e, raw_response)
             return self._get_fallback_analysis(sentiment_result, dto.stars)
 
     def _get_fallback_analysis(self, sentiment_result: SentimentAnalysisResultDTO, stars: int):
         """يرجع إجابة آمنة في حالة فشل DeepSeek"""
+        record_fallback('deepseek')
         # Fallback classification logic
         fallback_category = "عام"
         if sentiment_result.sentiment == "سلبي" or (stars and stars <= 2):
@@ -0,0 +1,73 @@
+"""
+HTTP Client
+Instrumented wrapper around `requests` for outbound API calls.
+
+Every call to Hugging Face, DeepSeek or Telegram goes through `post()` so
+latency and status are recorded per service in one place, and each call
+is traced as a span with the W3C `traceparent` header propagated. Model
+calls are also counted towards the current review's inference usage, and
+Hugging Face latencies feed the LoadMonitor (degraded mode).
+"""
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from app.infrastructure.observability.inference_usage import record_call
+from app.infrastructure.observability.metrics import EXTERNAL_CALL_SECONDS
+from app.infrastructure.observability.tracing import span, traceparent
+from app.infrastructure.throttling.load_monitor import record_latency
+
+
+def _status_label(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def _request_size(response: requests.Response) -> int:
+    body = getattr(response.request, 'body', None)
+    if body is None:
+        return 0
+    return len(body.encode('utf-8')) if isinstance(body, str) else len(body)
+
+
+def post(service: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a POST request and record its latency.
+
+    Args:
+        service: Metric label for the remote API (e.g. 'hf_sentiment')
+        url: Request URL
+        **kwargs: Passed through to `requests.post`
+
+    Returns:
+        requests.Response (exceptions are re-raised after being recorded)
+    """
+    start = time.perf_counter()
+    status = 'error'
+    response = None
+    with span(f"http.{service}", **{'http.method': 'POST', 'server.address': urlsplit(url).hostname or ''}) as call_span:
+        header = traceparent()
+        if header:
+            kwargs['headers'] = {**(kwargs.get('headers') or {}), 'traceparent': header}
+        try:
+            response = requests.post(url, **kwargs)
+            status = _status_label(response.status_code)
+            if call_span:
+                call_span.set_attribute('http.status_code', response.status_code)
+                if response.status_code >= 400:
+                    call_span.status = 'error'
+            return response
+        except requests.exceptions.Timeout:
+            status = 'timeout'
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            EXTERNAL_CALL_SECONDS.observe(elapsed, service=service, status=status)
+            record_latency(service, elapsed)
+            record_call(
+                service,
+                elapsed,
+                _request_size(response) if response is not None else 0,
+                len(response.content) if response is not None else 0,
+                ok=status == '2xx'
+            )
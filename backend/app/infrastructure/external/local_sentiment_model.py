@@ -0,0 +1,275 @@
+"""
+Local Sentiment Model
+Small in-process sentiment classifier trained from our own reviews.
+
+Texts are turned into hashed character n-grams (2-4 characters inside word
+boundaries, plus whole words), and a multinomial logistic regression over
+those buckets predicts سلبي / محايد / إيجابي with a probability. Prediction
+is a few hundred dictionary lookups, well under a millisecond for a review.
+
+The model is trained by train_sentiment_model.py from the HF labels already
+stored in `analysis.sentiment` (reviews whose `analysis.sentiment_source` is
+'hf', never its own answers), and saved as gzipped JSON holding only the
+non-zero weights. SentimentService.analyze_sentiment uses it when its
+confidence reaches SENTIMENT_LOCAL_MIN_CONFIDENCE and calls HF otherwise.
+"""
+import gzip
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.presentation.config import SENTIMENT_LOCAL_MODEL_PATH
+
+logger = logging.getLogger(__name__)
+
+LABELS = ("سلبي", "محايد", "إيجابي")
+FORMAT_VERSION = 1
+DEFAULT_DIM = 2 ** 18
+NGRAM_RANGE = (2, 4)
+PRUNE_BELOW = 1e-4
+# Response header of the model server naming the source of each prediction
+# ('local' or 'upstream', comma-separated in input order)
+PREDICTION_SOURCE_HEADER = 'X-Prediction-Source'
+
+_DIACRITICS = re.compile(r'[\u064B-\u065F\u0670\u0640]')
+_ELONGATION = re.compile(r'(.)\1{2,}')
+_TOKEN = re.compile(r'[\w\U00010000-\U0010ffff\u2600-\u27BF]+')
+
+
+def normalize(text: str) -> str:
+    """Lower-case, strip diacritics/tatweel, unify alef and cap repeated letters at two."""
+    text = _DIACRITICS.sub('', text.lower())
+    text = text.translate(str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ى': 'ي', 'ة': 'ه'}))
+    return _ELONGATION.sub(r'\1\1', text)
+
+
+def features(text: str, dim: int = DEFAULT_DIM, ngram_range: Sequence[int] = NGRAM_RANGE) -> Dict[int, float]:
+    """
+    Hashed, L2-normalized bag of character n-grams and words.
+
+    crc32 is used instead of `hash()` so buckets are the same in every process.
+    """
+    counts: Counter = Counter()
+    low, high = ngram_range
+    for word in _TOKEN.findall(normalize(text)):
+        counts[zlib.crc32(('w:' + word).encode('utf-8')) % dim] += 1
+        padded = f" {word} "
+        for n in range(low, high + 1):
+            for i in range(len(padded) - n + 1):
+                counts[zlib.crc32(padded[i:i + n].encode('utf-8')) % dim] += 1
+    norm = math.sqrt(sum(c * c for c in counts.values()))
+    return {bucket: c / norm for bucket, c in counts.items()} if norm else {}
+
+
+def _softmax(scores: List[float]) -> List[float]:
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    total = sum(exps)
+    return [e / total for e in exps]
+
+
+class LocalSentimentModel:
+    """
+    Hashed n-gram multinomial logistic regression.
+
+    Args:
+        weights: {bucket: [weight per label]} (only non-zero buckets)
+        bias: Weight per label
+        dim: Number of hash buckets
+        labels: Class labels, in weight order
+        ngram_range: Character n-gram sizes
+        metadata: Training details (samples, accuracy...) kept with the model
+    """
+
+    _instance: Optional['LocalSentimentModel'] = None
+    _instance_loaded = False
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        weights: Dict[int, List[float]],
+        bias: List[float],
+        dim: int = DEFAULT_DIM,
+        labels: Sequence[str] = LABELS,
+        ngram_range: Sequence[int] = NGRAM_RANGE,
+        metadata: Optional[dict] = None
+    ):
+        self.weights = weights
+        self.bias = list(bias)
+        self.dim = dim
+        self.labels = tuple(labels)
+        self.ngram_range = tuple(ngram_range)
+        self.metadata = metadata or {}
+
+    @classmethod
+    def instance(cls) -> Optional['LocalSentimentModel']:
+        """
+        The model at SENTIMENT_LOCAL_MODEL_PATH, loaded once per process.
+
+        Returns None when no model has been trained (or it cannot be read), in
+        which case every sentiment call goes to HF.
+        """
+        if not cls._instance_loaded:
+            with cls._instance_lock:
+                if not cls._instance_loaded:
+                    if os.path.exists(SENTIMENT_LOCAL_MODEL_PATH):
+                        try:
+                            cls._instance = cls.load(SENTIMENT_LOCAL_MODEL_PATH)
+                            logger.info(
+                                "Loaded local sentiment model (%s buckets, trained %s)",
+                                len(cls._instance.weights), cls._instance.metadata.get('trained_at')
+                            )
+                        except Exception as e:
+                            logger.error("Failed to load local sentiment model: %s", e)
+                    else:
+                        logger.info("No local sentiment model at %s", SENTIMENT_LOCAL_MODEL_PATH)
+                    cls._instance_loaded = True
+        return cls._instance
+
+    def predict_proba(self, text: str) -> List[float]:
+        """Probability of each label, in `self.labels` order."""
+        scores = list(self.bias)
+        k = len(scores)
+        weights = self.weights
+        for bucket, value in features(text, self.dim, self.ngram_range).items():
+            row = weights.get(bucket)
+            if row is not None:
+                for j in range(k):
+                    scores[j] += row[j] * value
+        return _softmax(scores)
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """Most likely label and its probability."""
+        probabilities = self.predict_proba(text)
+        best = max(range(len(probabilities)), key=probabilities.__getitem__)
+        return self.labels[best], probabilities[best]
+
+    @classmethod
+    def train(
+        cls,
+        samples: Iterable[Tuple[str, str]],
+        dim: int = DEFAULT_DIM,
+        epochs: int = 5,
+        learning_rate: float = 0.5,
+        l2: float = 1e-6,
+        balance: bool = True,
+        seed: int = 42,
+        labels: Sequence[str] = LABELS
+    ) -> 'LocalSentimentModel':
+        """
+        Fit the model with SGD on (text, label) samples.
+
+        Args:
+            samples: Texts and their labels (labels outside `labels` are skipped)
+            dim: Number of hash buckets
+            epochs: Passes over the shuffled samples
+            learning_rate: Initial step size (decays as 1/sqrt(1 + epochs done))
+            l2: Weight decay applied to the buckets a sample touches
+            balance: Weight classes inversely to their frequency
+            seed: Shuffle seed
+        """
+        index = {label: i for i, label in enumerate(labels)}
+        data = [(features(text, dim), index[label]) for text, label in samples if label in index]
+        data = [(x, y) for x, y in data if x]
+        if not data:
+            raise ValueError("No labelled samples to train on")
+
+        k = len(labels)
+        frequency = Counter(y for _, y in data)
+        class_weight = [
+            (len(data) / (k * frequency[j]) if balance and frequency[j] else 1.0) for j in range(k)
+        ]
+        weights: Dict[int, List[float]] = {}
+        bias = [0.0] * k
+        rng = random.Random(seed)
+        step = 0
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for x, y in data:
+                step += 1
+                rate = learning_rate / math.sqrt(step / len(data) + 1)
+                scores = list(bias)
+                for bucket, value in x.items():
+                    row = weights.get(bucket)
+                    if row is not None:
+                        for j in range(k):
+                            scores[j] += row[j] * value
+                probabilities = _softmax(scores)
+                gradient = [(probabilities[j] - (1.0 if j == y else 0.0)) * class_weight[y] for j in range(k)]
+                for j in range(k):
+                    bias[j] -= rate * gradient[j]
+                for bucket, value in x.items():
+                    row = weights.setdefault(bucket, [0.0] * k)
+                    for j in range(k):
+                        row[j] -= rate * (gradient[j] * value + l2 * row[j])
+
+        weights = {
+            bucket: row for bucket, row in weights.items() if max(abs(w) for w in row) >= PRUNE_BELOW
+        }
+        metadata = {
+            'trained_at': datetime.now(timezone.utc).isoformat(),
+            'samples': len(data),
+            'class_counts': {labels[j]: frequency[j] for j in range(k)},
+            'epochs': epochs,
+        }
+        return cls(weights, bias, dim, labels, NGRAM_RANGE, metadata)
+
+    def evaluate(self, samples: Iterable[Tuple[str, str]], thresholds: Sequence[float] = (0.0,)) -> List[dict]:
+        """
+        Accuracy and coverage of the predictions at each confidence threshold.
+
+        Coverage is the share of samples the model would answer locally;
+        accuracy is measured on those samples only.
+        """
+        predictions = [(self.predict(text), label) for text, label in samples if label in self.labels]
+        rows = []
+        for threshold in thresholds:
+            kept = [(predicted, label) for (predicted, confidence), label in predictions if confidence >= threshold]
+            correct = sum(1 for predicted, label in kept if predicted == label)
+            rows.append({
+                'threshold': threshold,
+                'coverage': round(len(kept) / len(predictions), 4) if predictions else 0.0,
+                'accuracy': round(correct / len(kept), 4) if kept else None,
+                'samples': len(kept),
+            })
+        return rows
+
+    def save(self, path: str) -> None:
+        """Write the model as gzipped JSON (weights rounded to 6 decimals)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = {
+            'version': FORMAT_VERSION,
+            'labels': list(self.labels),
+            'dim': self.dim,
+            'ngram_range': list(self.ngram_range),
+            'bias': [round(b, 6) for b in self.bias],
+            'weights': {str(bucket): [round(w, 6) for w in row] for bucket, row in self.weights.items()},
+            'metadata': self.metadata,
+        }
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path: str) -> 'LocalSentimentModel':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported local sentiment model version: {payload.get('version')}")
+        return cls(
+            weights={int(bucket): row for bucket, row in payload['weights'].items()},
+            bias=payload['bias'],
+            dim=payload['dim'],
+            labels=payload['labels'],
+            ngram_range=payload['ngram_range'],
+            metadata=payload.get('metadata')
+        )
@@ -1,60 +1,151 @@
-import firebase_admin
-from firebase_admin import credentials, messaging
 import json
 import logging
+import threading
+from concurrent.futures import Future
+from typing import List, Optional
 from app.presentation.config import FIREBASE_JSON, TELEGRAM_TOKEN
 from app.domain.services_interfaces import INotificationService
+from app.infrastructure.external.telegram_dispatcher import TelegramDispatcher
+
+logger = logging.getLogger(__name__)
 
 class NotificationService(INotificationService):
-    def __init__(self):
-        self._initialize_firebase()
+    FCM_MULTICAST_LIMIT = 500  # Max tokens per send_each_for_multicast call
+
+    # firebase_admin pulls in google-auth and httpx (~150ms); it is imported
+    # and initialized on the first FCM send rather than at startup
+    _firebase_lock = threading.Lock()
+
+    def __init__(self, telegram_dispatcher: TelegramDispatcher = None):
+        self.telegram_dispatcher = telegram_dispatcher or TelegramDispatcher.instance()
 
     def _initialize_firebase(self):
         """تهيئة Firebase"""
+        import firebase_admin
+        from firebase_admin import credentials
+
         try:
-            if not firebase_admin._apps:  # تأكد أنه لم يتم التهيئة مسبقاً
+            with self._firebase_lock:
+                if firebase_admin._apps:  # تأكد أنه لم يتم التهيئة مسبقاً
+                    return
                 cred_dict = json.loads(FIREBASE_JSON)
                 cred = credentials.Certificate(cred_dict)
                 firebase_admin.initialize_app(cred)
-                logging.info("Firebase initialized successfully")
+                logger.info("Firebase initialized successfully")
         except Exception as e:
-            logging.error(f"Error initializing Firebase: {e}")
+            logger.error("Error initializing Firebase: %s", e)
 
     def send_fcm_notification(self, device_token: str, message: str, title: str = "تقييم جديد") -> None:
         """إرسال إشعار عبر FCM"""
-        try:
-            msg = messaging.Message(
-                notification=messaging.Notification(
-                    title=title,
-                    body=message
-                ),
-                token=device_token
+        self.send_fcm_multicast([device_token], message, title)
+
+    def send_fcm_multicast(self, device_tokens: List[str], message: str, title: str = "تقييم جديد") -> List[str]:
+        """
+        إرسال نفس الإشعار لعدة أجهزة عبر FCM
+
+        Uses one send_each_for_multicast call per 500 tokens instead of one
+        request per device.
+
+        Args:
+            device_tokens: FCM registration tokens
+            message: Notification body
+            title: Notification title
+
+        Returns:
+            Tokens FCM reported as unregistered (callers should prune them)
+        """
+        tokens = [t for t in dict.fromkeys(device_tokens) if t]
+        stale_tokens = []
+        if not tokens:
+            return stale_tokens
+
+        from firebase_admin import messaging
+        self._initialize_firebase()
+        # FCM errors meaning the token will never work again
+        stale_token_errors = (messaging.UnregisteredError, messaging.SenderIdMismatchError)
+
+        for start in range(0, len(tokens), self.FCM_MULTICAST_LIMIT):
+            batch = tokens[start:start + self.FCM_MULTICAST_LIMIT]
+            try:
+                multicast = messaging.MulticastMessage(
+                    notification=messaging.Notification(
+                        title=title,
+                        body=message
+                    ),
+                    tokens=batch
+                )
+                batch_response = messaging.send_each_for_multicast(multicast)
+            except Exception as e:
+                logger.error("Error sending FCM notification: %s", e)
+                continue
+
+            for token, response in zip(batch, batch_response.responses):
+                if response.success:
+                    continue
+                if isinstance(response.exception, stale_token_errors):
+                    stale_tokens.append(token)
+                else:
+                    logger.warning("FCM delivery failed for one device: %s", response.exception)
+
+            logger.info(
+                "FCM multicast sent: %s delivered, %s failed", batch_response.success_count, batch_response.failure_count
             )
-            response = messaging.send(msg)
-            logging.info(f"Notification sent: {response}")
-        except Exception as e:
-            logging.error(f"Error sending FCM notification: {e}")
 
-    def send_telegram_notification(self, chat_id: str, message: str) -> None:
-        """إرسال إشعار عبر Telegram"""
+        return stale_tokens
+
+    def send_telegram_notification(self, chat_id: str, message: str) -> Optional[Future]:
+        """
+        إرسال إشعار عبر Telegram
+
+        The message goes through the rate-limited dispatcher, so bursts are
+        delayed rather than dropped (queued, or sent before returning on
+        serverless; see TelegramDispatcher).
+
+        Returns:
+            Future resolving to the sent Telegram message, or None if Telegram is not configured
+        """
         if not TELEGRAM_TOKEN:
-            logging.warning("Telegram token not set")
-            return
+            logger.warning("Telegram token not set")
+            return None
 
-        try:
-            # استخدام requests لإرسال الطلب بشكل متزامن وبسيط
-            import requests
-            url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-            data = {
-                "chat_id": chat_id,
-                "text": message,
-                "parse_mode": "Markdown",  # Support for bold, italic, links
-                "disable_web_page_preview": True  # Don't show link previews
-            }
-            response = requests.post(url, data=data, timeout=10)
-            if response.status_code == 200:
-                logging.info(f"Telegram notification sent to {chat_id}")
-            else:
-                logging.error(f"Failed to send Telegram notification: {response.text}")
-        except Exception as e:
-            logging.error(f"Error sending Telegram notification: {e}")
\ No newline at end of file
+        data = {
+            "chat_id": chat_id,
+            "text": message,
+            "parse_mode": "Markdown",  # Support for bold, italic, links
+            "disable_web_page_preview": True  # Don't show link previews
+        }
+        future = self.telegram_dispatcher.submit("sendMessage", data)
+        future.add_done_callback(lambda f: self._log_telegram_result(chat_id, f))
+        return future
+
+    def edit_telegram_message(self, chat_id: str, message_id: int, message: str) -> Optional[Future]:
+        """
+        تعديل رسالة Telegram مرسلة مسبقاً
+
+        Queued on the same dispatcher, so the edit is sent after any earlier
+        message for the chat.
+
+        Returns:
+            Future resolving to the edited Telegram message, or None if Telegram is not configured
+        """
+        if not TELEGRAM_TOKEN:
+            logger.warning("Telegram token not set")
+            return None
+
+        data = {
+            "chat_id": chat_id,
+            "message_id": message_id,
+            "text": message,
+            "parse_mode": "Markdown",
+            "disable_web_page_preview": True
+        }
+        return self.telegram_dispatcher.submit("editMessageText", data)
+
+    @staticmethod
+    def _log_telegram_result(chat_id: str, future: Future) -> None:
+        """Log the final outcome of a queued Telegram message."""
+        error = future.exception()
+        if error:
+            logger.error("Failed to send Telegram notification to %s: %s", chat_id, error)
+        else:
+            logger.info("Telegram notification sent to %s", chat_id)
@@ -9,6 +9,8 @@ import logging
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class QualityWeights:
@@ -94,7 +96,7 @@ class QualityService:
         ]
         all_text = " ".join(parts)
         if len(all_text) > self.MAX_TEXT_LENGTH:
-            logging.warning(f"Text too long ({len(all_text)} chars), truncating")
+            logger.warning("Text too long (%s chars), truncating", len(all_text))
             all_text = all_text[:self.MAX_TEXT_LENGTH]
         # 2. معالجة الحالة الفارغة
         if not all_text or len(all_text) < 3:
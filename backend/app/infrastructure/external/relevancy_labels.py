@@ -0,0 +1,180 @@
+"""
+Relevancy Labels
+Zero-shot candidate labels per ShopType, built once per process.
+
+`detect_context_mismatch` asks the NLI model whether a review is about the
+shop's domain, about generic customer service, or about something else.
+Those three labels depend only on the shop type, so they are formatted once
+here and shared by the relevancy gate, RelevancyLexicon and any local
+relevancy model. `cached()` keeps other label-side work (e.g. label
+embeddings) for the life of the process.
+"""
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterator, Mapping, Optional, Tuple, Union
+
+from app.domain.enums import ShopType
+
+# Zero-shot description of each shop type's domain
+SHOP_TYPE_DESCRIPTIONS: Mapping[ShopType, str] = MappingProxyType({
+    ShopType.RESTAURANT: "أكل وطعام ووجبات ومنيو ومطاعم وطبخ وأطباق وجوع",
+    ShopType.CAFE: "قهوة وكافيه وحلا ومشروبات وباريستا وجلسة روقان",
+    ShopType.CLOTHING_STORE: "أزياء ولبس وقماش وموضة ومقاسات وتفصيل وبراندات",
+    ShopType.PHARMACY: "دواء وعلاج وصيدليات ووصفة طبية وفيتامينات وشاش",
+    ShopType.SUPERMARKET: "بقالة ومقاضي وتسوق ومنتجات غذائية ومعلبات وخضار",
+    ShopType.ELECTRONICS: "أجهزة ذكية وشاشات وكمبيوترات وتقنية وقطع غيار وصيانة",
+    ShopType.BOOKSTORE: "كتب وقراءة وقرطاسية وأدوات مدرسية وروايات وتعليم",
+    ShopType.BEAUTY_SALON: "مكياج وبشرة وشعر وعطورات ومستحضرات تجميل وعناية",
+    ShopType.GYM: "جيم وتمارين وحديد ولياقة ورياضة ومدرب وعضلات",
+    ShopType.SCHOOL: "تعليم وطلاب ومدرسين وكتب ودوام مدرسي وفصول ودراسة",
+    ShopType.HOSPITAL: "طب ومرضى وعلاج ودكاترة وعيادات وفحوصات وعمليات",
+    ShopType.GAS_STATION: "بنزين وسيارات وزيت ووقود وتعبئة وإطارات ومغسلة سيارات",
+    ShopType.APPLIANCES: "أجهزة كهربائية ومنزلية وغسالات وثلاجات ومكيفات",
+    ShopType.TOY_STORE: "ألعاب أطفال وترفيه وهدايا صغار وبلايستيشن وعرائس",
+    ShopType.TRAVEL_AGENCY: "سفر وسياحة وطيران وفنادق وحجوزات ورحلات وتذاكر",
+    ShopType.GIFT_SHOP: "هدايا وتغليف وورد ومناسبات وتذكارات وتحف",
+    ShopType.LAUNDRY: "غسيل وكوي وتنظيف جاف وبقع ملابس ومصبغة",
+    ShopType.PHONE_STORE: "جوالات وموبايلات وإكسسوارات هواتف وشواحن وصيانة موبايل",
+    ShopType.FURNITURE: "أثاث وكنب وغرف نوم ومفروشات وطاولات وكراسي وديكور",
+    ShopType.OTHER: "تجربة العميل ومستوى الخدمة والمكان والتعامل والأسعار",
+})
+GENERIC_SERVICE_LABEL = "خدمة عملاء وتعامل عام ونظافة"
+
+# Names used before the keys followed ShopType
+LEGACY_NAMES: Mapping[str, ShopType] = MappingProxyType({
+    "مدرسة": ShopType.SCHOOL,
+    "روضة": ShopType.SCHOOL,
+    "مستشفى": ShopType.HOSPITAL,
+    "عيادة": ShopType.HOSPITAL,
+    "عام": ShopType.OTHER,
+})
+
+MAX_ADHOC_LABELS = 256
+
+
+@dataclass(frozen=True)
+class RelevancyLabels:
+    """The zero-shot candidate labels of one shop type."""
+    name: str
+    shop_type: Optional[ShopType]
+    description: str
+    candidate_labels: Tuple[str, str, str]
+
+    @property
+    def target(self) -> str:
+        return self.candidate_labels[0]
+
+    @property
+    def generic(self) -> str:
+        return self.candidate_labels[1]
+
+    @property
+    def unrelated(self) -> str:
+        return self.candidate_labels[2]
+
+    @classmethod
+    def build(cls, name: str, shop_type: Optional[ShopType], description: str) -> 'RelevancyLabels':
+        return cls(
+            name=name,
+            shop_type=shop_type,
+            description=description,
+            candidate_labels=(
+                description,
+                GENERIC_SERVICE_LABEL,
+                f"سياق آخر غير مرتبط ب{description} وايضا غير مرتبط ب خدمة العملاء وتعامل عام ونظافة"
+            )
+        )
+
+
+class LabelRegistry:
+    """
+    Read-only RelevancyLabels for every ShopType.
+
+    Shop types stored as free text are resolved by enum value, then by legacy
+    name ("مدرسة", "عام"), then by the part before a '/'. Unknown names keep
+    the old behavior of using the name itself as the target label.
+    """
+
+    _instance: Optional['LabelRegistry'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, descriptions: Mapping[ShopType, str] = SHOP_TYPE_DESCRIPTIONS):
+        missing = [t.value for t in ShopType if t not in descriptions]
+        if missing:
+            raise ValueError(f"No relevancy description for shop types: {missing}")
+        self._labels: Mapping[ShopType, RelevancyLabels] = MappingProxyType({
+            shop_type: RelevancyLabels.build(shop_type.value, shop_type, descriptions[shop_type])
+            for shop_type in ShopType
+        })
+        self._adhoc: Dict[str, RelevancyLabels] = {}
+        self._cache: Dict[Tuple[Hashable, ShopType], Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> 'LabelRegistry':
+        """Return the process-wide registry."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __iter__(self) -> Iterator[RelevancyLabels]:
+        return iter(self._labels.values())
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    @staticmethod
+    def resolve(shop_type: Union[str, ShopType, None]) -> Optional[ShopType]:
+        """The ShopType a stored shop type name refers to (None if unknown)."""
+        if isinstance(shop_type, ShopType):
+            return shop_type
+        name = (shop_type or '').strip()
+        if ShopType.is_valid(name):
+            return ShopType(name)
+        if name in LEGACY_NAMES:
+            return LEGACY_NAMES[name]
+        head = name.split('/')[0].strip()
+        if ShopType.is_valid(head):
+            return ShopType(head)
+        return LEGACY_NAMES.get(head)
+
+    def get(self, shop_type: Union[str, ShopType, None]) -> RelevancyLabels:
+        """Labels for a shop type; unknown names get labels built from the name."""
+        resolved = self.resolve(shop_type)
+        if resolved is not None:
+            return self._labels[resolved]
+        name = (shop_type or '').strip()
+        if not name:
+            return self._labels[ShopType.OTHER]
+        labels = self._adhoc.get(name)
+        if labels is None:
+            labels = RelevancyLabels.build(name, None, name)
+            with self._lock:
+                if len(self._adhoc) < MAX_ADHOC_LABELS:
+                    self._adhoc[name] = labels
+        return labels
+
+    def cached(self, key: Hashable, shop_type: Union[str, ShopType], factory: Callable[[RelevancyLabels], Any]) -> Any:
+        """
+        Label-side work computed once per (key, shop type), e.g. label embeddings.
+
+        Args:
+            key: Identifies the computation (e.g. the embedding model name)
+            shop_type: Shop type whose labels are used
+            factory: Called with the RelevancyLabels on first use
+
+        Returns:
+            The cached factory result (not cached for unknown shop types)
+        """
+        labels = self.get(shop_type)
+        if labels.shop_type is None:
+            return factory(labels)
+        cache_key = (key, labels.shop_type)
+        if cache_key not in self._cache:
+            value = factory(labels)
+            with self._lock:
+                self._cache.setdefault(cache_key, value)
+        return self._cache[cache_key]
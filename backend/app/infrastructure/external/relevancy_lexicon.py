@@ -0,0 +1,255 @@
+"""
+Relevancy Lexicon
+Keyword check in front of the zero-shot relevancy model.
+
+Each shop type gets a set of stemmed keywords: the words of its zero-shot
+description (from LabelRegistry) plus terms learned from reviews the
+zero-shot model accepted (see build_relevancy_lexicon.py). A keyword index
+maps every term to the shop types it belongs to. A review that clearly
+mentions its shop's domain, or several generic customer-service aspects
+(staff, price, cleanliness...), passes without a model call. Everything
+else, including every possible mismatch, still goes to zero-shot NLI: the
+lexicon only ever accepts.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Set, Union
+
+from app.presentation.config import RELEVANCY_LEXICON_ENABLED, RELEVANCY_LEXICON_REFRESH_SECONDS
+from app.domain.enums import ShopType
+from app.infrastructure.external.relevancy_labels import LabelRegistry
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+GENERIC_SHOP_TYPE = ShopType.OTHER
+MIN_TERM_LENGTH = 3
+
+# Aspects every business is reviewed on
+GENERIC_SERVICE_TERMS = (
+    "خدمة خدمات تعامل معاملة موظف موظفين موظفات استقبال كاشير محاسب مدير ادارة نظافة نظيف "
+    "وسخ اسعار سعر غالي رخيص انتظار تاخير تاخر سرعة سريع بطيء زحمة دوام مواعيد حجز طلب "
+    "طلبية توصيل مكان موقع مواقف جودة عرض عروض خصم فاتورة دفع بطاقة ترتيب احترام "
+    "service staff price prices clean cleanliness waiting delivery quality manager cashier"
+).split()
+
+# Function words that say nothing about the domain
+STOPWORDS = frozenset((
+    "في من على الى عن مع كان كانت يكون هذا هذه ذلك التي الذي هو هي انا انت نحن هم كل "
+    "بس مو ما لا لم لن جدا كتير كثير شوي شي شيء عند بعد قبل كمان ايضا لكن او ثم حتى "
+    "اذا لو قد تم غير مثل عم رح يا والله الله the and was were very but for with this that"
+).split())
+
+PREFIXES = ('وال', 'بال', 'فال', 'كال', 'لل', 'ال', 'و', 'ف', 'ب', 'ل')
+SUFFIXES = ('ات', 'ين', 'ون', 'ية', 'ه', 'ي')
+
+_DIACRITICS = re.compile(r'[\u064B-\u065F\u0670\u0640]')
+_TOKEN = re.compile(r'[\u0621-\u064Aa-z]+')
+
+LEXICON_DECISIONS_TOTAL = registry.counter(
+    'relevancy_lexicon_decisions_total',
+    'Relevancy checks accepted by the lexicon or sent to the zero-shot model.',
+    ('decision',)
+)
+
+
+def normalize(text: str) -> str:
+    """Lower-case, strip diacritics/tatweel and unify alef, ya and taa marbuta."""
+    text = _DIACRITICS.sub('', text.lower())
+    return text.translate(str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ى': 'ي', 'ة': 'ه'}))
+
+
+def variants(token: str) -> Set[str]:
+    """The token and its forms without a clitic prefix and/or one suffix."""
+    forms = {token}
+    for prefix in PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= MIN_TERM_LENGTH:
+            forms.add(token[len(prefix):])
+    for form in list(forms):
+        for suffix in SUFFIXES:
+            if form.endswith(suffix) and len(form) - len(suffix) >= MIN_TERM_LENGTH:
+                forms.add(form[:-len(suffix)])
+    return {f for f in forms if len(f) >= MIN_TERM_LENGTH}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN.findall(normalize(text)) if t not in STOPWORDS and len(t) >= MIN_TERM_LENGTH]
+
+
+def terms_of(text: str) -> Set[str]:
+    """All term variants of a text (what is looked up in the index)."""
+    terms: Set[str] = set()
+    for token in tokenize(text):
+        terms |= variants(token)
+    return terms
+
+
+def resolve_shop_type(shop_type: Union[str, ShopType, None]) -> ShopType:
+    """Map a stored shop type name to its lexicon entry (unknown names are generic)."""
+    return LabelRegistry.resolve(shop_type) or GENERIC_SHOP_TYPE
+
+
+@dataclass
+class LexiconMatch:
+    """Outcome of the lexicon check for one text."""
+    relevant: bool
+    shop_terms: List[str] = field(default_factory=list)
+    generic_terms: List[str] = field(default_factory=list)
+    other_types: List[str] = field(default_factory=list)
+
+
+class RelevancyLexicon:
+    """
+    Per-shop-type keyword index with learned terms refreshed from Mongo.
+
+    Args:
+        repository: Source of learned terms (`load() -> {shop_type: [terms]}`);
+            defaults to RelevancyLexiconRepository, created on first refresh
+        labels: Shared LabelRegistry (defaults to the process-wide one)
+        refresh_seconds: How often learned terms are reloaded
+        min_generic_terms: Distinct generic service terms that pass a text
+            with no shop-type keyword
+        enabled: When False nothing is accepted locally
+    """
+
+    def __init__(
+        self,
+        repository=None,
+        refresh_seconds: float = None,
+        min_generic_terms: int = 2,
+        enabled: bool = None,
+        labels: LabelRegistry = None
+    ):
+        self._repository = repository
+        self.labels = labels or LabelRegistry.instance()
+        self.enabled = RELEVANCY_LEXICON_ENABLED if enabled is None else enabled
+        self.refresh_seconds = RELEVANCY_LEXICON_REFRESH_SECONDS if refresh_seconds is None else refresh_seconds
+        self.min_generic_terms = min_generic_terms
+        self._generic = frozenset(t for word in GENERIC_SERVICE_TERMS for t in variants(normalize(word)))
+        self._base = {
+            entry.shop_type: self.labels.cached('lexicon_terms', entry.shop_type, self._description_terms)
+            for entry in self.labels
+        }
+        self._index: Dict[str, FrozenSet[ShopType]] = self._build_index({})
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _description_terms(labels) -> FrozenSet[str]:
+        return frozenset(terms_of(f"{labels.name} {labels.description}"))
+
+    def _build_index(self, learned: Dict[str, Iterable[str]]) -> Dict[str, FrozenSet[ShopType]]:
+        learned_by_type: Dict[ShopType, Set[str]] = {}
+        for name, terms in learned.items():
+            learned_by_type.setdefault(resolve_shop_type(name), set()).update(terms)
+
+        index: Dict[str, Set[ShopType]] = {}
+        for shop_type, base in self._base.items():
+            if shop_type == GENERIC_SHOP_TYPE:
+                continue
+            for term in base | learned_by_type.get(shop_type, set()):
+                if term not in self._generic:
+                    index.setdefault(term, set()).add(shop_type)
+        return {term: frozenset(types) for term, types in index.items()}
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._loaded_at and now - self._loaded_at < self.refresh_seconds:
+            return
+        with self._lock:
+            if self._loaded_at and now - self._loaded_at < self.refresh_seconds:
+                return
+            self._loaded_at = now
+            try:
+                if self._repository is None:
+                    from app.infrastructure.repositories import RelevancyLexiconRepository
+                    self._repository = RelevancyLexiconRepository()
+                self._index = self._build_index(self._repository.load())
+            except Exception as e:
+                logger.error("Failed to load learned relevancy terms: %s", e)
+
+    def match(self, text: str, shop_type: Union[str, ShopType]) -> LexiconMatch:
+        """Whether `text` clearly belongs to `shop_type` (False means: ask the model)."""
+        if not self.enabled:
+            return LexiconMatch(False)
+        self._refresh()
+        target = resolve_shop_type(shop_type)
+        shop_terms: List[str] = []
+        generic_terms: List[str] = []
+        other_types: Counter = Counter()
+
+        for token in tokenize(text):
+            forms = variants(token)
+            types = set().union(*(self._index.get(f, ()) for f in forms))
+            if target in types:
+                shop_terms.append(token)
+            elif types:
+                other_types.update(types)
+            elif forms & self._generic:
+                generic_terms.append(token)
+
+        shop_hits, generic_hits = len(set(shop_terms)), len(set(generic_terms))
+        other_hits = max(other_types.values(), default=0)
+        if target == GENERIC_SHOP_TYPE:
+            relevant = generic_hits >= 1 and not other_hits
+        else:
+            relevant = (
+                (shop_hits >= 1 and shop_hits >= other_hits)
+                or (generic_hits >= self.min_generic_terms and not other_hits)
+            )
+        LEXICON_DECISIONS_TOTAL.inc(decision='relevant' if relevant else 'escalated')
+        return LexiconMatch(relevant, shop_terms, generic_terms, sorted(t.value for t in other_types))
+
+
+def learn_terms(
+    texts_by_type: Dict[str, Iterable[str]],
+    min_reviews: int = 5,
+    min_share: float = 0.02,
+    min_lift: float = 3.0,
+    limit: int = 300
+) -> Dict[str, List[str]]:
+    """
+    Terms characteristic of each shop type's accepted reviews.
+
+    A term is kept for a type when it appears in at least `min_reviews` of
+    the type's reviews and `min_share` of them, and is `min_lift` times more
+    frequent there than in the other types' reviews. Generic service terms
+    and stop words are never learned.
+
+    Returns:
+        {shop_type: terms ordered by frequency (at most `limit`)}
+    """
+    generic = frozenset(t for word in GENERIC_SERVICE_TERMS for t in variants(normalize(word)))
+    frequency: Dict[str, Counter] = {}
+    reviews: Counter = Counter()
+    for shop_type, texts in texts_by_type.items():
+        counts = frequency.setdefault(shop_type, Counter())
+        for text in texts:
+            counts.update(terms_of(text))
+            reviews[shop_type] += 1
+
+    total_reviews = sum(reviews.values())
+    totals: Counter = Counter()
+    for counts in frequency.values():
+        totals.update(counts)
+
+    learned: Dict[str, List[str]] = {}
+    for shop_type, counts in frequency.items():
+        own = reviews[shop_type]
+        others = total_reviews - own
+        kept = []
+        for term, df in counts.most_common():
+            if df < min_reviews or df / own < min_share or term in generic:
+                continue
+            other_share = (totals[term] - df) / others if others else 0.0
+            if other_share and (df / own) / other_share < min_lift:
+                continue
+            kept.append(term)
+            if len(kept) >= limit:
+                break
+        learned[shop_type] = kept
+    return learned
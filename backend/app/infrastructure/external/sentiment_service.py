@@ -3,10 +3,31 @@ import re
 import unicodedata
 import logging
 from app.presentation.config import HF_TOKEN, HF_SENTIMENT_MODEL_URL, HF_TOXICITY_MODEL_URL, HF_ARABIC_TOXICITY_MODEL_URL
+from app.presentation.config import SENTIMENT_LOCAL_MODEL_ENABLED, SENTIMENT_LOCAL_MIN_CONFIDENCE
 from app.application.dto.sentiment_analysis_result_dto import SentimentAnalysisResultDTO
 from app.application.dto.review_dto import ReviewDTO
 from app.infrastructure.external.text_profanity_service import TextProfanityService
+from app.infrastructure.external.relevancy_labels import LabelRegistry
+from app.infrastructure.external.local_sentiment_model import LocalSentimentModel, PREDICTION_SOURCE_HEADER
+from app.infrastructure.external import http_client
+from app.infrastructure.observability.metrics import record_fallback, registry
 import time
+
+logger = logging.getLogger(__name__)
+
+LOCAL_SENTIMENT_TOTAL = registry.counter(
+    'sentiment_local_decisions_total',
+    'Sentiment calls answered by the local model, sent to the HF model, or answered locally in degraded mode.',
+    ('decision',)
+)
+LOCAL_SENTIMENT_CONFIDENCE = registry.histogram(
+    'sentiment_local_confidence',
+    'Confidence of the local sentiment model (for threshold tuning).',
+    ('decision',),
+    buckets=(0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95, 0.99, 1.0)
+)
+
+
 class SentimentService:
     MAX_RETRIES = 3
     INITIAL_WAIT = 2.0  # ثواني  
@@ -28,17 +49,36 @@ class SentimentService:
             return text
 
         except Exception as e:
-            logging.error(f"Error cleaning text: {e}")
+            logger.error("Error cleaning text: %s", e)
             return str(text) if text else ""
 
         except Exception as e:
-            logging.error(f"Error cleaning text: {e}")
+            logger.error("Error cleaning text: %s", e)
             return str(text) if text else ""
 
     @staticmethod
     def analyze_sentiment(text: str) -> str:
+        return SentimentService.analyze_sentiment_with_source(text)[0]
+
+    @staticmethod
+    def analyze_sentiment_with_source(text: str):
+        """
+        Sentiment and where it came from.
+
+        The source is 'local' (the local model answered, in-process or
+        through the model server), 'hf' (the HF model answered) or
+        'fallback' (no text, or the HF call failed). Only 'hf' labels are
+        fit to train the local model on.
+
+        Returns:
+            Tuple of (sentiment, source)
+        """
         if not text or not text.strip():
-            return "محايد"
+            return "محايد", 'fallback'
+
+        local = SentimentService._local_sentiment(text)
+        if local is not None:
+            return local, 'local'
 
         headers = {"Authorization": f"Bearer {HF_TOKEN}"}
         url = HF_SENTIMENT_MODEL_URL
@@ -46,25 +86,73 @@ class SentimentService:
 
         for attempt in range(SentimentService.MAX_RETRIES):
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=10)
+                response = http_client.post('hf_sentiment', url, headers=headers, json=payload, timeout=10)
                 if response.status_code == 200:
-                    return SentimentService._parse_response_to_string(response.json())
+                    # The model server answers confident texts with the local model
+                    source = 'local' if response.headers.get(PREDICTION_SOURCE_HEADER) == 'local' else 'hf'
+                    return SentimentService._parse_response_to_string(response.json()), source
                 elif response.status_code == 503:
                     error_data = response.json()
                     estimated_time = error_data.get("estimated_time", SentimentService.INITIAL_WAIT)
-                    logging.info(f"Model loading... Waiting {estimated_time:.2f}s (Attempt {attempt+1})")
+                    logger.info("Model loading... Waiting %.2fs (Attempt %s)", estimated_time, attempt+1)
                     time.sleep(estimated_time)
                     continue 
                 else:
-                    logging.error(f"HF API Error {response.status_code}: {response.text}")
+                    logger.error("HF API Error %s: %s", response.status_code, response.text)
                     break
 
             except requests.exceptions.Timeout:
-                logging.warning(f"HF API Timeout (Attempt {attempt+1})")
+                logger.warning("HF API Timeout (Attempt %s)", attempt+1)
             except Exception as e:
-                logging.error(f"Connection Error: {e}")
+                logger.error("Connection Error: %s", e)
                 break
-        return "محايد"
+        record_fallback('hf_sentiment')
+        return "محايد", 'fallback'
+
+    @staticmethod
+    def _local_sentiment(text: str):
+        """
+        Sentiment from the in-process model when it is confident enough.
+
+        Returns None (call HF) when the model is disabled, not trained yet or
+        below SENTIMENT_LOCAL_MIN_CONFIDENCE.
+        """
+        if not SENTIMENT_LOCAL_MODEL_ENABLED:
+            return None
+        model = LocalSentimentModel.instance()
+        if model is None:
+            return None
+        try:
+            label, confidence = model.predict(text)
+        except Exception as e:
+            logger.error("Local sentiment model error: %s", e)
+            return None
+        decision = 'local' if confidence >= SENTIMENT_LOCAL_MIN_CONFIDENCE else 'escalated'
+        LOCAL_SENTIMENT_TOTAL.inc(decision=decision)
+        LOCAL_SENTIMENT_CONFIDENCE.observe(confidence, decision=decision)
+        return label if decision == 'local' else None
+
+    @staticmethod
+    def analyze_sentiment_locally(text: str):
+        """
+        Sentiment from the in-process model whatever its confidence.
+
+        Used in degraded mode, where no HF call is made. Returns None when
+        the model is disabled or not trained yet.
+        """
+        if not text or not text.strip() or not SENTIMENT_LOCAL_MODEL_ENABLED:
+            return None
+        model = LocalSentimentModel.instance()
+        if model is None:
+            return None
+        try:
+            label, _ = model.predict(text)
+        except Exception as e:
+            logger.error("Local sentiment model error: %s", e)
+            return None
+        LOCAL_SENTIMENT_TOTAL.inc(decision='degraded')
+        return label
+
     @staticmethod
     def _parse_response_to_string(result) -> str:
         try:
@@ -99,7 +187,7 @@ class SentimentService:
             return mapping.get(raw_label, "محايد")
 
         except Exception as e:
-            logging.error(f"Parsing Error: {e}")
+            logger.error("Parsing Error: %s", e)
             return "محايد"
 
     @staticmethod
@@ -116,24 +204,25 @@ class SentimentService:
 
         for attempt in range(SentimentService.MAX_RETRIES):
             try:
-                response = requests.post(url, headers=headers, json=payload, timeout=70)
+                response = http_client.post('hf_toxicity', url, headers=headers, json=payload, timeout=70)
                 if response.status_code == 200:
                     return SentimentService._parse_toxicity_response(response.json())
 
                 elif response.status_code == 503:
                     error_data = response.json()
                     estimated_time = error_data.get("estimated_time", SentimentService.INITIAL_WAIT)
-                    logging.info(f"🛡️ Toxicity Model loading... Waiting {estimated_time:.2f}s")
+                    logger.info("🛡️ Toxicity Model loading... Waiting %.2fs", estimated_time)
                     time.sleep(estimated_time)
                     continue
                 else:
-                    logging.error(f"❌ Toxicity API Error {response.status_code}: {response.text}")
+                    logger.error("❌ Toxicity API Error %s: %s", response.status_code, response.text)
                     break
 
             except Exception as e:
-                logging.error(f"❌ Toxicity Check Error: {e}")
+                logger.error("❌ Toxicity Check Error: %s", e)
                 break
             
+        record_fallback('hf_toxicity')
         return "uncertain"
     @staticmethod
     def _parse_toxicity_response(result) -> str:
@@ -160,7 +249,7 @@ class SentimentService:
 
             if label == 'LABEL_1': # Toxic
                 if score >= 0.60:
-                    logging.warning(f"⚠️ Toxic detected (score: {score:.2f})")
+                    logger.warning("⚠️ Toxic detected (score: %.2f)", score)
                     return "toxic"
                 elif score >= 0.40:
                     return "uncertain"
@@ -172,7 +261,7 @@ class SentimentService:
             return "uncertain"
 
         except Exception as e:
-            logging.error(f"Parsing Toxicity Error: {e}")
+            logger.error("Parsing Toxicity Error: %s", e)
             return "uncertain"
 
     # NOTE: detect_review_quality has been moved to quality_service.py
@@ -183,36 +272,9 @@ class SentimentService:
         headers = {"Authorization": f"Bearer {HF_TOKEN}"}
         url = HF_TOXICITY_MODEL_URL
 
-        shop_types_arabic = {
-            "مطعم": "أكل وطعام ووجبات ومنيو ومطاعم وطبخ وأطباق وجوع",
-            "مقهى": "قهوة وكافيه وحلا ومشروبات وباريستا وجلسة روقان",
-            "محل ملابس": "أزياء ولبس وقماش وموضة ومقاسات وتفصيل وبراندات",
-            "صيدلية": "دواء وعلاج وصيدليات ووصفة طبية وفيتامينات وشاش",
-            "سوبر ماركت": "بقالة ومقاضي وتسوق ومنتجات غذائية ومعلبات وخضار",
-            "متجر إلكترونيات": "أجهزة ذكية وشاشات وكمبيوترات وتقنية وقطع غيار وصيانة",
-            "مكتبة": "كتب وقراءة وقرطاسية وأدوات مدرسية وروايات وتعليم",
-            "محل تجميل": "مكياج وبشرة وشعر وعطورات ومستحضرات تجميل وعناية",
-            "صالة رياضية": "جيم وتمارين وحديد ولياقة ورياضة ومدرب وعضلات",
-            "مدرسة": "تعليم وطلاب ومدرسين وكتب ودوام مدرسي وفصول ودراسة",
-            "مستشفى": "طب ومرضى وعلاج ودكاترة وعيادات وفحوصات وعمليات",
-            "محطة وقود": "بنزين وسيارات وزيت ووقود وتعبئة وإطارات ومغسلة سيارات",
-            "متجر أجهزة": "أجهزة كهربائية ومنزلية وغسالات وثلاجات ومكيفات",
-            "محل ألعاب": "ألعاب أطفال وترفيه وهدايا صغار وبلايستيشن وعرائس",
-            "مكتب سياحي": "سفر وسياحة وطيران وفنادق وحجوزات ورحلات وتذاكر",
-            "محل هدايا": "هدايا وتغليف وورد ومناسبات وتذكارات وتحف",
-            "مغسلة ملابس": "غسيل وكوي وتنظيف جاف وبقع ملابس ومصبغة",
-            "متجر هواتف": "جوالات وموبايلات وإكسسوارات هواتف وشواحن وصيانة موبايل",
-            "عام": "تجربة العميل ومستوى الخدمة والمكان والتعامل والأسعار"
-        }
-
-        target_label = shop_types_arabic.get(shop_type, shop_type)
-
-
-        candidate_labels = [
-            target_label,
-            "خدمة عملاء وتعامل عام ونظافة",
-            f"سياق آخر غير مرتبط ب{target_label} وايضا غير مرتبط ب خدمة العملاء وتعامل عام ونظافة"
-        ]
+        labels = LabelRegistry.instance().get(shop_type)
+        target_label = labels.target
+        candidate_labels = list(labels.candidate_labels)
         text_clean = text.strip()
         payload = {
             "inputs": text_clean,
@@ -223,13 +285,13 @@ class SentimentService:
         }
 
         try:
-            response = requests.post(url, headers=headers, json=payload)
+            response = http_client.post('hf_relevancy', url, headers=headers, json=payload)
 
             if response.status_code == 503:
-                logging.info("Model is loading, waiting...")
+                logger.info("Model is loading, waiting...")
                 import time
                 time.sleep(20)
-                response = requests.post(url, headers=headers, json=payload)
+                response = http_client.post('hf_relevancy', url, headers=headers, json=payload)
 
             if response.status_code == 200:
                 result = response.json()
@@ -253,6 +315,7 @@ class SentimentService:
                                     has_mismatch = False
                                 else:
                                     has_mismatch = top_label != target_label
+                                predicted_label = top_label
 
                             else:
                                 
@@ -273,11 +336,12 @@ class SentimentService:
                             }
 
             else:
-                logging.error(f"HF API Error: {response.status_code} - {response.text}")
+                logger.error("HF API Error: %s - %s", response.status_code, response.text)
 
         except Exception as e:
-            logging.error(f"Context mismatch detection error: {e}")
+            logger.error("Context mismatch detection error: %s", e)
 
+        record_fallback('hf_relevancy')
         return {
             'mismatch_score': 0.0,
             'confidence': 100.0,
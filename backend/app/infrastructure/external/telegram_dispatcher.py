@@ -0,0 +1,380 @@
+"""
+Telegram Dispatcher
+Rate-limit-aware delivery queue for the Telegram Bot API.
+
+Telegram throttles bots at roughly 1 message/second per chat and
+30 messages/second overall. Sending every notification synchronously
+means a burst at one busy shop gets HTTP 429 and the messages are lost.
+
+The dispatcher queues outgoing calls per chat and drains them from a
+single background thread, consuming a token from the chat's bucket and
+from the global bucket before each call. Calls for one chat are sent in
+order; 429 responses are honoured by pausing the chat for
+`parameters.retry_after` seconds and re-sending the same message.
+
+Serverless runtimes (Vercel) freeze the process once the response is sent
+and never run atexit hooks, so a background thread would lose queued
+messages there. With `inline=True` (TELEGRAM_DELIVERY=inline, the default
+on serverless) each call is sent on the caller's thread under the same
+buckets and retries, and the returned Future is already resolved.
+"""
+import atexit
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Optional, Set
+
+import requests
+
+from app.infrastructure.external import http_client
+from app.infrastructure.throttling import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+
+class TelegramDeliveryError(Exception):
+    """Raised (through the returned Future) when a message cannot be delivered."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@dataclass
+class _QueuedCall:
+    """A pending Bot API call."""
+    chat_id: str
+    method: str
+    payload: Dict[str, Any]
+    future: Future
+    attempts: int = 0
+    # Caller's context, so the send is traced under the request that queued it
+    context: contextvars.Context = field(default_factory=contextvars.copy_context)
+
+
+class TelegramDispatcher:
+    """
+    Queues Telegram Bot API calls and sends them within Telegram's limits.
+
+    One instance is shared per process (see `instance()`) so that the
+    global bucket really is global for every NotificationService.
+    """
+
+    MAX_BACKOFF_SECONDS = 30.0
+    IDLE_BUCKET_PRUNE_THRESHOLD = 1000
+
+    _instance: Optional['TelegramDispatcher'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        token: str,
+        api_url: str = "https://api.telegram.org",
+        global_rate: float = 30.0,
+        per_chat_rate: float = 1.0,
+        max_retries: int = 5,
+        request_timeout: float = 10.0,
+        inline: bool = False
+    ):
+        """
+        Args:
+            token: Bot token
+            api_url: Bot API base URL
+            global_rate: Messages per second across all chats
+            per_chat_rate: Messages per second for a single chat
+            max_retries: Attempts for transient (network/5xx) failures;
+                429 responses are always re-queued and do not count
+            request_timeout: HTTP timeout per call in seconds
+            inline: Send on the caller's thread instead of the background
+                queue (429 responses then count as attempts too)
+        """
+        self.token = token
+        self.api_url = api_url.rstrip('/')
+        self.per_chat_rate = per_chat_rate
+        self.max_retries = max_retries
+        self.request_timeout = request_timeout
+        self.inline = inline
+
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+
+        # Per-chat FIFO queues plus a heap of (ready_at, seq, chat_id) for
+        # chats that have work and no call in flight.
+        self._pending: Dict[str, Deque[_QueuedCall]] = {}
+        self._schedule: list = []
+        self._scheduled: Set[str] = set()
+        self._busy_chats: Set[str] = set()
+        self._sequence = itertools.count()
+
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @classmethod
+    def instance(cls) -> 'TelegramDispatcher':
+        """Return the process-wide dispatcher configured from app config."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from app.presentation.config import (
+                        TELEGRAM_TOKEN,
+                        TELEGRAM_API_URL,
+                        TELEGRAM_GLOBAL_RATE_LIMIT,
+                        TELEGRAM_PER_CHAT_RATE_LIMIT,
+                        TELEGRAM_MAX_RETRIES,
+                        TELEGRAM_DELIVERY
+                    )
+                    dispatcher = cls(
+                        token=TELEGRAM_TOKEN,
+                        api_url=TELEGRAM_API_URL,
+                        global_rate=TELEGRAM_GLOBAL_RATE_LIMIT,
+                        per_chat_rate=TELEGRAM_PER_CHAT_RATE_LIMIT,
+                        max_retries=TELEGRAM_MAX_RETRIES,
+                        inline=TELEGRAM_DELIVERY == 'inline'
+                    )
+                    # Drain the queue when a long-lived process exits
+                    atexit.register(dispatcher.flush, 5.0)
+                    cls._instance = dispatcher
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, method: str, payload: Dict[str, Any]) -> Future:
+        """
+        Queue a Bot API call.
+
+        Args:
+            method: Bot API method name (e.g. 'sendMessage')
+            payload: Method parameters; must contain 'chat_id'
+
+        Returns:
+            Future resolving to the Bot API `result` object, or failing
+            with TelegramDeliveryError
+        """
+        future: Future = Future()
+        chat_id = str(payload.get('chat_id'))
+        call = _QueuedCall(chat_id=chat_id, method=method, payload=payload, future=future)
+        if self.inline:
+            self._send_inline(call)
+            return future
+
+        with self._condition:
+            if self._stopped:
+                future.set_exception(TelegramDeliveryError("Dispatcher is stopped"))
+                return future
+            self._pending.setdefault(chat_id, deque()).append(call)
+            self._schedule_chat(chat_id, time.monotonic())
+            self._ensure_worker()
+            self._condition.notify()
+        return future
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting to be sent."""
+        with self._condition:
+            return sum(len(calls) for calls in self._pending.values())
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        Block until the queue is drained or `timeout` expires.
+
+        Returns:
+            True if nothing is left queued or in flight
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._busy_chats:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(min(remaining, 0.1))
+        return True
+
+    def stop(self) -> None:
+        """Stop accepting calls; queued calls still drain."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # Scheduling (all helpers below expect the condition lock to be held)
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+            self._thread.start()
+
+    def _schedule_chat(self, chat_id: str, ready_at: float) -> None:
+        if chat_id in self._scheduled or chat_id in self._busy_chats:
+            return
+        if not self._pending.get(chat_id):
+            self._pending.pop(chat_id, None)
+            return
+        heapq.heappush(self._schedule, (ready_at, next(self._sequence), chat_id))
+        self._scheduled.add(chat_id)
+
+    def _chat_bucket(self, chat_id: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if len(self._chat_buckets) >= self.IDLE_BUCKET_PRUNE_THRESHOLD:
+                self._chat_buckets = {
+                    cid: b for cid, b in self._chat_buckets.items() if not b.is_idle
+                }
+            bucket = TokenBucket(self.per_chat_rate)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    def _next_call(self) -> Optional[_QueuedCall]:
+        """Wait for the next call that both buckets allow. Returns None on shutdown."""
+        with self._condition:
+            while True:
+                if not self._schedule:
+                    if self._stopped and not self._busy_chats:
+                        return None
+                    self._condition.wait()
+                    continue
+
+                ready_at, _, chat_id = self._schedule[0]
+                now = time.monotonic()
+                if ready_at > now:
+                    self._condition.wait(ready_at - now)
+                    continue
+
+                chat_bucket = self._chat_bucket(chat_id)
+                wait = max(
+                    chat_bucket.time_until_available(),
+                    self._global_bucket.time_until_available()
+                )
+                if wait > 0:
+                    # Push the chat back and let other chats go first.
+                    heapq.heapreplace(self._schedule, (now + wait, next(self._sequence), chat_id))
+                    continue
+
+                heapq.heappop(self._schedule)
+                self._scheduled.discard(chat_id)
+                chat_bucket.try_consume()
+                self._global_bucket.try_consume()
+                self._busy_chats.add(chat_id)
+                return self._pending[chat_id].popleft()
+
+    def _finish(self, call: _QueuedCall, retry_at: Optional[float] = None) -> None:
+        """Release the chat; put the call back at the head when `retry_at` is set."""
+        with self._condition:
+            self._busy_chats.discard(call.chat_id)
+            if retry_at is not None:
+                self._pending.setdefault(call.chat_id, deque()).appendleft(call)
+            self._schedule_chat(call.chat_id, retry_at or time.monotonic())
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            call = self._next_call()
+            if call is None:
+                return
+            retry_at = None
+            try:
+                retry_at = call.context.copy().run(self._deliver, call)
+            except Exception as e:  # never let the worker die
+                logger.error("Unexpected Telegram dispatcher error: %s", e, exc_info=True)
+                if not call.future.done():
+                    call.future.set_exception(TelegramDeliveryError(str(e)))
+            finally:
+                self._finish(call, retry_at)
+
+    def _send_inline(self, call: _QueuedCall) -> None:
+        """Send a call on the caller's thread, waiting for the buckets and retries."""
+        rate_limited = 0
+        while True:
+            with self._condition:
+                chat_bucket = self._chat_bucket(call.chat_id)
+                wait = max(chat_bucket.time_until_available(), self._global_bucket.time_until_available())
+                if wait <= 0:
+                    chat_bucket.try_consume()
+                    self._global_bucket.try_consume()
+            if wait > 0:
+                time.sleep(wait)
+                continue
+
+            attempts = call.attempts
+            try:
+                retry_at = call.context.copy().run(self._deliver, call)
+            except Exception as e:
+                logger.error("Unexpected Telegram delivery error: %s", e, exc_info=True)
+                call.future.set_exception(TelegramDeliveryError(str(e)))
+                return
+            if retry_at is None:
+                return
+            if call.attempts == attempts:
+                # 429s are not attempts on the queue, but the request cannot wait forever
+                rate_limited += 1
+                if rate_limited >= self.max_retries:
+                    call.future.set_exception(TelegramDeliveryError(
+                        f"Telegram rate limit (gave up after {rate_limited} attempts)", 429
+                    ))
+                    return
+            time.sleep(max(0.0, retry_at - time.monotonic()))
+
+    def _deliver(self, call: _QueuedCall) -> Optional[float]:
+        """
+        Perform one Bot API call.
+
+        Returns:
+            Monotonic time at which to retry the call, or None when the
+            call's future has been resolved
+        """
+        url = f"{self.api_url}/bot{self.token}/{call.method}"
+        try:
+            response = http_client.post('telegram', url, json=call.payload, timeout=self.request_timeout)
+        except requests.exceptions.RequestException as e:
+            return self._retry_or_fail(call, f"Network error: {e}")
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+
+        if response.status_code == 200 and body.get('ok', True):
+            call.future.set_result(body.get('result'))
+            return None
+
+        if response.status_code == 429:
+            retry_after = float(body.get('parameters', {}).get('retry_after', 1))
+            logger.warning(
+                "Telegram rate limit hit for chat %s, retrying in %.0fs", call.chat_id, retry_after
+            )
+            with self._condition:
+                self._chat_bucket(call.chat_id).block_for(retry_after)
+            return time.monotonic() + retry_after
+
+        description = body.get('description') or response.text
+        if response.status_code >= 500:
+            return self._retry_or_fail(call, f"Telegram API error {response.status_code}: {description}")
+
+        # 4xx other than 429 (bad markup, bot blocked, chat not found): not retryable
+        call.future.set_exception(
+            TelegramDeliveryError(f"Telegram API error {response.status_code}: {description}", response.status_code)
+        )
+        return None
+
+    def _retry_or_fail(self, call: _QueuedCall, reason: str) -> Optional[float]:
+        call.attempts += 1
+        if call.attempts >= self.max_retries:
+            call.future.set_exception(TelegramDeliveryError(f"{reason} (gave up after {call.attempts} attempts)"))
+            return None
+
+        backoff = min(self.MAX_BACKOFF_SECONDS, 2.0 ** call.attempts)
+        logger.warning("%s; retrying in %.0fs (attempt %s)", reason, backoff, call.attempts)
+        return time.monotonic() + backoff
@@ -1,25 +1,119 @@
+import atexit
 import logging
-from typing import Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict, List, Optional, Tuple
 from app.domain.services_interfaces import ITelegramService, INotificationService
 from app.application.dto.review_processing_dto import ReviewDocument
+from app.presentation.config import TELEGRAM_DIGEST_THRESHOLD, TELEGRAM_DIGEST_WINDOW_SECONDS, SERVERLESS
+
+logger = logging.getLogger(__name__)
 
 class TelegramService(ITelegramService):
     """Specialized service for Telegram notifications with rich formatting."""
     
-    def __init__(self, notification_service: INotificationService):
+    DIGEST_MAX_ITEMS = 5  # Reviews listed individually in a digest
+    IDLE_CHAT_PRUNE_THRESHOLD = 1000  # Tracked chats before quiet ones are dropped
+    SENTIMENT_SEVERITY = {'سلبي': 0, 'محايد': 1, 'إيجابي': 2}
+    
+    def __init__(
+        self,
+        notification_service: INotificationService,
+        digest_threshold: int = TELEGRAM_DIGEST_THRESHOLD,
+        digest_window_seconds: float = TELEGRAM_DIGEST_WINDOW_SECONDS,
+        digest_timers: bool = not SERVERLESS
+    ):
         self.notification_service = notification_service
         self.max_length = 4096  # Telegram message limit
         
-    def send_review_notification(self, chat_id: str, review_doc: ReviewDocument) -> None:
-        """Send formatted review notification to Telegram."""
+        # Digest mode state (per chat)
+        self.digest_threshold = digest_threshold
+        self.digest_window_seconds = digest_window_seconds
+        self._arrivals: Dict[str, Deque[Tuple[float, str]]] = {}
+        self._digest_buffers: Dict[str, List[ReviewDocument]] = {}
+        # Timers send a digest when its window ends; without them (serverless,
+        # where timers never fire) due digests go out with the next review
+        self.digest_timers = digest_timers
+        self._digest_timers: Dict[str, threading.Timer] = {}
+        self._digest_due: Dict[str, float] = {}
+        self._digest_lock = threading.Lock()
+        atexit.register(self.flush_digests)
+        
+    def send_review_notification(
+        self,
+        chat_id: str,
+        review_doc: ReviewDocument,
+        preliminary: Optional[Future] = None
+    ) -> None:
+        """
+        Send formatted review notification to Telegram.
+        
+        If a preliminary alert was sent for this review, that message is
+        edited in place with the full content instead of sending a new one.
+        
+        When the chat receives more than `digest_threshold` reviews within
+        `digest_window_seconds`, further reviews are buffered and sent as a
+        single digest at the end of the window (or with the next review
+        after it, without timers).
+        
+        Args:
+            chat_id: Telegram chat ID
+            review_doc: Fully analyzed review document
+            preliminary: Future returned by `send_preliminary_notification`
+        """
         try:
+            self._flush_due_digests()
+            if preliminary is not None:
+                self._update_preliminary_message(chat_id, review_doc, preliminary)
+                return
+            
+            if self._buffer_for_digest(str(chat_id), review_doc):
+                logger.info("Review buffered for Telegram digest (chat %s)", chat_id)
+                return
+            
             message = self.build_review_message(review_doc)
             self.notification_service.send_telegram_notification(chat_id, message)
-            logging.info(f"Review notification sent to Telegram chat {chat_id}")
+            logger.info("Review notification sent to Telegram chat %s", chat_id)
         except Exception as e:
-            logging.error(f"Failed to send Telegram review notification: {e}")
+            logger.error("Failed to send Telegram review notification: %s", e)
             raise
     
+    def send_preliminary_notification(self, chat_id: str, review_doc: ReviewDocument) -> Optional[Future]:
+        """
+        Send a lightweight alert (stars, text, sentiment) before AI enrichment.
+        
+        Args:
+            chat_id: Telegram chat ID
+            review_doc: Review document with sentiment and quality, no generated content yet
+            
+        Returns:
+            Future resolving to the sent message (pass it to
+            `send_review_notification` later), or None if the chat is in
+            digest mode and the review will be part of the digest instead
+        """
+        self._flush_due_digests()
+        if self._register_arrival(str(chat_id), review_doc.id):
+            return None
+        
+        message = self.build_preliminary_message(review_doc)
+        future = self.notification_service.send_telegram_notification(chat_id, message)
+        logger.info("Preliminary review alert queued for Telegram chat %s", chat_id)
+        return future
+    
+    def build_preliminary_message(self, review_doc: ReviewDocument) -> str:
+        """Build the fast first alert shown while AI analysis is running."""
+        text = self._truncate_text(review_doc.processing.concatenated_text or "", 150)
+        parts = [
+            self._format_header(review_doc),
+            f"\n📝 *نص التقييم:*\n\"{text}\"" if text else None,
+            self._format_customer_info(review_doc),
+            "\n\n⏳ _جاري تحليل التقييم، سيتم تحديث هذه الرسالة بالتفاصيل..._"
+        ]
+        message = "\n".join(filter(None, parts))
+        return self._ensure_length_limit(message)
+    
     def build_review_message(self, review_doc: ReviewDocument) -> str:
         """Build complete formatted message from review data."""
         parts = [
@@ -34,6 +128,188 @@ class TelegramService(ITelegramService):
         message = "\n".join(filter(None, parts))
         return self._ensure_length_limit(message)
     
+    def build_digest_message(self, review_docs: List[ReviewDocument]) -> str:
+        """
+        Build one summary message for a batch of reviews.
+        
+        Shows counts by sentiment and the average rating, then lists the
+        worst reviews first (negative sentiment, then lowest rating).
+        
+        Args:
+            review_docs: Reviews collected during the digest window
+            
+        Returns:
+            Formatted Telegram message with Markdown
+        """
+        total = len(review_docs)
+        counts = {'إيجابي': 0, 'محايد': 0, 'سلبي': 0}
+        ratings = []
+        for doc in review_docs:
+            sentiment = (doc.analysis or {}).get('sentiment', 'محايد')
+            counts[sentiment] = counts.get(sentiment, 0) + 1
+            if doc.source.rating:
+                ratings.append(doc.source.rating)
+        
+        window_minutes = max(1, round(self.digest_window_seconds / 60))
+        header = f"📬 *ملخص التقييمات الجديدة*\n"
+        header += f"وصلك {total} تقييم خلال آخر {window_minutes} دقيقة\n\n"
+        header += " | ".join(
+            f"{self._get_sentiment_emoji(sentiment)} {sentiment}: {count}"
+            for sentiment, count in counts.items()
+        )
+        if ratings:
+            header += f"\n⭐ متوسط التقييم: {sum(ratings) / len(ratings):.1f}"
+        
+        worst_first = sorted(review_docs, key=self._digest_sort_key)
+        lines = ["\n🔻 *الأكثر أهمية:*"]
+        for index, doc in enumerate(worst_first[:self.DIGEST_MAX_ITEMS], start=1):
+            rating = doc.source.rating or 0
+            sentiment = (doc.analysis or {}).get('sentiment', 'محايد')
+            text = self._truncate_text(doc.processing.concatenated_text or "", 80)
+            line = f"{index}. {'⭐' * rating or '—'} {self._get_sentiment_emoji(sentiment)}"
+            if text:
+                line += f" \"{text}\""
+            lines.append(line)
+        
+        remaining = total - self.DIGEST_MAX_ITEMS
+        if remaining > 0:
+            lines.append(f"… و {remaining} تقييمات أخرى")
+        
+        message = header + "\n" + "\n".join(lines) + self._format_footer()
+        return self._ensure_length_limit(message)
+    
+    def flush_digests(self) -> None:
+        """Send every pending digest immediately (used on shutdown)."""
+        with self._digest_lock:
+            chat_ids = list(self._digest_buffers.keys())
+        for chat_id in chat_ids:
+            self._flush_digest(chat_id)
+    
+    def _register_arrival(self, chat_id: str, review_id: str) -> bool:
+        """
+        Record a review arrival for the chat (once per review id).
+        
+        Returns:
+            True if the chat is in digest mode
+        """
+        if self.digest_threshold <= 0:
+            return False
+        
+        now = time.monotonic()
+        with self._digest_lock:
+            if chat_id not in self._arrivals and len(self._arrivals) >= self.IDLE_CHAT_PRUNE_THRESHOLD:
+                self._prune_idle_chats(now)
+            arrivals = self._arrivals.setdefault(chat_id, deque())
+            while arrivals and now - arrivals[0][0] > self.digest_window_seconds:
+                arrivals.popleft()
+            if all(seen_id != review_id for _, seen_id in arrivals):
+                arrivals.append((now, review_id))
+            
+            return chat_id in self._digest_buffers or len(arrivals) > self.digest_threshold
+    
+    def _buffer_for_digest(self, chat_id: str, review_doc: ReviewDocument) -> bool:
+        """
+        Record the arrival and buffer the review if the chat is in digest mode.
+        
+        Returns:
+            True if the review was buffered, False if it should be sent now
+        """
+        if not self._register_arrival(chat_id, review_doc.id):
+            return False
+        
+        with self._digest_lock:
+            buffer = self._digest_buffers.setdefault(chat_id, [])
+            buffer.append(review_doc)
+            if chat_id not in self._digest_due:
+                self._digest_due[chat_id] = time.monotonic() + self.digest_window_seconds
+                if self.digest_timers:
+                    timer = threading.Timer(self.digest_window_seconds, self._flush_digest, args=(chat_id,))
+                    timer.daemon = True
+                    self._digest_timers[chat_id] = timer
+                    timer.start()
+                logger.info("Digest mode enabled for Telegram chat %s", chat_id)
+            return True
+    
+    def _flush_due_digests(self) -> None:
+        """Send the digests whose window has ended (needed when timers are off)."""
+        if not self._digest_due:
+            return
+        now = time.monotonic()
+        with self._digest_lock:
+            due = [chat_id for chat_id, due_at in self._digest_due.items() if due_at <= now]
+        for chat_id in due:
+            self._flush_digest(chat_id)
+    
+    def _prune_idle_chats(self, now: float) -> None:
+        """Forget chats with no arrival in the window and no digest pending (lock held)."""
+        self._arrivals = {
+            chat_id: arrivals for chat_id, arrivals in self._arrivals.items()
+            if chat_id in self._digest_buffers
+            or (arrivals and now - arrivals[-1][0] <= self.digest_window_seconds)
+        }
+    
+    def _flush_digest(self, chat_id: str) -> None:
+        """Send the buffered reviews for a chat as one digest message."""
+        with self._digest_lock:
+            review_docs = self._digest_buffers.pop(chat_id, [])
+            self._digest_due.pop(chat_id, None)
+            timer = self._digest_timers.pop(chat_id, None)
+        if timer:
+            timer.cancel()
+        if not review_docs:
+            return
+        
+        try:
+            if len(review_docs) == 1:
+                message = self.build_review_message(review_docs[0])
+            else:
+                message = self.build_digest_message(review_docs)
+            self.notification_service.send_telegram_notification(chat_id, message)
+            logger.info("Telegram digest with %s reviews sent to chat %s", len(review_docs), chat_id)
+        except Exception as e:
+            logger.error("Failed to send Telegram digest to chat %s: %s", chat_id, e)
+    
+    def _update_preliminary_message(self, chat_id: str, review_doc: ReviewDocument, preliminary: Future) -> None:
+        """
+        Replace the preliminary alert with the full message once it has been sent.
+        
+        Falls back to sending a new message if the preliminary alert or the
+        edit failed.
+        """
+        message = self.build_review_message(review_doc)
+        
+        def send_new_message() -> None:
+            self.notification_service.send_telegram_notification(chat_id, message)
+        
+        def on_edit_done(edit: Future) -> None:
+            error = edit.exception()
+            if error and 'message is not modified' not in str(error):
+                logger.warning("Editing Telegram alert failed for chat %s: %s; sending a new message", chat_id, error)
+                send_new_message()
+        
+        def on_preliminary_done(sent: Future) -> None:
+            try:
+                message_id = None if sent.exception() else (sent.result() or {}).get('message_id')
+                if not message_id:
+                    send_new_message()
+                    return
+                edit = self.notification_service.edit_telegram_message(chat_id, message_id, message)
+                if edit is not None:
+                    edit.add_done_callback(on_edit_done)
+            except Exception as e:
+                logger.error("Failed to update Telegram alert for chat %s: %s", chat_id, e)
+        
+        preliminary.add_done_callback(on_preliminary_done)
+    
+    def _digest_sort_key(self, review_doc: ReviewDocument) -> tuple:
+        """Sort key putting the most urgent reviews first."""
+        sentiment = (review_doc.analysis or {}).get('sentiment', 'محايد')
+        return (
+            self.SENTIMENT_SEVERITY.get(sentiment, 1),
+            review_doc.source.rating or 0,
+            -review_doc.created_at.timestamp()
+        )
+    
     def _format_header(self, review_doc: ReviewDocument) -> str:
         """Format header with stars, sentiment, and quality score."""
         rating = review_doc.source.rating or 0
@@ -166,7 +442,7 @@ class TelegramService(ITelegramService):
             return message
         
         # If too long, create a summary
-        logging.warning(f"Message too long ({len(message)} chars), creating summary")
+        logger.warning("Message too long (%s chars), creating summary", len(message))
         return message[:self.max_length - 50] + "\n\n... (الرسالة طويلة، راجع لوحة التحكم)"
     
     # Connection messages
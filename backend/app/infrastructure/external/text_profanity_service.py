@@ -1,8 +1,11 @@
-import requests
 import re
 import logging
-from typing import Dict, List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Pattern, Tuple
 from app.presentation.config import HF_TOKEN, HF_TOXICITY_MODEL_URL
+from app.infrastructure.external import http_client
+
+logger = logging.getLogger(__name__)
 
 class TextProfanityService:
     
@@ -39,6 +42,27 @@ class TextProfanityService:
         ]
     }
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def compiled_patterns() -> Tuple[Tuple[str, Pattern], ...]:
+        """PROFANITY_PATTERNS as (category, compiled case-insensitive pattern) pairs."""
+        return tuple(
+            (category, re.compile(pattern, re.IGNORECASE))
+            for category, patterns in TextProfanityService.PROFANITY_PATTERNS.items()
+            for pattern in patterns
+        )
+
+    @staticmethod
+    def pattern_hits(text: str) -> Dict[str, List[str]]:
+        """Matched words per category (categories without a match are omitted)."""
+        hits: Dict[str, List[str]] = {}
+        text_lower = text.lower()
+        for category, pattern in TextProfanityService.compiled_patterns():
+            matches = pattern.findall(text_lower)
+            if matches:
+                hits.setdefault(category, []).extend(matches)
+        return hits
+
     @staticmethod
     def detect_profanity_with_hf(text: str, confidence_threshold: float = 0.6) -> Dict:
         if not text or not text.strip():
@@ -57,7 +81,8 @@ class TextProfanityService:
         safe_label = "نقد محترم وكلام عادي"
 
         try:
-            response = requests.post(
+            response = http_client.post(
+                'hf_profanity',
                 url,
                 headers=headers,
                 json={
@@ -90,14 +115,14 @@ class TextProfanityService:
                     }
 
             elif response.status_code == 503:
-                logging.info("HF model loading, using fallback pattern matching")
+                logger.info("HF model loading, using fallback pattern matching")
                 return TextProfanityService._detect_profanity_with_patterns(text)
             else:
-                logging.error(f"HF API error: {response.status_code}")
+                logger.error("HF API error: %s", response.status_code)
                 return TextProfanityService._detect_profanity_with_patterns(text)
 
         except Exception as e:
-            logging.error(f"Profanity detection error: {e}")
+            logger.error("Profanity detection error: %s", e)
             return TextProfanityService._detect_profanity_with_patterns(text)
 
     @staticmethod
@@ -105,15 +130,10 @@ class TextProfanityService:
         detected_words = []
         max_score = 0.0
 
-        text_lower = text.lower()
-
-        for category, patterns in TextProfanityService.PROFANITY_PATTERNS.items():
-            for pattern in patterns:
-                matches = re.findall(pattern, text_lower)
-                if matches:
-                    detected_words.extend(matches)
-                    category_score = 0.7 if category == 'arabic_street' else 0.6
-                    max_score = max(max_score, category_score)
+        for category, matches in TextProfanityService.pattern_hits(text).items():
+            detected_words.extend(matches)
+            category_score = 0.7 if category == 'arabic_street' else 0.6
+            max_score = max(max_score, category_score)
 
         has_profanity = len(detected_words) > 0
 
@@ -133,32 +153,31 @@ class TextProfanityService:
         censored_text = text
         censored_words = []
 
-        for category, patterns in TextProfanityService.PROFANITY_PATTERNS.items():
-            for pattern in patterns:
-                matches = re.finditer(pattern, censored_text, re.IGNORECASE)
-                
-                for match in matches:
-                    original_word = match.group(0)
-                    censored_words.append(original_word)
-
-                    if method == 'word':
+        for category, pattern in TextProfanityService.compiled_patterns():
+            matches = pattern.finditer(censored_text)
+            
+            for match in matches:
+                original_word = match.group(0)
+                censored_words.append(original_word)
+
+                if method == 'word':
+                    replacement = censor_char * len(original_word)
+                elif method == 'first_last':
+                    if len(original_word) <= 2:
                         replacement = censor_char * len(original_word)
-                    elif method == 'first_last':
-                        if len(original_word) <= 2:
-                            replacement = censor_char * len(original_word)
-                        else:
-                            replacement = original_word[0] + censor_char * (len(original_word) - 2) + original_word[-1]
-                    elif method == 'emoji':
-                        replacement = '🔞'
                     else:
-                        replacement = censor_char * len(original_word)
-
-                    censored_text = re.sub(
-                        r'\b' + re.escape(original_word) + r'\b',
-                        replacement,
-                        censored_text,
-                        flags=re.IGNORECASE
-                    )
+                        replacement = original_word[0] + censor_char * (len(original_word) - 2) + original_word[-1]
+                elif method == 'emoji':
+                    replacement = '🔞'
+                else:
+                    replacement = censor_char * len(original_word)
+
+                censored_text = re.sub(
+                    r'\b' + re.escape(original_word) + r'\b',
+                    replacement,
+                    censored_text,
+                    flags=re.IGNORECASE
+                )
 
         return censored_text, list(set(censored_words))
 
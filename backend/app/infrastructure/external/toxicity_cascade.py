@@ -0,0 +1,281 @@
+"""
+Toxicity Cascade
+Local-first toxicity check in front of SentimentService.analyze_toxicity.
+
+A cheap local score combines the compiled TextProfanityService patterns with
+a weighted lexicon of insults, curses and harsh words. Texts with no signal
+are non-toxic and texts with strong explicit abuse are toxic without a model
+call; only the band in between is sent to the Hugging Face model. A high
+score alone is not enough for a local 'toxic': it also takes a strong term
+or several independent signals (see LocalVerdict.conclusive), and animal
+words count only when aimed at someone, so "a small dog" or "a box" (بكس)
+goes to the model at worst.
+
+To keep the thresholds honest, a sample of local decisions is also sent to
+the model (`audit_rate`), and every model verdict is compared with the
+local one. Decisions and agreement are exported as metrics and available
+from `stats()`.
+"""
+import logging
+import random
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.presentation.config import (
+    TOXICITY_CASCADE_ENABLED,
+    TOXICITY_LOCAL_CLEAN_MAX,
+    TOXICITY_LOCAL_TOXIC_MIN,
+    TOXICITY_AUDIT_RATE
+)
+from app.infrastructure.external.text_profanity_service import TextProfanityService
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Explicit sexual insults and curses: toxic on their own
+STRONG_TERMS = frozenset({
+    'كس', 'كسك', 'كسختك', 'نيك', 'ينيك', 'منيوك', 'منيوكة', 'شرموط', 'شرموطة', 'شراميط',
+    'عرص', 'معرص', 'قحبة', 'قحاب', 'خول', 'طيز', 'يلعن', 'تلعن', 'ملعون', 'خرا',
+    'fuck', 'fucking', 'shit', 'bitch', 'asshole', 'whore', 'slut',
+})
+# Animal words: only insults when aimed at someone ("يا كلب", "you dog")
+ANIMAL_TERMS = frozenset({
+    'حمار', 'حمير', 'كلب', 'كلاب', 'حيوان', 'حيوانات', 'جحش', 'بهيم', 'dog', 'pig', 'donkey',
+})
+# Insults: aimed at someone they count in full, otherwise they only send the
+# text to the model ("الموظف غبي" may be abuse or a complaint)
+INSULT_TERMS = frozenset({
+    'غبي', 'اغبياء', 'اغبيا', 'احمق', 'حقير', 'حقيرين', 'واطي', 'سافل', 'سفلة', 'وقح',
+    'وقحين', 'نصاب', 'نصابين', 'حرامي', 'حرامية', 'تافه', 'تافهين', 'stupid', 'idiot', 'moron',
+})
+# Harsh but often legitimate criticism ("food was disgusting")
+HARSH_TERMS = frozenset({
+    'زبالة', 'زبالا', 'مقرف', 'مقرفة', 'قرف', 'وسخ', 'وسخين', 'فاشل', 'فاشلين', 'سرقة',
+    'حرام', 'نصب', 'قذر', 'قذرين', 'crap', 'trash', 'garbage', 'disgusting',
+})
+CURSE_PHRASES = (
+    re.compile(r'الله\s+لا\s+(?:يوفق|يسامح|يعطي|يرد)'),
+    re.compile(r'يخرب\s+بيت'),
+    re.compile(r'الله\s+ياخذ'),
+    re.compile(r'يقطع\s+(?:عمر|ايد)'),
+)
+
+WEIGHTS = {
+    'strong': 0.9,
+    'insult': 0.5,
+    'undirected': 0.2,        # insult not aimed at anyone: above clean_max, below toxic_min
+    'harsh': 0.3,
+    'curse': 0.5,
+    'directed': 0.3,          # "يا غبي", "انت حمار"
+    'pattern': 0.15,          # per Arabic pattern category hit (broad, noisy)
+    'pattern_explicit': 0.4,  # per English / starred-abbreviation category hit
+}
+EXPLICIT_PATTERN_CATEGORIES = ('english', 'common_abbreviations')
+ADDRESS_WORDS = frozenset({'يا', 'انت', 'انتي', 'انتو', 'انتم', 'you', "you're", 'ur'})
+# Stripped from insult and harsh words only; strong terms must match whole
+# tokens ("بكس" is a box, not 'ب' + 'كس')
+PREFIXES = ('وال', 'بال', 'فال', 'لل', 'ال', 'و', 'ف', 'ب')
+MIN_STEM = 3
+
+_DIACRITICS = re.compile(r'[\u064B-\u065F\u0670\u0640]')
+_ELONGATION = re.compile(r'(.)\1{2,}')
+_TOKEN = re.compile(r"[\w*']+")
+
+CASCADE_DECISIONS_TOTAL = registry.counter(
+    'toxicity_cascade_decisions_total',
+    'Toxicity verdicts by how they were reached (local_clean, local_toxic, escalated).',
+    ('decision',)
+)
+CASCADE_AGREEMENT_TOTAL = registry.counter(
+    'toxicity_cascade_agreement_total',
+    'Local verdict compared with the model verdict, per local band.',
+    ('band', 'result')
+)
+CASCADE_ESCALATED_SCORE = registry.histogram(
+    'toxicity_cascade_escalated_score',
+    'Local score of texts sent to the model, by model verdict (for threshold tuning).',
+    ('verdict',),
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+)
+
+
+@dataclass
+class LocalVerdict:
+    """Local toxicity score (0..1) and the signals that produced it."""
+    score: float
+    signals: List[str] = field(default_factory=list)
+
+    @property
+    def lean(self) -> str:
+        return 'toxic' if self.score >= 0.5 else 'non-toxic'
+
+    @property
+    def conclusive(self) -> bool:
+        """
+        Whether the signals may decide 'toxic' without the model.
+
+        Needs a strong term or more than one independent signal. An insult
+        and its 'directed' marker are one signal, and pattern hits do not
+        count: they are substring matches that overlap the lexicon words.
+        """
+        kinds = [signal.split(':', 1)[0] for signal in self.signals]
+        if 'strong' in kinds:
+            return True
+        return sum(1 for kind in kinds if kind in ('insult', 'harsh', 'curse')) > 1
+
+
+def _normalize(text: str) -> str:
+    text = _DIACRITICS.sub('', text.lower())
+    text = text.replace('أ', 'ا').replace('إ', 'ا').replace('آ', 'ا')
+    return _ELONGATION.sub(r'\1', text)
+
+
+def _lexicon_class(token: str) -> Optional[str]:
+    if token in STRONG_TERMS:
+        return 'strong'
+    candidates = [token] + [
+        token[len(p):] for p in PREFIXES if token.startswith(p) and len(token) - len(p) >= MIN_STEM
+    ]
+    for candidate in candidates:
+        if candidate in ANIMAL_TERMS:
+            return 'animal'
+        if candidate in INSULT_TERMS:
+            return 'insult'
+        if candidate in HARSH_TERMS:
+            return 'harsh'
+    return None
+
+
+def local_score(text: str) -> LocalVerdict:
+    """Score `text` from lexicon, curse phrase and profanity pattern signals."""
+    normalized = _normalize(text)
+    tokens = _TOKEN.findall(normalized)
+    score = 0.0
+    signals: List[str] = []
+
+    previous = ''
+    for token in tokens:
+        kind = _lexicon_class(token)
+        if kind in ('animal', 'insult'):
+            if previous in ADDRESS_WORDS:
+                score += WEIGHTS['insult'] + WEIGHTS['directed']
+                signals += [f"insult:{token}", f"directed:{previous}"]
+            elif kind == 'insult':
+                score += WEIGHTS['undirected']
+                signals.append(f"undirected:{token}")
+        elif kind is not None:
+            score += WEIGHTS[kind]
+            signals.append(f"{kind}:{token}")
+        previous = token
+
+    for phrase in CURSE_PHRASES:
+        if phrase.search(normalized):
+            score += WEIGHTS['curse']
+            signals.append(f"curse:{phrase.pattern}")
+
+    for category in TextProfanityService.pattern_hits(normalized):
+        weight = WEIGHTS['pattern_explicit' if category in EXPLICIT_PATTERN_CATEGORIES else 'pattern']
+        score += weight
+        signals.append(f"pattern:{category}")
+
+    return LocalVerdict(min(round(score, 3), 1.0), signals)
+
+
+class ToxicityCascade:
+    """
+    Drop-in replacement for `SentimentService.analyze_toxicity`.
+
+    Args:
+        sentiment_service: Service whose `analyze_toxicity` calls the model
+        clean_max: Local scores at or below this are non-toxic without a model call
+        toxic_min: Local scores at or above this are toxic without a model call
+        audit_rate: Fraction of local decisions also sent to the model to
+            measure agreement (the model verdict is then used)
+        enabled: When False every text goes to the model (agreement is still recorded)
+    """
+
+    def __init__(
+        self,
+        sentiment_service,
+        clean_max: float = None,
+        toxic_min: float = None,
+        audit_rate: float = None,
+        enabled: bool = None,
+        seed: Optional[int] = None
+    ):
+        self.sentiment_service = sentiment_service
+        self.clean_max = TOXICITY_LOCAL_CLEAN_MAX if clean_max is None else clean_max
+        self.toxic_min = TOXICITY_LOCAL_TOXIC_MIN if toxic_min is None else toxic_min
+        self.audit_rate = TOXICITY_AUDIT_RATE if audit_rate is None else audit_rate
+        self.enabled = TOXICITY_CASCADE_ENABLED if enabled is None else enabled
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._decisions: Dict[str, int] = {}
+        self._agreement: Dict[str, Dict[str, int]] = {}
+
+    def analyze_toxicity(self, text: str) -> str:
+        """'toxic', 'non-toxic' or 'uncertain', as SentimentService.analyze_toxicity."""
+        if not text or not text.strip():
+            return "non-toxic"
+
+        verdict = local_score(text)
+        band = self._band(verdict)
+        if self.enabled and band != 'ambiguous':
+            local = 'toxic' if band == 'toxic' else 'non-toxic'
+            self._count_decision(f"local_{'toxic' if band == 'toxic' else 'clean'}")
+            if not self._should_audit():
+                return local
+            model = self.sentiment_service.analyze_toxicity(text)
+            self._count_agreement(band, local, model)
+            return model if model != 'uncertain' else local
+
+        self._count_decision('escalated')
+        model = self.sentiment_service.analyze_toxicity(text)
+        CASCADE_ESCALATED_SCORE.observe(verdict.score, verdict=model)
+        self._count_agreement(band, verdict.lean, model)
+        logger.debug("Escalated toxicity check (score %.2f, %s): %s", verdict.score, verdict.signals, model)
+        return model
+
+    def stats(self) -> dict:
+        """Decision counts, escalation rate and agreement with the model per band."""
+        with self._lock:
+            decisions = dict(self._decisions)
+            agreement = {band: dict(results) for band, results in self._agreement.items()}
+        total = sum(decisions.values())
+        for results in agreement.values():
+            checked = results.get('agree', 0) + results.get('disagree', 0)
+            results['agreement_rate'] = round(results.get('agree', 0) / checked, 3) if checked else None
+        return {
+            'total': total,
+            'decisions': decisions,
+            'escalation_rate': round(decisions.get('escalated', 0) / total, 3) if total else 0.0,
+            'agreement': agreement,
+            'thresholds': {'clean_max': self.clean_max, 'toxic_min': self.toxic_min, 'audit_rate': self.audit_rate},
+        }
+
+    def _band(self, verdict: LocalVerdict) -> str:
+        if verdict.score <= self.clean_max:
+            return 'clean'
+        if verdict.score >= self.toxic_min and verdict.conclusive:
+            return 'toxic'
+        return 'ambiguous'
+
+    def _should_audit(self) -> bool:
+        if self.audit_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.audit_rate
+
+    def _count_decision(self, decision: str) -> None:
+        CASCADE_DECISIONS_TOTAL.inc(decision=decision)
+        with self._lock:
+            self._decisions[decision] = self._decisions.get(decision, 0) + 1
+
+    def _count_agreement(self, band: str, local: str, model: str) -> None:
+        result = 'model_uncertain' if model == 'uncertain' else ('agree' if local == model else 'disagree')
+        CASCADE_AGREEMENT_TOTAL.inc(band=band, result=result)
+        with self._lock:
+            results = self._agreement.setdefault(band, {})
+            results[result] = results.get(result, 0) + 1
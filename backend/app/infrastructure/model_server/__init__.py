@@ -0,0 +1,12 @@
+"""Standalone server for the local models (see model_server.py)."""
+from .batcher import MicroBatcher
+from .handlers import ModelHandler, SentimentModelHandler, ToxicityModelHandler
+from .server import ModelServer
+
+__all__ = [
+    'MicroBatcher',
+    'ModelHandler',
+    'SentimentModelHandler',
+    'ToxicityModelHandler',
+    'ModelServer',
+]
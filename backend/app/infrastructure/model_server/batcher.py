@@ -0,0 +1,115 @@
+"""
+Micro Batcher
+Collects single predictions from many request threads into batches.
+
+Every web worker sends its own HTTP request, so without batching the model
+server would run one prediction per request. The batcher queues texts from
+all connections and a single thread per model runs them together: it takes
+what is queued, waits up to `max_wait_ms` for more (at most `max_batch`),
+then calls `predict_batch` once and resolves each caller's Future.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = registry.histogram(
+    'model_server_batch_size',
+    'Texts per model call in the model server.',
+    ('model',),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+
+class MicroBatcher:
+    """
+    Batches `predict_batch` calls across threads.
+
+    Args:
+        name: Model name (thread name and metric label)
+        predict_batch: Called with a list of texts, returns one result per text
+        max_batch: Most texts per call
+        max_wait_ms: How long the first queued text waits for others
+    """
+
+    def __init__(
+        self,
+        name: str,
+        predict_batch: Callable[[List[str]], List[Any]],
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        self.name = name
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Deque[Tuple[str, Future]] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def submit(self, text: str) -> Future:
+        """Queue one text; the Future resolves to its prediction."""
+        future: Future = Future()
+        with self._condition:
+            if self._stopped:
+                future.set_exception(RuntimeError(f"{self.name} batcher is stopped"))
+                return future
+            self._queue.append((text, future))
+            self._ensure_worker()
+            self._condition.notify()
+        return future
+
+    def predict(self, texts: List[str], timeout: float = 30.0) -> List[Any]:
+        """Predictions for `texts`, batched with whatever other threads submit."""
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout) for future in futures]
+
+    def stop(self) -> None:
+        """Stop accepting texts; queued texts still run."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"batcher-{self.name}", daemon=True)
+            self._thread.start()
+
+    def _next_batch(self) -> Optional[List[Tuple[str, Future]]]:
+        """Wait for a batch; None on shutdown."""
+        with self._condition:
+            while not self._queue:
+                if self._stopped:
+                    return None
+                self._condition.wait()
+            deadline = time.monotonic() + self.max_wait
+            while len(self._queue) < self.max_batch and not self._stopped:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            count = min(len(self._queue), self.max_batch)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            BATCH_SIZE.observe(len(batch), model=self.name)
+            try:
+                results = self.predict_batch([text for text, _ in batch])
+            except Exception as e:
+                logger.error("%s batch of %s failed: %s", self.name, len(batch), e)
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
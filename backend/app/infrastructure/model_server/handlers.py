@@ -0,0 +1,168 @@
+"""
+Model Handlers
+The models served by the model server, answering in the HF inference shape.
+
+Each handler turns texts into HF text-classification predictions
+(`[{"label": ..., "score": ...}, ...]`, best first), which is what
+SentimentService already parses, and says whether a prediction is confident
+enough to return. When it is not and the handler has an `upstream_url`, the
+server asks the real HF endpoint instead.
+
+The toxicity handler is only a front for its upstream model: the lexicon
+score settles clearly clean and conclusively abusive texts, and everything in
+between must reach a real classifier, so it cannot run without one.
+"""
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from app.infrastructure.external.local_sentiment_model import LocalSentimentModel
+from app.infrastructure.external.toxicity_cascade import local_score
+
+logger = logging.getLogger(__name__)
+
+Prediction = List[dict]
+
+
+class ModelHandler:
+    """
+    Base class: a named model with optional file-backed hot reload.
+
+    Args:
+        path: Model file, reloaded when its modification time changes
+        upstream_url: HF endpoint asked for predictions that are not confident
+    """
+
+    name = ''
+    # Whether an unconfident local prediction is returned when upstream fails
+    fallback_to_local = True
+
+    def __init__(self, path: Optional[str] = None, upstream_url: Optional[str] = None):
+        self.path = path
+        self.upstream_url = upstream_url
+        self._model = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether a model is loaded (file-less handlers always are)."""
+        return self.path is None or self._model is not None
+
+    @property
+    def info(self) -> dict:
+        return {'available': self.available, 'path': self.path, 'upstream': bool(self.upstream_url)}
+
+    def reload_if_changed(self, force: bool = False) -> bool:
+        """
+        Load the model file if it changed since the last load.
+
+        The new model is built before it replaces the old one, so requests
+        keep being served by the old model while it loads, and a broken file
+        leaves the old model in place.
+
+        Returns:
+            True if a new model was loaded
+        """
+        if self.path is None:
+            return False
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return False
+        if not force and mtime == self._mtime:
+            return False
+        try:
+            model = self._load(self.path)
+        except Exception as e:
+            logger.error("Failed to load %s model from %s: %s", self.name, self.path, e)
+            return False
+        with self._lock:
+            self._model, self._mtime = model, mtime
+        logger.info("Loaded %s model from %s", self.name, self.path)
+        return True
+
+    def _load(self, path: str):
+        raise NotImplementedError
+
+    def predict_batch(self, texts: List[str]) -> List[Prediction]:
+        raise NotImplementedError
+
+    def confident(self, text: str, prediction: Prediction) -> bool:
+        return True
+
+
+class SentimentModelHandler(ModelHandler):
+    """
+    LocalSentimentModel with HF sentiment labels (positive / neutral / negative).
+
+    Args:
+        min_confidence: Top probability below which the upstream model is asked
+    """
+
+    name = 'sentiment'
+    HF_LABELS = {"إيجابي": "positive", "محايد": "neutral", "سلبي": "negative"}
+
+    def __init__(self, path: str, min_confidence: float = 0.85, upstream_url: Optional[str] = None):
+        super().__init__(path, upstream_url)
+        self.min_confidence = min_confidence
+
+    def _load(self, path: str) -> LocalSentimentModel:
+        return LocalSentimentModel.load(path)
+
+    def predict_batch(self, texts: List[str]) -> List[Prediction]:
+        model = self._model
+        predictions = []
+        for text in texts:
+            probabilities = model.predict_proba(text)
+            prediction = [
+                {'label': self.HF_LABELS.get(label, label), 'score': round(p, 6)}
+                for label, p in zip(model.labels, probabilities)
+            ]
+            predictions.append(sorted(prediction, key=lambda item: item['score'], reverse=True))
+        return predictions
+
+    def confident(self, text: str, prediction: Prediction) -> bool:
+        return bool(prediction) and prediction[0]['score'] >= self.min_confidence
+
+
+class ToxicityModelHandler(ModelHandler):
+    """
+    The ToxicityCascade local score as LABEL_1 (toxic) / LABEL_0 probabilities,
+    in front of an upstream toxicity model.
+
+    Texts are answered locally in the cascade's clean and toxic bands only;
+    the rest go to `upstream_url`, and an upstream failure is an error rather
+    than the inconclusive local score.
+
+    Args:
+        upstream_url: HF toxicity endpoint (required)
+        clean_max: Scores at or below this are confidently non-toxic
+        toxic_min: Conclusive scores at or above this are confidently toxic
+
+    Raises:
+        ValueError: If `upstream_url` is missing
+    """
+
+    name = 'toxicity'
+    fallback_to_local = False
+
+    def __init__(self, upstream_url: str, clean_max: float = 0.1, toxic_min: float = 0.9):
+        if not upstream_url:
+            raise ValueError("the toxicity model needs an upstream URL for the texts the lexicon cannot settle")
+        super().__init__(None, upstream_url)
+        self.clean_max = clean_max
+        self.toxic_min = toxic_min
+
+    def predict_batch(self, texts: List[str]) -> List[Prediction]:
+        predictions = []
+        for text in texts:
+            score = local_score(text).score
+            prediction = [{'label': 'LABEL_1', 'score': score}, {'label': 'LABEL_0', 'score': round(1 - score, 6)}]
+            predictions.append(sorted(prediction, key=lambda item: item['score'], reverse=True))
+        return predictions
+
+    def confident(self, text: str, prediction: Prediction) -> bool:
+        verdict = local_score(text)
+        return verdict.score <= self.clean_max or (verdict.score >= self.toxic_min and verdict.conclusive)
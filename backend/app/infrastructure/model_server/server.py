@@ -0,0 +1,244 @@
+"""
+Model Server
+One process serving the local models to every web worker over HTTP.
+
+Loading the models inside each gunicorn worker multiplies their memory by
+the worker count. This server loads them once and speaks the HF inference
+API shape, so pointing `HF_SENTIMENT_MODEL_URL` (or, for workers without the
+toxicity cascade, `HF_ARABIC_TOXICITY_MODEL_URL`) at
+`http://127.0.0.1:<port>/models/<name>` needs no change in SentimentService:
+
+    POST /models/<name>   {"inputs": "text" | ["text", ...]}
+                          -> [[{"label": ..., "score": ...}, ...], ...]
+    GET  /health          models and whether they are loaded
+    GET  /metrics         Prometheus metrics
+    POST /admin/reload    reload every model file now
+
+Requests from all workers go through one MicroBatcher per model. Model files
+are polled for changes (and reloaded on SIGHUP) and swapped in without
+dropping requests. Predictions a handler is not confident about are sent to
+its upstream HF URL when one is configured, with the caller's Authorization
+header. The X-Prediction-Source response header says which inputs were
+answered 'local' and which 'upstream', so callers can tell the local model's
+answers from the real HF model's (SentimentService records them as local).
+"""
+import json
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from app.infrastructure.model_server.batcher import MicroBatcher
+from app.infrastructure.external.local_sentiment_model import PREDICTION_SOURCE_HEADER
+from app.infrastructure.model_server.handlers import ModelHandler, Prediction
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_TOTAL = registry.counter(
+    'model_server_requests_total',
+    'Model server requests by model and HTTP status.',
+    ('model', 'status')
+)
+PREDICTIONS_TOTAL = registry.counter(
+    'model_server_predictions_total',
+    'Texts answered locally or by the upstream model (upstream_failed falls back to local).',
+    ('model', 'source')
+)
+REQUEST_SECONDS = registry.histogram(
+    'model_server_request_seconds',
+    'Model server request latency.',
+    ('model',),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 10.0)
+)
+
+
+class ModelServer:
+    """
+    Serves ModelHandlers over HTTP.
+
+    Args:
+        handlers: Models to serve, by `handler.name`
+        host, port: Listen address (keep it on localhost)
+        max_batch, max_wait_ms: MicroBatcher settings
+        reload_interval: Seconds between model file checks (0 disables polling)
+        upstream_timeout: Timeout of upstream HF calls
+    """
+
+    def __init__(
+        self,
+        handlers: List[ModelHandler],
+        host: str = '127.0.0.1',
+        port: int = 8501,
+        max_batch: int = 32,
+        max_wait_ms: float = 5.0,
+        reload_interval: float = 30.0,
+        upstream_timeout: float = 30.0
+    ):
+        self.handlers: Dict[str, ModelHandler] = {handler.name: handler for handler in handlers}
+        self.batchers: Dict[str, MicroBatcher] = {
+            name: MicroBatcher(name, handler.predict_batch, max_batch, max_wait_ms)
+            for name, handler in self.handlers.items()
+        }
+        self.reload_interval = reload_interval
+        self.upstream_timeout = upstream_timeout
+        self._upstream = requests.Session()
+        self._stop = threading.Event()
+        self.httpd = ThreadingHTTPServer((host, port), self._request_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reload(self, force: bool = False) -> Dict[str, bool]:
+        """Reload changed (or, with `force`, all) model files."""
+        return {name: handler.reload_if_changed(force) for name, handler in self.handlers.items()}
+
+    def serve_forever(self) -> None:
+        self.reload(force=True)
+        if self.reload_interval > 0:
+            threading.Thread(target=self._watch, name='model-reload', daemon=True).start()
+        logger.info("Model server listening on %s (%s)", self.address, ', '.join(self.handlers))
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        for batcher in self.batchers.values():
+            batcher.stop()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.reload_interval):
+            self.reload()
+
+    # ------------------------------------------------------------------
+    # Predictions
+    # ------------------------------------------------------------------
+
+    def predict(
+        self,
+        name: str,
+        texts: List[str],
+        authorization: Optional[str] = None
+    ) -> Tuple[List[Prediction], List[str]]:
+        """
+        HF-shaped predictions for `texts`, asking upstream for unconfident ones.
+
+        Returns:
+            Tuple of (predictions, source of each: 'local' or 'upstream')
+        """
+        handler = self.handlers[name]
+        if not handler.available:
+            if not handler.upstream_url:
+                raise LookupError(f"Model {name} is not loaded")
+            answers = [self._ask_upstream(handler, text, authorization, None) for text in texts]
+            return [prediction for prediction, _ in answers], [source for _, source in answers]
+
+        predictions = self.batchers[name].predict(texts)
+        sources = ['local'] * len(texts)
+        for i, (text, prediction) in enumerate(zip(texts, predictions)):
+            if handler.upstream_url and not handler.confident(text, prediction):
+                predictions[i], sources[i] = self._ask_upstream(handler, text, authorization, prediction)
+            else:
+                PREDICTIONS_TOTAL.inc(model=name, source='local')
+        return predictions, sources
+
+    def _ask_upstream(
+        self,
+        handler: ModelHandler,
+        text: str,
+        authorization: Optional[str],
+        local: Optional[Prediction]
+    ) -> Tuple[Prediction, str]:
+        headers = {'Authorization': authorization} if authorization else {}
+        try:
+            response = self._upstream.post(
+                handler.upstream_url, headers=headers, json={'inputs': text}, timeout=self.upstream_timeout
+            )
+            response.raise_for_status()
+            result = response.json()
+            if isinstance(result, list) and result and isinstance(result[0], list):
+                result = result[0]
+            if isinstance(result, list):
+                PREDICTIONS_TOTAL.inc(model=handler.name, source='upstream')
+                return result, 'upstream'
+            raise ValueError(f"unexpected upstream response: {str(result)[:200]}")
+        except Exception as e:
+            PREDICTIONS_TOTAL.inc(model=handler.name, source='upstream_failed')
+            logger.warning("Upstream %s call failed: %s", handler.name, e)
+            if local is None or not handler.fallback_to_local:
+                raise
+            return local, 'local'
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    def _request_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                logger.debug("%s - %s", self.address_string(), format % args)
+
+            def _send(self, status: int, body, content_type: str = 'application/json', headers=None) -> None:
+                data = body.encode('utf-8') if isinstance(body, str) else json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                for header, value in (headers or {}).items():
+                    self.send_header(header, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                if self.path == '/health':
+                    self._send(200, {name: h.info for name, h in server.handlers.items()})
+                elif self.path == '/metrics':
+                    self._send(200, registry.render(), 'text/plain; version=0.0.4')
+                else:
+                    self._send(404, {'error': 'Not found'})
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                raw = self.rfile.read(length) if length else b''
+                if self.path == '/admin/reload':
+                    self._send(200, server.reload(force=True))
+                    return
+
+                name = self.path.rstrip('/').rsplit('/', 1)[-1] if self.path.startswith('/models/') else None
+                if name not in server.handlers:
+                    self._send(404, {'error': f"Model {name} not found"})
+                    return
+
+                with REQUEST_SECONDS.time(model=name):
+                    status, body, headers = self._predict(name, raw)
+                REQUESTS_TOTAL.inc(model=name, status=str(status))
+                self._send(status, body, headers=headers)
+
+            def _predict(self, name: str, raw: bytes):
+                try:
+                    inputs = json.loads(raw or b'{}').get('inputs')
+                except (ValueError, AttributeError):
+                    return 400, {'error': 'Body must be JSON with "inputs"'}, None
+                single = isinstance(inputs, str)
+                texts = [inputs] if single else inputs
+                if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+                    return 400, {'error': '"inputs" must be a string or a list of strings'}, None
+                try:
+                    predictions, sources = server.predict(name, texts, self.headers.get('Authorization'))
+                except LookupError as e:
+                    return 500, {'error': str(e)}, None
+                except Exception as e:
+                    logger.error("%s prediction failed: %s", name, e)
+                    return 500, {'error': 'Prediction failed'}, None
+                return 200, predictions, {PREDICTION_SOURCE_HEADER: ','.join(sources)}
+
+        return Handler
@@ -0,0 +1,30 @@
+"""Observability: startup profiling and metrics."""
+from .startup_report import (
+    install_import_timer,
+    record_init,
+    timed_init,
+    build_startup_report,
+    log_startup_report
+)
+from .metrics import (
+    registry,
+    Counter,
+    Histogram,
+    time_stage,
+    record_fallback,
+    collect_fallbacks
+)
+
+__all__ = [
+    'install_import_timer',
+    'record_init',
+    'timed_init',
+    'build_startup_report',
+    'log_startup_report',
+    'registry',
+    'Counter',
+    'Histogram',
+    'time_stage',
+    'record_fallback',
+    'collect_fallbacks',
+]
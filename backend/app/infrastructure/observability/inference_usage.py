@@ -0,0 +1,154 @@
+"""
+Inference Usage
+Per-review accounting of external model calls (Hugging Face and DeepSeek).
+
+`http_client.post` reports every inference call here (count, latency,
+request/response bytes) and DeepSeekService adds the prompt/completion
+tokens from the response `usage`. Calls are collected for the review being
+processed (`collect_usage`) and the use case persists the totals per shop
+and day through InferenceUsageRepository.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from app.infrastructure.observability.metrics import registry
+
+# Services billed as model inference (Telegram and others are not counted)
+INFERENCE_SERVICE_PREFIXES = ('hf_', 'deepseek')
+
+INFERENCE_CALLS_TOTAL = registry.counter(
+    'inference_calls_total',
+    'External model inference calls.',
+    ('service',)
+)
+INFERENCE_BYTES_TOTAL = registry.counter(
+    'inference_payload_bytes_total',
+    'Bytes sent to and received from external model APIs.',
+    ('service', 'direction')
+)
+INFERENCE_TOKENS_TOTAL = registry.counter(
+    'inference_tokens_total',
+    'LLM tokens reported by the model API.',
+    ('service', 'kind')
+)
+
+
+class InferenceUsage:
+    """Usage accumulated while processing one review."""
+
+    FIELDS = ('calls', 'errors', 'latency_ms', 'request_bytes', 'response_bytes',
+              'prompt_tokens', 'completion_tokens')
+
+    def __init__(self):
+        self.shop_id: Optional[str] = None
+        self.review_id: Optional[str] = None
+        self.services: Dict[str, Dict[str, float]] = {}
+        # Calls may finish on executor threads sharing this context
+        self._lock = threading.Lock()
+
+    def _entry(self, service: str) -> Dict[str, float]:
+        entry = self.services.get(service)
+        if entry is None:
+            entry = self.services[service] = dict.fromkeys(self.FIELDS, 0)
+        return entry
+
+    def add_call(self, service: str, latency_ms: float, request_bytes: int, response_bytes: int, ok: bool) -> None:
+        with self._lock:
+            entry = self._entry(service)
+            entry['calls'] += 1
+            entry['errors'] += 0 if ok else 1
+            entry['latency_ms'] += latency_ms
+            entry['request_bytes'] += request_bytes
+            entry['response_bytes'] += response_bytes
+
+    def add_tokens(self, service: str, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            entry = self._entry(service)
+            entry['prompt_tokens'] += prompt_tokens
+            entry['completion_tokens'] += completion_tokens
+
+    @property
+    def total_calls(self) -> int:
+        return int(sum(entry['calls'] for entry in self.services.values()))
+
+    @property
+    def total_tokens(self) -> int:
+        return int(sum(entry['prompt_tokens'] + entry['completion_tokens'] for entry in self.services.values()))
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {service: dict(entry) for service, entry in self.services.items()}
+
+
+_current_usage: ContextVar[Optional[InferenceUsage]] = ContextVar('inference_usage', default=None)
+
+
+def estimate_cost(services: Dict[str, dict]) -> float:
+    """
+    Estimated spend for per-service usage counters.
+
+    Hugging Face calls are priced per call, DeepSeek per 1K prompt and
+    completion tokens (rates from config).
+    """
+    from app.presentation.config import (
+        HF_COST_PER_CALL,
+        DEEPSEEK_COST_PER_1K_PROMPT_TOKENS,
+        DEEPSEEK_COST_PER_1K_COMPLETION_TOKENS
+    )
+    cost = 0.0
+    for service, entry in services.items():
+        if service.startswith('hf_'):
+            cost += entry.get('calls', 0) * HF_COST_PER_CALL
+        elif service == 'deepseek':
+            cost += entry.get('prompt_tokens', 0) / 1000 * DEEPSEEK_COST_PER_1K_PROMPT_TOKENS
+            cost += entry.get('completion_tokens', 0) / 1000 * DEEPSEEK_COST_PER_1K_COMPLETION_TOKENS
+    return round(cost, 6)
+
+
+def is_inference_service(service: str) -> bool:
+    return service.startswith(INFERENCE_SERVICE_PREFIXES)
+
+
+def record_call(service: str, latency_seconds: float, request_bytes: int, response_bytes: int, ok: bool) -> None:
+    """Count one inference call (no-op for non-inference services)."""
+    if not is_inference_service(service):
+        return
+    INFERENCE_CALLS_TOTAL.inc(service=service)
+    INFERENCE_BYTES_TOTAL.inc(request_bytes, service=service, direction='request')
+    INFERENCE_BYTES_TOTAL.inc(response_bytes, service=service, direction='response')
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add_call(service, latency_seconds * 1000, request_bytes, response_bytes, ok)
+
+
+def record_tokens(service: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """Count LLM tokens from a response `usage` block."""
+    INFERENCE_TOKENS_TOTAL.inc(prompt_tokens, service=service, kind='prompt')
+    INFERENCE_TOKENS_TOTAL.inc(completion_tokens, service=service, kind='completion')
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.add_tokens(service, prompt_tokens, completion_tokens)
+
+
+def attribute_usage(shop_id: Optional[str] = None, review_id: Optional[str] = None) -> None:
+    """Set the shop/review that the collected usage is charged to."""
+    usage = _current_usage.get()
+    if usage is None:
+        return
+    if shop_id is not None:
+        usage.shop_id = shop_id
+    if review_id is not None:
+        usage.review_id = review_id
+
+
+@contextmanager
+def collect_usage() -> Iterator[InferenceUsage]:
+    """Collect inference usage while the block runs."""
+    usage = InferenceUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
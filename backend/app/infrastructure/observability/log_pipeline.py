@@ -0,0 +1,208 @@
+"""
+Log Pipeline
+Non-blocking, structured logging.
+
+Request threads only put records on an in-memory queue (`ContextQueueHandler`);
+a single `QueueListener` thread formats them and does the file and console
+I/O. Everything that depends on the request context (the trace ID, the
+message arguments, the exception traceback) is resolved on the producer side
+before the record is queued, since contextvars are not visible to the
+listener thread.
+
+High-frequency INFO logs from the review pipeline can be sampled. Sampling is
+decided per trace, so a sampled review keeps all of its log lines.
+
+On serverless platforms the process is frozen once the response is sent, so a
+listener thread would leave queued records unwritten; there the pipeline runs
+the handlers synchronously in the logging thread instead.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterable, Optional, Sequence
+
+from app.infrastructure.observability.tracing import current_trace_id
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {
+    'message', 'asctime', 'trace_id'
+}
+
+DEFAULT_SAMPLED_LOGGERS = (
+    'app.application.services.webhook',
+    'app.infrastructure.external',
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'module': record.module,
+            'message': record.getMessage(),
+            'trace_id': getattr(record, 'trace_id', '-'),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc_info'] = record.exc_text
+        if record.stack_info:
+            entry['stack_info'] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of INFO-and-below records from the given loggers.
+
+    Warnings and errors always pass. Within a trace the decision is derived
+    from the trace ID, so either all or none of a review's lines are kept.
+    """
+
+    def __init__(self, rate: float, prefixes: Sequence[str] = DEFAULT_SAMPLED_LOGGERS):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+        self.prefixes = tuple(prefixes)
+        self._threshold = int(self.rate * 0xFFFFFFFF)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno > logging.INFO or not record.name.startswith(self.prefixes):
+            return True
+        trace_id = getattr(record, 'trace_id', None) or current_trace_id()
+        if trace_id and trace_id != '-':
+            return zlib.crc32(trace_id.encode()) <= self._threshold
+        return random.random() < self.rate
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    QueueHandler that captures request context before enqueueing.
+
+    Unlike the stock handler it keeps `args` unformatted until `prepare` and
+    only then merges them, so records dropped by a filter are never formatted.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.trace_id = current_trace_id() or '-'
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            # Tracebacks hold frames that must not cross into the listener thread
+            record.exc_info = None
+        return record
+
+
+class ContextHandler(logging.Handler):
+    """Runs the handlers in the logging thread, with the trace ID attached."""
+
+    def __init__(self, handlers: Iterable[logging.Handler]):
+        super().__init__()
+        self.handlers = tuple(handlers)
+        self.dropped = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record.trace_id = current_trace_id() or '-'
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class LogPipeline:
+    """Owns the queue and the listener thread that drains it (or, synchronous, neither)."""
+
+    def __init__(
+        self,
+        handlers: Iterable[logging.Handler],
+        sample_rate: float = 1.0,
+        maxsize: int = 10000,
+        synchronous: bool = False
+    ):
+        """
+        Args:
+            handlers: Handlers run on the listener thread (files, console)
+            sample_rate: Fraction of hot-path INFO records to keep
+            maxsize: Queue bound; when full, records are dropped rather than blocking
+            synchronous: Run the handlers in the logging thread, without a
+                queue (for serverless platforms)
+        """
+        if synchronous:
+            self.queue = None
+            self.handler = ContextHandler(handlers)
+            self.listener = None
+        else:
+            self.queue: queue.Queue = queue.Queue(maxsize)
+            self.handler = _DroppingQueueHandler(self.queue)
+            self.listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        if sample_rate < 1.0:
+            self.handler.addFilter(SamplingFilter(sample_rate))
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped
+
+    def start(self) -> None:
+        if self.listener is not None:
+            self.listener.start()
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener (idempotent)."""
+        if self.listener is not None and self.listener._thread is not None:
+            self.listener.stop()
+
+
+class _DroppingQueueHandler(ContextQueueHandler):
+    """Never blocks the caller: a full queue drops the record and counts it."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def install(pipeline: LogPipeline, loggers: Iterable[logging.Logger]) -> None:
+    """
+    Route `loggers` through `pipeline`, replacing a previously installed one.
+
+    The listener is stopped at exit, after later-registered atexit hooks
+    (e.g. the Telegram dispatcher flush) have logged.
+    """
+    global _pipeline
+    if _pipeline is not None:
+        _pipeline.stop()
+    else:
+        atexit.register(shutdown)
+    for log in loggers:
+        for handler in list(log.handlers):
+            if isinstance(handler, (ContextQueueHandler, ContextHandler)):
+                log.removeHandler(handler)
+        log.addHandler(pipeline.handler)
+    pipeline.start()
+    _pipeline = pipeline
+
+
+def shutdown() -> None:
+    """Drain and stop the installed pipeline."""
+    if _pipeline is not None:
+        _pipeline.stop()
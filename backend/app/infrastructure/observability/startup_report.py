@@ -0,0 +1,144 @@
+"""
+Startup Report
+Breaks cold-start time down into module imports and service initialization.
+
+Import timing wraps module loaders through a meta path finder, so it only
+sees modules imported after `install_import_timer()` and is opt-in
+(STARTUP_REPORT=true). Initialization timings are always recorded; they
+cost one perf_counter pair per service.
+"""
+import importlib.abc
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+_import_times: Dict[str, List[float]] = {}  # module -> [self seconds, cumulative seconds]
+_init_times: Dict[str, float] = {}
+_local = threading.local()
+_lock = threading.Lock()
+_installed_at: Optional[float] = None
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Delegating loader that times `exec_module`."""
+
+    def __init__(self, loader, fullname: str):
+        self._loader = loader
+        self._fullname = fullname
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(0.0)  # time spent in nested imports
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            with _lock:
+                _import_times[self._fullname] = [cumulative - nested, cumulative]
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimingFinder(importlib.abc.MetaPathFinder):
+    """Finds specs with the remaining finders and wraps their loaders."""
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                spec.loader = _TimedLoader(spec.loader, fullname)
+            return spec
+        return None
+
+
+def install_import_timer() -> None:
+    """Start timing imports (idempotent)."""
+    global _installed_at
+    if any(isinstance(finder, _ImportTimingFinder) for finder in sys.meta_path):
+        return
+    _installed_at = time.perf_counter()
+    sys.meta_path.insert(0, _ImportTimingFinder())
+
+
+def record_init(name: str, seconds: float) -> None:
+    """Record how long constructing a service took."""
+    with _lock:
+        _init_times[name] = _init_times.get(name, 0.0) + seconds
+
+
+@contextmanager
+def timed_init(name: str):
+    """Time a block of startup work under `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_init(name, time.perf_counter() - start)
+
+
+def build_startup_report(top: int = 20) -> dict:
+    """
+    Summarize startup cost.
+
+    Args:
+        top: Number of slowest modules to include
+
+    Returns:
+        Dictionary with per-module import times (self and cumulative, ms)
+        and per-service initialization times (ms)
+    """
+    with _lock:
+        imports = sorted(_import_times.items(), key=lambda item: item[1][0], reverse=True)
+        init_times = dict(_init_times)
+
+    # Top-level packages as seen by the application (e.g. flask, firebase_admin, app.infrastructure)
+    by_package: Dict[str, float] = {}
+    for module, (self_seconds, _) in imports:
+        parts = module.split('.')
+        package = '.'.join(parts[:2]) if parts[0] == 'app' else parts[0]
+        by_package[package] = by_package.get(package, 0.0) + self_seconds
+
+    return {
+        'import_timing_enabled': _installed_at is not None,
+        'total_import_ms': round(sum(t[0] for _, t in imports) * 1000, 1),
+        'imports_by_package_ms': {
+            package: round(seconds * 1000, 1)
+            for package, seconds in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+        },
+        'slowest_modules': [
+            {'module': module, 'self_ms': round(s * 1000, 1), 'cumulative_ms': round(c * 1000, 1)}
+            for module, (s, c) in imports[:top]
+        ],
+        'initialization_ms': {
+            name: round(seconds * 1000, 1)
+            for name, seconds in sorted(init_times.items(), key=lambda item: item[1], reverse=True)
+        }
+    }
+
+
+def log_startup_report(logger: logging.Logger, top: int = 10) -> None:
+    """Write a compact startup report to `logger`."""
+    report = build_startup_report(top)
+    if report['import_timing_enabled']:
+        logger.info("Startup imports: %sms total", report['total_import_ms'])
+        for package, ms in report['imports_by_package_ms'].items():
+            logger.info("  import %s: %sms", package, ms)
+    for name, ms in report['initialization_ms'].items():
+        logger.info("  init %s: %sms", name, ms)
@@ -0,0 +1,286 @@
+"""
+Tracing
+Lightweight request tracing with W3C trace context.
+
+A trace is started at the Flask route (`start_trace`). Pipeline stages and
+outbound HTTP calls open child spans (`span`), and the current context is
+carried by contextvars, so concurrent requests never mix. The `traceparent`
+of the current span is injected into outbound calls.
+
+Finished spans are written by a local exporter as JSON Lines. Choose plain
+span records ('json') or OTLP/JSON `resourceSpans` batches ('otlp'). Use
+trace_waterfall.py to render per-review waterfalls from either format.
+"""
+import json
+import logging
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = 'reputation-guardian'
+_TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$')
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    start_ns: int
+    end_ns: Optional[int] = None
+    status: str = 'ok'
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict:
+        return {
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': round(self.duration_ms, 3),
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+class _Trace:
+    """Spans of one trace that are exported together when the root ends."""
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List[Span] = []
+        self.root_finished = False
+        self.lock = threading.Lock()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+_current_trace: ContextVar[Optional[_Trace]] = ContextVar('current_trace', default=None)
+
+
+# ----------------------------------------------------------------------
+# Exporters
+# ----------------------------------------------------------------------
+
+class JsonLinesSpanExporter:
+    """Appends one JSON span record per line to a daily file."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self) -> str:
+        return os.path.join(self.directory, f"spans-{datetime.now(timezone.utc):%Y%m%d}.jsonl")
+
+    def _write(self, lines: List[str]) -> None:
+        with self._lock, open(self._path(), 'a', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def export(self, spans: List[Span]) -> None:
+        self._write([json.dumps(s.to_dict(), ensure_ascii=False, default=str) for s in spans])
+
+
+class OtlpJsonFileExporter(JsonLinesSpanExporter):
+    """Appends OTLP/JSON `ExportTraceServiceRequest` payloads, one per line."""
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> dict:
+        if isinstance(value, bool):
+            typed = {'boolValue': value}
+        elif isinstance(value, int):
+            typed = {'intValue': str(value)}
+        elif isinstance(value, float):
+            typed = {'doubleValue': value}
+        else:
+            typed = {'stringValue': str(value)}
+        return {'key': key, 'value': typed}
+
+    def export(self, spans: List[Span]) -> None:
+        payload = {
+            'resourceSpans': [{
+                'resource': {'attributes': [self._attribute('service.name', SERVICE_NAME)]},
+                'scopeSpans': [{
+                    'scope': {'name': __name__},
+                    'spans': [{
+                        'traceId': s.trace_id,
+                        'spanId': s.span_id,
+                        'parentSpanId': s.parent_id or '',
+                        'name': s.name,
+                        'kind': 1,
+                        'startTimeUnixNano': str(s.start_ns),
+                        'endTimeUnixNano': str(s.end_ns or s.start_ns),
+                        'attributes': [self._attribute(k, v) for k, v in s.attributes.items()],
+                        'status': {'code': 2 if s.status == 'error' else 1}
+                    } for s in spans]
+                }]
+            }]
+        }
+        self._write([json.dumps(payload, ensure_ascii=False, default=str)])
+
+
+_exporter = None
+_exporter_configured = False
+_exporter_lock = threading.Lock()
+
+
+def configure_exporter(exporter) -> None:
+    """Set the span exporter (None disables export)."""
+    global _exporter, _exporter_configured
+    with _exporter_lock:
+        _exporter = exporter
+        _exporter_configured = True
+
+
+def _get_exporter():
+    global _exporter, _exporter_configured
+    if not _exporter_configured:
+        with _exporter_lock:
+            if not _exporter_configured:
+                from app.presentation.config import TRACE_EXPORTER, TRACE_DIR
+                try:
+                    if TRACE_EXPORTER == 'json':
+                        _exporter = JsonLinesSpanExporter(TRACE_DIR)
+                    elif TRACE_EXPORTER == 'otlp':
+                        _exporter = OtlpJsonFileExporter(TRACE_DIR)
+                except OSError as e:
+                    logger.warning("Trace export disabled, cannot use %s: %s", TRACE_DIR, e)
+                _exporter_configured = True
+    return _exporter
+
+
+def _export(spans: List[Span]) -> None:
+    exporter = _get_exporter()
+    if exporter is None or not spans:
+        return
+    try:
+        exporter.export(spans)
+    except Exception as e:
+        logger.warning("Span export failed: %s", e)
+
+
+# ----------------------------------------------------------------------
+# Context API
+# ----------------------------------------------------------------------
+
+def _new_id(n_bytes: int) -> str:
+    return secrets.token_hex(n_bytes)
+
+
+def parse_traceparent(header: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Extract (trace_id, parent span_id) from a W3C traceparent header."""
+    match = _TRACEPARENT_PATTERN.match((header or '').strip().lower())
+    if not match:
+        return None, None
+    return match.group(1), match.group(2)
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+def traceparent() -> Optional[str]:
+    """W3C traceparent for the current span, for outbound requests."""
+    span = _current_span.get()
+    return f"00-{span.trace_id}-{span.span_id}-01" if span else None
+
+
+def _finish(span: Span, trace: _Trace, is_root: bool) -> None:
+    span.end_ns = time.time_ns()
+    with trace.lock:
+        if trace.root_finished:
+            # Ended after the request finished (e.g. a queued Telegram send)
+            late = [span]
+        else:
+            trace.spans.append(span)
+            late = None
+            if is_root:
+                trace.root_finished = True
+                finished, trace.spans = trace.spans, []
+    if late:
+        _export(late)
+    elif is_root:
+        _export(finished)
+
+
+@contextmanager
+def start_trace(name: str, traceparent_header: Optional[str] = None, **attributes) -> Iterator[Span]:
+    """
+    Start a new trace (or continue the caller's, given a traceparent header).
+
+    Args:
+        name: Root span name (e.g. 'POST /webhook')
+        traceparent_header: Incoming W3C traceparent, if any
+        **attributes: Root span attributes
+    """
+    trace_id, parent_id = parse_traceparent(traceparent_header)
+    trace = _Trace(trace_id or _new_id(16))
+    root = Span(trace.trace_id, _new_id(8), parent_id, name, time.time_ns(), attributes=dict(attributes))
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    try:
+        yield root
+    except BaseException:
+        root.status = 'error'
+        raise
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        _finish(root, trace, is_root=True)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Open a child span of the current span.
+
+    Outside of a trace this does nothing and yields None.
+    """
+    parent = _current_span.get()
+    trace = _current_trace.get()
+    if parent is None or trace is None:
+        yield None
+        return
+
+    child = Span(trace.trace_id, _new_id(8), parent.span_id, name, time.time_ns(), attributes=dict(attributes))
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException:
+        child.status = 'error'
+        raise
+    finally:
+        _current_span.reset(token)
+        _finish(child, trace, is_root=False)
+
+
+class TraceContextFilter(logging.Filter):
+    """Adds `trace_id` to log records (\"-\" outside a trace)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id() or '-'
+        return True
@@ -3,10 +3,16 @@ from .base_repository import BaseRepository
 from .user_repository import UserRepository
 from .review_repository import ReviewRepository
 from .qr_repository import QRRepository
+from .inference_usage_repository import InferenceUsageRepository
+from .relevancy_lexicon_repository import RelevancyLexiconRepository
+from .idempotency_repository import IdempotencyRepository
 
 __all__ = [
     'BaseRepository',
     'UserRepository',
     'ReviewRepository',
     'QRRepository',
+    'InferenceUsageRepository',
+    'RelevancyLexiconRepository',
+    'IdempotencyRepository',
 ]
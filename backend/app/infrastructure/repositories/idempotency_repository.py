@@ -0,0 +1,91 @@
+"""Webhook idempotency repository."""
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.infrastructure.database import MongoDBManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyRepository:
+    """
+    Claims and results of webhook deliveries, keyed by submission.
+
+    One document per key: `{_id: key, status: 'in_flight' | 'completed',
+    owner, lease_until, result, created_at, expires_at}`. Inserting the
+    document is the claim (the unique `_id` makes it atomic across workers);
+    an in-flight claim whose lease expired can be taken over. Documents are
+    removed by a TTL index on `expires_at`.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else MongoDBManager().db['webhook_idempotency']
+        self._indexes_ready = False
+
+    def _ensure_indexes(self) -> None:
+        if not self._indexes_ready:
+            self.collection.create_index('expires_at', expireAfterSeconds=0)
+            self._indexes_ready = True
+
+    def claim(self, key: str, owner: str, lease_seconds: float, ttl_seconds: float) -> Tuple[bool, Optional[dict]]:
+        """
+        Try to become the one execution for `key`.
+
+        Returns:
+            (True, None) if claimed, else (False, the existing record)
+        """
+        self._ensure_indexes()
+        now = datetime.now(timezone.utc)
+        try:
+            self.collection.insert_one({
+                '_id': key,
+                'status': 'in_flight',
+                'owner': owner,
+                'lease_until': now + timedelta(seconds=lease_seconds),
+                'created_at': now,
+                'expires_at': now + timedelta(seconds=ttl_seconds),
+            })
+            return True, None
+        except DuplicateKeyError:
+            pass
+
+        taken = self.collection.find_one_and_update(
+            {'_id': key, 'status': 'in_flight', 'lease_until': {'$lt': now}},
+            {'$set': {'owner': owner, 'lease_until': now + timedelta(seconds=lease_seconds)}},
+            return_document=ReturnDocument.AFTER
+        )
+        if taken is not None:
+            logger.warning("Took over expired webhook claim %s", key)
+            return True, None
+        record = self.get(key)
+        if record is None:
+            # Released between the insert and the lookup; try once more
+            return self.claim(key, owner, lease_seconds, ttl_seconds)
+        return False, record
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.collection.find_one({'_id': key})
+
+    def complete(self, key: str, result: dict, ttl_seconds: float) -> None:
+        """
+        Store the result of an execution of `key`.
+
+        Not limited to the claim's owner: a run whose claim was taken over
+        (or dropped by the delivery that took it) still finished the review,
+        and its result is what later retries should get.
+        """
+        now = datetime.now(timezone.utc)
+        self.collection.update_one(
+            {'_id': key},
+            {
+                '$set': {'status': 'completed', 'result': result, 'completed_at': now},
+                '$setOnInsert': {'created_at': now, 'expires_at': now + timedelta(seconds=ttl_seconds)}
+            },
+            upsert=True
+        )
+
+    def release(self, key: str, owner: str) -> None:
+        """Drop a claim whose execution failed, so a retry runs again."""
+        self.collection.delete_one({'_id': key, 'owner': owner, 'status': 'in_flight'})
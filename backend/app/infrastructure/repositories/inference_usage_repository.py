@@ -0,0 +1,125 @@
+"""Inference usage repository."""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING
+from app.infrastructure.database import MongoDBManager
+from app.infrastructure.observability.inference_usage import InferenceUsage, estimate_cost
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceUsageRepository:
+    """
+    Daily inference usage per shop.
+
+    One document per shop and UTC day:
+    `{shop_id, day, reviews, totals: {...}, services: {<service>: {...}}}`
+    where every counter is incremented atomically with an upsert. The
+    estimated cost is priced with the rates in effect when the review ran.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else MongoDBManager().db['inference_usage']
+        self._indexes_ready = False
+
+    def _ensure_indexes(self) -> None:
+        if not self._indexes_ready:
+            self.collection.create_index([('shop_id', ASCENDING), ('day', ASCENDING)], unique=True)
+            self.collection.create_index('day')
+            self._indexes_ready = True
+
+    @staticmethod
+    def _day(offset_days: int = 0) -> str:
+        return (datetime.now(timezone.utc) - timedelta(days=offset_days)).strftime('%Y-%m-%d')
+
+    def record(self, usage: InferenceUsage, reviews: int = 1) -> None:
+        """
+        Add one review's usage to its shop's counters for today.
+
+        Args:
+            usage: The review's usage (may have no calls)
+            reviews: Reviews counted (0 for later work on a counted review)
+        """
+        services = usage.to_dict()
+        if not usage.shop_id or not (services or reviews):
+            return
+        self._ensure_indexes()
+
+        increments: Dict[str, float] = {'reviews': reviews, 'totals.estimated_cost': estimate_cost(services)}
+        for service, entry in services.items():
+            for field, value in entry.items():
+                increments[f"services.{service}.{field}"] = value
+                increments[f"totals.{field}"] = increments.get(f"totals.{field}", 0) + value
+
+        day = self._day()
+        self.collection.update_one(
+            {'shop_id': usage.shop_id, 'day': day},
+            {
+                '$inc': increments,
+                '$set': {'updated_at': datetime.now(timezone.utc)}
+            },
+            upsert=True
+        )
+
+    def find_by_shop(self, shop_id: str, days: int = 30) -> List[dict]:
+        """Daily usage documents for a shop over the last `days` days, oldest first."""
+        return list(self.collection.find(
+            {'shop_id': shop_id, 'day': {'$gte': self._day(days - 1)}},
+            {'_id': 0}
+        ).sort('day', ASCENDING))
+
+    def top_shops(self, days: int = 7, limit: int = 20, sort_by: str = 'calls') -> List[dict]:
+        """
+        Shops with the highest usage over the last `days` days.
+
+        Args:
+            days: Period length
+            limit: Number of shops returned
+            sort_by: Field to rank by ('calls', 'prompt_tokens', 'latency_ms', 'estimated_cost', ...)
+
+        Returns:
+            List of {shop_id, reviews, estimated_cost, totals} sorted by `sort_by` descending
+        """
+        group = {
+            '_id': '$shop_id',
+            'reviews': {'$sum': '$reviews'},
+            'estimated_cost': {'$sum': '$totals.estimated_cost'}
+        }
+        for field in InferenceUsage.FIELDS:
+            group[field] = {'$sum': f"$totals.{field}"}
+        pipeline = [
+            {'$match': {'day': {'$gte': self._day(days - 1)}}},
+            {'$group': group},
+            {'$sort': {sort_by: DESCENDING}},
+            {'$limit': limit}
+        ]
+        return [
+            {
+                'shop_id': row['_id'],
+                'reviews': row['reviews'],
+                'estimated_cost': row['estimated_cost'],
+                'totals': {field: row[field] for field in InferenceUsage.FIELDS}
+            }
+            for row in self.collection.aggregate(pipeline)
+        ]
+
+    def period_totals(self, days: int = 7) -> dict:
+        """Usage summed over all shops for the last `days` days."""
+        group = {
+            '_id': None,
+            'reviews': {'$sum': '$reviews'},
+            'estimated_cost': {'$sum': '$totals.estimated_cost'}
+        }
+        for field in InferenceUsage.FIELDS:
+            group[field] = {'$sum': f"$totals.{field}"}
+        rows = list(self.collection.aggregate([
+            {'$match': {'day': {'$gte': self._day(days - 1)}}},
+            {'$group': group}
+        ]))
+        row = rows[0] if rows else {}
+        return {
+            'reviews': row.get('reviews', 0),
+            'estimated_cost': row.get('estimated_cost', 0),
+            'totals': {field: row.get(field, 0) for field in InferenceUsage.FIELDS}
+        }
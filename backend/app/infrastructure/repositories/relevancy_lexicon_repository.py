@@ -0,0 +1,36 @@
+"""Relevancy lexicon repository."""
+from datetime import datetime, timezone
+from typing import Dict, List
+from app.infrastructure.database import MongoDBManager
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RelevancyLexiconRepository:
+    """
+    Learned relevancy terms per shop type.
+
+    One document per shop type: `{shop_type, terms, review_count, updated_at}`,
+    replaced as a whole by build_relevancy_lexicon.py.
+    """
+
+    def __init__(self, collection=None):
+        self.collection = collection if collection is not None else MongoDBManager().db['relevancy_lexicon']
+
+    def load(self) -> Dict[str, List[str]]:
+        """Learned terms keyed by shop type."""
+        return {doc['shop_type']: doc.get('terms', []) for doc in self.collection.find({}, {'_id': 0})}
+
+    def save(self, shop_type: str, terms: List[str], review_count: int) -> None:
+        self.collection.replace_one(
+            {'shop_type': shop_type},
+            {
+                'shop_type': shop_type,
+                'terms': terms,
+                'review_count': review_count,
+                'updated_at': datetime.now(timezone.utc)
+            },
+            upsert=True
+        )
+        logger.info("Saved %s relevancy terms for %s", len(terms), shop_type)
@@ -1,6 +1,9 @@
 """Review repository."""
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List
 from bson import ObjectId
+from pymongo import ReturnDocument
+from app.domain.enums import ReviewPriority
 from app.domain.models.review import Review
 from app.infrastructure.repositories.base_repository import BaseRepository
 from app.infrastructure.database import MongoDBManager
@@ -10,11 +13,27 @@ logger = logging.getLogger(__name__)
 
 
 class ReviewRepository(BaseRepository[Review]):
-    """Repository for Review entities."""
+    """
+    Repository for Review entities.
+    
+    Reviews in the webhook pipeline carry a `pipeline` sub-document
+    (`state`, `lease_until`, `attempts`, ...) checkpointed after each stage;
+    see ProcessReviewUseCase.
+    """
+    
+    ACTIVE_PIPELINE_STATES = ('pending', 'gated', 'analyzed')
     
     def __init__(self):
         db = MongoDBManager().db
         super().__init__(db['reviews'])
+        self._indexes_ready = False
+    
+    def _ensure_indexes(self) -> None:
+        if not self._indexes_ready:
+            self.collection.create_index([('pipeline.state', 1), ('pipeline.lease_until', 1)])
+            self.collection.create_index('pipeline.submission_key', sparse=True)
+            self.collection.create_index('enrichment_pending', sparse=True)
+            self._indexes_ready = True
     
     def to_entity(self, data: dict) -> Review:
         """Convert database document to Review entity."""
@@ -72,3 +91,177 @@ class ReviewRepository(BaseRepository[Review]):
             limit=limit,
             sort=[('timestamp', -1)]
         )
+    
+    # Pipeline checkpoints
+    
+    def find_document(self, review_id: str) -> Optional[dict]:
+        """Raw review document (with its pipeline checkpoint)."""
+        return self.collection.find_one({'_id': ObjectId(review_id)})
+    
+    def find_by_submission(self, submission_key: str) -> Optional[dict]:
+        """Raw review document created for a Tally submission ID (see `tally_submission_key`)."""
+        self._ensure_indexes()
+        return self.collection.find_one({'pipeline.submission_key': submission_key})
+    
+    def save_checkpoint(self, review_id: str, fields: dict, lease_seconds: Optional[float] = None) -> None:
+        """
+        Set `fields` (dotted paths allowed) on a review in the pipeline.
+        
+        Args:
+            review_id: Review ID
+            fields: Fields to set, e.g. {'pipeline.state': 'gated', 'analysis.quality': {...}}
+            lease_seconds: Extend the lease by this much (None ends it)
+        """
+        now = datetime.now(timezone.utc)
+        update = dict(fields)
+        update['pipeline.updated_at'] = now
+        update['pipeline.lease_until'] = now + timedelta(seconds=lease_seconds) if lease_seconds else now
+        self.collection.update_one({'_id': ObjectId(review_id)}, {'$set': update})
+    
+    def claim_resumable(
+        self,
+        lease_seconds: float,
+        max_attempts: int,
+        review_id: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Take the lease on an interrupted review (the oldest one, or `review_id`).
+        
+        A review is resumable while its pipeline state is active, its lease
+        has expired and it has run fewer than `max_attempts` times.
+        
+        Returns:
+            The claimed document (attempts already incremented), or None
+        """
+        self._ensure_indexes()
+        now = datetime.now(timezone.utc)
+        query = {
+            'pipeline.state': {'$in': list(self.ACTIVE_PIPELINE_STATES)},
+            'pipeline.lease_until': {'$lt': now},
+            'pipeline.attempts': {'$lt': max_attempts}
+        }
+        if review_id:
+            query['_id'] = ObjectId(review_id)
+        return self.collection.find_one_and_update(
+            query,
+            {
+                '$set': {'pipeline.lease_until': now + timedelta(seconds=lease_seconds), 'pipeline.updated_at': now},
+                '$inc': {'pipeline.attempts': 1}
+            },
+            sort=[('created_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    def count_in_pipeline(self) -> int:
+        """Reviews not yet through the pipeline (the backlog the LoadMonitor watches)."""
+        self._ensure_indexes()
+        return self.collection.count_documents({'pipeline.state': {'$in': list(self.ACTIVE_PIPELINE_STATES)}})
+    
+    def claim_enrichment(
+        self,
+        lease_seconds: float,
+        max_attempts: int,
+        review_id: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Take the lease on a review saved in degraded mode (the oldest one, or `review_id`).
+        
+        Returns:
+            The claimed document (enrichment attempts already incremented), or None
+        """
+        self._ensure_indexes()
+        now = datetime.now(timezone.utc)
+        query = {
+            'enrichment_pending': True,
+            'pipeline.state': 'notified',
+            'pipeline.lease_until': {'$lt': now},
+            'pipeline.enrichment_attempts': {'$not': {'$gte': max_attempts}}
+        }
+        if review_id:
+            query['_id'] = ObjectId(review_id)
+        return self.collection.find_one_and_update(
+            query,
+            {
+                '$set': {'pipeline.lease_until': now + timedelta(seconds=lease_seconds), 'pipeline.updated_at': now},
+                '$inc': {'pipeline.enrichment_attempts': 1}
+            },
+            sort=[('created_at', 1)],
+            return_document=ReturnDocument.AFTER
+        )
+    
+    def find_waiting_by_shop(self, max_attempts: int, per_shop: int, aging_seconds: float = 0) -> List[dict]:
+        """
+        Reviews waiting for the worker, grouped by shop.
+        
+        A review waits when its lease has expired and it is either still in
+        the pipeline (interrupted) or saved in degraded mode and not yet
+        enriched, with attempts left.
+        
+        Reviews are ordered by their effective priority: the priority
+        assigned at ingestion (`pipeline.priority`, NORMAL if missing) plus
+        one level per `aging_seconds` waited, so low priority reviews are
+        not starved. Ties go to the oldest.
+        
+        Returns:
+            [{'shop_id', 'depth', 'reviews'}] where depth counts all of the
+            shop's waiting reviews and reviews lists the first `per_shop`
+            of them as {'_id', 'state', 'priority'}
+        """
+        self._ensure_indexes()
+        now = datetime.now(timezone.utc)
+        priority = {'$ifNull': ['$pipeline.priority', int(ReviewPriority.NORMAL)]}
+        if aging_seconds > 0:
+            waited = {'$divide': [{'$subtract': [now, '$created_at']}, aging_seconds * 1000]}
+            priority = {'$add': [priority, {'$max': [waited, 0]}]}
+        groups = self.collection.aggregate([
+            {'$match': {
+                'pipeline.lease_until': {'$lt': now},
+                '$or': [
+                    {
+                        'pipeline.state': {'$in': list(self.ACTIVE_PIPELINE_STATES)},
+                        'pipeline.attempts': {'$lt': max_attempts}
+                    },
+                    {
+                        'enrichment_pending': True,
+                        'pipeline.state': 'notified',
+                        'pipeline.enrichment_attempts': {'$not': {'$gte': max_attempts}}
+                    }
+                ]
+            }},
+            {'$addFields': {'effective_priority': priority}},
+            {'$sort': {'effective_priority': -1, 'created_at': 1}},
+            {'$group': {
+                '_id': '$shop_id',
+                'depth': {'$sum': 1},
+                'reviews': {'$push': {'_id': '$_id', 'state': '$pipeline.state', 'priority': '$effective_priority'}}
+            }},
+            {'$project': {'depth': 1, 'reviews': {'$slice': ['$reviews', per_shop]}}}
+        ])
+        return [
+            {'shop_id': group['_id'], 'depth': group['depth'], 'reviews': group['reviews']}
+            for group in groups
+        ]
+    
+    def release_lease(self, review_id: str) -> None:
+        """End the lease of a review whose run failed, so it is resumed soon."""
+        self.collection.update_one(
+            {'_id': ObjectId(review_id)},
+            {'$set': {'pipeline.lease_until': datetime.now(timezone.utc)}}
+        )
+    
+    def renew_lease(self, review_id: str, lease_seconds: float) -> bool:
+        """
+        Extend the lease of a review its run still holds.
+        
+        A lease that was ended (the run finished, failed or was released)
+        is left alone, so a late renewal cannot hold back the worker.
+        
+        Returns:
+            Whether the lease was extended
+        """
+        now = datetime.now(timezone.utc)
+        result = self.collection.update_one(
+            {'_id': ObjectId(review_id), 'pipeline.lease_until': {'$gt': now}},
+            {'$set': {'pipeline.lease_until': now + timedelta(seconds=lease_seconds)}}
+        )
+        return result.modified_count > 0
@@ -1,10 +1,11 @@
 """User repository."""
-from typing import Optional
+from typing import List, Optional
 from bson import ObjectId
-import bcrypt
 from app.domain.models.user import User
 from app.infrastructure.repositories.base_repository import BaseRepository
 from app.infrastructure.database import MongoDBManager
+from app.infrastructure.security import PasswordHasher
+from app.application.shared.exceptions import AuthServiceBusyException
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,9 +14,10 @@ logger = logging.getLogger(__name__)
 class UserRepository(BaseRepository[User]):
     """Repository for User entities."""
     
-    def __init__(self):
+    def __init__(self, password_hasher: PasswordHasher = None):
         db = MongoDBManager().db
         super().__init__(db['users'])
+        self.password_hasher = password_hasher or PasswordHasher.instance()
     
     def to_entity(self, data: dict) -> User:
         """Convert database document to User entity."""
@@ -43,15 +45,17 @@ class UserRepository(BaseRepository[User]):
             User ID as string
         """
         # Hash password
-        hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        hashed_pw = self.password_hasher.hash(password)
         
         # Create user entity
+        device_token = (device_token or "").strip()
         user = User(
             email=email.lower().strip(),
             password_hash=hashed_pw,
             shop_name=shop_name.strip(),
             shop_type=shop_type,
-            device_token=(device_token or "").strip()
+            device_token=device_token,
+            device_tokens=[device_token] if device_token else []
         )
         
         user_id = self.insert(user)
@@ -61,14 +65,34 @@ class UserRepository(BaseRepository[User]):
     def verify_password(self, stored_password_hash: str, provided_password: str) -> bool:
         """Verify password against hash."""
         try:
-            return bcrypt.checkpw(
-                provided_password.encode('utf-8'),
-                stored_password_hash.encode('utf-8')
-            )
+            return self.password_hasher.verify(provided_password, stored_password_hash)
+        except AuthServiceBusyException:
+            raise
         except Exception as e:
             logger.error(f"Password verification error: {e}")
             return False
     
+    def rehash_password_if_needed(self, user_id: ObjectId, stored_password_hash: str, password: str) -> bool:
+        """
+        Re-hash a verified password whose bcrypt cost differs from the configured one.
+        
+        Call only after `verify_password` succeeded.
+        
+        Returns:
+            True if a new hash was stored
+        """
+        if not self.password_hasher.needs_rehash(stored_password_hash):
+            return False
+        
+        new_hash = self.password_hasher.hash(password)
+        result = self.collection.update_one(
+            {'_id': user_id, 'password_hash': stored_password_hash},
+            {'$set': {'password_hash': new_hash}}
+        )
+        if result.modified_count:
+            logger.info("Re-hashed password for user %s with cost %s", user_id, self.password_hasher.rounds)
+        return result.modified_count > 0
+    
     def update_user(self, user_id: ObjectId, update_data: dict) -> bool:
         """
         Update user with allowed fields only.
@@ -92,4 +116,57 @@ class UserRepository(BaseRepository[User]):
         from datetime import datetime
         filtered_data['updated_at'] = datetime.utcnow()
         
-        return self.update(user_id, filtered_data)
+        updated = self.update(user_id, filtered_data)
+        
+        # A device token sent by a client registers one more device
+        device_token = (filtered_data.get('device_token') or '').strip()
+        if device_token:
+            updated = self.add_device_token(user_id, device_token) or updated
+        
+        return updated
+    
+    def add_device_token(self, user_id: ObjectId, device_token: str) -> bool:
+        """
+        Register an FCM device token for a user (no-op if already known).
+        
+        Args:
+            user_id: User ID
+            device_token: FCM registration token
+            
+        Returns:
+            True if the token was added
+        """
+        result = self.collection.update_one(
+            {'_id': user_id},
+            {'$addToSet': {'device_tokens': device_token}}
+        )
+        return result.modified_count > 0
+    
+    def remove_device_tokens(self, user_id: ObjectId, device_tokens: List[str]) -> bool:
+        """
+        Remove FCM tokens that are no longer valid (uninstalled app, expired token).
+        
+        Also clears the legacy `device_token` field if it is one of them.
+        
+        Args:
+            user_id: User ID
+            device_tokens: Tokens reported as unregistered by FCM
+            
+        Returns:
+            True if anything was removed
+        """
+        if not device_tokens:
+            return False
+        
+        result = self.collection.update_one(
+            {'_id': user_id},
+            {'$pull': {'device_tokens': {'$in': device_tokens}}}
+        )
+        legacy = self.collection.update_one(
+            {'_id': user_id, 'device_token': {'$in': device_tokens}},
+            {'$set': {'device_token': ''}}
+        )
+        removed = result.modified_count > 0 or legacy.modified_count > 0
+        if removed:
+            logger.info("Pruned %s stale device token(s) for user %s", len(device_tokens), user_id)
+        return removed
@@ -0,0 +1,4 @@
+"""Security primitives."""
+from .password_hasher import PasswordHasher
+
+__all__ = ['PasswordHasher']
@@ -0,0 +1,148 @@
+"""
+Password Hasher
+Runs bcrypt off the request thread with bounded concurrency.
+
+bcrypt is deliberately CPU-heavy (~250ms at cost 12). Hashing inline in
+/login and /register lets a login storm occupy every worker thread, so the
+webhook queues behind it. Hashes are computed in a small process pool
+(falling back to threads where processes are unavailable, e.g. serverless
+runtimes), and a semaphore caps how many auth requests may wait for that
+pool at once; callers beyond the cap are rejected quickly instead of piling up.
+"""
+import logging
+import multiprocessing
+import re
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+import bcrypt
+
+from app.application.shared.exceptions import AuthServiceBusyException
+
+logger = logging.getLogger(__name__)
+
+_BCRYPT_COST_PATTERN = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+def _hash_password(password: bytes, rounds: int) -> bytes:
+    """Pool task: hash a password (module-level so it can be pickled)."""
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def _check_password(password: bytes, hashed: bytes) -> bool:
+    """Pool task: verify a password against a bcrypt hash."""
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """
+    bcrypt hashing on a bounded worker pool.
+
+    One instance is shared per process (see `instance()`) so the
+    concurrency cap applies to every repository.
+    """
+
+    _instance: Optional['PasswordHasher'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        rounds: int = 12,
+        max_workers: int = 2,
+        max_concurrent: int = 4,
+        queue_timeout: float = 5.0,
+        use_processes: bool = True
+    ):
+        """
+        Args:
+            rounds: bcrypt cost factor for new hashes
+            max_workers: Pool size (CPU cores given to hashing)
+            max_concurrent: Hash/verify calls allowed to run or wait on the pool
+            queue_timeout: Seconds to wait for a free slot before rejecting
+            use_processes: Prefer a process pool over threads
+        """
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.queue_timeout = queue_timeout
+        self.use_processes = use_processes
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> 'PasswordHasher':
+        """Return the process-wide hasher configured from app config."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from app.presentation.config import (
+                        BCRYPT_ROUNDS,
+                        PASSWORD_HASH_WORKERS,
+                        PASSWORD_HASH_MAX_CONCURRENT,
+                        PASSWORD_HASH_QUEUE_TIMEOUT
+                    )
+                    cls._instance = cls(
+                        rounds=BCRYPT_ROUNDS,
+                        max_workers=PASSWORD_HASH_WORKERS,
+                        max_concurrent=PASSWORD_HASH_MAX_CONCURRENT,
+                        queue_timeout=PASSWORD_HASH_QUEUE_TIMEOUT
+                    )
+        return cls._instance
+
+    def hash(self, password: str) -> str:
+        """Hash a password with the configured cost factor."""
+        hashed = self._run(_hash_password, password.encode('utf-8'), self.rounds)
+        return hashed.decode('utf-8')
+
+    def verify(self, password: str, hashed: str) -> bool:
+        """Check a password against a stored bcrypt hash."""
+        return self._run(_check_password, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """True if the hash was made with a different cost factor than configured."""
+        match = _BCRYPT_COST_PATTERN.match(hashed or '')
+        return not match or int(match.group(1)) != self.rounds
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            logger.warning("Password hashing pool saturated, rejecting request")
+            raise AuthServiceBusyException()
+        try:
+            return self._get_executor().submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = self._create_executor()
+        return self._executor
+
+    def _create_executor(self) -> Executor:
+        if self.use_processes:
+            try:
+                # Spawned, not forked: the pool starts on the first login, when the
+                # process already runs threads (dispatcher, log listener, lease
+                # renewals) whose locks a forked child could inherit held
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                # Fail here rather than on the first request if processes cannot start
+                executor.submit(int).result(timeout=10)
+                logger.info("Password hashing uses %s worker processes", self.max_workers)
+                return executor
+            except Exception as e:
+                logger.warning("Process pool unavailable for password hashing (%s); using threads", e)
+        # bcrypt releases the GIL while hashing, so threads still keep the CPU
+        # work bounded to max_workers cores.
+        return ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hasher")
@@ -0,0 +1,20 @@
+"""Throttling primitives shared by outbound dispatchers and inbound limiters."""
+from .token_bucket import TokenBucket
+from .load_monitor import LoadMonitor
+from .fair_scheduler import FairScheduler
+from .rate_limiter import (
+    RateLimiter,
+    RateLimitResult,
+    InMemoryRateLimitBackend,
+    MongoRateLimitBackend
+)
+
+__all__ = [
+    'TokenBucket',
+    'RateLimiter',
+    'RateLimitResult',
+    'InMemoryRateLimitBackend',
+    'MongoRateLimitBackend',
+    'LoadMonitor',
+    'FairScheduler',
+]
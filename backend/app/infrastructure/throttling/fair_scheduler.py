@@ -0,0 +1,135 @@
+"""
+Deficit round-robin over per-key job queues.
+
+Jobs wait in one queue per key (the shop in the review worker). Keys take
+turns: on its turn a key earns its weight in credit and runs one job per
+whole credit, so a key with thousands of waiting jobs gets the same share of
+turns as one with a single job (scaled by weight) instead of starving it as
+a FIFO would. A key already running its concurrency cap of jobs is skipped
+without earning credit, and a key whose queue empties loses its credit.
+
+With a `rank`, only keys whose next job has the highest rank among the keys
+that may run take turns, so urgent jobs of any key go before the rest while
+keys stay fair within a rank.
+"""
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Generic, Hashable, List, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class FairScheduler(Generic[T]):
+    """
+    Weighted deficit round-robin with per-key concurrency caps.
+
+    Args:
+        weights: Weight per key (jobs per turn; below 1 means a job every few turns)
+        default_weight: Weight of keys not in `weights`
+        concurrency: Most jobs of a key running at once, per key
+        default_concurrency: Cap of keys not in `concurrency`
+        rank: Rank of a job (higher runs first); queues should be sorted by it
+    """
+
+    def __init__(
+        self,
+        weights: Mapping[Hashable, float] = None,
+        default_weight: float = 1.0,
+        concurrency: Mapping[Hashable, int] = None,
+        default_concurrency: int = 1,
+        rank: Callable[[T], int] = None
+    ):
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.concurrency = dict(concurrency or {})
+        self.default_concurrency = default_concurrency
+        self.rank = rank
+        if any(weight <= 0 for weight in list(self.weights.values()) + [default_weight]):
+            raise ValueError("weights must be positive")
+        self._queues: Dict[Hashable, Deque[T]] = {}
+        self._turns: Deque[Hashable] = deque()
+        self._credit: Dict[Hashable, float] = {}
+        self._running: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def weight(self, key: Hashable) -> float:
+        return self.weights.get(key, self.default_weight)
+
+    def cap(self, key: Hashable) -> int:
+        return self.concurrency.get(key, self.default_concurrency)
+
+    def replace(self, jobs: Mapping[Hashable, List[T]]) -> None:
+        """
+        Replace the waiting jobs (e.g. with a fresh poll of the queue).
+
+        Running jobs are not affected; keys keep their place and credit if
+        they still have jobs waiting.
+        """
+        with self._lock:
+            self._queues = {key: deque(items) for key, items in jobs.items() if items}
+            turns = [key for key in self._turns if key in self._queues]
+            queued = set(turns)
+            turns += [key for key in self._queues if key not in queued]
+            self._turns = deque(turns)
+            self._credit = {key: credit for key, credit in self._credit.items() if key in self._queues}
+
+    def next(self) -> Optional[Tuple[Hashable, T]]:
+        """
+        The next job to run as (key, job), or None if no key may run one now.
+
+        The key counts the job as running until `done(key)`.
+        """
+        with self._lock:
+            runnable = [key for key in self._turns if self._running.get(key, 0) < self.cap(key)]
+            if not runnable:
+                return None
+            top = max(self.rank(self._queues[key][0]) for key in runnable) if self.rank else None
+            while True:
+                key = self._turns[0]
+                if self._running.get(key, 0) >= self.cap(key) or (
+                    top is not None and self.rank(self._queues[key][0]) < top
+                ):
+                    self._turns.rotate(-1)
+                    continue
+                credit = self._credit.get(key, 0.0)
+                if credit < 1:
+                    credit += self.weight(key)
+                    if credit < 1:
+                        self._credit[key] = credit
+                        self._turns.rotate(-1)
+                        continue
+                queue = self._queues[key]
+                job = queue.popleft()
+                self._running[key] = self._running.get(key, 0) + 1
+                credit -= 1
+                if not queue:
+                    self._turns.popleft()
+                    self._queues.pop(key)
+                    self._credit.pop(key, None)
+                else:
+                    self._credit[key] = credit
+                    if credit < 1:
+                        self._turns.rotate(-1)
+                return key, job
+
+    def done(self, key: Hashable) -> None:
+        """Mark a job returned by `next` as finished."""
+        with self._lock:
+            running = self._running.get(key, 0) - 1
+            if running > 0:
+                self._running[key] = running
+            else:
+                self._running.pop(key, None)
+
+    def running(self, key: Hashable) -> int:
+        with self._lock:
+            return self._running.get(key, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Waiting and running jobs per key."""
+        with self._lock:
+            keys = set(self._queues) | set(self._running)
+            return {
+                str(key): {'waiting': len(self._queues.get(key, ())), 'running': self._running.get(key, 0)}
+                for key in keys
+            }
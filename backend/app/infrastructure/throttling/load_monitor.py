@@ -0,0 +1,195 @@
+"""
+Load monitor deciding when the review pipeline runs in degraded mode.
+
+Under a spike, waiting on the relevancy model and DeepSeek for every review
+makes ingestion fall behind. The monitor watches:
+
+- the reviews in flight in this process,
+- the review backlog across workers (reviews still in the pipeline, counted
+  at most every BACKLOG_REFRESH_SECONDS),
+- the moving average of Hugging Face call latency (`hf_*` calls made through
+  http_client in the last LATENCY_WINDOW_SECONDS),
+
+and reports `degraded` once any of them crosses its threshold. It recovers
+only when all of them are back under RECOVERY_RATIO of their thresholds, so
+it does not flap around the limit.
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from app.infrastructure.observability.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+TRANSITIONS_TOTAL = registry.counter(
+    'degraded_mode_transitions_total',
+    'Times this process entered or left degraded mode.',
+    ('state',)
+)
+
+
+class LoadMonitor:
+    """
+    Pipeline load signals with a degraded/normal decision.
+
+    Thresholds of 0 disable their signal.
+    """
+
+    BACKLOG_REFRESH_SECONDS = 5.0
+    LATENCY_WINDOW_SECONDS = 60.0
+    LATENCY_ALPHA = 0.2
+    RECOVERY_RATIO = 0.7
+
+    _instance: Optional['LoadMonitor'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_in_flight: int = 16,
+        max_backlog: int = 500,
+        max_hf_latency: float = 4.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            enabled: When False the pipeline is never degraded
+            max_in_flight: Reviews processed at once in this process
+            max_backlog: Reviews waiting in the pipeline across workers
+            max_hf_latency: Average Hugging Face call latency in seconds
+            clock: Monotonic clock, injectable for testing
+        """
+        self.enabled = enabled
+        self.max_in_flight = max_in_flight
+        self.max_backlog = max_backlog
+        self.max_hf_latency = max_hf_latency
+        self._clock = clock
+        self._in_flight = 0
+        self._latency: Optional[float] = None
+        self._latency_at = 0.0
+        self._backlog = 0
+        self._backlog_at: Optional[float] = None
+        self._backlog_source: Optional[Callable[[], int]] = None
+        self._degraded = False
+        self._lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> 'LoadMonitor':
+        """Return the process-wide monitor configured from app config."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from app.presentation.config import (
+                        DEGRADED_MODE_ENABLED,
+                        DEGRADED_MAX_IN_FLIGHT,
+                        DEGRADED_MAX_BACKLOG,
+                        DEGRADED_HF_LATENCY_SECONDS
+                    )
+                    cls._instance = cls(
+                        enabled=DEGRADED_MODE_ENABLED,
+                        max_in_flight=DEGRADED_MAX_IN_FLIGHT,
+                        max_backlog=DEGRADED_MAX_BACKLOG,
+                        max_hf_latency=DEGRADED_HF_LATENCY_SECONDS
+                    )
+        return cls._instance
+
+    def attach_backlog(self, source: Callable[[], int]) -> None:
+        """Count the backlog with `source` (e.g. ReviewRepository.count_in_pipeline)."""
+        self._backlog_source = source
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count a review as in flight while the block runs."""
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def record_latency(self, service: str, seconds: float) -> None:
+        """Feed an outbound call's latency (only Hugging Face calls count)."""
+        if not service.startswith('hf_'):
+            return
+        with self._lock:
+            if self._latency is None or self._clock() - self._latency_at > self.LATENCY_WINDOW_SECONDS:
+                self._latency = seconds
+            else:
+                self._latency += self.LATENCY_ALPHA * (seconds - self._latency)
+            self._latency_at = self._clock()
+
+    @property
+    def degraded(self) -> bool:
+        """Whether reviews should skip the relevancy model and DeepSeek for now."""
+        if not self.enabled:
+            return False
+        pressure = self._pressure()
+        with self._lock:
+            was_degraded = self._degraded
+            if was_degraded and pressure < self.RECOVERY_RATIO:
+                self._degraded = False
+            elif not was_degraded and pressure >= 1.0:
+                self._degraded = True
+            changed = self._degraded != was_degraded
+        if changed:
+            state = 'entered' if self._degraded else 'recovered'
+            TRANSITIONS_TOTAL.inc(state=state)
+            logger.warning("Degraded mode %s (%s)", state, self.snapshot())
+        return self._degraded
+
+    def snapshot(self) -> dict:
+        """Current signals and thresholds (for /health/load)."""
+        latency = self._recent_latency()
+        return {
+            'enabled': self.enabled,
+            'degraded': self._degraded,
+            'in_flight': self._in_flight,
+            'backlog': self._backlog,
+            'hf_latency_ms': round(latency * 1000, 1) if latency is not None else None,
+            'max_in_flight': self.max_in_flight,
+            'max_backlog': self.max_backlog,
+            'max_hf_latency_ms': round(self.max_hf_latency * 1000, 1),
+        }
+
+    def _pressure(self) -> float:
+        """Highest signal as a fraction of its threshold."""
+        ratios = [0.0]
+        if self.max_in_flight > 0:
+            ratios.append(self._in_flight / self.max_in_flight)
+        if self.max_backlog > 0:
+            ratios.append(self._current_backlog() / self.max_backlog)
+        latency = self._recent_latency()
+        if self.max_hf_latency > 0 and latency is not None:
+            ratios.append(latency / self.max_hf_latency)
+        return max(ratios)
+
+    def _recent_latency(self) -> Optional[float]:
+        # No recent calls (e.g. all skipped while degraded) is no evidence of slowness
+        if self._latency is None or self._clock() - self._latency_at > self.LATENCY_WINDOW_SECONDS:
+            return None
+        return self._latency
+
+    def _current_backlog(self) -> int:
+        if self._backlog_source is None:
+            return 0
+        now = self._clock()
+        with self._lock:
+            stale = self._backlog_at is None or now - self._backlog_at >= self.BACKLOG_REFRESH_SECONDS
+            if stale:
+                # Claim the refresh so concurrent requests keep the last count
+                self._backlog_at = now
+        if stale:
+            try:
+                self._backlog = self._backlog_source()
+            except Exception as e:
+                logger.error("Failed to count the review backlog: %s", e)
+        return self._backlog
+
+
+def record_latency(service: str, seconds: float) -> None:
+    """Feed an outbound call's latency to the process-wide monitor."""
+    LoadMonitor.instance().record_latency(service, seconds)
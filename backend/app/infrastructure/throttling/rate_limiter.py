@@ -0,0 +1,230 @@
+"""
+Rate Limiter
+Sliding-window request limiter for inbound API traffic.
+
+Uses the sliding-window counter approximation: the count of the current
+fixed window plus the previous window's count weighted by how much of it
+still overlaps the sliding window. It needs only two counters per key, so
+the same algorithm runs in-process or on a shared MongoDB collection.
+Rejected requests are taken back off the counter, so a client retrying while
+blocked does not extend its own block.
+"""
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a single rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: int  # Seconds until a request would be allowed (0 if allowed)
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process window counters.
+
+    Suitable for a single worker; with several workers each one enforces
+    the limit separately.
+    """
+
+    PRUNE_THRESHOLD = 10000
+
+    def __init__(self):
+        self._counters: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, key: str, window_start: int, window: int) -> Tuple[int, int]:
+        """
+        Count a hit in the window starting at `window_start`.
+
+        Returns:
+            Tuple of (previous window count, current window count including this hit)
+        """
+        with self._lock:
+            if len(self._counters) >= self.PRUNE_THRESHOLD:
+                self._prune(window_start - window)
+            current = self._counters.get((key, window_start), 0) + 1
+            self._counters[(key, window_start)] = current
+            return self._counters.get((key, window_start - window), 0), current
+
+    def decrement(self, key: str, window_start: int) -> None:
+        """Take back a hit counted by `increment` (the request was rejected)."""
+        with self._lock:
+            count = self._counters.get((key, window_start), 0) - 1
+            if count > 0:
+                self._counters[(key, window_start)] = count
+            else:
+                self._counters.pop((key, window_start), None)
+
+    def _prune(self, oldest_start: int) -> None:
+        self._counters = {k: v for k, v in self._counters.items() if k[1] >= oldest_start}
+
+
+class MongoRateLimitBackend:
+    """
+    Window counters shared between workers through MongoDB.
+
+    One document per key and window, incremented atomically with an upsert.
+    A TTL index on `expires_at` removes old windows.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self._indexes_ready = False
+
+    def _ensure_indexes(self) -> None:
+        if not self._indexes_ready:
+            self.collection.create_index('expires_at', expireAfterSeconds=0)
+            self._indexes_ready = True
+
+    def increment(self, key: str, window_start: int, window: int) -> Tuple[int, int]:
+        """
+        Count a hit in the window starting at `window_start`.
+
+        Returns:
+            Tuple of (previous window count, current window count including this hit)
+        """
+        from datetime import datetime, timezone
+        from pymongo import ReturnDocument
+
+        self._ensure_indexes()
+        expires_at = datetime.fromtimestamp(window_start + 2 * window, tz=timezone.utc)
+        doc = self.collection.find_one_and_update(
+            {'_id': f"{key}:{window_start}"},
+            {'$inc': {'count': 1}, '$setOnInsert': {'expires_at': expires_at}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        previous = self.collection.find_one({'_id': f"{key}:{window_start - window}"}, {'count': 1})
+        return (previous or {}).get('count', 0), doc['count']
+
+    def decrement(self, key: str, window_start: int) -> None:
+        """Take back a hit counted by `increment` (the request was rejected)."""
+        self.collection.update_one({'_id': f"{key}:{window_start}"}, {'$inc': {'count': -1}})
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limiter with pluggable counter storage.
+
+    Backend failures fail open (the request is allowed) so that a database
+    hiccup never takes the API down; they are counted in the metrics.
+    """
+
+    _instance: Optional['RateLimiter'] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, backend=None, enabled: bool = True, clock: Callable[[], float] = time.time):
+        """
+        Args:
+            backend: Counter storage (defaults to InMemoryRateLimitBackend)
+            enabled: When False every request is allowed
+            clock: Wall clock; windows must line up across workers
+        """
+        self.backend = backend or InMemoryRateLimitBackend()
+        self.enabled = enabled
+        self._clock = clock
+        self._metrics = defaultdict(lambda: {'allowed': 0, 'blocked': 0})
+        self._backend_errors = 0
+        self._metrics_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> 'RateLimiter':
+        """Return the process-wide limiter configured from app config."""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    from app.presentation.config import RATE_LIMIT_ENABLED, RATE_LIMIT_BACKEND
+                    backend = None
+                    if RATE_LIMIT_BACKEND == 'mongo':
+                        from app.infrastructure.database import MongoDBManager
+                        backend = MongoRateLimitBackend(MongoDBManager().db['rate_limits'])
+                    cls._instance = cls(backend=backend, enabled=RATE_LIMIT_ENABLED)
+        return cls._instance
+
+    def hit(self, scope: str, key: str, limit: int, window: int) -> RateLimitResult:
+        """
+        Record a request and decide whether it is allowed.
+
+        Args:
+            scope: Name of the limited endpoint (used for metrics and key namespacing)
+            key: Client identity (shop ID, JWT subject or IP)
+            limit: Allowed requests per window
+            window: Window length in seconds
+
+        Returns:
+            RateLimitResult
+        """
+        if not self.enabled:
+            return RateLimitResult(True, limit, limit, 0)
+
+        now = self._clock()
+        window_start = int(now // window) * window
+        try:
+            previous, current = self.backend.increment(f"{scope}:{key}", window_start, window)
+        except Exception as e:
+            logger.error("Rate limit backend error for %s: %s", scope, e)
+            with self._metrics_lock:
+                self._backend_errors += 1
+            return RateLimitResult(True, limit, limit, 0)
+
+        elapsed = now - window_start
+        weight = 1.0 - elapsed / window
+        estimated = previous * weight + current
+        allowed = estimated <= limit
+
+        if allowed:
+            result = RateLimitResult(True, limit, max(0, int(limit - estimated)), 0)
+        else:
+            current -= 1
+            try:
+                self.backend.decrement(f"{scope}:{key}", window_start)
+            except Exception as e:
+                logger.error("Rate limit backend error for %s: %s", scope, e)
+                with self._metrics_lock:
+                    self._backend_errors += 1
+            result = RateLimitResult(False, limit, 0, self._retry_after(previous, current, limit, window, elapsed))
+
+        with self._metrics_lock:
+            self._metrics[scope]['allowed' if allowed else 'blocked'] += 1
+        return result
+
+    @staticmethod
+    def _retry_after(previous: int, current: int, limit: int, window: int, elapsed: float) -> int:
+        """
+        Seconds until one more request fits under the limit.
+
+        `previous` and `current` are the allowed hits of the previous and
+        current windows; a request at `t` seconds into a window is allowed
+        when previous * (1 - t/window) + current + 1 <= limit.
+        """
+        room = limit - current - 1
+        if previous > 0 and room >= 0:
+            # Still in this window, once enough of the previous one has slid out
+            target = window * (1.0 - room / previous)
+            if target < window:
+                return max(1, math.ceil(target - elapsed))
+        # In the next window this window's count is the weighted one
+        # current * (1 - t/window) + 1 <= limit  =>  t >= window * (1 - (limit - 1) / current)
+        target = window * (1.0 - (limit - 1) / current) if current > 0 else 0.0
+        return max(1, math.ceil(window - elapsed + max(0.0, target)))
+
+    def metrics(self) -> dict:
+        """Snapshot of allowed/blocked counts per scope."""
+        with self._metrics_lock:
+            return {
+                'backend': type(self.backend).__name__,
+                'enabled': self.enabled,
+                'backend_errors': self._backend_errors,
+                'scopes': {scope: dict(counts) for scope, counts in self._metrics.items()}
+            }
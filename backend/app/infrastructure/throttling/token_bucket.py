@@ -0,0 +1,74 @@
+"""Thread-safe token bucket."""
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """
+    Classic token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    A bucket can also be blocked for a fixed period (e.g. when the remote
+    side answers with an explicit `retry_after`).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Refill rate in tokens per second
+            capacity: Maximum burst size (defaults to max(rate, 1))
+            clock: Monotonic clock, injectable for testing
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1.0))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def try_consume(self, tokens: float = 1.0) -> bool:
+        """Consume tokens if available. Returns True on success."""
+        with self._lock:
+            now = self._clock()
+            if now < self._blocked_until:
+                return False
+            self._refill(now)
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def time_until_available(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` can be consumed (0.0 if available now)."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            blocked = max(0.0, self._blocked_until - now)
+            missing = max(0.0, tokens - self._tokens)
+            return max(blocked, missing / self.rate)
+
+    def block_for(self, seconds: float) -> None:
+        """Block the bucket for `seconds`; it reopens with a single token."""
+        with self._lock:
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = min(1.0, self.capacity)
+            self._updated_at = self._blocked_until
+
+    @property
+    def is_idle(self) -> bool:
+        """True when the bucket is full and not blocked (safe to discard)."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            return now >= self._blocked_until and self._tokens >= self.capacity
@@ -1,21 +1,21 @@
 """Authentication routes."""
 from flask import Blueprint, request
-from app.application.services import AuthService
-from app.domain.services_interfaces import IAuthService
 from app.presentation.utils.response import ResponseBuilder
+from app.presentation.utils.middleware import rate_limit
 from app.application.dto.user_dto import RegisterDTO, LoginDTO
+from app.container import container
 
 auth_bp = Blueprint('auth', __name__)
-auth_service: IAuthService = AuthService()
 
 
 @auth_bp.route('/register', methods=['POST'])
+@rate_limit(limit=5, window=3600)
 def register():
     """Register a new user."""
     data = request.json or {}
     dto = RegisterDTO.from_dict(data)
 
-    result = auth_service.register(
+    result = container.auth_service.register(
         email=dto.email,
         password=dto.password,
         shop_name=dto.shop_name,
@@ -26,12 +26,13 @@ def register():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limit(limit=10, window=300)
 def login():
     """Login user."""
     data = request.json or {}
     dto = LoginDTO.from_dict(data)
 
-    result = auth_service.login(
+    result = container.auth_service.login(
         email=dto.email,
         password=dto.password
     )
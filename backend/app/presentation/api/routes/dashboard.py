@@ -3,12 +3,11 @@ from flask import Blueprint, request, jsonify
 from app.presentation.utils.middleware import token_required, handle_mongodb_errors
 from app.presentation.utils.response import ResponseBuilder
 from app.application.dto.dashboard_dto import DashboardDTO
-from app.application.services import DashboardService
-from app.domain.services_interfaces import IDashboardService
+from app.container import container
+from bson import ObjectId
 import logging
 
 dashboard_bp = Blueprint('dashboard', __name__)
-dashboard_service: IDashboardService = DashboardService()
 
 
 @dashboard_bp.route('/dashboard', methods=['GET'])
@@ -17,7 +16,7 @@ def get_dashboard():
     try:
         dto = DashboardDTO.from_request(request)
 
-        dashboard_data = dashboard_service.get_dashboard_data(dto.shop_id, request.email, request.shop_type)
+        dashboard_data = container.dashboard_service.get_dashboard_data(dto.shop_id, request.email, request.shop_type)
         if not dashboard_data:
             return ResponseBuilder.error("المتجر غير موجود", 404)
 
@@ -33,7 +32,7 @@ def get_dashboard():
 @token_required
 def get_rejected_dashboard():
     try:
-        rejected_data = dashboard_service.get_rejected_reviews(request.shop_id)
+        rejected_data = container.dashboard_service.get_rejected_reviews(request.shop_id)
         return ResponseBuilder.success(rejected_data, "تم جلب التقييمات المرفوضة", 200)
 
     except Exception as e:
@@ -47,11 +46,7 @@ def get_rejected_dashboard():
 def get_profile():
     """Get user profile information"""
     try:
-        from app.infrastructure.repositories import UserRepository
-        from bson import ObjectId
-        
-        user_repository = UserRepository()
-        user = user_repository.find_by_id(ObjectId(request.shop_id))
+        user = container.user_repository.find_by_id(ObjectId(request.shop_id))
         
         if not user:
              return ResponseBuilder.error("المستخدم غير موجود", 404)
@@ -62,7 +57,8 @@ def get_profile():
             "shop_type": user.shop_type,
             "shop_name": user.shop_name,
             "telegram_chat_id": user.telegram_chat_id,
-            "device_token": user.device_token
+            "device_token": user.device_token,
+            "device_tokens": user.notification_tokens
         }
         
         return ResponseBuilder.success(profile_data, "تم جلب معلومات الحساب", 200)
@@ -77,16 +73,12 @@ def get_profile():
 def update_profile():
     """تحديث معلومات المستخدم"""
     try:
-        from app.infrastructure.repositories import UserRepository
-        from bson import ObjectId
-        
-        user_repository = UserRepository()
         data = request.json or {}
         user_id = ObjectId(request.shop_id)
         
-        result = user_repository.update_user(user_id, data)
+        updated = container.user_repository.update_user(user_id, data)
         
-        if result and result.modified_count > 0:
+        if updated:
             return ResponseBuilder.success(None, "تم تحديث البيانات بنجاح", 200)
         else:
             return ResponseBuilder.success(None, "لم يتم إجراء أي تغييرات", 200)
@@ -94,3 +86,18 @@ def update_profile():
     except Exception as e:
         logging.error(f"Profile update failed: {e}")
         return ResponseBuilder.error("فشل في تحديث البيانات", 400)
+
+
+@dashboard_bp.route('/dashboard/inference-usage', methods=['GET'])
+@token_required
+def get_inference_usage():
+    """External model usage and estimated cost for the shop (?days=1..90, default 30)"""
+    try:
+        days = min(max(request.args.get('days', 30, type=int), 1), 90)
+        report = container.inference_usage_service.get_shop_report(request.shop_id, days)
+        return ResponseBuilder.success(report, "تم جلب استهلاك خدمات الذكاء الاصطناعي", 200)
+
+    except Exception as e:
+        error_message = handle_mongodb_errors(e)
+        logging.error("Inference usage retrieval failed: %s", e)
+        return ResponseBuilder.error(error_message, 400)
@@ -1,23 +1,19 @@
 """QR routes."""
 from flask import Blueprint, request, send_file
-from app.infrastructure.repositories import UserRepository
-from app.domain.services import QRService
-from app.domain.services_interfaces import IQRService
 from app.presentation.utils.middleware import token_required, rate_limit, handle_mongodb_errors
 from app.presentation.utils.response import ResponseBuilder
 from app.application.dto.qr_dto import QRDTO
 from app.presentation.config import TALLY_FORM_URL
+from app.container import container
 from bson import ObjectId
 import logging
 
 qr_bp = Blueprint('qr', __name__)
-user_repository = UserRepository()
-qr_service: IQRService = QRService()
 
 
 @qr_bp.route('/generate-qr', methods=['POST'])
 @token_required
-@rate_limit(limit=10, window=3600)
+@rate_limit(limit=10, window=3600, key='user')
 def generate_qr():
     try:
         dto = QRDTO.from_request(request)
@@ -27,13 +23,13 @@ def generate_qr():
         except:
             return ResponseBuilder.error("معرف المتجر غير صحيح", 400)
 
-        user = user_repository.find_by_id(shop_id_obj)
+        user = container.user_repository.find_by_id(shop_id_obj)
         if not user:
             return ResponseBuilder.error("المتجر غير موجود", 404)
 
         shop_name = user.shop_name or ''
 
-        qr_base64 = qr_service.generate_qr_with_type(dto.shop_id, dto.shop_type, shop_name)
+        qr_base64 = container.qr_service.generate_qr_with_type(dto.shop_id, dto.shop_type, shop_name)
 
         if not qr_base64:
             return ResponseBuilder.error("فشل في إنشاء رمز QR", 500)
@@ -57,7 +53,7 @@ def generate_qr():
 @qr_bp.route('/qr/<shop_id>', methods=['GET'])
 def get_qr(shop_id):
     try:
-        user = user_repository.find_by_id(ObjectId(shop_id))
+        user = container.user_repository.find_by_id(ObjectId(shop_id))
         if not user:
             return ResponseBuilder.error("المتجر غير موجود", 404)
 
@@ -65,7 +61,7 @@ def get_qr(shop_id):
         shop_name = user.shop_name or 'حاسر السمعة'
 
         # QR code generation (qr_code field not in Domain User model yet)
-        qr_base64 = qr_service.generate_qr_with_type(shop_id, shop_type, shop_name)
+        qr_base64 = container.qr_service.generate_qr_with_type(shop_id, shop_type, shop_name)
 
         url = f"{TALLY_FORM_URL}?shop_id={shop_id}&shop_type={shop_type}&shop_name={shop_name}"
 
@@ -1,19 +1,26 @@
 """Webhook routes."""
 from flask import Blueprint, request, jsonify
-from app.application.services import WebhookService
 from app.presentation.utils.response import ResponseBuilder
+from app.presentation.utils.middleware import rate_limit, traced
 from app.application.dto.review_dto import ReviewDTO
+from app.application.shared.exceptions import ReviewInProgressException
+from app.container import container
 from app.presentation.config import SIGNING_SECRET
 import logging
 import hmac
 import hashlib
 import base64
 
+logger = logging.getLogger(__name__)
+
 webhook_bp = Blueprint('webhook', __name__)
-webhook_service = WebhookService()
 
 
 @webhook_bp.route('/webhook', methods=['POST'])
+@traced('POST /webhook')
+# Keyed by sender IP with a ceiling far above Tally's bursts: it only stops
+# a single source flooding the endpoint; load is handled by degraded mode
+@rate_limit(limit=600, window=60, key='ip')
 def webhook():
     # Verify Signature
     # if SIGNING_SECRET:
@@ -34,27 +41,31 @@ def webhook():
         data = request.json or {}
 
         # The service layer now handles the raw dictionary directly.
-        result = webhook_service.process_review(data)
+        result = container.webhook_service.process_review(data)
         return ResponseBuilder.success(result, "تم حفظ التقييم بنجاح", 200)
 
+    except ReviewInProgressException as e:
+        logger.info("Retry of a submission still in progress")
+        return ResponseBuilder.error(e.message, e.status_code)
     except ValueError as e:
-        logging.warning(f"Validation error: {e}")
+        logger.warning("Validation error: %s", e)
         return ResponseBuilder.error(str(e), 400)
     except LookupError as e:
-        logging.warning(f"Duplicate or not found: {e}")
+        logger.warning("Duplicate or not found: %s", e)
         return ResponseBuilder.error(str(e), 400)
     except Exception as e:
-        logging.error(f"Webhook error: {e}", exc_info=True)
+        logger.error("Webhook error: %s", e, exc_info=True)
         return ResponseBuilder.error("Internal server error", 500)
 
 
 @webhook_bp.route('/webhook/telegram', methods=['POST'])
+@traced('POST /webhook/telegram')
 def telegram_webhook():
     """Endpoint for Telegram Webhook"""
     try:
         data = request.json or {}
-        webhook_service.process_telegram_webhook(data)
+        container.webhook_service.process_telegram_webhook(data)
         return ResponseBuilder.success(None, "OK", 200)
     except Exception as e:
-        logging.error(f"Telegram Webhook error: {e}", exc_info=True)
+        logger.error("Telegram Webhook error: %s", e, exc_info=True)
         return ResponseBuilder.error("Internal server error", 500)
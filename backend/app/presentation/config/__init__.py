@@ -24,16 +24,62 @@ _config = get_config()
 SECRET_KEY = _config.SECRET_KEY
 MONGO_URI = _config.MONGO_URI
 DATABASE_NAME = _config.DATABASE_NAME
+BCRYPT_ROUNDS = _config.BCRYPT_ROUNDS
+PASSWORD_HASH_WORKERS = _config.PASSWORD_HASH_WORKERS
+PASSWORD_HASH_MAX_CONCURRENT = _config.PASSWORD_HASH_MAX_CONCURRENT
+PASSWORD_HASH_QUEUE_TIMEOUT = _config.PASSWORD_HASH_QUEUE_TIMEOUT
 HF_TOKEN = _config.HF_TOKEN
 HF_SENTIMENT_MODEL_URL = _config.HF_SENTIMENT_MODEL_URL
 HF_TOXICITY_MODEL_URL = _config.HF_TOXICITY_MODEL_URL
 HF_ARABIC_TOXICITY_MODEL_URL = _config.HF_ARABIC_TOXICITY_MODEL_URL
 API_URL = _config.API_URL
 MODEL_ID = _config.MODEL_ID
+HF_COST_PER_CALL = _config.HF_COST_PER_CALL
+DEEPSEEK_COST_PER_1K_PROMPT_TOKENS = _config.DEEPSEEK_COST_PER_1K_PROMPT_TOKENS
+DEEPSEEK_COST_PER_1K_COMPLETION_TOKENS = _config.DEEPSEEK_COST_PER_1K_COMPLETION_TOKENS
 FIREBASE_JSON = _config.FIREBASE_JSON
 TELEGRAM_TOKEN = _config.TELEGRAM_TOKEN
+TELEGRAM_API_URL = _config.TELEGRAM_API_URL
+TELEGRAM_GLOBAL_RATE_LIMIT = _config.TELEGRAM_GLOBAL_RATE_LIMIT
+TELEGRAM_PER_CHAT_RATE_LIMIT = _config.TELEGRAM_PER_CHAT_RATE_LIMIT
+TELEGRAM_MAX_RETRIES = _config.TELEGRAM_MAX_RETRIES
+TELEGRAM_DELIVERY = _config.TELEGRAM_DELIVERY
+SERVERLESS = _config.SERVERLESS
+TELEGRAM_DIGEST_THRESHOLD = _config.TELEGRAM_DIGEST_THRESHOLD
+TELEGRAM_DIGEST_WINDOW_SECONDS = _config.TELEGRAM_DIGEST_WINDOW_SECONDS
+RATE_LIMIT_ENABLED = _config.RATE_LIMIT_ENABLED
+RATE_LIMIT_BACKEND = _config.RATE_LIMIT_BACKEND
+TRUSTED_PROXY_COUNT = _config.TRUSTED_PROXY_COUNT
+OPS_TOKEN = _config.OPS_TOKEN
+TRACE_EXPORTER = _config.TRACE_EXPORTER
+TRACE_DIR = _config.TRACE_DIR
 TALLY_FORM_URL = _config.TALLY_FORM_URL
+IDEMPOTENCY_ENABLED = _config.IDEMPOTENCY_ENABLED
+IDEMPOTENCY_WAIT_SECONDS = _config.IDEMPOTENCY_WAIT_SECONDS
+IDEMPOTENCY_TTL_SECONDS = _config.IDEMPOTENCY_TTL_SECONDS
+PIPELINE_LEASE_SECONDS = _config.PIPELINE_LEASE_SECONDS
+PIPELINE_MAX_ATTEMPTS = _config.PIPELINE_MAX_ATTEMPTS
+PIPELINE_RETRY_FALLBACKS = _config.PIPELINE_RETRY_FALLBACKS
+DEGRADED_MODE_ENABLED = _config.DEGRADED_MODE_ENABLED
+DEGRADED_MAX_IN_FLIGHT = _config.DEGRADED_MAX_IN_FLIGHT
+DEGRADED_MAX_BACKLOG = _config.DEGRADED_MAX_BACKLOG
+DEGRADED_HF_LATENCY_SECONDS = _config.DEGRADED_HF_LATENCY_SECONDS
+WORKER_CONCURRENCY = _config.WORKER_CONCURRENCY
+WORKER_SHOP_CONCURRENCY = _config.WORKER_SHOP_CONCURRENCY
+WORKER_SHOP_CONCURRENCY_OVERRIDES = _config.WORKER_SHOP_CONCURRENCY_OVERRIDES
+WORKER_SHOP_WEIGHTS = _config.WORKER_SHOP_WEIGHTS
+WORKER_FETCH_PER_SHOP = _config.WORKER_FETCH_PER_SHOP
+WORKER_PRIORITY_AGING_SECONDS = _config.WORKER_PRIORITY_AGING_SECONDS
 QUALITY_GATE_THRESHOLD = _config.QUALITY_GATE_THRESHOLD
+TOXICITY_CASCADE_ENABLED = _config.TOXICITY_CASCADE_ENABLED
+TOXICITY_LOCAL_CLEAN_MAX = _config.TOXICITY_LOCAL_CLEAN_MAX
+TOXICITY_LOCAL_TOXIC_MIN = _config.TOXICITY_LOCAL_TOXIC_MIN
+TOXICITY_AUDIT_RATE = _config.TOXICITY_AUDIT_RATE
+RELEVANCY_LEXICON_ENABLED = _config.RELEVANCY_LEXICON_ENABLED
+RELEVANCY_LEXICON_REFRESH_SECONDS = _config.RELEVANCY_LEXICON_REFRESH_SECONDS
+SENTIMENT_LOCAL_MODEL_ENABLED = _config.SENTIMENT_LOCAL_MODEL_ENABLED
+SENTIMENT_LOCAL_MODEL_PATH = _config.SENTIMENT_LOCAL_MODEL_PATH
+SENTIMENT_LOCAL_MIN_CONFIDENCE = _config.SENTIMENT_LOCAL_MIN_CONFIDENCE
 SHOP_TYPES = _config.SHOP_TYPES
 SIGNING_SECRET = _config.SIGNING_SECRET
 
@@ -1,10 +1,20 @@
 """Base configuration class for all environments."""
 import os
-from typing import List
+from typing import Callable, Dict, List
 from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def _parse_shop_map(name: str, cast: Callable[[str], float]) -> Dict[str, float]:
+    """Parse a `<shop_id>:<value>,...` environment variable."""
+    entries = {}
+    for entry in os.environ.get(name, '').split(','):
+        if ':' in entry:
+            shop_id, value = entry.rsplit(':', 1)
+            entries[shop_id.strip()] = cast(value.strip())
+    return entries
+
 class BaseConfig:
     """Base configuration with common settings."""
     
@@ -15,6 +25,9 @@ class BaseConfig:
     
     DEBUG = False
     TESTING = False
+    # Vercel / Lambda: the process is frozen after each response, so nothing
+    # may be left to background threads or timers
+    SERVERLESS = bool(os.environ.get('VERCEL') or os.environ.get('AWS_LAMBDA_FUNCTION_NAME'))
     
     # MongoDB
     MONGO_URI = os.environ.get('MONGO_URI')
@@ -32,6 +45,12 @@ class BaseConfig:
     # JWT
     JWT_ACCESS_TOKEN_EXPIRES = 2592000  # 30 days in seconds
     
+    # Password hashing (bcrypt runs on a bounded worker pool)
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_CONCURRENT = int(os.environ.get('PASSWORD_HASH_MAX_CONCURRENT', 4))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5))  # seconds
+    
     # External APIs
     HF_TOKEN = os.environ.get('HF_TOKEN')
     HF_SENTIMENT_MODEL_URL = os.environ.get('HF_SENTIMENT_MODEL_URL')
@@ -40,14 +59,100 @@ class BaseConfig:
     API_URL = os.environ.get("API_URL")
     MODEL_ID = os.environ.get("MODEL_ID")
     
+    # Inference cost estimates (currency units; 0 = not priced)
+    HF_COST_PER_CALL = float(os.environ.get('HF_COST_PER_CALL', 0))
+    DEEPSEEK_COST_PER_1K_PROMPT_TOKENS = float(os.environ.get('DEEPSEEK_COST_PER_1K_PROMPT_TOKENS', 0))
+    DEEPSEEK_COST_PER_1K_COMPLETION_TOKENS = float(os.environ.get('DEEPSEEK_COST_PER_1K_COMPLETION_TOKENS', 0))
+    
     # Firebase
     FIREBASE_JSON = os.environ.get('FIREBASE_JSON')
     
     # Telegram
     TELEGRAM_TOKEN = os.environ.get('TELEGRAM_TOKEN')
+    TELEGRAM_API_URL = os.environ.get('TELEGRAM_API_URL', 'https://api.telegram.org')
+    TELEGRAM_GLOBAL_RATE_LIMIT = float(os.environ.get('TELEGRAM_GLOBAL_RATE_LIMIT', 30))  # messages/second
+    TELEGRAM_PER_CHAT_RATE_LIMIT = float(os.environ.get('TELEGRAM_PER_CHAT_RATE_LIMIT', 1))  # messages/second
+    TELEGRAM_MAX_RETRIES = int(os.environ.get('TELEGRAM_MAX_RETRIES', 5))
+    # 'queue' sends from a background thread; 'inline' sends before the
+    # request returns (required on serverless, where the thread is frozen)
+    TELEGRAM_DELIVERY = os.environ.get('TELEGRAM_DELIVERY', 'inline' if SERVERLESS else 'queue')
+    # Digest mode: above THRESHOLD reviews per WINDOW for one chat, reviews are
+    # collapsed into one summary message per window (0 = off). A digest is
+    # sent when its window ends, or on serverless with the chat's next review
+    TELEGRAM_DIGEST_THRESHOLD = int(os.environ.get('TELEGRAM_DIGEST_THRESHOLD', 0))
+    TELEGRAM_DIGEST_WINDOW_SECONDS = float(os.environ.get('TELEGRAM_DIGEST_WINDOW_SECONDS', 300))
+    
+    # Rate limiting: 'memory' (per worker) or 'mongo' (shared between workers)
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    # Proxies in front of the app that append to X-Forwarded-For (Vercel: 1);
+    # the client IP is read that many entries from the right, 0 uses the socket
+    TRUSTED_PROXY_COUNT = int(os.environ.get('TRUSTED_PROXY_COUNT', 1))
+    
+    # Operational endpoints (/metrics, /health/rate-limits, /health/load,
+    # /health/startup) require 'Authorization: Bearer OPS_TOKEN'; unset, they
+    # only answer clients on the loopback interface
+    OPS_TOKEN = os.environ.get('OPS_TOKEN', '')
+    
+    # Webhook idempotency: a Tally delivery claims its submission for
+    # PIPELINE_LEASE_SECONDS; retries arriving meanwhile wait up to WAIT
+    # seconds for the result, and completed results are replayed for TTL seconds
+    IDEMPOTENCY_ENABLED = os.environ.get('IDEMPOTENCY_ENABLED', 'true').lower() == 'true'
+    IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get('IDEMPOTENCY_WAIT_SECONDS', 10))
+    IDEMPOTENCY_TTL_SECONDS = float(os.environ.get('IDEMPOTENCY_TTL_SECONDS', 3 * 24 * 3600))
+    
+    # Review pipeline checkpoints: a review being processed holds a LEASE of
+    # this many seconds, renewed while its run is alive; worker.py resumes
+    # reviews whose lease expired, up to MAX_ATTEMPTS runs. With
+    # RETRY_FALLBACKS, a review whose DeepSeek call fell
+    # back is left for the worker to retry instead of saved with the fallback
+    PIPELINE_LEASE_SECONDS = float(os.environ.get('PIPELINE_LEASE_SECONDS', 300))
+    PIPELINE_MAX_ATTEMPTS = int(os.environ.get('PIPELINE_MAX_ATTEMPTS', 3))
+    PIPELINE_RETRY_FALLBACKS = os.environ.get('PIPELINE_RETRY_FALLBACKS', 'false').lower() == 'true'
+    
+    # Degraded mode: above MAX_IN_FLIGHT reviews in a process, MAX_BACKLOG
+    # reviews in the pipeline or HF_LATENCY seconds of average HF latency,
+    # reviews skip the relevancy model and DeepSeek and are enriched later by
+    # worker.py (so only enable it where the worker runs)
+    DEGRADED_MODE_ENABLED = os.environ.get('DEGRADED_MODE_ENABLED', 'false').lower() == 'true'
+    DEGRADED_MAX_IN_FLIGHT = int(os.environ.get('DEGRADED_MAX_IN_FLIGHT', 16))
+    DEGRADED_MAX_BACKLOG = int(os.environ.get('DEGRADED_MAX_BACKLOG', 500))
+    DEGRADED_HF_LATENCY_SECONDS = float(os.environ.get('DEGRADED_HF_LATENCY_SECONDS', 4.0))
+    
+    # Review worker: CONCURRENCY jobs at once, shared across shops by weighted
+    # deficit round-robin. A shop runs at most SHOP_CONCURRENCY jobs at once and
+    # gets a weight of 1 per turn; both can be overridden per shop as
+    # "<shop_id>:<value>,...". FETCH_PER_SHOP is how many of each shop's
+    # waiting reviews are read per poll. Higher priority reviews run first; a
+    # review rises one priority level per PRIORITY_AGING_SECONDS waited
+    WORKER_CONCURRENCY = int(os.environ.get('WORKER_CONCURRENCY', 4))
+    WORKER_SHOP_CONCURRENCY = int(os.environ.get('WORKER_SHOP_CONCURRENCY', 1))
+    WORKER_SHOP_CONCURRENCY_OVERRIDES = _parse_shop_map('WORKER_SHOP_CONCURRENCY_OVERRIDES', int)
+    WORKER_SHOP_WEIGHTS = _parse_shop_map('WORKER_SHOP_WEIGHTS', float)
+    WORKER_FETCH_PER_SHOP = int(os.environ.get('WORKER_FETCH_PER_SHOP', 20))
+    WORKER_PRIORITY_AGING_SECONDS = float(os.environ.get('WORKER_PRIORITY_AGING_SECONDS', 300))
     
     # Business Logic
     QUALITY_GATE_THRESHOLD = float(os.environ.get('QUALITY_GATE_THRESHOLD', 0.65))
+    # Toxicity cascade: local scores <= CLEAN_MAX are non-toxic and >= TOXIC_MIN
+    # toxic without calling the model; AUDIT_RATE of those local decisions are
+    # still checked against the model to measure agreement
+    TOXICITY_CASCADE_ENABLED = os.environ.get('TOXICITY_CASCADE_ENABLED', 'true').lower() == 'true'
+    TOXICITY_LOCAL_CLEAN_MAX = float(os.environ.get('TOXICITY_LOCAL_CLEAN_MAX', 0.1))
+    TOXICITY_LOCAL_TOXIC_MIN = float(os.environ.get('TOXICITY_LOCAL_TOXIC_MIN', 0.9))
+    TOXICITY_AUDIT_RATE = float(os.environ.get('TOXICITY_AUDIT_RATE', 0.05))
+    # Relevancy lexicon: accept reviews that clearly match the shop type before
+    # zero-shot NLI; learned terms (build_relevancy_lexicon.py) reload every REFRESH
+    RELEVANCY_LEXICON_ENABLED = os.environ.get('RELEVANCY_LEXICON_ENABLED', 'true').lower() == 'true'
+    RELEVANCY_LEXICON_REFRESH_SECONDS = float(os.environ.get('RELEVANCY_LEXICON_REFRESH_SECONDS', 600))
+    # Local sentiment model (train_sentiment_model.py): predictions with
+    # confidence >= MIN_CONFIDENCE are used, the rest go to the HF model
+    SENTIMENT_LOCAL_MODEL_ENABLED = os.environ.get('SENTIMENT_LOCAL_MODEL_ENABLED', 'true').lower() == 'true'
+    SENTIMENT_LOCAL_MODEL_PATH = os.environ.get(
+        'SENTIMENT_LOCAL_MODEL_PATH',
+        os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'models', 'sentiment_local.json.gz'))
+    )
+    SENTIMENT_LOCAL_MIN_CONFIDENCE = float(os.environ.get('SENTIMENT_LOCAL_MIN_CONFIDENCE', 0.85))
     
     # Other
     TALLY_FORM_URL = os.environ.get('TALLY_FORM_URL')
@@ -64,4 +169,17 @@ class BaseConfig:
     
     # Logging
     LOG_LEVEL = 'INFO'
-    LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s: %(message)s'
+    LOG_FORMAT = '[%(asctime)s] %(levelname)s in %(module)s [trace=%(trace_id)s]: %(message)s'
+    # JSON lines (default) or the LOG_FORMAT text lines
+    LOG_JSON = os.environ.get('LOG_JSON', 'true').lower() == 'true'
+    # Fraction of INFO logs kept from the webhook pipeline and external services
+    # (decided per trace, so a kept review keeps all its lines)
+    LOG_INFO_SAMPLE_RATE = float(os.environ.get('LOG_INFO_SAMPLE_RATE', '1.0'))
+    
+    # Tracing: 'none', 'json' (span per line) or 'otlp' (OTLP/JSON batches per line)
+    TRACE_EXPORTER = os.environ.get('TRACE_EXPORTER', 'none')
+    TRACE_DIR = os.environ.get(
+        'TRACE_DIR',
+        '/tmp/traces' if SERVERLESS
+        else os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'logs', 'traces'))
+    )
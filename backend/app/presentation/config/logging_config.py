@@ -1,8 +1,9 @@
 """Logging configuration."""
 import logging
-import os
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
+from app.infrastructure.observability import log_pipeline
+from app.infrastructure.observability.log_pipeline import JsonFormatter, LogPipeline
 
 def setup_logging(app):
     """Configure application logging."""
@@ -10,7 +11,8 @@ def setup_logging(app):
     # Determine log directory based on environment
     # Use /tmp for serverless (Vercel) since file system is read-only
     # Use local logs directory for development
-    if os.environ.get('VERCEL') or os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+    serverless = app.config.get('SERVERLESS', False)
+    if serverless:
         # Serverless environment - use /tmp
         log_dir = Path('/tmp/logs')
     else:
@@ -28,8 +30,11 @@ def setup_logging(app):
     # Get log level from config
     log_level = getattr(logging, app.config.get('LOG_LEVEL', 'INFO'))
     
-    # Format
-    formatter = logging.Formatter(app.config.get('LOG_FORMAT'))
+    # Format: one JSON object per line, or the plain text LOG_FORMAT
+    if app.config.get('LOG_JSON', True):
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(app.config.get('LOG_FORMAT'))
     
     # File handler for all logs
     file_handler = RotatingFileHandler(
@@ -54,11 +59,28 @@ def setup_logging(app):
     console_handler.setFormatter(formatter)
     console_handler.setLevel(log_level)
     
-    # Configure app logger
+    # Handlers run on a listener thread; request threads only enqueue
+    # records (with their trace ID already attached). Serverless processes
+    # freeze after the response, so there the handlers run inline.
+    pipeline = LogPipeline(
+        (file_handler, error_handler, console_handler),
+        sample_rate=app.config.get('LOG_INFO_SAMPLE_RATE', 1.0),
+        synchronous=serverless
+    )
+    
+    # Configure app logger and the root logger, which module loggers
+    # (logging.getLogger(__name__)) propagate to
     app.logger.handlers.clear()
-    app.logger.addHandler(file_handler)
-    app.logger.addHandler(error_handler)
-    app.logger.addHandler(console_handler)
+    app.logger.propagate = False
     app.logger.setLevel(log_level)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    # Driver debug output would flood the queue in development
+    for noisy in ('pymongo', 'urllib3'):
+        logging.getLogger(noisy).setLevel(max(log_level, logging.WARNING))
+    log_pipeline.install(pipeline, (app.logger, root_logger))
     
-    app.logger.info(f"Logging configured with level: {app.config.get('LOG_LEVEL')}, logs directory: {log_dir}")
+    app.logger.info(
+        "Logging configured with level: %s, logs directory: %s, INFO sample rate: %s",
+        app.config.get('LOG_LEVEL'), log_dir, app.config.get('LOG_INFO_SAMPLE_RATE', 1.0)
+    )
@@ -9,5 +9,8 @@ class TestingConfig(BaseConfig):
     # Use test database
     DATABASE_NAME = 'ReputationGuardian_Test'
     
+    # Cheap hashes keep auth tests fast
+    BCRYPT_ROUNDS = 4
+    
     # Disable external services in tests
     LOG_LEVEL = 'ERROR'
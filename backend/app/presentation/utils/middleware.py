@@ -1,7 +1,10 @@
-from flask import request, jsonify
+from flask import request, jsonify, make_response
 from functools import wraps
+import hmac
+import ipaddress
 import jwt
 from app.presentation.config import get_config
+from app.presentation.utils.response import ResponseBuilder
 import logging
 
 config = get_config()
@@ -88,17 +91,120 @@ def sanitize_input(value):
 
     return value
 
-def rate_limit(limit=100, window=3600):
+def _client_ip():
     """
-    Simple rate limiting decorator (basic implementation)
-    In production, use flask-limiter or similar
+    Client IP as seen by the trusted proxies.
+
+    Each of the TRUSTED_PROXY_COUNT proxies in front of the app appends the
+    address it received the request from to X-Forwarded-For, so the client
+    is that many entries from the right; entries further left are whatever
+    the client sent and are ignored. Without trusted proxies (or with fewer
+    hops than expected) the socket address is used.
+    """
+    hops = config.TRUSTED_PROXY_COUNT
+    forwarded = [hop.strip() for hop in request.headers.get('X-Forwarded-For', '').split(',') if hop.strip()]
+    if hops > 0 and len(forwarded) >= hops:
+        return forwarded[-hops]
+    return request.remote_addr or 'unknown'
+
+def _is_loopback(address):
+    try:
+        return ipaddress.ip_address(address).is_loopback
+    except ValueError:
+        return False
+
+def ops_access_required(f):
+    """
+    Guard for operational endpoints (metrics and internal health reports)
+
+    With OPS_TOKEN set the request must carry 'Authorization: Bearer
+    <OPS_TOKEN>'. Without it only local requests are served: both the socket
+    peer and the forwarded client address have to be loopback, so neither a
+    spoofed X-Forwarded-For nor a local reverse proxy opens the endpoint up.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if config.OPS_TOKEN:
+            auth_header = request.headers.get('Authorization', '')
+            token = auth_header[len('Bearer '):] if auth_header.startswith('Bearer ') else ''
+            if not hmac.compare_digest(token.encode(), config.OPS_TOKEN.encode()):
+                return jsonify({'error': 'Invalid or missing ops token'}), 401
+        elif not (_is_loopback(request.remote_addr or '') and _is_loopback(_client_ip())):
+            return jsonify({'error': 'Not available'}), 403
+
+        return f(*args, **kwargs)
+
+    return decorated_function
+
+RATE_LIMIT_KEY_FUNCTIONS = {
+    'ip': lambda: f"ip:{_client_ip()}",
+    # JWT subject; requires token_required to run first
+    'user': lambda: f"shop:{request.shop_id}" if getattr(request, 'shop_id', None) else f"ip:{_client_ip()}",
+}
+
+def rate_limit(limit=100, window=3600, key='ip', scope=None):
+    """
+    Sliding-window rate limiting decorator
+
+    Args:
+        limit: Allowed requests per window
+        window: Window length in seconds
+        key: 'ip', 'user' (JWT shop_id) or a callable
+        scope: Counter namespace (defaults to the endpoint function name)
+
+    Rejected requests get 429 with Retry-After; every response carries
+    X-RateLimit-Limit / X-RateLimit-Remaining.
+    """
+    key_function = key if callable(key) else RATE_LIMIT_KEY_FUNCTIONS[key]
+
+    def decorator(f):
+        limit_scope = scope or f.__name__
+
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+            from app.infrastructure.throttling import RateLimiter
+
+            client_key = key_function()
+            result = RateLimiter.instance().hit(limit_scope, client_key, limit, window)
+            if not result.allowed:
+                logging.warning("Rate limit exceeded for %s (%s)", limit_scope, client_key)
+                response, status_code = ResponseBuilder.error(
+                    "تم تجاوز الحد المسموح من الطلبات، يرجى المحاولة لاحقاً", 429
+                )
+                response.headers['Retry-After'] = str(result.retry_after)
+            else:
+                response = make_response(f(*args, **kwargs))
+                status_code = response.status_code
+
+            response.headers['X-RateLimit-Limit'] = str(result.limit)
+            response.headers['X-RateLimit-Remaining'] = str(result.remaining)
+            return response, status_code
+        return wrapped
+    return decorator
+
+def traced(name=None):
+    """
+    Run the endpoint inside a new trace
+
+    Continues the caller's trace when a W3C traceparent header is sent,
+    and returns the trace ID in the X-Trace-Id response header.
     """
     def decorator(f):
         @wraps(f)
         def wrapped(*args, **kwargs):
-            # Basic rate limiting logic (you should implement proper rate limiting)
-            # For now, just pass through
-            return f(*args, **kwargs)
+            from app.infrastructure.observability.tracing import start_trace
+
+            with start_trace(
+                name or f"{request.method} {request.path}",
+                traceparent_header=request.headers.get('traceparent'),
+                **{'http.route': request.path, 'client.address': _client_ip()}
+            ) as root:
+                response = make_response(f(*args, **kwargs))
+                root.set_attribute('http.status_code', response.status_code)
+                if response.status_code >= 500:
+                    root.status = 'error'
+                response.headers['X-Trace-Id'] = root.trace_id
+                return response
         return wrapped
     return decorator
 
@@ -0,0 +1 @@
+"""Dashboard read-path benchmark against a seeded local MongoDB (see run.py)."""
@@ -0,0 +1,3 @@
+from benchmarks.dashboard.run import main
+
+main()
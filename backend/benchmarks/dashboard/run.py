@@ -0,0 +1,187 @@
+"""
+Dashboard Scale Benchmark
+=========================
+
+Seeds a local MongoDB with one shop per size (1k/10k/100k reviews by default)
+in the real nested review schema, then measures the /dashboard read path for
+each shop: the raw Mongo reads, the repository reads (reads + entity
+mapping), DashboardService.get_dashboard_data and the JSON response
+serialization. It reports time and peak Python memory for each phase.
+
+Usage (from the backend directory, with MongoDB running):
+    python -m benchmarks.dashboard                                  # 1k, 10k, 100k reviews
+    python -m benchmarks.dashboard --sizes 1000,10000 --repeat 10
+    python -m benchmarks.dashboard --json before.json               # keep the numbers
+    python -m benchmarks.dashboard --compare before.json            # after a change
+    python -m benchmarks.dashboard --drop                           # remove the benchmark database
+
+Seeded shops are reused across runs (seeding 100k reviews takes a while);
+pass --reseed to rebuild them. Memory is measured in a separate pass with
+tracemalloc so its overhead does not affect the timings.
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+STATUSES = ('processed', 'rejected_low_quality', 'rejected_irrelevant')
+SHOP_TYPE = "مطعم"
+PHASES = ('mongo_fetch', 'repository_reads', 'get_dashboard_data', 'serialization')
+
+
+def timed(func: Callable[[], object], repeat: int) -> List[float]:
+    """Wall time of `repeat` calls in milliseconds (after one warm-up call)."""
+    func()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def peak_memory(func: Callable[[], object]) -> int:
+    """Peak bytes allocated by Python while `func` runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _phases(shop_id: str, review_repository, dashboard_service, flask_app) -> Dict[str, Callable[[], object]]:
+    """The measured steps of GET /dashboard for one shop."""
+    from app.presentation.utils.response import ResponseBuilder
+
+    collection = review_repository.collection
+    dashboard_data = dashboard_service.get_dashboard_data(shop_id, '', SHOP_TYPE)
+
+    def serialize():
+        with flask_app.app_context():
+            response, _ = ResponseBuilder.success(dashboard_data, "تم جلب بيانات لوحة التحكم", 200)
+            return response.get_data()
+
+    return {
+        'mongo_fetch': lambda: [list(collection.find({'shop_id': shop_id, 'status': s})) for s in STATUSES],
+        'repository_reads': lambda: [review_repository.find_by_status(shop_id, s) for s in STATUSES],
+        'get_dashboard_data': lambda: dashboard_service.get_dashboard_data(shop_id, '', SHOP_TYPE),
+        'serialization': serialize,
+    }
+
+
+def run(args) -> dict:
+    os.environ.setdefault('SECRET_KEY', 'dashboard-benchmark')
+    os.environ.setdefault('MONGO_URI', args.mongo_uri)
+
+    from flask import Flask
+    from app.application.services.dashboard_service import DashboardService
+    from app.infrastructure.database import MongoDBManager
+    from app.infrastructure.repositories import ReviewRepository, UserRepository
+    from benchmarks.dashboard.seed import seed_shop
+
+    manager = MongoDBManager()
+    manager.initialize(args.mongo_uri, args.database)
+    user_repository = UserRepository()
+    review_repository = ReviewRepository()
+    dashboard_service = DashboardService(user_repository, review_repository)
+    flask_app = Flask('dashboard-benchmark')
+
+    shops = {}
+    for size in args.sizes:
+        started = time.perf_counter()
+        shops[size] = seed_shop(
+            user_repository, review_repository.collection, size, SHOP_TYPE, args.seed, args.reseed
+        )
+        print(f"shop with {size} reviews ready ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+
+    results = {}
+    for size, shop_id in shops.items():
+        phases = _phases(shop_id, review_repository, dashboard_service, flask_app)
+        rows = {}
+        for name in PHASES:
+            durations = timed(phases[name], args.repeat)
+            rows[name] = {
+                'median_ms': round(statistics.median(durations), 2),
+                'min_ms': round(min(durations), 2),
+                'max_ms': round(max(durations), 2),
+                'peak_mb': round(peak_memory(phases[name]) / 2 ** 20, 2),
+            }
+        status_counts = {
+            s: review_repository.collection.count_documents({'shop_id': shop_id, 'status': s}) for s in STATUSES
+        }
+        results[str(size)] = {
+            'shop_id': shop_id,
+            'reviews_by_status': status_counts,
+            'response_kb': round(len(phases['serialization']()) / 1024, 1),
+            'phases': rows,
+        }
+
+    report = {
+        'config': {'sizes': args.sizes, 'repeat': args.repeat, 'seed': args.seed, 'database': args.database},
+        'review_indexes': sorted(review_repository.collection.index_information()),
+        'results': results,
+    }
+    if args.drop:
+        manager.client.drop_database(args.database)
+    return report
+
+
+def print_report(report: dict, previous: Optional[dict] = None) -> None:
+    print(f"\nIndexes on reviews: {', '.join(report['review_indexes'])}")
+    header = f"{'phase':<22} {'median ms':>10} {'min ms':>10} {'max ms':>10} {'peak MB':>9} {'vs before':>10}"
+    for size, result in report['results'].items():
+        counts = ', '.join(f"{k} {v}" for k, v in result['reviews_by_status'].items())
+        print(f"\n{size} reviews ({counts}); response {result['response_kb']} KB")
+        print(header)
+        print('-' * len(header))
+        before = ((previous or {}).get('results', {}).get(size) or {}).get('phases', {})
+        for name, row in result['phases'].items():
+            change = ''
+            if name in before and before[name]['median_ms']:
+                change = f"{row['median_ms'] / before[name]['median_ms'] - 1:+.1%}"
+            print(
+                f"{name:<22} {row['median_ms']:>10.2f} {row['min_ms']:>10.2f} {row['max_ms']:>10.2f} "
+                f"{row['peak_mb']:>9.2f} {change:>10}"
+            )
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--sizes', type=lambda v: [int(s) for s in v.split(',')], default=list(DEFAULT_SIZES),
+        help='Comma-separated review counts, one shop each'
+    )
+    parser.add_argument('--repeat', type=int, default=5, help='Timed calls per phase')
+    parser.add_argument('--mongo-uri', default=os.environ.get('MONGO_URI', 'mongodb://localhost:27017'))
+    parser.add_argument('--database', default='ReputationGuardian_DashboardBench')
+    parser.add_argument('--reseed', action='store_true', help='Rebuild the seeded shops')
+    parser.add_argument('--drop', action='store_true', help='Drop the benchmark database afterwards')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Write the report to this file')
+    parser.add_argument('--compare', help='Report from an earlier run to compare medians with')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.CRITICAL, stream=sys.stderr)
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+    report = run(args)
+    print_report(report, previous)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
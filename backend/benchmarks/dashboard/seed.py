@@ -0,0 +1,161 @@
+"""
+Seed shops and reviews for the dashboard benchmark.
+
+Review documents are built with the pipeline's own ReviewDocument model and
+stored the way ReviewRepository.create_review stores them, so the benchmark
+reads the real nested schema (`source`, `processing`, `analysis`,
+`generated_content`). Seeding is reproducible: the same seed and size give
+the same documents.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+from bson import ObjectId
+
+from app.application.dto.review_processing_dto import Processing, ReviewDocument, Source
+from app.domain.models.user import User
+
+from benchmarks.load_test.payloads import ABUSIVE, IMPROVEMENTS, NEGATIVE, OFF_TOPIC, POSITIVE
+
+SEED_MARKER = 'dashboard-benchmark'
+INSERT_BATCH = 1000
+
+# (status, weight) as seen in production: most reviews pass both gates
+STATUS_MIX = (
+    ('processed', 0.80),
+    ('rejected_low_quality', 0.12),
+    ('rejected_irrelevant', 0.08),
+)
+CATEGORIES = ("مدح", "شكوى", "اقتراح", "استفسار", "محايد")
+THEMES = ("الخدمة", "الأسعار", "النظافة", "السرعة", "الجودة", "الموظفين", "التوصيل")
+QUALITY_FLAGS = ("too_short", "high_repetition", "low_valid_chars", "toxic_content", "rating_text_mismatch")
+
+
+def _quality(rng: random.Random, passed: bool) -> dict:
+    score = rng.uniform(0.55, 1.0) if passed else rng.uniform(0.1, 0.45)
+    flags = [] if passed else rng.sample(QUALITY_FLAGS, rng.randint(1, 2))
+    return {
+        'quality_score': round(score, 2),
+        'scores_breakdown': {
+            'length': round(rng.random(), 2),
+            'valid_chars': round(rng.random(), 2),
+            'repetition': round(rng.random(), 2),
+            'toxicity': round(rng.random(), 2),
+            'rating': round(rng.random(), 2),
+        },
+        'flags': flags,
+        'is_suspicious': not passed,
+        'toxicity_status': 'toxic' if 'toxic_content' in flags else 'non-toxic',
+    }
+
+
+def _context(rng: random.Random, shop_type: str, relevant: bool) -> dict:
+    score = rng.uniform(0.6, 0.99)
+    return {
+        'mismatch_score': round(score, 2),
+        'confidence': round((score if relevant else 1 - score) * 100, 2),
+        'reasons': [] if relevant else [f"النص بعيد عن سياق {shop_type}"],
+        'has_mismatch': not relevant,
+        'predicted_label': shop_type if relevant else "غير مرتبط",
+    }
+
+
+def build_review(rng: random.Random, shop_id: str, shop_type: str, status: str, created_at: datetime) -> dict:
+    """One review document as ReviewRepository.create_review stores it."""
+    rating = rng.randint(1, 5)
+    positive = rating >= 4
+    if status == 'rejected_irrelevant':
+        enjoy_most = rng.choice(OFF_TOPIC)
+    elif status == 'rejected_low_quality' and rng.random() < 0.5:
+        enjoy_most = rng.choice(ABUSIVE)
+    else:
+        enjoy_most = rng.choice(POSITIVE if positive else NEGATIVE)
+    fields = {
+        'enjoy_most': enjoy_most,
+        'improve_product': rng.choice(IMPROVEMENTS),
+        'additional_feedback': rng.choice(POSITIVE + NEGATIVE) if rng.random() < 0.4 else '',
+    }
+    text = " ".join(v for v in fields.values() if v)
+    sentiment = "إيجابي" if positive else ("سلبي" if rating <= 2 else "محايد")
+
+    analysis = {'quality': _quality(rng, status != 'rejected_low_quality')}
+    generated_content = None
+    if status != 'rejected_low_quality':
+        analysis['context'] = _context(rng, shop_type, status == 'processed')
+    if status == 'processed':
+        analysis.update({
+            'sentiment': sentiment,
+            'toxicity': 'non-toxic',
+            'category': rng.choice(CATEGORIES),
+            'key_themes': rng.sample(THEMES, rng.randint(1, 3)),
+        })
+        generated_content = {
+            'summary': f"العميل قيّم المتجر بـ {rating} نجوم: {enjoy_most}",
+            'actionable_insights': [f"مراجعة {theme}" for theme in rng.sample(THEMES, rng.randint(0, 3))],
+            'suggested_reply': "شكراً لملاحظاتك، نعمل دائماً على تحسين خدماتنا.",
+        }
+
+    document = ReviewDocument(
+        id=str(ObjectId()),
+        shop_id=shop_id,
+        email=f"customer-{rng.getrandbits(40):x}@example.com",
+        stars=rating,
+        overall_sentiment=sentiment if status == 'processed' else "محايد",
+        created_at=created_at,
+        status=status,
+        source=Source(rating=rating, fields=fields),
+        processing=Processing(concatenated_text=text, is_profane=False),
+        analysis=analysis,
+        generated_content=generated_content,
+    ).model_dump(by_alias=True)
+    document['_id'] = ObjectId(document.pop('id'))
+    return document
+
+
+def generate_reviews(shop_id: str, shop_type: str, count: int, seed: int) -> Iterator[dict]:
+    """`count` reviews spread evenly over one year, oldest first."""
+    rng = random.Random(seed * 1000003 + count)
+    statuses, weights = zip(*STATUS_MIX)
+    now = datetime(2026, 1, 1)
+    step = timedelta(days=365) / max(count, 1)
+    for i in range(count):
+        status = rng.choices(statuses, weights)[0]
+        yield build_review(rng, shop_id, shop_type, status, now - step * (count - i))
+
+
+def seed_shop(user_repository, review_collection, size: int, shop_type: str, seed: int, reseed: bool = False) -> str:
+    """
+    Create a shop holding `size` reviews, reusing it if an earlier run seeded it.
+
+    Returns:
+        The shop id
+    """
+    email = f"dashboard-bench-{size}@example.com"
+    existing = user_repository.collection.find_one({'email': email, 'seed_marker': SEED_MARKER})
+    if existing is not None:
+        shop_id = str(existing['_id'])
+        if not reseed and review_collection.count_documents({'shop_id': shop_id}) == size:
+            return shop_id
+        review_collection.delete_many({'shop_id': shop_id})
+        user_repository.collection.delete_one({'_id': existing['_id']})
+
+    user = User(
+        email=email,
+        password_hash='',
+        shop_name=f"Dashboard Bench {size}",
+        shop_type=shop_type,
+    )
+    user_id = user_repository.insert(user)
+    user_repository.collection.update_one({'_id': user_id}, {'$set': {'seed_marker': SEED_MARKER}})
+    shop_id = str(user_id)
+
+    batch: List[dict] = []
+    for document in generate_reviews(shop_id, shop_type, size, seed):
+        batch.append(document)
+        if len(batch) >= INSERT_BATCH:
+            review_collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        review_collection.insert_many(batch, ordered=False)
+    return shop_id
@@ -0,0 +1,7 @@
+"""
+Offline end-to-end load test for WebhookService.process_review.
+
+    python -m benchmarks.load_test --reviews 500 --concurrency 16
+
+See run.py for the options.
+"""
@@ -0,0 +1,3 @@
+from benchmarks.load_test.run import main
+
+main()
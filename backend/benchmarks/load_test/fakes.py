@@ -0,0 +1,277 @@
+"""
+In-process fakes for the load test.
+
+In-memory repositories with the methods the review pipeline calls, and a
+NotificationService whose FCM multicast sleeps instead of calling Firebase.
+Import only after the app environment is set (see run.py).
+"""
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+
+from app.domain.enums import ReviewPriority
+from app.domain.models.user import User
+from app.infrastructure.external import NotificationService
+from app.infrastructure.observability.inference_usage import InferenceUsage
+
+from benchmarks.load_test.stubs import EndpointBehavior
+
+
+class InMemoryUserRepository:
+    """Shops keyed by ObjectId."""
+
+    def __init__(self):
+        self._users: Dict[ObjectId, User] = {}
+        self._lock = threading.Lock()
+
+    def add(self, user: User) -> User:
+        with self._lock:
+            user.id = user.id or ObjectId()
+            self._users[user.id] = user
+        return user
+
+    def find_by_id(self, user_id: ObjectId) -> Optional[User]:
+        return self._users.get(user_id)
+
+    def update_user(self, user_id: ObjectId, data: dict) -> bool:
+        user = self._users.get(user_id)
+        if user is None:
+            return False
+        for key, value in data.items():
+            setattr(user, key, value)
+        return True
+
+    def remove_device_tokens(self, user_id: ObjectId, tokens: List[str]) -> bool:
+        user = self._users.get(user_id)
+        if user is None:
+            return False
+        with self._lock:
+            user.device_tokens = [t for t in user.device_tokens if t not in tokens]
+        return True
+
+
+class InMemoryReviewRepository:
+    """Review documents with the duplicate lookup and pipeline checkpoints the use cases call."""
+
+    ACTIVE_PIPELINE_STATES = ('pending', 'gated', 'analyzed')
+
+    def __init__(self):
+        self.documents: Dict[str, dict] = {}
+        self._by_email: Dict[tuple, str] = {}
+        self._by_submission: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def create_review(self, review_data: dict) -> str:
+        review_id = str(review_data.pop('id', None) or review_data.get('_id') or ObjectId())
+        review_data['_id'] = ObjectId(review_id)
+        with self._lock:
+            self.documents[review_id] = review_data
+            if review_data.get('email'):
+                self._by_email[(review_data['email'], review_data.get('shop_id'))] = review_id
+            submission_key = (review_data.get('pipeline') or {}).get('submission_key')
+            if submission_key:
+                self._by_submission[submission_key] = review_id
+        return review_id
+
+    def find_existing_review(self, email: str, shop_id: str):
+        review_id = self._by_email.get((email, shop_id))
+        return self.documents.get(review_id) if review_id else None
+
+    def find_document(self, review_id: str) -> Optional[dict]:
+        return self.documents.get(str(review_id))
+
+    def find_by_submission(self, submission_key: str) -> Optional[dict]:
+        review_id = self._by_submission.get(submission_key)
+        return self.documents.get(review_id) if review_id else None
+
+    def update(self, review_id: ObjectId, fields: dict) -> bool:
+        with self._lock:
+            document = self.documents.get(str(review_id))
+            if document is None:
+                return False
+            for path, value in fields.items():
+                self._set(document, path, value)
+        return True
+
+    def save_checkpoint(self, review_id: str, fields: dict, lease_seconds: Optional[float] = None) -> None:
+        now = datetime.now(timezone.utc)
+        fields = dict(fields)
+        fields['pipeline.updated_at'] = now
+        fields['pipeline.lease_until'] = now + timedelta(seconds=lease_seconds) if lease_seconds else now
+        self.update(review_id, fields)
+
+    def claim_resumable(self, lease_seconds: float, max_attempts: int, review_id: Optional[str] = None):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for document in self._candidates(review_id):
+                if self._resumable(document, now, max_attempts):
+                    pipeline = document['pipeline']
+                    pipeline['lease_until'] = now + timedelta(seconds=lease_seconds)
+                    pipeline['attempts'] = pipeline.get('attempts', 1) + 1
+                    return document
+        return None
+
+    def count_in_pipeline(self) -> int:
+        with self._lock:
+            return sum(
+                1 for d in self.documents.values()
+                if (d.get('pipeline') or {}).get('state') in self.ACTIVE_PIPELINE_STATES
+            )
+
+    def claim_enrichment(self, lease_seconds: float, max_attempts: int, review_id: Optional[str] = None):
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for document in self._candidates(review_id):
+                if self._enrichable(document, now, max_attempts):
+                    pipeline = document['pipeline']
+                    pipeline['lease_until'] = now + timedelta(seconds=lease_seconds)
+                    pipeline['enrichment_attempts'] = pipeline.get('enrichment_attempts', 0) + 1
+                    return document
+        return None
+
+    def find_waiting_by_shop(self, max_attempts: int, per_shop: int, aging_seconds: float = 0) -> List[dict]:
+        now = datetime.now(timezone.utc)
+        waiting = []
+        with self._lock:
+            for document in self.documents.values():
+                if self._resumable(document, now, max_attempts) or self._enrichable(document, now, max_attempts):
+                    created_at = document['created_at']
+                    if created_at.tzinfo is None:
+                        created_at = created_at.replace(tzinfo=timezone.utc)
+                    priority = document['pipeline'].get('priority', int(ReviewPriority.NORMAL))
+                    if aging_seconds > 0:
+                        priority += max((now - created_at).total_seconds(), 0) / aging_seconds
+                    waiting.append((-priority, created_at, document))
+        groups: Dict[str, dict] = {}
+        for negated_priority, _, document in sorted(waiting, key=lambda entry: entry[:2]):
+            group = groups.setdefault(
+                document.get('shop_id'),
+                {'shop_id': document.get('shop_id'), 'depth': 0, 'reviews': []}
+            )
+            group['depth'] += 1
+            if len(group['reviews']) < per_shop:
+                group['reviews'].append({
+                    '_id': document['_id'],
+                    'state': document['pipeline']['state'],
+                    'priority': -negated_priority
+                })
+        return list(groups.values())
+
+    def _candidates(self, review_id: Optional[str]) -> List[dict]:
+        if review_id:
+            return [self.documents[review_id]] if review_id in self.documents else []
+        return sorted(self.documents.values(), key=lambda d: d['created_at'])
+
+    def _resumable(self, document: dict, now: datetime, max_attempts: int) -> bool:
+        pipeline = document.get('pipeline') or {}
+        return (pipeline.get('state') in self.ACTIVE_PIPELINE_STATES
+                and pipeline['lease_until'] < now
+                and pipeline.get('attempts', 1) < max_attempts)
+
+    @staticmethod
+    def _enrichable(document: dict, now: datetime, max_attempts: int) -> bool:
+        pipeline = document.get('pipeline') or {}
+        return bool(document.get('enrichment_pending') and pipeline.get('state') == 'notified'
+                    and pipeline['lease_until'] < now
+                    and pipeline.get('enrichment_attempts', 0) < max_attempts)
+
+    def release_lease(self, review_id: str) -> None:
+        self.update(review_id, {'pipeline.lease_until': datetime.now(timezone.utc)})
+
+    def renew_lease(self, review_id: str, lease_seconds: float) -> bool:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            pipeline = (self.documents.get(str(review_id)) or {}).get('pipeline') or {}
+            if pipeline.get('lease_until') is None or pipeline['lease_until'] <= now:
+                return False
+            pipeline['lease_until'] = now + timedelta(seconds=lease_seconds)
+        return True
+
+    @staticmethod
+    def _set(document: dict, path: str, value) -> None:
+        *parents, name = path.split('.')
+        for parent in parents:
+            document = document.setdefault(parent, {})
+        document[name] = value
+
+
+class InMemoryInferenceUsageRepository:
+    """Keeps the per-review usage records instead of daily Mongo counters."""
+
+    def __init__(self):
+        self.records: List[dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, usage: InferenceUsage, reviews: int = 1) -> None:
+        with self._lock:
+            self.records.append({'shop_id': usage.shop_id, 'reviews': reviews, 'services': usage.to_dict()})
+
+
+class InMemoryRelevancyLexiconRepository:
+    """No learned terms: the lexicon runs on the shop-type descriptions only."""
+
+    def __init__(self, learned: Optional[Dict[str, List[str]]] = None):
+        self.learned = learned or {}
+
+    def load(self) -> Dict[str, List[str]]:
+        return self.learned
+
+
+class InMemoryIdempotencyRepository:
+    """Submission claims and results, with the lease takeover of the Mongo version."""
+
+    def __init__(self):
+        self.records: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, owner: str, lease_seconds: float, ttl_seconds: float):
+        now = time.monotonic()
+        with self._lock:
+            record = self.records.get(key)
+            if record is None or (record['status'] == 'in_flight' and record['lease_until'] < now):
+                self.records[key] = {'status': 'in_flight', 'owner': owner, 'lease_until': now + lease_seconds}
+                return True, None
+            return False, dict(record)
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            record = self.records.get(key)
+            return dict(record) if record else None
+
+    def complete(self, key: str, result: dict, ttl_seconds: float) -> None:
+        with self._lock:
+            record = self.records.setdefault(key, {'owner': None})
+            record.update(status='completed', result=result)
+
+    def release(self, key: str, owner: str) -> None:
+        with self._lock:
+            record = self.records.get(key)
+            if record and record['owner'] == owner and record['status'] == 'in_flight':
+                del self.records[key]
+
+
+class StubNotificationService(NotificationService):
+    """NotificationService whose FCM multicast sleeps instead of calling Firebase."""
+
+    def __init__(self, behavior: EndpointBehavior, seed: int = 11, **kwargs):
+        super().__init__(**kwargs)
+        self.behavior = behavior
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.fcm_batches = 0
+        self.fcm_tokens = 0
+
+    def send_fcm_multicast(self, device_tokens: List[str], message: str, title: str = "تقييم جديد") -> List[str]:
+        tokens = [t for t in dict.fromkeys(device_tokens) if t]
+        if not tokens:
+            return []
+        with self._lock:
+            latency = self.behavior.latency.sample(self._rng)
+            self.fcm_batches += 1
+            self.fcm_tokens += len(tokens)
+        time.sleep(latency)
+        return []
@@ -0,0 +1,145 @@
+"""
+Synthetic Tally webhook payloads.
+
+Produces `FORM_RESPONSE` events with the `data.fields` labels that
+FormFieldExtractor reads (shop_id, email, shop_type, shop_name, stars and
+the three free-text fields). The review text is drawn from weighted pools so
+a run exercises every pipeline path: stars-only, short, detailed positive and
+negative, off-topic and abusive reviews.
+"""
+import random
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+POSITIVE = [
+    "الخدمة ممتازة والموظفين محترمين جدا",
+    "الأكل طيب والأسعار مناسبة والمكان نظيف",
+    "تجربة رائعة وسرعة في التوصيل",
+    "الجودة عالية والتعامل راقي",
+    "أنصح الجميع بالتجربة، كل شيء كان مرتب",
+]
+NEGATIVE = [
+    "تأخر الطلب أكثر من ساعة والموظف لم يعتذر",
+    "الأسعار مرتفعة مقارنة بالجودة",
+    "المكان غير نظيف والطاولات متسخة",
+    "الموظف كان غير متعاون ورفض تبديل المنتج",
+    "الطلب وصل بارد وناقص",
+]
+IMPROVEMENTS = [
+    "زيادة عدد الموظفين وقت الذروة",
+    "تحسين التكييف في الصالة",
+    "إضافة خيارات دفع إلكتروني",
+    "تقليل وقت الانتظار",
+    "",
+]
+OFF_TOPIC = [
+    "مباراة أمس كانت ممتعة جدا والفريق لعب بشكل رائع",
+    "الطقس اليوم حار والطرق مزدحمة",
+    "أبحث عن شقة للإيجار في المنطقة",
+]
+ABUSIVE = [
+    "خدمة زبالة وموظفين حمير",
+    "يا غبي ما بتعرف تشتغل",
+]
+SHORT = ["ممتاز", "جيد", "سيء", "👍", "تمام"]
+
+# (kind, weight)
+DEFAULT_MIX: Tuple[Tuple[str, float], ...] = (
+    ('positive', 0.35),
+    ('negative', 0.25),
+    ('stars_only', 0.15),
+    ('short', 0.10),
+    ('off_topic', 0.10),
+    ('abusive', 0.05),
+)
+
+
+@dataclass
+class Shop:
+    """A shop that synthetic reviews are addressed to."""
+    shop_id: str
+    shop_type: str
+    shop_name: str
+
+
+class PayloadGenerator:
+    """
+    Reproducible stream of webhook payloads.
+
+    Args:
+        shops: Shops to spread reviews over
+        seed: RNG seed (same seed, same payloads)
+        mix: (kind, weight) pairs; kinds as in DEFAULT_MIX
+        hot_shop_share: Fraction of reviews sent to the first shop, to model
+            one shop receiving a burst (0 = uniform)
+    """
+
+    def __init__(
+        self,
+        shops: Sequence[Shop],
+        seed: int = 42,
+        mix: Sequence[Tuple[str, float]] = DEFAULT_MIX,
+        hot_shop_share: float = 0.0
+    ):
+        if not shops:
+            raise ValueError("At least one shop is required")
+        self.shops = list(shops)
+        self.rng = random.Random(seed)
+        self.kinds = [kind for kind, _ in mix]
+        self.weights = [weight for _, weight in mix]
+        self.hot_shop_share = hot_shop_share
+
+    def _pick_shop(self) -> Shop:
+        if self.hot_shop_share and self.rng.random() < self.hot_shop_share:
+            return self.shops[0]
+        return self.rng.choice(self.shops)
+
+    def _texts(self, kind: str) -> Tuple[str, str, str, int]:
+        """(enjoy_most, improve_product, additional_feedback, stars) for a review kind."""
+        rng = self.rng
+        if kind == 'positive':
+            return rng.choice(POSITIVE), rng.choice(IMPROVEMENTS), "", rng.choice((4, 5))
+        if kind == 'negative':
+            return "", rng.choice(NEGATIVE), rng.choice(NEGATIVE), rng.choice((1, 2))
+        if kind == 'stars_only':
+            return "", "", "", rng.randint(1, 5)
+        if kind == 'short':
+            return rng.choice(SHORT), "", "", rng.randint(1, 5)
+        if kind == 'off_topic':
+            return rng.choice(OFF_TOPIC), "", "", rng.randint(1, 5)
+        if kind == 'abusive':
+            return "", rng.choice(ABUSIVE), "", 1
+        raise ValueError(f"Unknown review kind: {kind}")
+
+    def generate(self, kind: Optional[str] = None) -> Dict:
+        """One webhook payload (the review kind is drawn from the mix unless given)."""
+        kind = kind or self.rng.choices(self.kinds, self.weights)[0]
+        shop = self._pick_shop()
+        enjoy_most, improve_product, additional_feedback, stars = self._texts(kind)
+        response_id = uuid.UUID(int=self.rng.getrandbits(128)).hex[:12]
+
+        fields: List[Dict] = [
+            {'key': 'question_shop_id', 'label': 'shop_id', 'type': 'HIDDEN_FIELDS', 'value': shop.shop_id},
+            {'key': 'question_shop_type', 'label': 'shop_type', 'type': 'HIDDEN_FIELDS', 'value': shop.shop_type},
+            {'key': 'question_shop_name', 'label': 'shop_name', 'type': 'HIDDEN_FIELDS', 'value': shop.shop_name},
+            {'key': 'question_email', 'label': 'email', 'type': 'INPUT_EMAIL', 'value': f"load-{response_id}@example.com"},
+            {'key': 'question_stars', 'label': 'stars', 'type': 'RATING', 'value': stars},
+            {'key': 'question_enjoy', 'label': 'enjoy_most', 'type': 'TEXTAREA', 'value': enjoy_most},
+            {'key': 'question_improve', 'label': 'improve_product', 'type': 'TEXTAREA', 'value': improve_product},
+            {'key': 'question_feedback', 'label': 'additional_feedback', 'type': 'TEXTAREA', 'value': additional_feedback},
+        ]
+        return {
+            'eventId': uuid.UUID(int=self.rng.getrandbits(128)).hex,
+            'eventType': 'FORM_RESPONSE',
+            'data': {
+                'responseId': response_id,
+                'formName': 'Load test',
+                'fields': fields,
+            },
+            # Not part of the Tally payload; read by the runner for reporting
+            '_kind': kind,
+        }
+
+    def batch(self, count: int) -> List[Dict]:
+        return [self.generate() for _ in range(count)]
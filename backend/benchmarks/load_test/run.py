@@ -0,0 +1,306 @@
+"""
+Load Test Runner
+================
+
+Drives WebhookService.process_review with synthetic Tally payloads while
+every external API is served by local stubs, and reports throughput and
+p50/p95/p99 latency end to end, per pipeline stage and per external call.
+
+Usage (from the backend directory):
+    python -m benchmarks.load_test                                   # 200 reviews, realistic latencies
+    python -m benchmarks.load_test --reviews 1000 --concurrency 32 --profile instant
+    python -m benchmarks.load_test --profile flaky --latency-scale 0.1
+    python -m benchmarks.load_test --repository mongo --mongo-uri mongodb://localhost:27017
+    python -m benchmarks.load_test --json report.json
+
+Per-stage timings come from the pipeline's own tracing spans (time_stage and
+http_client), collected in memory instead of being exported to files.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from benchmarks.load_test.payloads import PayloadGenerator, Shop
+from benchmarks.load_test.stubs import PROFILES, StubServer
+
+SHOP_TYPES = ("مطعم", "مقهى", "صيدلية", "محل ملابس", "سوبر ماركت")
+ROOT_SPAN = 'benchmark.review'
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100.0 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {
+        'count': len(values),
+        'mean_ms': round(sum(values) / len(values), 2) if values else 0.0,
+        'p50_ms': round(percentile(values, 50), 2),
+        'p95_ms': round(percentile(values, 95), 2),
+        'p99_ms': round(percentile(values, 99), 2),
+        'max_ms': round(max(values), 2) if values else 0.0,
+    }
+
+
+class SpanCollector:
+    """Span exporter that keeps durations in memory, grouped by span name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+        self.fallbacks: Counter = Counter()
+
+    def export(self, spans) -> None:
+        with self._lock:
+            for s in spans:
+                self.durations[s.name].append(s.duration_ms)
+                if s.status == 'error':
+                    self.errors[s.name] += 1
+                if s.name == ROOT_SPAN:
+                    for stage in filter(None, str(s.attributes.get('fallbacks', '')).split(',')):
+                        self.fallbacks[stage] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.durations.clear()
+            self.errors.clear()
+            self.fallbacks.clear()
+
+
+def _prepare_environment(server: StubServer, args) -> None:
+    """Point the app's config at the stubs (must run before any app import)."""
+    os.environ.update(server.environment())
+    os.environ.setdefault('SECRET_KEY', 'load-test')
+    os.environ.setdefault('MONGO_URI', args.mongo_uri)
+    os.environ['TRACE_EXPORTER'] = 'none'
+    os.environ.setdefault('TELEGRAM_DIGEST_WINDOW_SECONDS', str(args.digest_window))
+    os.environ.setdefault('TELEGRAM_GLOBAL_RATE_LIMIT', str(args.telegram_rate))
+
+
+def _build_shops(args, user_repository) -> List[Shop]:
+    from app.domain.models.user import User
+
+    shops = []
+    for i in range(args.shops):
+        shop_type = SHOP_TYPES[i % len(SHOP_TYPES)]
+        user = User(
+            email=f"load-shop-{i}@example.com",
+            password_hash='',
+            shop_name=f"Load Shop {i}",
+            shop_type=shop_type,
+            telegram_chat_id=str(100000 + i),
+            device_tokens=[f"fcm-token-{i}-a", f"fcm-token-{i}-b"] if i % 2 else []
+        )
+        if hasattr(user_repository, 'add'):
+            user_repository.add(user)
+        else:
+            user.id = user_repository.insert(user)
+        shops.append(Shop(str(user.id), shop_type, user.shop_name))
+    return shops
+
+
+def _wire_container(args, profile):
+    """Register fakes or Mongo-backed repositories; returns a cleanup callable."""
+    from app.container import container
+    from benchmarks.load_test.fakes import (
+        InMemoryUserRepository,
+        InMemoryReviewRepository,
+        InMemoryInferenceUsageRepository,
+        InMemoryRelevancyLexiconRepository,
+        InMemoryIdempotencyRepository,
+        StubNotificationService
+    )
+
+    container.reset()
+    container.override('notification_service', StubNotificationService(profile.fcm))
+
+    if args.repository == 'memory':
+        container.override('user_repository', InMemoryUserRepository())
+        container.override('review_repository', InMemoryReviewRepository())
+        container.override('inference_usage_repository', InMemoryInferenceUsageRepository())
+        container.override('relevancy_lexicon_repository', InMemoryRelevancyLexiconRepository())
+        container.override('idempotency_repository', InMemoryIdempotencyRepository())
+        return lambda: None
+
+    from app.infrastructure.database import MongoDBManager
+    manager = MongoDBManager()
+    manager.initialize(args.mongo_uri, args.database)
+
+    def cleanup():
+        if not args.keep_data:
+            manager.client.drop_database(args.database)
+    return cleanup
+
+
+def run(args) -> dict:
+    profile = PROFILES[args.profile].scaled(args.latency_scale)
+    server = StubServer(profile, seed=args.seed).start()
+    _prepare_environment(server, args)
+
+    # App imports happen only now that the environment points at the stubs
+    from app.container import container
+    from app.infrastructure.observability.tracing import configure_exporter, start_trace
+    from app.infrastructure.external.telegram_dispatcher import TelegramDispatcher
+
+    collector = SpanCollector()
+    configure_exporter(collector)
+    cleanup = _wire_container(args, profile)
+    try:
+        shops = _build_shops(args, container.user_repository)
+        generator = PayloadGenerator(shops, seed=args.seed, hot_shop_share=args.hot_shop_share)
+        webhook_service = container.webhook_service
+
+        outcomes: Counter = Counter()
+        kinds: Counter = Counter()
+        outcomes_lock = threading.Lock()
+
+        def process(payload: dict) -> None:
+            kind = payload.pop('_kind')
+            with start_trace(ROOT_SPAN, kind=kind):
+                try:
+                    outcome = webhook_service.process_review(payload).get('status', 'unknown')
+                except (ValueError, LookupError):
+                    outcome = 'invalid'
+                except Exception as e:
+                    outcome = f"error:{type(e).__name__}"
+            with outcomes_lock:
+                outcomes[outcome] += 1
+                kinds[kind] += 1
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(process, generator.batch(args.warmup)))
+        collector.reset()
+        server.reset_counts()
+        outcomes.clear()
+        kinds.clear()
+
+        payloads = generator.batch(args.reviews)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(process, payloads))
+        elapsed = time.perf_counter() - started
+
+        # Queued Telegram messages are delivered after the request returns
+        drain_started = time.perf_counter()
+        container.telegram_service.flush_digests()
+        drained = TelegramDispatcher.instance().flush(args.drain_timeout)
+        drain_seconds = time.perf_counter() - drain_started
+
+        stages = {
+            name: {**summarize(values), 'errors': collector.errors.get(name, 0)}
+            for name, values in sorted(collector.durations.items())
+            if name != ROOT_SPAN and not name.startswith('http.')
+        }
+        external = {
+            name[len('http.'):]: {**summarize(values), 'errors': collector.errors.get(name, 0)}
+            for name, values in sorted(collector.durations.items())
+            if name.startswith('http.')
+        }
+        return {
+            'config': {
+                'reviews': args.reviews,
+                'concurrency': args.concurrency,
+                'shops': args.shops,
+                'profile': args.profile,
+                'latency_scale': args.latency_scale,
+                'repository': args.repository,
+                'seed': args.seed,
+            },
+            'throughput': {
+                'elapsed_s': round(elapsed, 3),
+                'reviews_per_s': round(args.reviews / elapsed, 2) if elapsed else 0.0,
+            },
+            'end_to_end': summarize(collector.durations.get(ROOT_SPAN, [])),
+            'outcomes': dict(outcomes),
+            'review_kinds': dict(kinds),
+            'fallbacks': dict(collector.fallbacks),
+            'stages': stages,
+            'external_calls': external,
+            'stub_requests': {k: dict(v) for k, v in server.requests.items()},
+            'fcm': {
+                'batches': container.notification_service.fcm_batches,
+                'tokens': container.notification_service.fcm_tokens,
+            },
+            'telegram_drain': {'seconds': round(drain_seconds, 3), 'complete': drained},
+        }
+    finally:
+        cleanup()
+        server.stop()
+
+
+def print_report(report: dict) -> None:
+    config, throughput = report['config'], report['throughput']
+    print(
+        f"\n{config['reviews']} reviews, concurrency {config['concurrency']}, {config['shops']} shops, "
+        f"profile '{config['profile']}' x{config['latency_scale']}, {config['repository']} repositories"
+    )
+    print(f"Throughput: {throughput['reviews_per_s']} reviews/s ({throughput['elapsed_s']}s)")
+    print(f"Outcomes:   {report['outcomes']}")
+    if report['fallbacks']:
+        print(f"Fallbacks:  {report['fallbacks']}")
+
+    header = f"{'':<28} {'count':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'err':>5}"
+
+    def table(title: str, rows: Dict[str, dict]) -> None:
+        print(f"\n{title}\n{header}\n{'-' * len(header)}")
+        for name, s in rows.items():
+            print(
+                f"{name:<28} {s['count']:>6} {s['mean_ms']:>9.1f} {s['p50_ms']:>9.1f} {s['p95_ms']:>9.1f} "
+                f"{s['p99_ms']:>9.1f} {s['max_ms']:>9.1f} {s.get('errors', 0):>5}"
+            )
+
+    table("Latency (ms)", {'end_to_end': report['end_to_end'], **report['stages']})
+    table("External calls (ms)", report['external_calls'])
+    print(f"\nStub requests by status: {report['stub_requests']}")
+    print(f"FCM batches: {report['fcm']['batches']} ({report['fcm']['tokens']} tokens)")
+    drain = report['telegram_drain']
+    print(f"Telegram queue drained in {drain['seconds']}s{'' if drain['complete'] else ' (timed out)'}")
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--reviews', type=int, default=200, help='Measured reviews')
+    parser.add_argument('--warmup', type=int, default=10, help='Unmeasured reviews sent first')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent webhook requests')
+    parser.add_argument('--shops', type=int, default=20, help='Number of shops')
+    parser.add_argument('--hot-shop-share', type=float, default=0.0, help='Fraction of reviews sent to one shop')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='realistic', help='Stub API behavior')
+    parser.add_argument('--latency-scale', type=float, default=1.0, help='Multiply all stub latencies')
+    parser.add_argument('--repository', choices=('memory', 'mongo'), default='memory')
+    parser.add_argument('--mongo-uri', default=os.environ.get('MONGO_URI', 'mongodb://localhost:27017'))
+    parser.add_argument('--database', default='ReputationGuardian_LoadTest')
+    parser.add_argument('--keep-data', action='store_true', help='Do not drop the load test database')
+    parser.add_argument('--digest-window', type=float, default=5.0, help='Telegram digest window (s)')
+    parser.add_argument('--telegram-rate', type=float, default=30.0, help='Telegram global messages/s')
+    parser.add_argument('--drain-timeout', type=float, default=60.0, help='Max wait for queued Telegram sends')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', help='Also write the report to this file')
+    parser.add_argument('--verbose', action='store_true', help='Show application warnings')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.CRITICAL, stream=sys.stderr)
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,316 @@
+"""
+Local stand-ins for the paid external APIs.
+
+One threaded HTTP server answers in the request/response shapes the
+services parse:
+
+    POST /hf/sentiment                 text classification (sentiment labels)
+    POST /hf/toxicity                  text classification (LABEL_0 / LABEL_1)
+    POST /hf/zero-shot                 zero-shot classification (relevancy, profanity)
+    POST /deepseek/chat/completions    OpenAI-style chat completion with `usage`
+    POST /telegram/bot<token>/<method> Bot API sendMessage / editMessageText
+
+Each endpoint has its own latency distribution and failure rates (HF-style
+503 "model loading" with `estimated_time`, Telegram-style 429 with
+`retry_after`). FCM has no HTTP API in this code path (firebase_admin), so
+fakes.StubNotificationService replaces the multicast call in-process using
+the profile's `fcm` behavior.
+
+This module does not import the app: the server must be running before the
+app's config is loaded with `StubServer.environment()`.
+"""
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+TOXIC_WORDS = ('زبالة', 'حمير', 'غبي')
+OFF_TOPIC_WORDS = ('مباراة', 'الطقس', 'شقة')
+NEGATIVE_WORDS = ('تأخر', 'مرتفعة', 'غير', 'سيء', 'بارد', 'ناقص', 'رفض')
+
+
+@dataclass
+class LatencyModel:
+    """Log-normal latency given its median and 95th percentile (milliseconds)."""
+    median_ms: float
+    p95_ms: float
+
+    def sample(self, rng: random.Random) -> float:
+        """One latency in seconds."""
+        if self.median_ms <= 0:
+            return 0.0
+        sigma = math.log(max(self.p95_ms, self.median_ms) / self.median_ms) / 1.645
+        return rng.lognormvariate(math.log(self.median_ms), sigma) / 1000.0
+
+    def scaled(self, factor: float) -> 'LatencyModel':
+        return LatencyModel(self.median_ms * factor, self.p95_ms * factor)
+
+
+@dataclass
+class EndpointBehavior:
+    """How one stub endpoint responds."""
+    latency: LatencyModel
+    error_503_rate: float = 0.0
+    error_429_rate: float = 0.0
+    estimated_time: float = 0.2  # seconds, in HF 503 bodies
+    retry_after: int = 1  # seconds, in Telegram 429 bodies
+
+
+@dataclass
+class StubProfile:
+    """Behavior of every stub endpoint."""
+    hf_sentiment: EndpointBehavior
+    hf_toxicity: EndpointBehavior
+    hf_zero_shot: EndpointBehavior
+    deepseek: EndpointBehavior
+    telegram: EndpointBehavior
+    fcm: EndpointBehavior
+    # Simulated DeepSeek token usage per completion
+    prompt_tokens: int = 650
+    completion_tokens: int = 280
+
+    def scaled(self, factor: float) -> 'StubProfile':
+        """Same profile with every latency multiplied by `factor`."""
+        def scale(behavior: EndpointBehavior) -> EndpointBehavior:
+            return EndpointBehavior(
+                behavior.latency.scaled(factor),
+                behavior.error_503_rate,
+                behavior.error_429_rate,
+                behavior.estimated_time * factor,
+                behavior.retry_after
+            )
+        return StubProfile(
+            scale(self.hf_sentiment), scale(self.hf_toxicity), scale(self.hf_zero_shot),
+            scale(self.deepseek), scale(self.telegram), scale(self.fcm),
+            self.prompt_tokens, self.completion_tokens
+        )
+
+
+def _profile(hf: LatencyModel, deepseek: LatencyModel, telegram: LatencyModel, fcm: LatencyModel,
+             hf_503: float = 0.0, telegram_429: float = 0.0, deepseek_503: float = 0.0) -> StubProfile:
+    return StubProfile(
+        hf_sentiment=EndpointBehavior(hf, error_503_rate=hf_503),
+        hf_toxicity=EndpointBehavior(hf, error_503_rate=hf_503),
+        hf_zero_shot=EndpointBehavior(hf.scaled(1.5), error_503_rate=hf_503),
+        deepseek=EndpointBehavior(deepseek, error_503_rate=deepseek_503),
+        telegram=EndpointBehavior(telegram, error_429_rate=telegram_429),
+        fcm=EndpointBehavior(fcm)
+    )
+
+
+PROFILES: Dict[str, StubProfile] = {
+    # Measures the pipeline's own overhead
+    'instant': _profile(LatencyModel(0, 0), LatencyModel(0, 0), LatencyModel(0, 0), LatencyModel(0, 0)),
+    # Roughly what the hosted APIs show on a warm model
+    'realistic': _profile(
+        hf=LatencyModel(250, 900), deepseek=LatencyModel(3500, 9000),
+        telegram=LatencyModel(80, 250), fcm=LatencyModel(120, 400)
+    ),
+    # Realistic latencies plus cold models and Telegram throttling
+    'flaky': _profile(
+        hf=LatencyModel(250, 900), deepseek=LatencyModel(3500, 9000),
+        telegram=LatencyModel(80, 250), fcm=LatencyModel(120, 400),
+        hf_503=0.05, telegram_429=0.03, deepseek_503=0.02
+    ),
+}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: 'StubServer'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        pass
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            payload = {}
+        status, body = self.server.respond(self.path, payload)
+        self._send(status, body)
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Threaded HTTP server for all stub endpoints.
+
+    Args:
+        profile: Latency and failure behavior
+        seed: RNG seed for latencies, failures and labels
+        port: 0 picks a free port
+    """
+
+    daemon_threads = True
+    # The default backlog of 5 makes bursts of new connections wait for SYN retries
+    request_queue_size = 256
+
+    def __init__(self, profile: StubProfile, seed: int = 7, port: int = 0):
+        super().__init__(('127.0.0.1', port), _StubHandler)
+        self.profile = profile
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._message_ids = iter(range(1, 10 ** 9))
+        self._counts_lock = threading.Lock()
+        self.requests: Dict[str, Dict[int, int]] = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables pointing the app's services at this server."""
+        return {
+            'HF_TOKEN': 'stub',
+            'HF_SENTIMENT_MODEL_URL': f"{self.base_url}/hf/sentiment",
+            'HF_ARABIC_TOXICITY_MODEL_URL': f"{self.base_url}/hf/toxicity",
+            'HF_TOXICITY_MODEL_URL': f"{self.base_url}/hf/zero-shot",
+            'API_URL': f"{self.base_url}/deepseek/chat/completions",
+            'MODEL_ID': 'stub/deepseek',
+            'TELEGRAM_TOKEN': 'stub-token',
+            'TELEGRAM_API_URL': f"{self.base_url}/telegram",
+        }
+
+    def reset_counts(self) -> None:
+        with self._counts_lock:
+            self.requests.clear()
+
+    def start(self) -> 'StubServer':
+        self._thread = threading.Thread(target=self.serve_forever, name='stub-apis', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    # ------------------------------------------------------------------
+
+    def _random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    def _latency(self, behavior: EndpointBehavior) -> float:
+        with self._rng_lock:
+            return behavior.latency.sample(self._rng)
+
+    def _count(self, endpoint: str, status: int) -> None:
+        with self._counts_lock:
+            by_status = self.requests.setdefault(endpoint, {})
+            by_status[status] = by_status.get(status, 0) + 1
+
+    def respond(self, path: str, payload: dict):
+        """(status, body) for a request; sleeps for the endpoint's latency first."""
+        if path.startswith('/hf/sentiment'):
+            endpoint, behavior, handler = 'hf_sentiment', self.profile.hf_sentiment, self._sentiment
+        elif path.startswith('/hf/toxicity'):
+            endpoint, behavior, handler = 'hf_toxicity', self.profile.hf_toxicity, self._toxicity
+        elif path.startswith('/hf/zero-shot'):
+            endpoint, behavior, handler = 'hf_zero_shot', self.profile.hf_zero_shot, self._zero_shot
+        elif path.startswith('/deepseek'):
+            endpoint, behavior, handler = 'deepseek', self.profile.deepseek, self._chat_completion
+        elif path.startswith('/telegram'):
+            endpoint, behavior, handler = 'telegram', self.profile.telegram, self._telegram
+        else:
+            self._count('unknown', 404)
+            return 404, {'error': f'No stub for {path}'}
+
+        time.sleep(self._latency(behavior))
+        roll = self._random()
+        if roll < behavior.error_503_rate:
+            status, body = 503, {'error': 'Model is currently loading', 'estimated_time': behavior.estimated_time}
+        elif roll < behavior.error_503_rate + behavior.error_429_rate:
+            status, body = 429, {
+                'ok': False,
+                'error_code': 429,
+                'description': f"Too Many Requests: retry after {behavior.retry_after}",
+                'parameters': {'retry_after': behavior.retry_after}
+            }
+        else:
+            status, body = 200, handler(payload)
+        self._count(endpoint, status)
+        return status, body
+
+    # ------------------------------------------------------------------
+    # Response bodies
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _text(payload: dict) -> str:
+        return str(payload.get('inputs') or '')
+
+    def _sentiment(self, payload: dict) -> list:
+        text = self._text(payload)
+        if any(word in text for word in NEGATIVE_WORDS + TOXIC_WORDS):
+            scores = {'negative': 0.86, 'neutral': 0.09, 'positive': 0.05}
+        else:
+            scores = {'positive': 0.88, 'neutral': 0.08, 'negative': 0.04}
+        return [[{'label': label, 'score': score} for label, score in scores.items()]]
+
+    def _toxicity(self, payload: dict) -> list:
+        toxic = any(word in self._text(payload) for word in TOXIC_WORDS)
+        toxic_score = 0.93 if toxic else 0.04
+        return [[
+            {'label': 'LABEL_1' if toxic else 'LABEL_0', 'score': max(toxic_score, 1 - toxic_score)},
+            {'label': 'LABEL_0' if toxic else 'LABEL_1', 'score': min(toxic_score, 1 - toxic_score)}
+        ]]
+
+    def _zero_shot(self, payload: dict) -> dict:
+        text = self._text(payload)
+        labels: List[str] = list((payload.get('parameters') or {}).get('candidate_labels') or [])
+        if len(labels) == 2:
+            # Profanity check: [toxic label, safe label]
+            first = 0 if any(word in text for word in TOXIC_WORDS) else 1
+        else:
+            # Relevancy: [shop context, customer service, unrelated]
+            first = len(labels) - 1 if any(word in text for word in OFF_TOPIC_WORDS) else 0
+        ordered = [labels[first]] + [label for i, label in enumerate(labels) if i != first] if labels else []
+        rest = len(ordered) - 1
+        scores = [0.82] + [round(0.18 / rest, 4)] * rest if rest > 0 else ([1.0] if ordered else [])
+        return {'sequence': text, 'labels': ordered, 'scores': scores}
+
+    def _chat_completion(self, payload: dict) -> dict:
+        content = json.dumps({
+            'category': 'مدح',
+            'summary': 'العميل راضٍ عن الخدمة بشكل عام',
+            'key_themes': ['الخدمة', 'الأسعار'],
+            'actionable_insights': ['الحفاظ على مستوى الخدمة', 'مراجعة أوقات الانتظار'],
+            'suggested_reply': 'شكراً جزيلاً لتقييمك، يسعدنا أنك استمتعت بتجربتك.'
+        }, ensure_ascii=False)
+        return {
+            'id': 'chatcmpl-stub',
+            'object': 'chat.completion',
+            'model': payload.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+            'usage': {
+                'prompt_tokens': self.profile.prompt_tokens,
+                'completion_tokens': self.profile.completion_tokens,
+                'total_tokens': self.profile.prompt_tokens + self.profile.completion_tokens
+            }
+        }
+
+    def _telegram(self, payload: dict) -> dict:
+        message_id = payload.get('message_id') or next(self._message_ids)
+        return {
+            'ok': True,
+            'result': {
+                'message_id': message_id,
+                'chat': {'id': payload.get('chat_id')},
+                'date': int(time.time()),
+                'text': payload.get('text', '')
+            }
+        }
@@ -0,0 +1,8 @@
+"""
+Micro-benchmarks for the per-review text hot paths.
+
+    python -m benchmarks.micro --save-baseline    # record this host's baseline
+    python -m benchmarks.micro                    # run and compare with it
+
+See run.py for the options.
+"""
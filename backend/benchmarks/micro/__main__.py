@@ -0,0 +1,5 @@
+import sys
+
+from benchmarks.micro.run import main
+
+sys.exit(main())
@@ -0,0 +1,15 @@
+"""SentimentService.clean_text: runs on the concatenated text of every review."""
+from app.infrastructure.external.sentiment_service import SentimentService
+
+from benchmarks.micro import corpus
+from benchmarks.micro.harness import bench, parametrized
+
+
+@bench('clean_text', 'clean_text[corpus]')
+def clean_text_corpus():
+    for text in corpus.short_texts():
+        SentimentService.clean_text(text)
+
+
+for _size in corpus.GENERATED_SIZES:
+    parametrized('clean_text', f"clean_text[{_size}w]", SentimentService.clean_text, corpus.long_text(_size))
@@ -0,0 +1,28 @@
+"""TextProfanityService pattern matching: censoring and profanity statistics."""
+from app.infrastructure.external.text_profanity_service import TextProfanityService
+
+from benchmarks.micro import corpus
+from benchmarks.micro.harness import bench, parametrized
+
+
+@bench('censor_profanity', 'censor_profanity[corpus]')
+def censor_profanity_corpus():
+    for text in corpus.short_texts():
+        TextProfanityService.censor_profanity(text)
+
+
+@bench('get_profanity_stats', 'get_profanity_stats[corpus]')
+def get_profanity_stats_corpus():
+    for text in corpus.short_texts():
+        TextProfanityService.get_profanity_stats(text)
+
+
+for _size in corpus.GENERATED_SIZES:
+    parametrized(
+        'censor_profanity', f"censor_profanity[{_size}w]",
+        TextProfanityService.censor_profanity, corpus.long_text(_size)
+    )
+    parametrized(
+        'get_profanity_stats', f"get_profanity_stats[{_size}w]",
+        TextProfanityService.get_profanity_stats, corpus.long_text(_size)
+    )
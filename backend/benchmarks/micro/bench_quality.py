@@ -0,0 +1,28 @@
+"""QualityService.assess_quality: the quality gate, run on every review with text."""
+from app.infrastructure.external.quality_service import QualityService
+
+from benchmarks.micro import corpus
+from benchmarks.micro.harness import bench, parametrized
+
+_service = QualityService()
+
+
+def _assess(case: dict):
+    return _service.assess_quality(
+        case['enjoy_most'],
+        case['improve_product'],
+        case['additional_feedback'],
+        rating=case['rating'],
+        toxicity_status='non-toxic'
+    )
+
+
+@bench('assess_quality', 'assess_quality[corpus]')
+def assess_quality_corpus():
+    for case in corpus.review_cases()[:-len(corpus.GENERATED_SIZES)]:
+        _assess(case)
+
+
+for _case in corpus.review_cases()[-len(corpus.GENERATED_SIZES):]:
+    _size = _case['name'].split()[1]
+    parametrized('assess_quality', f"assess_quality[{_size}w]", _assess, _case)
@@ -0,0 +1,101 @@
+"""
+Benchmark corpus.
+
+Built from the hand-written cases in backend/test_review_quality.py and the
+repository-level test_arabic_toxicity.py, plus generated long inputs so the
+benchmarks show how each function scales with text length. The scripts are
+read with `ast` rather than imported: importing them runs their setup
+(sys.path edits, logging config, app imports).
+"""
+import ast
+import os
+import random
+from functools import lru_cache
+from typing import Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+REVIEW_QUALITY_SCRIPT = os.path.join(BACKEND_DIR, 'test_review_quality.py')
+ARABIC_TOXICITY_SCRIPT = os.path.join(os.path.dirname(BACKEND_DIR), 'test_arabic_toxicity.py')
+
+# Word counts of the generated inputs
+GENERATED_SIZES = (50, 500, 5000)
+
+_WORDS = (
+    "الخدمة ممتازة والموظفين محترمين لكن الانتظار كان طويلا والأسعار مرتفعة "
+    "المكان نظيف والأكل طيب جدا أنصح بالتجربة التوصيل تأخر قليلا والطلب وصل بارد "
+    "great service friendly staff but slow delivery"
+).split()
+_NOISE = ("😀", "👍", "!!!", "؟؟", "ـــ", "جميييييل", "سيء", "رائعععع", "#", "@", "123")
+_PROFANE = ("غبي", "حمار", "يلعن", "stupid", "crap", "f*ck")
+
+
+def _load_cases(path: str) -> List[dict]:
+    """The `test_cases` list of a script, evaluated without running the script."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == 'test_cases' for t in node.targets):
+            # Literals plus simple expressions like " ".join(["كلمة"] * 180)
+            return eval(compile(ast.Expression(node.value), path, 'eval'), {'__builtins__': {}})
+    return []
+
+
+def generate_text(word_count: int, profane_ratio: float = 0.02, noise_ratio: float = 0.05, seed: int = 0) -> str:
+    """Review-like text of `word_count` words with some noise and profanity."""
+    rng = random.Random(seed * 100003 + word_count)
+    words = []
+    for _ in range(word_count):
+        roll = rng.random()
+        if roll < profane_ratio:
+            words.append(rng.choice(_PROFANE))
+        elif roll < profane_ratio + noise_ratio:
+            words.append(rng.choice(_NOISE))
+        else:
+            words.append(rng.choice(_WORDS))
+    return " ".join(words)
+
+
+@lru_cache(maxsize=1)
+def review_cases() -> List[Dict]:
+    """Quality-gate inputs: the script's cases followed by generated long reviews."""
+    cases = [
+        {
+            'name': case['name'],
+            'enjoy_most': case['input'].get('enjoy_most', ''),
+            'improve_product': case['input'].get('improve_product', ''),
+            'additional_feedback': case['input'].get('additional_feedback', ''),
+            'rating': case['input'].get('rating', 0),
+        }
+        for case in _load_cases(REVIEW_QUALITY_SCRIPT)
+    ]
+    for size in GENERATED_SIZES:
+        third = size // 3
+        cases.append({
+            'name': f"generated {size} words",
+            'enjoy_most': generate_text(third, seed=1),
+            'improve_product': generate_text(third, seed=2),
+            'additional_feedback': generate_text(size - 2 * third, seed=3),
+            'rating': 3,
+        })
+    return cases
+
+
+@lru_cache(maxsize=1)
+def short_texts() -> List[str]:
+    """Every non-empty text from both scripts (typical review sizes)."""
+    texts = [case['text'] for case in _load_cases(ARABIC_TOXICITY_SCRIPT)]
+    for case in review_cases()[:-len(GENERATED_SIZES)]:
+        text = " ".join(
+            part for part in (case['enjoy_most'], case['improve_product'], case['additional_feedback'])
+            if part and part.strip()
+        )
+        if text:
+            texts.append(text)
+    return texts
+
+
+@lru_cache(maxsize=None)
+def long_text(word_count: int) -> str:
+    return generate_text(word_count, seed=4)
@@ -0,0 +1,191 @@
+"""
+Benchmark registry, timer and baseline comparison.
+
+Timing follows pytest-benchmark: calibrate how many calls make one round
+last at least `MIN_ROUND_SECONDS`, run rounds until `min_rounds` and
+`max_time` are met, and report per-call min/median/mean/stddev. The median
+is compared against a stored baseline.
+
+Timings only mean something on the machine that recorded them, so baselines
+are not committed: each host records its own (named after the host by
+default), and a baseline from another setup is compared for information
+only.
+"""
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+MIN_ROUND_SECONDS = 0.002
+
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    func: Callable[[], object]
+
+
+@dataclass
+class Stats:
+    name: str
+    group: str
+    rounds: int
+    iterations: int
+    min_us: float
+    median_us: float
+    mean_us: float
+    stddev_us: float
+
+    @property
+    def ops(self) -> float:
+        return 1e6 / self.median_us if self.median_us else 0.0
+
+
+_registry: Dict[str, Benchmark] = {}
+
+
+def bench(group: str, name: Optional[str] = None):
+    """Register a zero-argument function as a benchmark."""
+    def decorator(func: Callable[[], object]) -> Callable[[], object]:
+        key = name or func.__name__
+        _registry[key] = Benchmark(key, group, func)
+        return func
+    return decorator
+
+
+def parametrized(group: str, name: str, func: Callable, *args, **kwargs) -> None:
+    """Register `func(*args, **kwargs)` as a benchmark named `name`."""
+    _registry[name] = Benchmark(name, group, lambda: func(*args, **kwargs))
+
+
+def benchmarks(selector: Optional[str] = None) -> List[Benchmark]:
+    return [b for b in _registry.values() if not selector or selector in b.name or selector == b.group]
+
+
+def _calibrate(func: Callable[[], object]) -> int:
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        if time.perf_counter() - start >= MIN_ROUND_SECONDS or iterations >= 1 << 20:
+            return iterations
+        iterations *= 2
+
+
+def measure(benchmark: Benchmark, min_rounds: int = 15, max_time: float = 1.0) -> Stats:
+    """Time one benchmark; per-call durations are in microseconds."""
+    func = benchmark.func
+    func()  # warm caches (compiled regexes, lru_cache'd corpus)
+    iterations = _calibrate(func)
+    samples: List[float] = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        deadline = time.perf_counter() + max_time
+        while len(samples) < min_rounds or time.perf_counter() < deadline:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            samples.append((time.perf_counter() - start) / iterations * 1e6)
+            if len(samples) >= min_rounds and time.perf_counter() >= deadline:
+                break
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return Stats(
+        name=benchmark.name,
+        group=benchmark.group,
+        rounds=len(samples),
+        iterations=iterations,
+        min_us=round(min(samples), 3),
+        median_us=round(statistics.median(samples), 3),
+        mean_us=round(statistics.fmean(samples), 3),
+        stddev_us=round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+    )
+
+
+# ----------------------------------------------------------------------
+# Baselines
+# ----------------------------------------------------------------------
+
+def baseline_path(name: str) -> str:
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def host_baseline_name() -> str:
+    """Default baseline name of this host (its hostname and Python version)."""
+    host = re.sub(r'[^A-Za-z0-9_.-]+', '-', platform.node()) or 'host'
+    major, minor = sys.version_info[:2]
+    return f"{host}-py{major}{minor}"
+
+
+def machine_info() -> dict:
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or platform.machine(),
+        'system': platform.system(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def save_baseline(name: str, results: List[Stats]) -> str:
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'machine': machine_info(),
+            'benchmarks': {s.name: asdict(s) for s in results},
+        }, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    return path
+
+
+def load_baseline(name: str) -> Optional[dict]:
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_us: Optional[float]
+    current_us: float
+    change: Optional[float]  # relative change of the median (+0.10 = 10% slower)
+    regressed: bool
+
+
+def compare(results: List[Stats], baseline: dict, threshold: float) -> List[Comparison]:
+    """Compare medians; a benchmark regresses when it is more than `threshold` slower."""
+    stored = baseline.get('benchmarks', {})
+    comparisons = []
+    for s in results:
+        previous = stored.get(s.name)
+        if previous is None:
+            comparisons.append(Comparison(s.name, None, s.median_us, None, False))
+            continue
+        change = s.median_us / previous['median_us'] - 1.0 if previous['median_us'] else 0.0
+        comparisons.append(Comparison(s.name, previous['median_us'], s.median_us, change, change > threshold))
+    return comparisons
+
+
+def other_machine(baseline: dict) -> List[str]:
+    """The machine properties that differ from the ones the baseline was recorded with."""
+    recorded = baseline.get('machine', {})
+    current = machine_info()
+    return [k for k in ('python', 'machine', 'processor', 'cpu_count') if recorded.get(k) != current.get(k)]
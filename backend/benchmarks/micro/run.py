@@ -0,0 +1,135 @@
+"""
+Micro-benchmark Runner
+======================
+
+Times the text functions that run on every review and compares the
+medians with a baseline recorded on the same machine. Exits with status 1
+when any benchmark is slower than the baseline by more than the threshold,
+so it can gate a deploy on a host with a baseline of its own.
+
+Baselines are kept out of git in baselines/, named after the host by default
+(see harness.host_baseline_name). A baseline recorded on a different setup
+(Python version, CPU) is shown for information and never fails the run.
+
+Usage (from the backend directory):
+    python -m benchmarks.micro --save-baseline --no-compare  # record this host's baseline
+    python -m benchmarks.micro                                # compare with this host's baseline
+    python -m benchmarks.micro --threshold 0.25 --filter censor_profanity
+    python -m benchmarks.micro --save-baseline before-change --no-compare
+    python -m benchmarks.micro --baseline before-change       # compare with another baseline
+    python -m benchmarks.micro --json results.json
+"""
+import argparse
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import sys
+from dataclasses import asdict
+from typing import List, Optional
+
+from benchmarks.micro import harness
+
+DEFAULT_BASELINE = harness.host_baseline_name()
+DEFAULT_THRESHOLD = 0.15
+
+
+def _load_benchmark_modules() -> None:
+    """Import every bench_*.py module (they register themselves)."""
+    # The services read app config at import time
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('MONGO_URI', 'mongodb://localhost:27017')
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for module in pkgutil.iter_modules([package_dir]):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f"benchmarks.micro.{module.name}")
+
+
+def _format_us(value: Optional[float]) -> str:
+    if value is None:
+        return '-'
+    if value >= 1000:
+        return f"{value / 1000:.2f} ms"
+    return f"{value:.1f} us"
+
+
+def print_results(results: List[harness.Stats], comparisons: Optional[List[harness.Comparison]], threshold: float):
+    by_name = {c.name: c for c in comparisons or []}
+    header = f"{'benchmark':<34} {'median':>11} {'min':>11} {'stddev':>11} {'rounds':>7} {'baseline':>11} {'change':>8}"
+    print(header)
+    print('-' * len(header))
+    for s in results:
+        c = by_name.get(s.name)
+        change = ''
+        if c is not None and c.change is not None:
+            change = f"{c.change:+.1%}" + (' !' if c.regressed else '')
+        print(
+            f"{s.name:<34} {_format_us(s.median_us):>11} {_format_us(s.min_us):>11} {_format_us(s.stddev_us):>11} "
+            f"{s.rounds:>7} {_format_us(c.baseline_us if c else None):>11} {change:>8}"
+        )
+    regressions = [c for c in comparisons or [] if c.regressed]
+    if comparisons is not None:
+        print(f"\n{len(regressions)} regression(s) above {threshold:.0%}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', help='Only benchmarks whose name contains this (or whose group equals it)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline name or JSON path to compare with')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='Allowed slowdown of the median')
+    parser.add_argument('--save-baseline', nargs='?', const=DEFAULT_BASELINE, help='Store results as a baseline')
+    parser.add_argument('--no-compare', action='store_true', help='Skip the baseline comparison')
+    parser.add_argument('--min-rounds', type=int, default=15)
+    parser.add_argument('--max-time', type=float, default=1.0, help='Seconds per benchmark')
+    parser.add_argument('--json', help='Write results (and comparison) to this file')
+    args = parser.parse_args(argv)
+
+    # Keep pattern-match warnings out of the timings
+    logging.disable(logging.CRITICAL)
+    _load_benchmark_modules()
+
+    selected = harness.benchmarks(args.filter)
+    if not selected:
+        print(f"No benchmarks match {args.filter!r}", file=sys.stderr)
+        return 2
+
+    results = [harness.measure(b, args.min_rounds, args.max_time) for b in selected]
+
+    comparisons = None
+    gate = False
+    if not args.no_compare:
+        baseline = harness.load_baseline(args.baseline)
+        if baseline is None:
+            print(f"No baseline '{args.baseline}' yet; run with --save-baseline to record one.\n", file=sys.stderr)
+        else:
+            differing = harness.other_machine(baseline)
+            gate = not differing
+            if differing:
+                print(
+                    f"warning: baseline was recorded on a different setup ({', '.join(differing)}); "
+                    "the comparison is not gated. Record one here with --save-baseline.\n",
+                    file=sys.stderr
+                )
+            comparisons = harness.compare(results, baseline, args.threshold)
+
+    print_results(results, comparisons, args.threshold)
+
+    if args.save_baseline:
+        path = harness.save_baseline(args.save_baseline, results)
+        print(f"\nBaseline saved to {path}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'machine': harness.machine_info(),
+                'threshold': args.threshold,
+                'results': [asdict(s) for s in results],
+                'comparisons': [asdict(c) for c in comparisons] if comparisons is not None else None,
+            }, f, indent=2, ensure_ascii=False)
+
+    return 1 if gate and any(c.regressed for c in comparisons) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
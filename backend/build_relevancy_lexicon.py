@@ -0,0 +1,90 @@
+"""
+Build Relevancy Lexicon
+=======================
+
+Learns the keywords of each shop type from reviews the zero-shot relevancy
+model accepted and stores them in the `relevancy_lexicon` collection, where
+RelevancyLexicon picks them up (every RELEVANCY_LEXICON_REFRESH_SECONDS).
+
+Reviews the lexicon itself let through, and reviews that never reached the
+model (stars-only or short texts, deferred in degraded mode, or a failed
+call), are left out: the lexicon can only accept, so learning from its own
+passes would widen it on every rebuild with no model check.
+
+Usage:
+    python build_relevancy_lexicon.py                       # learn and save
+    python build_relevancy_lexicon.py --dry-run --show 30   # print the top terms only
+    python build_relevancy_lexicon.py --min-reviews 10 --min-lift 4
+"""
+import argparse
+import os
+import re
+from collections import defaultdict
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+load_dotenv()
+
+from app.infrastructure.external.relevancy_lexicon import learn_terms, resolve_shop_type  # noqa: E402
+from app.infrastructure.repositories.relevancy_lexicon_repository import RelevancyLexiconRepository  # noqa: E402
+
+DATABASE_NAME = 'ReputationGuardian'
+
+
+def accepted_texts_by_type(db, limit_per_type: int):
+    """Texts of processed reviews the relevancy model accepted, grouped by shop type."""
+    shop_types = {
+        str(user['_id']): resolve_shop_type(user.get('shop_type'))
+        for user in db['users'].find({}, {'shop_type': 1})
+    }
+    texts = defaultdict(list)
+    cursor = db['reviews'].find(
+        {
+            'status': 'processed',
+            'analysis.context.has_mismatch': False,
+            'analysis.context.method': {'$ne': 'lexicon'},
+            'analysis.context.deferred': {'$ne': True},
+            # 'N/A (...)': the gate was skipped; 'Error': the model call failed
+            'analysis.context.predicted_label': {'$ne': 'Error', '$not': re.compile(r'^N/A')},
+            'enrichment_pending': {'$ne': True}  # relevancy not checked yet
+        },
+        {'shop_id': 1, 'processing.concatenated_text': 1}
+    ).sort('_id', -1)
+    for review in cursor:
+        shop_type = shop_types.get(review.get('shop_id'))
+        text = (review.get('processing') or {}).get('concatenated_text')
+        if shop_type and text and len(texts[shop_type]) < limit_per_type:
+            texts[shop_type].append(text)
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--min-reviews', type=int, default=5, help='Reviews a term must appear in')
+    parser.add_argument('--min-share', type=float, default=0.02, help="Share of the type's reviews")
+    parser.add_argument('--min-lift', type=float, default=3.0, help='How much more frequent than in other types')
+    parser.add_argument('--limit', type=int, default=300, help='Terms kept per shop type')
+    parser.add_argument('--reviews-per-type', type=int, default=20000, help='Most recent reviews used per type')
+    parser.add_argument('--dry-run', action='store_true', help='Print the terms without saving')
+    parser.add_argument('--show', type=int, default=15, help='Terms printed per shop type')
+    args = parser.parse_args()
+
+    db = MongoClient(os.environ.get('MONGO_URI'))[DATABASE_NAME]
+    texts = accepted_texts_by_type(db, args.reviews_per_type)
+    learned = learn_terms(texts, args.min_reviews, args.min_share, args.min_lift, args.limit)
+
+    repository = RelevancyLexiconRepository(db['relevancy_lexicon'])
+    for shop_type, terms in sorted(learned.items(), key=lambda item: item[0].value):
+        print(f"{shop_type.value} ({len(texts[shop_type])} reviews): {len(terms)} terms")
+        if terms:
+            print("   " + ", ".join(terms[:args.show]))
+        if not args.dry_run:
+            repository.save(shop_type.value, terms, len(texts[shop_type]))
+
+    if args.dry_run:
+        print("\nDry run: nothing saved")
+
+
+if __name__ == '__main__':
+    main()
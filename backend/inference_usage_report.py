@@ -0,0 +1,62 @@
+"""
+Inference Usage Report
+======================
+
+Ranks shops by external model usage (Hugging Face calls, DeepSeek tokens)
+recorded in the `inference_usage` collection, to find the shops driving
+disproportionate inference load.
+
+Usage:
+    python inference_usage_report.py                        # top 20 shops, last 7 days, by calls
+    python inference_usage_report.py --days 30 --sort estimated_cost
+    python inference_usage_report.py --shop <shop_id>       # one shop, per service and per day
+"""
+import argparse
+import json
+import os
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+load_dotenv()
+
+from app.infrastructure.repositories.inference_usage_repository import InferenceUsageRepository  # noqa: E402
+from app.application.services.inference_usage_service import InferenceUsageService  # noqa: E402
+
+DATABASE_NAME = 'ReputationGuardian'
+SORT_FIELDS = ('calls', 'prompt_tokens', 'completion_tokens', 'latency_ms', 'response_bytes', 'estimated_cost')
+
+
+def print_top_shops(rows, days):
+    print(f"Top shops by inference usage, last {days} day(s)\n")
+    header = f"{'shop_id':<26} {'reviews':>8} {'calls':>7} {'tokens':>9} {'calls/rev':>9} {'avg ms':>8} {'cost':>10}  share(calls/reviews)"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        share = row['share']
+        print(
+            f"{row['shop_id']:<26} {row['reviews']:>8} {row['calls']:>7} {row['tokens']:>9} "
+            f"{row['calls_per_review']:>9} {row['avg_latency_ms']:>8} {row['estimated_cost']:>10.4f}  "
+            f"{share['calls']:.1%} / {share['reviews']:.1%}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, default=7, help='Period length in days')
+    parser.add_argument('--limit', type=int, default=20, help='Number of shops listed')
+    parser.add_argument('--sort', choices=SORT_FIELDS, default='calls', help='Ranking field')
+    parser.add_argument('--shop', help='Show the detailed report of one shop')
+    args = parser.parse_args()
+
+    collection = MongoClient(os.environ.get('MONGO_URI'))[DATABASE_NAME]['inference_usage']
+    service = InferenceUsageService(InferenceUsageRepository(collection))
+
+    if args.shop:
+        print(json.dumps(service.get_shop_report(args.shop, args.days), indent=2, ensure_ascii=False))
+    else:
+        print_top_shops(service.get_top_shops(args.days, args.limit, args.sort), args.days)
+
+
+if __name__ == '__main__':
+    main()
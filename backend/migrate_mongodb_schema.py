@@ -71,7 +71,12 @@ def migrate_users_schema(db):
                 },
                 "device_token": {
                     "bsonType": ["string", "null"],
-                    "description": "FCM device token for push notifications"
+                    "description": "FCM device token for push notifications (legacy, latest device)"
+                },
+                "device_tokens": {
+                    "bsonType": "array",
+                    "items": {"bsonType": "string"},
+                    "description": "FCM device tokens for every registered device"
                 },
                 "telegram_chat_id": {
                     "bsonType": ["string", "null"],
@@ -0,0 +1,101 @@
+"""
+Model Server
+============
+
+Runs the local models in one process shared by all web workers, behind an
+HTTP API in the Hugging Face inference shape (see
+app/infrastructure/model_server/server.py):
+
+    POST http://127.0.0.1:8501/models/sentiment   LocalSentimentModel
+    POST http://127.0.0.1:8501/models/toxicity    ToxicityCascade local score
+                                                  (with --toxicity-upstream only)
+
+Point HF_SENTIMENT_MODEL_URL at the sentiment URL and set
+SENTIMENT_LOCAL_MODEL_ENABLED=false in the web workers, so the model is held
+in memory once instead of once per worker. With --sentiment-upstream, texts
+the local model is not confident about are sent to the real HF endpoint, as
+SentimentService does in-process. The X-Prediction-Source response header
+tells SentimentService which answers were local, so reviews record them as
+`analysis.sentiment_source: local` and train_sentiment_model.py leaves them out.
+
+The toxicity endpoint answers only what the lexicon settles and forwards the
+rest to --toxicity-upstream, so it is served only when that is set. The web
+workers already run the same lexicon (TOXICITY_CASCADE_ENABLED) before any
+toxicity call, so point HF_ARABIC_TOXICITY_MODEL_URL at it only for workers
+that run with the cascade disabled.
+
+The sentiment model file is reloaded when it changes (checked every
+--reload-interval seconds), on SIGHUP, or on POST /admin/reload, so a model
+retrained with train_sentiment_model.py goes live without a restart.
+
+Usage:
+    python model_server.py
+    python model_server.py --port 8501 --max-batch 64 \\
+        --sentiment-upstream https://router.huggingface.co/models/CAMeL-Lab/bert-base-arabic-camelbert-da-sentiment \\
+        --toxicity-upstream https://router.huggingface.co/hf-inference/models/textdetox/xlmr-large-toxicity-classifier-v2
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.presentation.config import (  # noqa: E402
+    SENTIMENT_LOCAL_MODEL_PATH,
+    SENTIMENT_LOCAL_MIN_CONFIDENCE,
+    TOXICITY_LOCAL_CLEAN_MAX,
+    TOXICITY_LOCAL_TOXIC_MIN
+)
+from app.infrastructure.model_server import ModelServer, SentimentModelHandler, ToxicityModelHandler  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8501)
+    parser.add_argument('--sentiment-model', default=SENTIMENT_LOCAL_MODEL_PATH)
+    parser.add_argument('--sentiment-min-confidence', type=float, default=SENTIMENT_LOCAL_MIN_CONFIDENCE)
+    parser.add_argument('--sentiment-upstream', help='HF URL for sentiment predictions below the confidence')
+    parser.add_argument(
+        '--toxicity-upstream',
+        help='HF toxicity URL for texts the lexicon cannot settle (the toxicity endpoint is served only with it)'
+    )
+    parser.add_argument('--max-batch', type=int, default=32, help='Most texts per model call')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='How long a text waits to be batched')
+    parser.add_argument('--reload-interval', type=float, default=30.0, help='Seconds between model file checks')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(levelname)s %(name)s: %(message)s')
+
+    own_prefixes = (f"http://{args.host}:{args.port}", f"http://localhost:{args.port}")
+    for upstream in (args.sentiment_upstream, args.toxicity_upstream):
+        if upstream and upstream.startswith(own_prefixes):
+            parser.error(f"upstream {upstream} points at this server")
+
+    handlers = [SentimentModelHandler(args.sentiment_model, args.sentiment_min_confidence, args.sentiment_upstream)]
+    if args.toxicity_upstream:
+        handlers.append(ToxicityModelHandler(args.toxicity_upstream, TOXICITY_LOCAL_CLEAN_MAX, TOXICITY_LOCAL_TOXIC_MIN))
+
+    server = ModelServer(
+        handlers,
+        host=args.host,
+        port=args.port,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+        reload_interval=args.reload_interval
+    )
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda *_: threading.Thread(target=server.reload, args=(True,)).start())
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""
+Trace Waterfall
+===============
+
+Renders per-review span waterfalls from the files written by the tracing
+exporter (TRACE_EXPORTER=json or otlp).
+
+Usage:
+    python trace_waterfall.py                      # slowest 5 traces in app/logs/traces
+    python trace_waterfall.py --trace <trace_id>   # one trace (X-Trace-Id response header)
+    python trace_waterfall.py --review <review_id> # trace that processed a review
+    python trace_waterfall.py --dir /tmp/traces --slowest 10
+"""
+import argparse
+import glob
+import json
+import os
+from collections import defaultdict
+
+DEFAULT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app', 'logs', 'traces')
+BAR_WIDTH = 50
+
+
+def _otlp_value(value):
+    for key in ('stringValue', 'boolValue', 'doubleValue'):
+        if key in value:
+            return value[key]
+    if 'intValue' in value:
+        return int(value['intValue'])
+    return None
+
+
+def _spans_from_line(record):
+    """Yield normalized span dicts from a JSON span record or an OTLP batch."""
+    if 'resourceSpans' not in record:
+        yield record
+        return
+    for resource_spans in record['resourceSpans']:
+        for scope_spans in resource_spans.get('scopeSpans', []):
+            for s in scope_spans.get('spans', []):
+                start, end = int(s['startTimeUnixNano']), int(s['endTimeUnixNano'])
+                yield {
+                    'trace_id': s['traceId'],
+                    'span_id': s['spanId'],
+                    'parent_id': s.get('parentSpanId') or None,
+                    'name': s['name'],
+                    'start_ns': start,
+                    'end_ns': end,
+                    'duration_ms': (end - start) / 1e6,
+                    'status': 'error' if s.get('status', {}).get('code') == 2 else 'ok',
+                    'attributes': {a['key']: _otlp_value(a['value']) for a in s.get('attributes', [])}
+                }
+
+
+def load_traces(directory):
+    """Group every span found in `directory` by trace ID."""
+    traces = defaultdict(list)
+    for path in sorted(glob.glob(os.path.join(directory, '*.jsonl'))):
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                for span in _spans_from_line(record):
+                    traces[span['trace_id']].append(span)
+    return traces
+
+
+def _root(spans):
+    ids = {s['span_id'] for s in spans}
+    roots = [s for s in spans if not s.get('parent_id') or s['parent_id'] not in ids]
+    return min(roots, key=lambda s: s['start_ns']) if roots else spans[0]
+
+
+def render_waterfall(spans):
+    """Return the waterfall for one trace as text."""
+    root = _root(spans)
+    trace_start = min(s['start_ns'] for s in spans)
+    trace_end = max(s['end_ns'] or s['start_ns'] for s in spans)
+    total = max(trace_end - trace_start, 1)
+
+    children = defaultdict(list)
+    for s in spans:
+        if s is not root:
+            children[s.get('parent_id')].append(s)
+
+    attrs = root.get('attributes', {})
+    lines = [
+        f"trace {root['trace_id']}  {root['name']}  {total / 1e6:.1f}ms"
+        + (f"  review={attrs['review_id']}" if attrs.get('review_id') else '')
+        + (f"  shop={attrs['shop_id']}" if attrs.get('shop_id') else '')
+        + (f"  outcome={attrs['outcome']}" if attrs.get('outcome') else '')
+    ]
+
+    def walk(span, depth):
+        offset = int((span['start_ns'] - trace_start) / total * BAR_WIDTH)
+        width = max(1, int(((span['end_ns'] or span['start_ns']) - span['start_ns']) / total * BAR_WIDTH))
+        bar = ' ' * offset + ('█' if span['status'] == 'ok' else '▓') * width
+        label = ('  ' * depth + span['name'])[:38]
+        lines.append(f"  {label:<38} {span['duration_ms']:>9.1f}ms |{bar:<{BAR_WIDTH}}|")
+        for child in sorted(children.get(span['span_id'], []), key=lambda s: s['start_ns']):
+            walk(child, depth + 1)
+
+    walk(root, 0)
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render trace waterfalls")
+    parser.add_argument('--dir', default=os.environ.get('TRACE_DIR', DEFAULT_DIR))
+    parser.add_argument('--trace', help="Trace ID to show")
+    parser.add_argument('--review', help="Review ID to show")
+    parser.add_argument('--slowest', type=int, default=5, help="Show the N slowest traces")
+    args = parser.parse_args()
+
+    traces = load_traces(args.dir)
+    if not traces:
+        print(f"No spans found in {args.dir}")
+        return
+
+    if args.trace:
+        selected = [traces.get(args.trace, [])]
+    elif args.review:
+        selected = [
+            spans for spans in traces.values()
+            if any(s.get('attributes', {}).get('review_id') == args.review for s in spans)
+        ]
+    else:
+        selected = sorted(traces.values(), key=lambda spans: _root(spans)['duration_ms'], reverse=True)
+        selected = selected[:args.slowest]
+
+    selected = [spans for spans in selected if spans]
+    if not selected:
+        print("No matching trace")
+        return
+    print('\n\n'.join(render_waterfall(spans) for spans in selected))
+
+
+if __name__ == "__main__":
+    main()
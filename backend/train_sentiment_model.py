@@ -0,0 +1,137 @@
+"""
+Train Sentiment Model
+=====================
+
+Fits the local sentiment model (hashed character n-grams + logistic
+regression) from processed reviews: the label is the HF sentiment stored in
+`analysis.sentiment`, checked against the star rating. Only reviews whose
+`analysis.sentiment_source` is 'hf' are used, so the model never learns from
+its own answers (or from star-rating and fallback labels). Reviews whose
+label contradicts their stars are left out (a positive label on 1-2 stars, a
+negative one on 4-5 stars, or "neutral" on 1 or 5 stars), as are reviews too
+short to have reached the HF model.
+
+Reviews saved before the label source was recorded have none; --legacy adds
+them, which is only safe while no local model has ever been deployed.
+
+A held-out split reports accuracy and the share of reviews answered locally
+at several confidence thresholds, to choose SENTIMENT_LOCAL_MIN_CONFIDENCE.
+The model is written to SENTIMENT_LOCAL_MODEL_PATH and loaded by every
+worker on its next start.
+
+Usage:
+    python train_sentiment_model.py                         # train, evaluate and save
+    python train_sentiment_model.py --dry-run               # evaluate only
+    python train_sentiment_model.py --legacy                # first model: also reviews without a label source
+    python train_sentiment_model.py --limit 50000 --epochs 8 --output /tmp/model.json.gz
+"""
+import argparse
+import os
+import random
+import time
+
+from dotenv import load_dotenv
+from pymongo import MongoClient
+
+load_dotenv()
+
+from app.presentation.config import SENTIMENT_LOCAL_MODEL_PATH  # noqa: E402
+from app.infrastructure.external.local_sentiment_model import LABELS, DEFAULT_DIM, LocalSentimentModel  # noqa: E402
+
+DATABASE_NAME = 'ReputationGuardian'
+MIN_CHARS = 15
+MIN_WORDS = 3
+THRESHOLDS = (0.0, 0.6, 0.7, 0.8, 0.85, 0.9, 0.95)
+
+
+def consistent_with_stars(label: str, stars) -> bool:
+    """Whether a stored sentiment label is plausible for the star rating."""
+    if not stars:
+        return True
+    if label == "إيجابي":
+        return stars >= 3
+    if label == "سلبي":
+        return stars <= 3
+    return 1 < stars < 5
+
+
+def labelled_samples(db, limit: int, legacy: bool = False):
+    """(text, label) pairs from the most recent HF-labelled reviews, and a skip count."""
+    sources = ['hf', None] if legacy else ['hf']
+    cursor = db['reviews'].find(
+        {
+            'status': 'processed',
+            'analysis.sentiment': {'$in': list(LABELS)},
+            'analysis.sentiment_source': {'$in': sources}
+        },
+        {'stars': 1, 'source.rating': 1, 'processing.concatenated_text': 1, 'analysis.sentiment': 1}
+    ).sort('_id', -1).limit(limit)
+    samples, skipped = [], 0
+    for review in cursor:
+        text = ((review.get('processing') or {}).get('concatenated_text') or '').strip()
+        label = review['analysis']['sentiment']
+        stars = (review.get('source') or {}).get('rating') or review.get('stars')
+        if len(text) < MIN_CHARS or len(text.split()) < MIN_WORDS or not consistent_with_stars(label, stars):
+            skipped += 1
+            continue
+        samples.append((text, label))
+    return samples, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--limit', type=int, default=100000, help='Most recent processed reviews read')
+    parser.add_argument('--holdout', type=float, default=0.1, help='Share of samples kept for evaluation')
+    parser.add_argument('--epochs', type=int, default=5)
+    parser.add_argument('--learning-rate', type=float, default=0.5)
+    parser.add_argument('--dim', type=int, default=DEFAULT_DIM, help='Hash buckets')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=SENTIMENT_LOCAL_MODEL_PATH)
+    parser.add_argument('--dry-run', action='store_true', help='Evaluate without saving the model')
+    parser.add_argument(
+        '--legacy',
+        action='store_true',
+        help='Also use reviews saved without a label source (only before any local model was deployed)'
+    )
+    args = parser.parse_args()
+
+    db = MongoClient(os.environ.get('MONGO_URI'))[DATABASE_NAME]
+    samples, skipped = labelled_samples(db, args.limit, args.legacy)
+    print(f"{len(samples)} labelled reviews ({skipped} skipped: too short or label contradicts stars)")
+    if not samples:
+        return
+
+    random.Random(args.seed).shuffle(samples)
+    split = int(len(samples) * (1 - args.holdout))
+    train, holdout = samples[:split], samples[split:]
+
+    started = time.perf_counter()
+    model = LocalSentimentModel.train(
+        train, dim=args.dim, epochs=args.epochs, learning_rate=args.learning_rate, seed=args.seed
+    )
+    print(f"Trained on {len(train)} reviews in {time.perf_counter() - started:.1f}s, {len(model.weights)} buckets")
+
+    if holdout:
+        rows = model.evaluate(holdout, THRESHOLDS)
+        print(f"\nHeld-out reviews: {len(holdout)}")
+        print(f"{'min confidence':>14} {'answered locally':>17} {'accuracy':>9}")
+        for row in rows:
+            accuracy = f"{row['accuracy']:.1%}" if row['accuracy'] is not None else '-'
+            print(f"{row['threshold']:>14.2f} {row['coverage']:>17.1%} {accuracy:>9}")
+        model.metadata['holdout'] = rows
+
+        started = time.perf_counter()
+        for text, _ in holdout[:1000]:
+            model.predict(text)
+        per_call = (time.perf_counter() - started) / min(len(holdout), 1000) * 1000
+        print(f"\nPrediction: {per_call:.3f} ms per review")
+
+    if args.dry_run:
+        print("\nDry run: model not saved")
+        return
+    model.save(args.output)
+    print(f"\nSaved to {args.output} ({os.path.getsize(args.output) / 1024:.0f} KB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Review Worker
+=============
+
+Finishes reviews whose webhook run was interrupted. Every review is
+checkpointed after each pipeline stage (see
+app/application/services/webhook/use_cases/process_review_use_case.py); this
+worker claims reviews whose lease expired and continues them from their last
+completed stage, so the model calls already made are not paid for again.
+
+Run one or more next to the web app (claims are atomic). With
+PIPELINE_RETRY_FALLBACKS=true it also retries reviews whose DeepSeek call
+fell back, up to PIPELINE_MAX_ATTEMPTS runs per review.
+
+It also enriches reviews saved in degraded mode (DEGRADED_MODE_ENABLED)
+with the relevancy check and DeepSeek content, pausing while the pipeline is
+still degraded.
+
+Jobs run WORKER_CONCURRENCY at a time, shared between shops by weighted
+deficit round-robin (see app/application/services/review_worker.py), so a
+burst of reviews for one shop does not delay the others. Complaints and
+low ratings (the priority assigned at ingestion) run before other reviews,
+which gain priority as they wait.
+
+Usage:
+    python worker.py                       # poll every 10 seconds
+    python worker.py --interval 5
+    python worker.py --once                # resume what is pending and exit
+"""
+import argparse
+import logging
+import signal
+import threading
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app import create_app  # noqa: E402
+from app.container import container  # noqa: E402
+
+logger = logging.getLogger('worker')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--interval', type=float, default=10.0, help='Seconds between polls when idle')
+    parser.add_argument('--once', action='store_true', help='Resume pending reviews once and exit')
+    args = parser.parse_args()
+
+    create_app()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+
+    worker = container.review_worker
+    logger.info(
+        "Review worker started (interval=%ss, concurrency=%s)", args.interval, worker.concurrency
+    )
+    try:
+        outcomes = worker.run(stop, interval=args.interval, once=args.once)
+        if outcomes:
+            logger.info("Review jobs run: %s", outcomes)
+    except KeyboardInterrupt:
+        stop.set()
+    logger.info("Review worker stopped")
+
+
+if __name__ == '__main__':
+    main()